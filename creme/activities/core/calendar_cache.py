@@ -0,0 +1,319 @@
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2026  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+from __future__ import annotations
+
+import json
+import logging
+from collections.abc import Callable, Iterable, Sequence
+from hashlib import sha1
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.core import signing
+from django.db import transaction
+from django.utils.timezone import get_current_timezone_name
+from django.utils.translation import get_language
+
+from creme.creme_core.core.token_cache import TokenCache
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from django.core.cache.backends.base import BaseCache
+
+logger = logging.getLogger(__name__)
+
+# Serialized activities (see views.calendar.ActivitiesData), per calendar ID
+EventsFetcher = Callable[[Sequence[int]], dict[int, list[dict]]]
+
+
+class CalendarsState:
+    """Versions of some calendars at a given time (see CalendarCache.get_state()).
+    The same state should be used to build the ETag, the sync token & to
+    retrieve the events of a response (so they are consistent).
+    """
+    def __init__(self, *, cache: BaseCache, global_token: str, calendars: dict[int, tuple]):
+        self.cache = cache
+        self.global_token = global_token
+        # Per calendar ID: tuple (token, sequence number of the last change)
+        self.calendars = calendars
+
+
+class CalendarCache:
+    """Cache for the data of the calendars' view.
+
+    The data are stored in a Django's cache (see the settings
+    "ACTIVITIES_CALENDAR_CACHE_ALIAS" & "ACTIVITIES_CALENDAR_CACHE_TIMEOUT").
+    Each calendar has:
+      - a token, renewed when the calendar itself is modified.
+      - a sequence number, incremented each time an activity of the calendar
+        changes (see 'activities.signals') ; the ID of the changed activity
+        is logged with this number, so the changes since a given state can
+        be retrieved (incremental synchronisation).
+    A global token is renewed when the configuration (credentials, types of
+    activity...) is modified.
+    The changes are recorded immediately, & again when the current transaction
+    is committed (see 'creme_core.core.token_cache').
+
+    Notice that modifications which do not send signals (e.g. QuerySet.update())
+    are not detected ; so use a timeout if you use such things.
+    """
+    key_prefix = 'activities-calendar'
+    sync_salt = 'creme.activities.calendar_sync'
+    # Beyond this number of changes (for a calendar), a synchronisation
+    # sends all the data again.
+    max_changes = 500
+
+    def __init__(self):
+        self.tokens = TokenCache(
+            key_prefix=self.key_prefix, alias_setting='ACTIVITIES_CALENDAR_CACHE_ALIAS',
+        )
+
+    @property
+    def cache(self) -> BaseCache | None:
+        "Get the Django's cache which is used; <None> means the cache is disabled."
+        return self.tokens.cache
+
+    def _seq_key(self, calendar_id: int) -> str:
+        return f'{self.key_prefix}-seq-{calendar_id}'
+
+    def _log_key(self, calendar_id: int, seq: int) -> str:
+        return f'{self.key_prefix}-log-{calendar_id}-{seq}'
+
+    @staticmethod
+    def _user_signature(user) -> str:
+        return (
+            f'{user.id}-superuser' if user.is_superuser else
+            f'{user.id}-{user.role_id}-{int(user.is_staff)}'
+        )
+
+    def get_state(self, calendar_ids: Iterable[int]) -> CalendarsState | None:
+        "Get the current versions of some calendars; <None> means the cache is disabled."
+        cache = self.cache
+        if cache is None:
+            return None
+
+        calendar_ids = [*calendar_ids]
+        seq_key = self._seq_key
+        seqs = cache.get_many([seq_key(cal_id) for cal_id in calendar_ids])
+
+        for cal_id in calendar_ids:
+            key = seq_key(cal_id)
+
+            if key not in seqs:
+                # NB: the sequence is created here, so log_change() can detect
+                #     the sequences which have been lost.
+                seqs[key] = 0 if cache.add(key, 0, timeout=None) else cache.get(key, 0)
+
+        global_token, *calendar_tokens = self.tokens.get_many(
+            cache, ['global', *(f'calendar-{cal_id}' for cal_id in calendar_ids)],
+        )
+
+        return CalendarsState(
+            cache=cache,
+            global_token=global_token,
+            calendars={
+                cal_id: (token, seqs[seq_key(cal_id)])
+                for cal_id, token in zip(calendar_ids, calendar_tokens)
+            },
+        )
+
+    def _signature(self, *, state: CalendarsState, calendar_ids: Iterable[int],
+                   user, start: datetime, end: datetime, extra: Sequence,
+                   ) -> str:
+        signature = json.dumps([
+            state.global_token,
+            [(cal_id, *state.calendars[cal_id]) for cal_id in calendar_ids],
+            self._user_signature(user),
+            start.isoformat(), end.isoformat(),
+            [str(e) for e in extra],
+            get_language(), get_current_timezone_name(),
+        ])
+
+        return sha1(signature.encode()).hexdigest()
+
+    def build_etag(self, *, state: CalendarsState | None, user,
+                   start: datetime, end: datetime, extra: Sequence = (),
+                   ) -> str | None:
+        """Build an ETag for the activities of some calendars (the ones of the
+        state) in a range of dates, as seen by a user.
+        @param extra: Additional data which change the content (e.g. format of the labels).
+        @return: A string, or <None> if the cache is disabled.
+        """
+        if state is None:
+            return None
+
+        return '"{}"'.format(self._signature(
+            state=state, calendar_ids=sorted(state.calendars), user=user,
+            start=start, end=end, extra=extra,
+        ))
+
+    def get_or_fetch(self, *, state: CalendarsState | None,
+                     calendar_ids: Sequence[int], user,
+                     start: datetime, end: datetime,
+                     fetcher: EventsFetcher,
+                     extra: Sequence = (),
+                     ) -> dict[int, list[dict]]:
+        """Get the serialized activities of some calendars in a range of dates.
+        The data are cached per calendar, so only the calendars which have
+        been modified are fetched again.
+        @param state: see get_state().
+        @param calendar_ids: IDs of the calendars (the ones of the state if it's not None).
+        @param fetcher: Callable which takes a sequence of calendars' IDs &
+               returns the serialized activities per calendar ID.
+        @param extra: see build_etag().
+        @return: A dictionary with calendars' IDs as keys & lists of
+                 serialized activities as values.
+        """
+        if state is None:
+            return fetcher(calendar_ids)
+
+        cache = state.cache
+        keys = {
+            cal_id: f'{self.key_prefix}-data-{cal_id}-' + self._signature(
+                state=state, calendar_ids=[cal_id], user=user,
+                start=start, end=end, extra=extra,
+            ) for cal_id in calendar_ids
+        }
+        cached = cache.get_many(keys.values())
+        events = {
+            cal_id: cached[key] for cal_id, key in keys.items() if key in cached
+        }
+
+        missing_ids = [cal_id for cal_id in calendar_ids if cal_id not in events]
+        if missing_ids:
+            fetched = fetcher(missing_ids)
+            missing_events = {cal_id: fetched.get(cal_id, []) for cal_id in missing_ids}
+            cache.set_many(
+                {keys[cal_id]: cal_events for cal_id, cal_events in missing_events.items()},
+                timeout=settings.ACTIVITIES_CALENDAR_CACHE_TIMEOUT,
+            )
+            events.update(missing_events)
+
+        return events
+
+    def build_sync_token(self, *, state: CalendarsState | None,
+                         start: datetime, end: datetime,
+                         ) -> str | None:
+        "Build the token used to retrieve the changes which happen after the given state."
+        if state is None:
+            return None
+
+        return signing.dumps(
+            {
+                'global': state.global_token,
+                'calendars': {
+                    str(cal_id): [*cal_state] for cal_id, cal_state in state.calendars.items()
+                },
+                'range': [start.isoformat(), end.isoformat()],
+            },
+            salt=self.sync_salt, compress=True,
+        )
+
+    def get_changes(self, *, state: CalendarsState | None, sync_token: str,
+                    start: datetime, end: datetime,
+                    ) -> dict[int, set[int]] | None:
+        """Get the activities which have changed since a sync token has been built.
+        @param state: The current state (see get_state()).
+        @param sync_token: see build_sync_token().
+        @return: A dictionary with calendars' IDs as keys & sets of activities'
+                 IDs as values ; <None> means that the changes are unknown
+                 (so all the data must be sent again).
+        """
+        if state is None or not sync_token:
+            return None
+
+        try:
+            data = signing.loads(sync_token, salt=self.sync_salt)
+            old_calendars = {
+                int(cal_id): tuple(cal_state)
+                for cal_id, cal_state in data['calendars'].items()
+            }
+            old_global_token = data['global']
+            old_range = data['range']
+        except Exception as e:
+            logger.info('CalendarCache.get_changes(): invalid token (%s)', e)
+            return None
+
+        if (
+            old_global_token != state.global_token
+            or old_range != [start.isoformat(), end.isoformat()]
+            or old_calendars.keys() != state.calendars.keys()
+        ):
+            return None
+
+        log_keys = {}
+        for cal_id, (token, seq) in state.calendars.items():
+            old_token, old_seq = old_calendars[cal_id]
+
+            if token != old_token or not (0 <= seq - old_seq <= self.max_changes):
+                return None
+
+            log_keys.update(
+                (self._log_key(cal_id, i), cal_id) for i in range(old_seq + 1, seq + 1)
+            )
+
+        logged = state.cache.get_many(log_keys.keys())
+        if len(logged) != len(log_keys):  # Some entries have expired
+            return None
+
+        changes = {cal_id: set() for cal_id in state.calendars}
+        for key, activity_id in logged.items():
+            changes[log_keys[key]].add(activity_id)
+
+        return changes
+
+    def _log_change(self, cache: BaseCache, calendar_ids: Sequence[int], activity_id: int) -> None:
+        timeout = settings.ACTIVITIES_CALENDAR_CACHE_TIMEOUT
+
+        for cal_id in calendar_ids:
+            seq_key = self._seq_key(cal_id)
+
+            if cache.add(seq_key, 0, timeout=None):
+                # The sequence has been lost (eviction...) & restarts
+                # => the previous sync tokens must be rejected.
+                self.tokens.renew(f'calendar-{cal_id}')
+
+            seq = cache.incr(seq_key)
+            cache.set(self._log_key(cal_id, seq), activity_id, timeout=timeout)
+
+    def log_change(self, *, calendar_ids: Iterable[int], activity_id: int) -> None:
+        """Indicate that an activity has changed in some calendars (creation, edition, removal...).
+        The change is logged again when the current transaction is committed
+        (another process could cache the old data with the new sequence number meanwhile).
+        """
+        cache = self.cache
+
+        if cache is not None:
+            calendar_ids = [*calendar_ids]
+            self._log_change(cache, calendar_ids, activity_id)
+            transaction.on_commit(
+                lambda: self._log_change(cache, calendar_ids, activity_id)
+            )
+
+    def invalidate_calendar(self, calendar_id: int) -> None:
+        "Invalidate all the data related to a calendar."
+        self.tokens.renew(f'calendar-{calendar_id}')
+
+    def invalidate_all(self) -> None:
+        "Invalidate the data of all the calendars."
+        self.tokens.renew('global')
+
+
+calendar_cache = CalendarCache()
@@ -42,6 +42,7 @@ from creme.persons.models import Civility
 
 from .. import constants
 from ..models import Calendar
+from ..utils import ActivityCollisionIndex
 from . import fields as act_fields
 from .fields import ActivitySubTypeField
 
@@ -616,6 +617,7 @@ def get_massimport_form_builder(header_dict, choices) -> type[ImportForm4CremeEn
 
             self.user_participants = set()
             self.calendars = []
+            self.collisions_index = ActivityCollisionIndex()
 
         def clean_my_participation(self):
             my_participation = self.cleaned_data['my_participation']
@@ -714,6 +716,24 @@ def get_massimport_form_builder(header_dict, choices) -> type[ImportForm4CremeEn
                 if part_user is not None:
                     add_to_default_calendar(part_user)
 
+            # Collisions (the imported activities are checked against each other too)
+            participants = {
+                participant.id: participant
+                for participant in (*self.user_participants, *dyn_participants)
+            }.values()
+            collisions_index = self.collisions_index
+
+            for err_msg in collisions_index.check(
+                activity_start=instance.start,
+                activity_end=instance.end,
+                participants=participants,
+                busy=instance.busy,
+                exclude_activity_id=instance.id,
+            ):
+                self.append_error(err_msg)
+
+            collisions_index.add(instance, participants)
+
             # Subjects ----
             subjects, err_messages = cdata['subjects'].extract_value(line, self.user)
 
@@ -1,6 +1,6 @@
 ################################################################################
 #    Creme is a free/open-source Customer Relationship Management software
-#    Copyright (C) 2015-2025  Hybird
+#    Copyright (C) 2015-2026  Hybird
 #
 #    This program is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU Affero General Public License as published by
@@ -19,22 +19,29 @@
 import logging
 
 from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.db.models import signals
 from django.dispatch import receiver
 
 import creme.persons.constants as persons_constants
-from creme.creme_core.models import Relation
+from creme.creme_core.core.token_cache import watch_models
+from creme.creme_core.models import Relation, SetCredentials, UserRole
 from creme.persons import get_organisation_model
 
+from . import get_activity_model
 from .constants import (
+    REL_OBJ_ACTIVITY_SUBJECT,
+    REL_OBJ_LINKED_2_ACTIVITY,
     REL_OBJ_PART_2_ACTIVITY,
     REL_SUB_ACTIVITY_SUBJECT,
     REL_SUB_PART_2_ACTIVITY,
 )
-from .models import Calendar
+from .core.calendar_cache import calendar_cache
+from .models import ActivityType, Calendar, Status
 from .utils import is_auto_orga_subject_enabled
 
 logger = logging.getLogger(__name__)
+Activity = get_activity_model()
 Organisation = get_organisation_model()
 
 
@@ -127,3 +134,106 @@ def _transfer_default_calendar(sender, instance, **kwargs):
     #     different from the original default Calendar (i.e. the default Calendar
     #     of this User can change 'silently').
     Calendar.objects.filter(user=instance, is_default=True).update(is_default=False)
+
+
+# Cache of the calendars' data ---
+def _log_activity_change(activity_id):
+    calendar_cache.log_change(
+        calendar_ids=[
+            cal_id
+            for cal_id in Activity.objects.filter(
+                id=activity_id,
+            ).values_list('calendars', flat=True)
+            if cal_id is not None
+        ],
+        activity_id=activity_id,
+    )
+
+
+@receiver(
+    signals.post_save,
+    sender=Activity, dispatch_uid='activities-log_calendar_change_on_save',
+)
+@receiver(
+    signals.pre_delete,
+    sender=Activity, dispatch_uid='activities-log_calendar_change_on_deletion',
+)
+def _log_calendar_change(sender, instance, created=False, **kwargs):
+    # NB: the calendars are set after the creation
+    if not created and calendar_cache.cache is not None:
+        _log_activity_change(instance.id)
+
+
+@receiver(
+    signals.m2m_changed,
+    sender=Activity.calendars.through, dispatch_uid='activities-log_calendar_change_on_m2m',
+)
+def _log_calendar_change_on_m2m(sender, instance, action, reverse, pk_set, **kwargs):
+    if calendar_cache.cache is None:
+        return
+
+    if action in ('post_add', 'post_remove'):
+        if reverse:  # "instance" is a Calendar
+            for activity_id in pk_set:
+                calendar_cache.log_change(calendar_ids=[instance.id], activity_id=activity_id)
+        else:
+            calendar_cache.log_change(calendar_ids=pk_set, activity_id=instance.id)
+    elif action == 'pre_clear':
+        if reverse:
+            calendar_cache.invalidate_calendar(instance.id)
+        else:
+            _log_activity_change(instance.id)
+
+
+@receiver(
+    signals.post_save,
+    sender=Relation, dispatch_uid='activities-log_calendar_change_on_relation_save',
+)
+@receiver(
+    signals.post_delete,
+    sender=Relation, dispatch_uid='activities-log_calendar_change_on_relation_deletion',
+)
+def _log_calendar_change_on_relation(sender, instance, **kwargs):
+    # NB: the subject of these types is the activity
+    #     (the symmetrical relationships are ignored to avoid useless work)
+    if (
+        instance.type_id in (
+            REL_OBJ_PART_2_ACTIVITY, REL_OBJ_ACTIVITY_SUBJECT, REL_OBJ_LINKED_2_ACTIVITY,
+        )
+        and calendar_cache.cache is not None
+    ):
+        _log_activity_change(instance.subject_entity_id)
+
+
+@receiver(
+    signals.post_save,
+    sender=Calendar, dispatch_uid='activities-invalidate_calendar_cache_on_save',
+)
+@receiver(
+    signals.post_delete,
+    sender=Calendar, dispatch_uid='activities-invalidate_calendar_cache_on_deletion',
+)
+def _invalidate_calendar_cache(sender, instance, **kwargs):
+    calendar_cache.invalidate_calendar(instance.id)
+
+
+def _invalidate_calendars_cache(sender, instance, **kwargs):
+    calendar_cache.invalidate_all()
+
+
+watch_models(
+    _invalidate_calendars_cache,
+    models=[ActivityType, Status, UserRole, SetCredentials],
+    dispatch_uid='activities-invalidate_calendars_cache',
+)
+
+
+@receiver(
+    signals.m2m_changed,
+    sender=get_user_model().teammates_set.through,
+    dispatch_uid='activities-invalidate_calendars_cache_on_teams',
+)
+def _invalidate_calendars_cache_on_teams(sender, action, **kwargs):
+    # NB: the teams change the credentials (activities owned by a team...)
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        calendar_cache.invalidate_all()
@@ -0,0 +1,320 @@
+from functools import partial
+
+from django.core.cache import caches
+from django.test.utils import override_settings
+
+from creme.activities import constants
+from creme.activities.core.calendar_cache import (
+    CalendarCache,
+    CalendarsState,
+    calendar_cache,
+)
+from creme.activities.models import Calendar, Status
+from creme.creme_core.models import Relation
+
+from ..base import Activity, _ActivitiesTestCase, skipIfCustomActivity
+
+
+@skipIfCustomActivity
+@override_settings(
+    ACTIVITIES_CALENDAR_CACHE_ALIAS='default', ACTIVITIES_CALENDAR_CACHE_TIMEOUT=None,
+)
+class CalendarCacheTestCase(_ActivitiesTestCase):
+    def setUp(self):
+        super().setUp()
+        caches['default'].clear()
+
+    def _create_activity(self, user, title='Meeting #1', **kwargs):
+        sub_type = self._get_sub_type(constants.UUID_SUBTYPE_MEETING_NETWORK)
+        create_dt = self.create_datetime
+
+        return Activity.objects.create(
+            user=user, title=title,
+            type_id=sub_type.type_id, sub_type=sub_type,
+            start=create_dt(year=2025, month=3, day=10, hour=14),
+            end=create_dt(year=2025, month=3, day=10, hour=15),
+            **kwargs
+        )
+
+    def _get_seq(self, calendar):
+        return calendar_cache.get_state([calendar.id]).calendars[calendar.id][1]
+
+    def test_cache(self):
+        self.assertIsInstance(calendar_cache, CalendarCache)
+        self.assertIs(caches['default'], calendar_cache.cache)
+
+        with override_settings(ACTIVITIES_CALENDAR_CACHE_ALIAS=''):
+            self.assertIsNone(calendar_cache.cache)
+            self.assertIsNone(calendar_cache.get_state([1, 2]))
+
+    def test_state(self):
+        user = self.get_root_user()
+        cal1 = Calendar.objects.get_default_calendar(user)
+        cal2 = Calendar.objects.create(user=user, name='Other Cal', is_custom=True)
+
+        state1 = calendar_cache.get_state([cal1.id, cal2.id])
+        self.assertIsInstance(state1, CalendarsState)
+        self.assertCountEqual([cal1.id, cal2.id], state1.calendars.keys())
+        self.assertEqual(0, state1.calendars[cal1.id][1])
+
+        state2 = calendar_cache.get_state([cal1.id, cal2.id])
+        self.assertEqual(state1.global_token, state2.global_token)
+        self.assertDictEqual(state1.calendars, state2.calendars)
+
+        calendar_cache.log_change(calendar_ids=[cal1.id], activity_id=12)
+        state3 = calendar_cache.get_state([cal1.id, cal2.id])
+        self.assertEqual((state1.calendars[cal1.id][0], 1), state3.calendars[cal1.id])
+        self.assertEqual(state1.calendars[cal2.id], state3.calendars[cal2.id])
+
+        calendar_cache.invalidate_calendar(cal2.id)
+        state4 = calendar_cache.get_state([cal1.id, cal2.id])
+        self.assertEqual(state3.calendars[cal1.id], state4.calendars[cal1.id])
+        self.assertNotEqual(state3.calendars[cal2.id], state4.calendars[cal2.id])
+
+        calendar_cache.invalidate_all()
+        self.assertNotEqual(
+            state4.global_token,
+            calendar_cache.get_state([cal1.id]).global_token,
+        )
+
+    def test_log_change__on_commit(self):
+        "The change is logged again after the commit."
+        user = self.get_root_user()
+        cal = Calendar.objects.get_default_calendar(user)
+        self.assertEqual(0, self._get_seq(cal))
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            calendar_cache.log_change(calendar_ids=[cal.id], activity_id=12)
+            self.assertEqual(1, self._get_seq(cal))
+
+        self.assertEqual(1, len(callbacks))
+        self.assertEqual(2, self._get_seq(cal))
+
+        state = calendar_cache.get_state([cal.id])
+        self.assertEqual(
+            12, caches['default'].get(calendar_cache._log_key(cal.id, 2)),
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            calendar_cache.invalidate_all()
+            global_token = calendar_cache.get_state([cal.id]).global_token
+            self.assertNotEqual(state.global_token, global_token)
+
+        self.assertNotEqual(global_token, calendar_cache.get_state([cal.id]).global_token)
+
+    def test_etag(self):
+        user = self.get_root_user()
+        other_user = self.create_user()
+        cal = Calendar.objects.get_default_calendar(user)
+
+        create_dt = self.create_datetime
+        start = create_dt(year=2025, month=3, day=1)
+        end = create_dt(year=2025, month=3, day=31)
+
+        build_etag = partial(calendar_cache.build_etag, start=start, end=end)
+        self.assertIsNone(build_etag(state=None, user=user))
+
+        state = calendar_cache.get_state([cal.id])
+        etag = build_etag(state=state, user=user)
+        self.assertIsInstance(etag, str)
+        self.assertEqual(etag, build_etag(state=state, user=user))
+        self.assertNotEqual(etag, build_etag(state=state, user=other_user))
+        self.assertNotEqual(etag, build_etag(state=state, user=user, extra=['label']))
+        self.assertNotEqual(
+            etag,
+            calendar_cache.build_etag(
+                state=state, user=user, start=start, end=create_dt(year=2025, month=4, day=1),
+            ),
+        )
+
+        calendar_cache.log_change(calendar_ids=[cal.id], activity_id=12)
+        self.assertNotEqual(
+            etag,
+            build_etag(state=calendar_cache.get_state([cal.id]), user=user),
+        )
+
+    def test_get_or_fetch(self):
+        user = self.get_root_user()
+        cal1 = Calendar.objects.get_default_calendar(user)
+        cal2 = Calendar.objects.create(user=user, name='Other Cal', is_custom=True)
+        calendar_ids = [cal1.id, cal2.id]
+
+        fetched_ids = []
+
+        def fetcher(cal_ids):
+            fetched_ids.append([*cal_ids])
+            return {cal_id: [{'id': 12, 'calendar': cal_id}] for cal_id in cal_ids}
+
+        create_dt = self.create_datetime
+        get_or_fetch = partial(
+            calendar_cache.get_or_fetch,
+            calendar_ids=calendar_ids, user=user, fetcher=fetcher,
+            start=create_dt(year=2025, month=3, day=1),
+            end=create_dt(year=2025, month=3, day=31),
+        )
+        expected = {
+            cal1.id: [{'id': 12, 'calendar': cal1.id}],
+            cal2.id: [{'id': 12, 'calendar': cal2.id}],
+        }
+        self.assertDictEqual(expected, get_or_fetch(state=calendar_cache.get_state(calendar_ids)))
+        self.assertListEqual([calendar_ids], fetched_ids)
+
+        # Cached
+        self.assertDictEqual(expected, get_or_fetch(state=calendar_cache.get_state(calendar_ids)))
+        self.assertEqual(1, len(fetched_ids))
+
+        # Only the modified calendar is fetched again
+        calendar_cache.log_change(calendar_ids=[cal2.id], activity_id=12)
+        self.assertDictEqual(expected, get_or_fetch(state=calendar_cache.get_state(calendar_ids)))
+        self.assertListEqual([cal2.id], fetched_ids[-1])
+
+        # No cache
+        self.assertDictEqual(expected, get_or_fetch(state=None))
+        self.assertListEqual(calendar_ids, fetched_ids[-1])
+
+    def test_changes(self):
+        user = self.get_root_user()
+        cal1 = Calendar.objects.get_default_calendar(user)
+        cal2 = Calendar.objects.create(user=user, name='Other Cal', is_custom=True)
+        calendar_ids = [cal1.id, cal2.id]
+
+        create_dt = self.create_datetime
+        start = create_dt(year=2025, month=3, day=1)
+        end = create_dt(year=2025, month=3, day=31)
+
+        state1 = calendar_cache.get_state(calendar_ids)
+        token = calendar_cache.build_sync_token(state=state1, start=start, end=end)
+        self.assertIsInstance(token, str)
+        self.assertDictEqual(
+            {cal1.id: set(), cal2.id: set()},
+            calendar_cache.get_changes(state=state1, sync_token=token, start=start, end=end),
+        )
+
+        calendar_cache.log_change(calendar_ids=[cal1.id], activity_id=12)
+        calendar_cache.log_change(calendar_ids=[cal1.id, cal2.id], activity_id=13)
+        calendar_cache.log_change(calendar_ids=[cal1.id], activity_id=12)
+
+        get_changes = partial(
+            calendar_cache.get_changes,
+            state=calendar_cache.get_state(calendar_ids), sync_token=token,
+        )
+        self.assertDictEqual(
+            {cal1.id: {12, 13}, cal2.id: {13}},
+            get_changes(start=start, end=end),
+        )
+
+        # Changes cannot be computed => None
+        self.assertIsNone(get_changes(start=start, end=create_dt(year=2025, month=4, day=1)))
+        self.assertIsNone(calendar_cache.get_changes(
+            state=calendar_cache.get_state([cal1.id]), sync_token=token, start=start, end=end,
+        ))
+        self.assertIsNone(calendar_cache.get_changes(
+            state=calendar_cache.get_state(calendar_ids), sync_token='invalid',
+            start=start, end=end,
+        ))
+        self.assertIsNone(calendar_cache.get_changes(
+            state=None, sync_token=token, start=start, end=end,
+        ))
+
+        calendar_cache.invalidate_calendar(cal2.id)
+        self.assertIsNone(calendar_cache.get_changes(
+            state=calendar_cache.get_state(calendar_ids), sync_token=token,
+            start=start, end=end,
+        ))
+
+    def test_changes__too_many(self):
+        user = self.get_root_user()
+        cal = Calendar.objects.get_default_calendar(user)
+
+        create_dt = self.create_datetime
+        start = create_dt(year=2025, month=3, day=1)
+        end = create_dt(year=2025, month=3, day=31)
+
+        token = calendar_cache.build_sync_token(
+            state=calendar_cache.get_state([cal.id]), start=start, end=end,
+        )
+
+        cache = CalendarCache()
+        cache.max_changes = 2
+        cache.log_change(calendar_ids=[cal.id], activity_id=12)
+        cache.log_change(calendar_ids=[cal.id], activity_id=13)
+
+        get_changes = partial(cache.get_changes, sync_token=token, start=start, end=end)
+        self.assertDictEqual(
+            {cal.id: {12, 13}}, get_changes(state=cache.get_state([cal.id])),
+        )
+
+        cache.log_change(calendar_ids=[cal.id], activity_id=14)
+        self.assertIsNone(get_changes(state=cache.get_state([cal.id])))
+
+    def test_signals__activity(self):
+        user = self.get_root_user()
+        cal1 = Calendar.objects.get_default_calendar(user)
+        cal2 = Calendar.objects.create(user=user, name='Other Cal', is_custom=True)
+
+        activity = self._create_activity(user)
+        self.assertEqual(0, self._get_seq(cal1))
+
+        activity.calendars.add(cal1)
+        self.assertEqual(1, self._get_seq(cal1))
+
+        activity.title = 'Meeting #1 (edited)'
+        activity.save()
+        self.assertEqual(2, self._get_seq(cal1))
+
+        activity.calendars.set([cal2])
+        self.assertEqual(3, self._get_seq(cal1))
+        self.assertEqual(1, self._get_seq(cal2))
+
+        cal2.activity_set.remove(activity)
+        self.assertEqual(2, self._get_seq(cal2))
+
+        cal2.activity_set.add(activity)
+        self.assertEqual(3, self._get_seq(cal2))
+
+        activity.delete()
+        self.assertEqual(4, self._get_seq(cal2))
+
+    def test_signals__relation(self):
+        user = self.get_root_user()
+        cal = Calendar.objects.get_default_calendar(user)
+
+        activity = self._create_activity(user)
+        activity.calendars.add(cal)
+        seq = self._get_seq(cal)
+
+        Relation.objects.create(
+            user=user, subject_entity=user.linked_contact,
+            type_id=constants.REL_SUB_PART_2_ACTIVITY, object_entity=activity,
+        )
+        self.assertLess(seq, self._get_seq(cal))
+
+    def test_signals__calendar(self):
+        user = self.get_root_user()
+        cal = Calendar.objects.get_default_calendar(user)
+        state1 = calendar_cache.get_state([cal.id])
+
+        cal.color = '00FF00'
+        cal.save()
+        state2 = calendar_cache.get_state([cal.id])
+        self.assertNotEqual(state1.calendars[cal.id], state2.calendars[cal.id])
+        self.assertEqual(state1.global_token, state2.global_token)
+
+        Status.objects.create(name='Pending')
+        self.assertNotEqual(
+            state2.global_token, calendar_cache.get_state([cal.id]).global_token,
+        )
+
+    def test_signals__teams(self):
+        user = self.get_root_user()
+        cal = Calendar.objects.get_default_calendar(user)
+        state1 = calendar_cache.get_state([cal.id])
+
+        team = self.create_team('Team', user)
+        state2 = calendar_cache.get_state([cal.id])
+        self.assertNotEqual(state1.global_token, state2.global_token)
+
+        team.teammates_set.remove(user)
+        self.assertNotEqual(
+            state2.global_token, calendar_cache.get_state([cal.id]).global_token,
+        )
@@ -5,6 +5,7 @@ from django.core.exceptions import ValidationError
 from django.utils.timezone import get_current_timezone
 from django.utils.timezone import override as override_tz
 from django.utils.timezone import zoneinfo
+from django.utils.translation import gettext as _
 from django.utils.translation import pgettext
 
 from creme import __version__ as creme_version
@@ -14,6 +15,7 @@ from creme.persons.tests.base import skipIfCustomContact
 from .. import constants
 from ..models import Status
 from ..utils import (
+    ActivityCollisionIndex,
     ICalEncoder,
     ZoneinfoToVtimezone,
     check_activity_collisions,
@@ -192,6 +194,263 @@ class UtilsTestCase(_ActivitiesTestCase):
             busy=False, participants=[c1, c2],
         )
 
+    @skipIfCustomContact
+    def test_collision__queries(self):
+        "The participants are checked with one query."
+        user = self.get_root_user()
+
+        sub_type = self._get_sub_type(constants.UUID_SUBTYPE_MEETING_MEETING)
+        create_dt = self.create_datetime
+        create_activity = partial(
+            Activity.objects.create,
+            user=user, type_id=sub_type.type_id, sub_type=sub_type,
+        )
+        act1 = create_activity(
+            title='meet01',
+            start=create_dt(year=2010, month=10, day=1, hour=14, minute=0),
+            end=create_dt(year=2010, month=10, day=1, hour=15, minute=0),
+        )
+        act2 = create_activity(
+            title='meet02',
+            start=create_dt(year=2010, month=10, day=1, hour=14, minute=30),
+            end=create_dt(year=2010, month=10, day=1, hour=16, minute=0),
+        )
+
+        create_contact = partial(Contact.objects.create, user=user)
+        c1 = create_contact(first_name='Tatsumi', last_name='Oga')
+        c2 = create_contact(first_name='Aoi',     last_name='Kunieda')
+        c3 = create_contact(first_name='Hilda',   last_name='Oga')
+
+        create_rel = partial(
+            Relation.objects.create, user=user, type_id=constants.REL_SUB_PART_2_ACTIVITY,
+        )
+        create_rel(subject_entity=c1, object_entity=act1)
+        create_rel(subject_entity=c1, object_entity=act2)
+        create_rel(subject_entity=c2, object_entity=act1)
+
+        start = create_dt(year=2010, month=10, day=1, hour=14, minute=45)
+        end   = create_dt(year=2010, month=10, day=1, hour=17, minute=0)
+
+        with self.assertNumQueries(1):
+            collisions = check_activity_collisions(
+                activity_start=start, activity_end=end, participants=[c1, c2, c3],
+            )
+
+        msg = _(
+            '{participant} already participates in the activity '
+            '«{activity}» between {start} and {end}.'
+        )
+        self.assertListEqual(
+            [
+                # The latest activity
+                msg.format(participant=c1, activity=act2, start='14:45:00', end='16:00:00'),
+                msg.format(participant=c2, activity=act1, start='14:45:00', end='15:00:00'),
+            ],
+            collisions,
+        )
+
+        self.assertListEqual(
+            [msg.format(participant=c1, activity=act2, start='14:45:00', end='16:00:00')],
+            check_activity_collisions(
+                activity_start=start, activity_end=end, participants=[c1, c2, c3],
+                exclude_activity_id=act1.id,
+            ),
+        )
+        self.assertListEqual(
+            [], check_activity_collisions(start, end, participants=[]),
+        )
+
+    @skipIfCustomContact
+    def test_collision_index(self):
+        user = self.get_root_user()
+
+        sub_type = self._get_sub_type(constants.UUID_SUBTYPE_MEETING_MEETING)
+        create_dt = self.create_datetime
+        build_activity = partial(
+            Activity, user=user, type_id=sub_type.type_id, sub_type=sub_type,
+        )
+        act1 = build_activity(
+            title='meet01', busy=True,
+            start=create_dt(year=2010, month=10, day=1, hour=14, minute=0),
+            end=create_dt(year=2010, month=10, day=1, hour=15, minute=0),
+        )
+        act1.save()
+
+        create_contact = partial(Contact.objects.create, user=user)
+        c1 = create_contact(first_name='Tatsumi', last_name='Oga')
+        c2 = create_contact(first_name='Aoi',     last_name='Kunieda')
+
+        Relation.objects.create(
+            user=user, subject_entity=c1,
+            type_id=constants.REL_SUB_PART_2_ACTIVITY, object_entity=act1,
+        )
+
+        index = ActivityCollisionIndex()
+        load_start = create_dt(year=2010, month=10, day=1, hour=9, minute=0)
+        load_end = create_dt(year=2010, month=10, day=1, hour=18, minute=0)
+        with self.assertNumQueries(1):
+            index.load([c1, c2], load_start, load_end)
+
+        with self.assertNumQueries(0):
+            index.load([c1], load_start, load_end)
+
+        msg = _(
+            '{participant} already participates in the activity '
+            '«{activity}» between {start} and {end}.'
+        )
+
+        # Existing activity ---
+        check = index.check
+        with self.assertNumQueries(0):
+            self.assertListEqual(
+                [msg.format(participant=c1, activity=act1, start='14:00:00', end='15:00:00')],
+                check(
+                    activity_start=create_dt(year=2010, month=10, day=1, hour=13, minute=0),
+                    activity_end=create_dt(year=2010, month=10, day=1, hour=16, minute=0),
+                    participants=[c1, c2],
+                ),
+            )
+            self.assertListEqual(
+                [],
+                check(
+                    activity_start=create_dt(year=2010, month=10, day=1, hour=15, minute=0),
+                    activity_end=create_dt(year=2010, month=10, day=1, hour=16, minute=0),
+                    participants=[c1, c2],
+                ),
+            )
+            self.assertListEqual(
+                [],
+                check(
+                    activity_start=create_dt(year=2010, month=10, day=1, hour=13, minute=0),
+                    activity_end=create_dt(year=2010, month=10, day=1, hour=14, minute=0),
+                    participants=[c1, c2],
+                ),
+            )
+            self.assertListEqual(
+                [],
+                check(
+                    activity_start=create_dt(year=2010, month=10, day=1, hour=14, minute=0),
+                    activity_end=create_dt(year=2010, month=10, day=1, hour=15, minute=0),
+                    participants=[c1],
+                    exclude_activity_id=act1.id,
+                ),
+            )
+
+        # Not saved activities ---
+        act2 = build_activity(
+            id=act1.id + 1000,  # NB: not saved
+            title='meet02', busy=False,
+            start=create_dt(year=2010, month=10, day=2, hour=9, minute=0),
+            end=create_dt(year=2010, month=10, day=2, hour=12, minute=0),
+        )
+        index.add(act2, [c1, c2])
+
+        start = create_dt(year=2010, month=10, day=2, hour=11, minute=0)
+        end   = create_dt(year=2010, month=10, day=2, hour=13, minute=0)
+        self.assertListEqual(
+            [
+                msg.format(participant=c1, activity=act2, start='11:00:00', end='12:00:00'),
+                msg.format(participant=c2, activity=act2, start='11:00:00', end='12:00:00'),
+            ],
+            check(activity_start=start, activity_end=end, participants=[c1, c2]),
+        )
+        # act2 does not busy its participants
+        self.assertListEqual(
+            [],
+            check(activity_start=start, activity_end=end, participants=[c1], busy=False),
+        )
+
+        # Re-indexed with other dates & participants
+        act2.start = create_dt(year=2010, month=10, day=3, hour=9, minute=0)
+        act2.end   = create_dt(year=2010, month=10, day=3, hour=12, minute=0)
+        index.add(act2, [c2])
+        self.assertListEqual(
+            [], check(activity_start=start, activity_end=end, participants=[c1, c2]),
+        )
+        self.assertIsNone(index.find(
+            activity_start=create_dt(year=2010, month=10, day=3, hour=10, minute=0),
+            activity_end=create_dt(year=2010, month=10, day=3, hour=11, minute=0),
+            participant_id=c1.id,
+        ))
+        self.assertEqual(
+            act2,
+            index.find(
+                activity_start=create_dt(year=2010, month=10, day=3, hour=10, minute=0),
+                activity_end=create_dt(year=2010, month=10, day=3, hour=11, minute=0),
+                participant_id=c2.id,
+            ),
+        )
+
+    @skipIfCustomContact
+    def test_collision_index__windows(self):
+        "The existing activities are loaded per window; the NULL dates are ignored."
+        user = self.get_root_user()
+
+        sub_type = self._get_sub_type(constants.UUID_SUBTYPE_MEETING_MEETING)
+        create_dt = self.create_datetime
+        create_activity = partial(
+            Activity.objects.create,
+            user=user, type_id=sub_type.type_id, sub_type=sub_type, busy=True,
+        )
+        act1 = create_activity(
+            title='meet01',
+            start=create_dt(year=2010, month=10, day=1, hour=14, minute=0),
+            end=create_dt(year=2010, month=10, day=1, hour=15, minute=0),
+        )
+        act2 = create_activity(
+            title='meet02',
+            start=create_dt(year=2011, month=3, day=1, hour=14, minute=0),
+            end=create_dt(year=2011, month=3, day=1, hour=15, minute=0),
+        )
+        act3 = create_activity(
+            title='meet03',
+            start=create_dt(year=2010, month=10, day=1, hour=10, minute=0),
+        )
+        self.assertIsNone(act3.end)
+
+        contact = Contact.objects.create(user=user, first_name='Tatsumi', last_name='Oga')
+
+        for activity in (act1, act2, act3):
+            Relation.objects.create(
+                user=user, subject_entity=contact,
+                type_id=constants.REL_SUB_PART_2_ACTIVITY, object_entity=activity,
+            )
+
+        index = ActivityCollisionIndex()
+        with self.assertNumQueries(1):
+            index.check(
+                activity_start=create_dt(year=2010, month=10, day=1, hour=9, minute=0),
+                activity_end=create_dt(year=2010, month=10, day=1, hour=12, minute=0),
+                participants=[contact],
+            )
+
+        self.assertIn(act1.id, index._activities)
+        self.assertNotIn(act2.id, index._activities)
+        self.assertNotIn(act3.id, index._activities)
+
+        # Other window
+        start = create_dt(year=2011, month=3, day=1, hour=13, minute=0)
+        end = create_dt(year=2011, month=3, day=1, hour=16, minute=0)
+        with self.assertNumQueries(1):
+            errors = index.check(activity_start=start, activity_end=end, participants=[contact])
+
+        self.assertEqual(1, len(errors))
+        self.assertIn(str(act2), errors[0])
+
+        with self.assertNumQueries(0):
+            index.check(activity_start=start, activity_end=end, participants=[contact])
+
+        # The activities are not indexed twice
+        index.load(
+            [contact],
+            create_dt(year=2010, month=9, day=1, hour=0, minute=0),
+            create_dt(year=2011, month=4, day=1, hour=0, minute=0),
+        )
+        self.assertListEqual(
+            [act1.id, act2.id],
+            [period[2] for period in index._periods[contact.id]],
+        )
+
 
 @skipIfCustomActivity
 class ICalEncoderTestCase(_ActivitiesTestCase):
@@ -339,6 +598,28 @@ END:VTIMEZONE""",
             ),
         )
 
+    def test_ZoneinfoToVtimezone__cache(self):
+        tz = zoneinfo.ZoneInfo('Europe/London')
+        get_vtimezone = ZoneinfoToVtimezone.get_vtimezone
+
+        vtimezone = get_vtimezone(timezone=tz, year_from=2010, year_to=2010)
+        self.assertEqual(
+            ZoneinfoToVtimezone.generate_vtimezone(
+                timezone=tz,
+                date_from=datetime(year=2010, month=1, day=1),
+                date_to=datetime(year=2010, month=12, day=31),
+            ),
+            vtimezone,
+        )
+
+        hits = get_vtimezone.cache_info().hits
+        self.assertEqual(vtimezone, get_vtimezone(timezone=tz, year_from=2010, year_to=2010))
+        self.assertEqual(hits + 1, get_vtimezone.cache_info().hits)
+
+        self.assertNotEqual(
+            vtimezone, get_vtimezone(timezone=tz, year_from=2010, year_to=2011),
+        )
+
     @override_tz('Europe/Paris')
     def test_encode(self):
         user = self.get_root_user()
@@ -391,3 +672,57 @@ END:VTIMEZONE""",
         self.assertIn(f'UID:{act1.uuid}\n', content)
         self.assertCountOccurrences('UID:', content, 2)
         self.assertEndsWith(content, 'END:VEVENT\nEND:VCALENDAR')
+
+    @override_tz('Europe/Paris')
+    def test_iter_encode(self):
+        user = self.get_root_user()
+
+        sub_type = self._get_sub_type(constants.UUID_SUBTYPE_MEETING_MEETING)
+        create_act = partial(
+            Activity.objects.create,
+            user=user, busy=True,
+            type_id=sub_type.type_id,
+            sub_type=sub_type,
+        )
+        create_dt = self.create_datetime
+        activities = [
+            create_act(
+                title=f'Act#{day}',
+                start=create_dt(year=2023, month=4, day=day, hour=9),
+                end=create_dt(year=2024 if day == 3 else 2023, month=4, day=day, hour=10),
+            ) for day in range(1, 4)
+        ]
+        queryset = Activity.objects.filter(id__in=[a.id for a in activities])
+
+        encoder = ICalEncoder()
+        encoder.page_size = 2
+        self.assertTupleEqual((2023, 2024), encoder.get_year_range(queryset))
+
+        chunks = [*encoder.iter_encode(queryset)]
+        self.assertEqual(4, len(chunks), chunks)
+
+        header = chunks[0]
+        self.assertStartsWith(header, 'BEGIN:VCALENDAR\n')
+        self.assertIn('RDATE:20241027T000300\n', header)
+        self.assertEndsWith(header, 'END:VTIMEZONE\n')
+        self.assertNotIn('UID:', header)
+
+        self.assertCountOccurrences('UID:', chunks[1], 2)
+        self.assertStartsWith(chunks[1], f'BEGIN:VEVENT\nUID:{activities[2].uuid}\n')
+        self.assertCountOccurrences('UID:', chunks[2], 1)
+        self.assertStartsWith(chunks[2], f'BEGIN:VEVENT\nUID:{activities[0].uuid}\n')
+        self.assertEndsWith(chunks[2], 'END:VEVENT\n')
+        self.assertEqual('END:VCALENDAR', chunks[3])
+
+        self.assertEqual(''.join(chunks), encoder.encode(queryset))
+
+    @override_tz('Europe/Paris')
+    def test_iter_encode__empty(self):
+        encoder = ICalEncoder()
+        queryset = Activity.objects.none()
+        self.assertTupleEqual((2000, 2010), encoder.get_year_range(queryset))
+
+        content = encoder.encode(queryset)
+        self.assertStartsWith(content, 'BEGIN:VCALENDAR\n')
+        self.assertNotIn('UID:', content)
+        self.assertEndsWith(content, 'END:VTIMEZONE\nEND:VCALENDAR')
@@ -4,7 +4,9 @@ from unittest.mock import patch
 
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.sessions.models import Session
-from django.test.utils import override_settings
+from django.core.cache import caches
+from django.db import connections
+from django.test.utils import CaptureQueriesContext, override_settings
 from django.urls import reverse
 from django.utils.html import escape
 from django.utils.timezone import now
@@ -607,6 +609,162 @@ class CalendarPageViewsTestCase(_ActivitiesTestCase):
             [(d['id'], d['calendar']) for d in response.json()],
         )
 
+    @skipIfCustomActivity
+    @override_settings(
+        ACTIVITIES_CALENDAR_CACHE_ALIAS='default', ACTIVITIES_CALENDAR_CACHE_TIMEOUT=None,
+    )
+    def test_activities_data__etag(self):
+        caches['default'].clear()
+        user = self.login_as_root_and_get()
+        cal = Calendar.objects.get_default_calendar(user)
+
+        create_dt = self.create_datetime
+        start = create_dt(year=2013, month=3, day=1)
+        end   = create_dt(year=2013, month=3, day=31, hour=23, minute=59)
+
+        sub_type = self._get_sub_type(constants.UUID_SUBTYPE_PHONECALL_INCOMING)
+        act = Activity.objects.create(
+            user=user, title='Act#1',
+            type_id=sub_type.type_id, sub_type=sub_type,
+            start=start + timedelta(days=1), end=start + timedelta(days=2),
+        )
+        act.calendars.set([cal])
+
+        url = reverse('activities__calendars_activities')
+        data = {'calendar_id': [str(cal.id)], 'start': start.isoformat(), 'end': end.isoformat()}
+        response1 = self.assertGET200(url, data=data)
+        self.assertListEqual([act.id], [d['id'] for d in response1.json()])
+
+        etag = response1['ETag']
+        self.assertTrue(etag)
+        self.assertIn('no-cache', response1['Cache-Control'])
+        self.assertIn('private', response1['Cache-Control'])
+
+        # Not modified ---
+        response2 = self.client.get(url, data=data, headers={'If-None-Match': etag})
+        self.assertEqual(304, response2.status_code)
+
+        # Cached (queries: user + calendars)
+        # Cached => activities are not retrieved
+        with CaptureQueriesContext(connections['default']) as ctxt:
+            response3 = self.client.get(url, data=data)
+        self.assertFalse([
+            query for query in ctxt.captured_queries
+            if 'activities_activity' in query['sql']
+        ])
+        self.assertEqual(etag, response3['ETag'])
+        self.assertEqual(response1.json(), response3.json())
+
+        # Modified ---
+        act.title = 'Act#1 (edited)'
+        act.save()
+
+        response4 = self.client.get(url, data=data, headers={'If-None-Match': etag})
+        self.assertEqual(200, response4.status_code)
+        self.assertNotEqual(etag, response4['ETag'])
+        self.assertEqual('Act#1 (edited)', self.get_alone_element(response4.json())['title'])
+
+    @skipIfCustomActivity
+    @override_settings(
+        ACTIVITIES_CALENDAR_CACHE_ALIAS='default', ACTIVITIES_CALENDAR_CACHE_TIMEOUT=None,
+    )
+    def test_activities_data__sync(self):
+        caches['default'].clear()
+        user = self.login_as_root_and_get()
+        cal1 = Calendar.objects.get_default_calendar(user)
+        cal2 = Calendar.objects.create(user=user, name='Other Cal #1', is_custom=True)
+
+        create_dt = self.create_datetime
+        start = create_dt(year=2013, month=3, day=1)
+        end   = create_dt(year=2013, month=3, day=31, hour=23, minute=59)
+
+        sub_type = self._get_sub_type(constants.UUID_SUBTYPE_PHONECALL_INCOMING)
+        create_act = partial(
+            Activity.objects.create,
+            user=user, type_id=sub_type.type_id, sub_type=sub_type,
+            start=start + timedelta(days=1), end=start + timedelta(days=2),
+        )
+        act1 = create_act(title='Act#1')
+        act2 = create_act(title='Act#2')
+        act3 = create_act(title='Act#3')
+        act1.calendars.set([cal1])
+        act2.calendars.set([cal1, cal2])
+
+        url = reverse('activities__calendars_activities')
+        data = {
+            'calendar_id': [str(cal1.id), str(cal2.id)],
+            'start': start.isoformat(), 'end': end.isoformat(),
+        }
+
+        # First synchronisation ---
+        data1 = self.assertGET200(url, data={**data, 'sync_token': ''}).json()
+        self.assertIsInstance(data1, dict)
+        self.assertTrue(data1['reset'])
+        self.assertCountEqual(
+            [(act1.id, cal1.id), (act2.id, cal1.id), (act2.id, cal2.id)],
+            [(d['id'], d['calendar']) for d in data1['events']],
+        )
+        self.assertListEqual([], data1['removed'])
+
+        token1 = data1['sync_token']
+        self.assertTrue(token1)
+
+        # No change ---
+        data2 = self.assertGET200(url, data={**data, 'sync_token': token1}).json()
+        self.assertFalse(data2['reset'])
+        self.assertListEqual([], data2['events'])
+        self.assertListEqual([], data2['removed'])
+
+        # Changes ---
+        act1.title = 'Act#1 (edited)'
+        act1.save()
+
+        act2.calendars.remove(cal2)
+        act3.calendars.add(cal2)
+
+        data3 = self.assertGET200(url, data={**data, 'sync_token': data2['sync_token']}).json()
+        self.assertFalse(data3['reset'])
+        self.assertCountEqual(
+            [(act1.id, cal1.id, 'Act#1 (edited)'), (act3.id, cal2.id, 'Act#3')],
+            [(d['id'], d['calendar'], d['title']) for d in data3['events']],
+        )
+        self.assertListEqual([{'id': act2.id, 'calendar': cal2.id}], data3['removed'])
+
+        # Out of range
+        act3.start = end + timedelta(days=1)
+        act3.end = end + timedelta(days=2)
+        act3.save()
+        data4 = self.assertGET200(url, data={**data, 'sync_token': data3['sync_token']}).json()
+        self.assertListEqual([], data4['events'])
+        self.assertListEqual([{'id': act3.id, 'calendar': cal2.id}], data4['removed'])
+
+        # Other range => reset
+        data5 = self.assertGET200(
+            url,
+            data={
+                **data,
+                'sync_token': data4['sync_token'],
+                'end': (end + timedelta(days=5)).isoformat(),
+            },
+        ).json()
+        self.assertTrue(data5['reset'])
+        self.assertEqual(3, len(data5['events']))
+
+    @skipIfCustomActivity
+    def test_activities_data__sync__no_cache(self):
+        user = self.login_as_root_and_get()
+        cal = Calendar.objects.get_default_calendar(user)
+
+        response = self.assertGET200(
+            reverse('activities__calendars_activities'),
+            data={'calendar_id': [str(cal.id)], 'sync_token': 'foobar'},
+        )
+        self.assertNotIn('ETag', response)
+        self.assertDictEqual(
+            {'sync_token': None, 'reset': True, 'events': [], 'removed': []},
+            response.json(),
+        )
+
     @override_settings(ACTIVITIES_DEFAULT_CALENDAR_IS_PUBLIC=False)
     def test_selected_calendars_in_session(self):
         user = self.login_as_root_and_get()
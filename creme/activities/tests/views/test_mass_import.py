@@ -507,6 +507,82 @@ class MassImportActivityTestCase(MassImportBaseTestCaseMixin, _ActivitiesTestCas
         act1 = self.get_object_or_fail(Activity, title=title1)
         self.assertHaveRelation(subject=act1, type=constants.REL_OBJ_PART_2_ACTIVITY, object=aoi)
 
+    @skipIfCustomContact
+    def test_participants__collisions(self):
+        user = self.login_as_root_and_get()
+
+        aoi = Contact.objects.create(user=user, first_name='Aoi', last_name='Kunieda')
+
+        sub_type = self._get_sub_type(constants.UUID_SUBTYPE_MEETING_NETWORK)
+        create_dt = self.create_datetime
+        busy_act = Activity.objects.create(
+            user=user, title='Fight against demons',
+            type_id=sub_type.type_id, sub_type=sub_type, busy=True,
+            start=create_dt(year=2014, month=5, day=28, hour=14),
+            end=create_dt(year=2014, month=5, day=28, hour=16),
+        )
+        Relation.objects.create(
+            user=user, subject_entity=aoi,
+            type_id=constants.REL_SUB_PART_2_ACTIVITY, object_entity=busy_act,
+        )
+
+        title1 = 'Meeting#1'
+        title2 = 'Meeting#2'
+        dt_value = self.formfield_value_datetime
+        lines = [
+            (
+                title1, aoi.first_name, aoi.last_name,
+                dt_value(year=2014, month=5, day=28, hour=15),
+                dt_value(year=2014, month=5, day=28, hour=17),
+            ),
+            (
+                title2, aoi.first_name, aoi.last_name,
+                dt_value(year=2014, month=5, day=28, hour=16),
+                dt_value(year=2014, month=5, day=28, hour=17),
+            ),
+        ]
+
+        doc = self._build_csv_doc(lines, user=user)
+        response = self.client.post(
+            self._build_import_url(Activity), follow=True,
+            data={
+                **self.lv_import_data,
+                'document': doc.id,
+                'user': user.id,
+                'type_selector': sub_type.id,
+                'start_colselect': 4,
+                'end_colselect': 5,
+
+                'participants_mode': 1,  # Search with 1 or 2 columns
+                'participants_first_name_colselect': 2,
+                'participants_last_name_colselect': 3,
+            },
+        )
+        self.assertNoFormError(response)
+
+        job = self._execute_job(response)
+
+        # NB: the activity is imported anyway
+        act1 = self.get_object_or_fail(Activity, title=title1)
+        self.assertHaveRelation(subject=act1, type=constants.REL_OBJ_PART_2_ACTIVITY, object=aoi)
+        self.get_object_or_fail(Activity, title=title2)
+
+        jr_error = self.get_alone_element(
+            r for r in self._get_job_results(job) if r.messages
+        )
+        self.assertEqual(act1, jr_error.entity.get_real_entity())
+        self.assertListEqual(
+            [
+                _(
+                    '{participant} already participates in the activity '
+                    '«{activity}» between {start} and {end}.'
+                ).format(
+                    participant=aoi, activity=busy_act, start='15:00:00', end='16:00:00',
+                ),
+            ],
+            jr_error.messages,
+        )
+
     @skipIfCustomOrganisation
     def test_participants__search_n_create(self):
         "Dynamic participants with search on first_name/last_name + creation."
@@ -1,6 +1,6 @@
 ################################################################################
 #    Creme is a free/open-source Customer Relationship Management software
-#    Copyright (C) 2009-2025  Hybird
+#    Copyright (C) 2009-2026  Hybird
 #
 #    This program is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU Affero General Public License as published by
@@ -16,11 +16,14 @@
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ################################################################################
 
+import bisect
 import collections
+import functools
 import logging
-from datetime import datetime, timedelta
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
 
-from django.db.models import Q, QuerySet
+from django.db.models import F, Max, Min, Q, QuerySet
 from django.utils.timezone import (
     get_current_timezone,
     localtime,
@@ -29,12 +32,13 @@ from django.utils.timezone import (
 )
 from django.utils.translation import gettext as _
 
-from creme.creme_core.models import Relation, SettingValue
+from creme.creme_core.core.paginator import FlowPaginator
+from creme.creme_core.models import SettingValue
 from creme.creme_core.utils.dates import to_utc
 
 from . import get_activity_model
 # from .constants import FLOATING_TIME, NARROW
-from .constants import REL_SUB_PART_2_ACTIVITY
+from .constants import REL_OBJ_PART_2_ACTIVITY
 from .setting_keys import auto_subjects_key
 
 logger = logging.getLogger(__name__)
@@ -57,6 +61,39 @@ def get_current_utc_offset():
     return int(tz.utcoffset(now()).total_seconds() / 60)
 
 
+def _collision_message(participant, activity_start, activity_end, colliding_activity):
+    collision_start = max(
+        activity_start.time(), localtime(colliding_activity.start).time(),
+    )
+    collision_end = min(
+        activity_end.time(), localtime(colliding_activity.end).time(),
+    )
+
+    return _(
+        '{participant} already participates in the activity '
+        '«{activity}» between {start} and {end}.'
+    ).format(
+        participant=participant,
+        activity=colliding_activity,
+        start=collision_start,
+        end=collision_end,
+    )
+
+
+def _collidable_activities():
+    "Activities which can busy their participants."
+    Activity = get_activity_model()
+
+    # TODO: test is_deleted=True
+    return Activity.objects.filter(
+        is_deleted=False,
+        floating_type__in=(
+            Activity.FloatingType.NARROW,
+            Activity.FloatingType.FLOATING_TIME,
+        ),
+    )
+
+
 def check_activity_collisions(
         activity_start,
         activity_end,
@@ -66,63 +103,243 @@ def check_activity_collisions(
     if not activity_start:
         return
 
-    collision_test = ~(Q(end__lte=activity_start) | Q(start__gte=activity_end))
-    collisions = []
+    participants = [*participants]
+    if not participants:
+        return []
+
+    # The activities of all the participants are retrieved with one query;
+    # each activity is annotated with the participant it collides with.
+    activities = _collidable_activities().filter(
+        ~(Q(end__lte=activity_start) | Q(start__gte=activity_end)),
+        relations__type=REL_OBJ_PART_2_ACTIVITY,
+        relations__object_entity__in=[participant.id for participant in participants],
+    ).annotate(colliding_participant_id=F('relations__object_entity'))
+
+    if not busy:
+        activities = activities.filter(busy=True)
+
+    # Exclude current activity if asked
+    if exclude_activity_id is not None:
+        activities = activities.exclude(pk=exclude_activity_id)
+
+    colliding_activities = {}
+    for activity in activities:
+        colliding_activities.setdefault(activity.colliding_participant_id, activity)
+
+    return [
+        _collision_message(
+            participant=participant,
+            activity_start=activity_start,
+            activity_end=activity_end,
+            colliding_activity=colliding_activity,
+        )
+        for participant in participants
+        if (colliding_activity := colliding_activities.get(participant.id)) is not None
+    ]
+
+
+class ActivityCollisionIndex:
+    """In-memory index of the periods during which participants are busy.
+
+    It's useful to check the collisions of a lot of activities (e.g. mass
+    import): the activities are checked against each other, & against the
+    existing activities, without additional query. The existing activities
+    are retrieved lazily, per participant & per period of time (see 'window').
+
+    Hint: use add() after each check to index the checked activity.
 
-    for participant in participants:
-        # Find activities of participant
-        activity_req = Relation.objects.filter(
-            subject_entity=participant.id, type=REL_SUB_PART_2_ACTIVITY,
+        index = ActivityCollisionIndex()
+
+        for activity, participants in ...:
+            errors = index.check(activity.start, activity.end, participants)
+            ...
+            index.add(activity, participants)
+    """
+    # The existing activities are loaded by periods of this duration
+    window = timedelta(days=7)
+
+    def __init__(self):
+        # Per participant ID: list of tuples (start, end, activity ID) sorted by start
+        self._periods = collections.defaultdict(list)
+        # Per participant ID: duration of the longest indexed activity
+        # (used to limit the number of periods to inspect).
+        self._max_durations = collections.defaultdict(timedelta)
+        self._activities = {}  # Indexed activities per ID
+        self._participant_ids = collections.defaultdict(set)  # Per activity ID
+        # Per participant ID: indices of the windows which have been loaded
+        self._loaded_windows = collections.defaultdict(set)
+        # IDs of the activities passed to add(); their instances in the DB
+        # (which could be outdated) are ignored by load().
+        self._added_ids = set()
+
+    def _index(self, activity, participant_id):
+        start = activity.start
+        end = activity.end
+        periods = self._periods[participant_id]
+
+        bisect.insort(periods, (start, end, activity.id))
+        self._max_durations[participant_id] = max(
+            self._max_durations[participant_id], end - start,
         )
+        self._participant_ids[activity.id].add(participant_id)
 
-        # Exclude current activity if asked
-        if exclude_activity_id is not None:
-            activity_req = activity_req.exclude(object_entity=exclude_activity_id)
-
-        # Get id of activities of participant
-        activity_ids = activity_req.values_list('object_entity__id', flat=True)
-
-        # Do collision request
-        # TODO: can be done with less queries ?
-        #           Activity.objects.filter(
-        #               relations__object_entity=participant.id,
-        #               relations__object_entity__type=REL_OBJ_PART_2_ACTIVITY,
-        #           ).filter(collision_test)
-        busy_args = {} if busy else {'busy': True}
-        # TODO: test is_deleted=True
-        Activity = get_activity_model()
-        colliding_activity = Activity.objects.filter(
-            collision_test,
-            is_deleted=False,
-            pk__in=activity_ids,
-            floating_type__in=(
-                Activity.FloatingType.NARROW,
-                Activity.FloatingType.FLOATING_TIME,
-            ),
-            **busy_args
-        ).first()
+    def _discard(self, activity_id):
+        for participant_id in self._participant_ids.pop(activity_id, ()):
+            periods = self._periods[participant_id]
+            periods[:] = [period for period in periods if period[2] != activity_id]
+
+        self._activities.pop(activity_id, None)
+
+    def _window_index(self, dt: datetime) -> int:
+        return int(dt.timestamp() // self.window.total_seconds())
 
-        if colliding_activity is not None:
-            collision_start = max(
-                activity_start.time(), localtime(colliding_activity.start).time(),
+    def _window_start(self, index: int) -> datetime:
+        return datetime.fromtimestamp(
+            index * self.window.total_seconds(), tz=timezone.utc,
+        )
+
+    def load(self, participants, start: datetime, end: datetime) -> None:
+        """Index the existing activities of some participants which overlap a
+        period (extended to whole windows).
+        The windows which have already been loaded are ignored.
+        @param participants: Iterable of entities (generally Contacts).
+        @param start: Start of the period.
+        @param end: End of the period.
+        """
+        windows = range(self._window_index(start), self._window_index(end) + 1)
+        loaded_windows = self._loaded_windows
+        missing_windows = set()
+        participant_ids = set()
+
+        for participant in participants:
+            missing = {*windows} - loaded_windows[participant.id]
+
+            if missing:
+                participant_ids.add(participant.id)
+                missing_windows.update(missing)
+
+        if not participant_ids:
+            return
+
+        # NB: one query for all the participants; the windows which have
+        #     already been loaded for some participants are retrieved again,
+        #     so the activities are de-duplicated.
+        first_window = min(missing_windows)
+        last_window = max(missing_windows)
+        loaded_range = range(first_window, last_window + 1)
+
+        for participant_id in participant_ids:
+            loaded_windows[participant_id].update(loaded_range)
+
+        participants_per_activity = self._participant_ids
+        added_ids = self._added_ids
+
+        for activity in _collidable_activities().filter(
+            ~(
+                Q(end__lte=self._window_start(first_window))
+                | Q(start__gte=self._window_start(last_window + 1))
+            ),
+            start__isnull=False,
+            end__isnull=False,
+            relations__type=REL_OBJ_PART_2_ACTIVITY,
+            relations__object_entity__in=participant_ids,
+        ).annotate(participant_id=F('relations__object_entity')):
+            activity_id = activity.id
+
+            if (
+                activity_id in added_ids
+                or activity.participant_id in participants_per_activity.get(activity_id, ())
+            ):
+                continue
+
+            self._activities.setdefault(activity_id, activity)
+            self._index(activity, activity.participant_id)
+
+    def add(self, activity, participants) -> None:
+        """Index an activity (which can have been indexed before with other
+        dates, & so is re-indexed).
+        @param activity: Instance of Activity.
+        @param participants: Iterable of entities (generally Contacts).
+        """
+        self._discard(activity.id)
+        self._added_ids.add(activity.id)
+
+        if (
+            activity.is_deleted
+            or not activity.start
+            or not activity.end
+            or activity.floating_type not in (
+                activity.FloatingType.NARROW,
+                activity.FloatingType.FLOATING_TIME,
             )
-            collision_end = min(
-                activity_end.time(), localtime(colliding_activity.end).time(),
+        ):
+            return
+
+        self._activities[activity.id] = activity
+
+        for participant in participants:
+            self._index(activity, participant.id)
+
+    def find(self, activity_start, activity_end, participant_id,
+             busy=True, exclude_activity_id=None):
+        """Search an indexed activity of a participant which collides with a period.
+        @return: An Activity instance, or None.
+        """
+        periods = self._periods.get(participant_id)
+        if not periods:
+            return None
+
+        # Only the periods starting after "activity_start - longest duration"
+        # & before "activity_end" can overlap.
+        first = bisect.bisect_right(
+            periods, (activity_start - self._max_durations[participant_id],),
+        )
+        last = bisect.bisect_left(periods, (activity_end,), lo=first)
+
+        # NB: latest first (like check_activity_collisions())
+        for start, end, activity_id in reversed(periods[first:last]):
+            if end <= activity_start or activity_id == exclude_activity_id:
+                continue
+
+            activity = self._activities[activity_id]
+            if busy or activity.busy:
+                return activity
+
+        return None
+
+    def check(self,
+              activity_start,
+              activity_end,
+              participants,
+              busy=True,
+              exclude_activity_id=None):
+        """Equivalent of check_activity_collisions() which uses the index.
+        The existing activities of the participants are loaded if needed.
+        @return: A list of error messages.
+        """
+        if not activity_start or not activity_end:
+            return []
+
+        participants = [*participants]
+        self.load(participants, activity_start, activity_end)
+
+        collisions = []
+
+        for participant in participants:
+            colliding_activity = self.find(
+                activity_start, activity_end, participant.id,
+                busy=busy, exclude_activity_id=exclude_activity_id,
             )
 
-            collisions.append(
-                _(
-                    '{participant} already participates in the activity '
-                    '«{activity}» between {start} and {end}.'
-                ).format(
+            if colliding_activity is not None:
+                collisions.append(_collision_message(
                     participant=participant,
-                    activity=colliding_activity,
-                    start=collision_start,
-                    end=collision_end,
-                )
-            )
+                    activity_start=activity_start,
+                    activity_end=activity_end,
+                    colliding_activity=colliding_activity,
+                ))
 
-    return collisions
+        return collisions
 
 
 def is_auto_orga_subject_enabled():
@@ -134,6 +351,8 @@ class ICalEncoder:
     See https://www.rfc-editor.org/rfc/rfc5545
     """
     prefetched_fields = ['type', 'sub_type', 'status']
+    # Number of activities retrieved by query (see iter_encode())
+    page_size = 256
 
     # <PRODID>
     product_editor = 'hybird.org'
@@ -180,34 +399,54 @@ CATEGORIES:{activity.type.name},{activity.sub_type.name}
 STATUS:{activity.status or ''}
 END:VEVENT"""
 
-    def encode(self, activities: QuerySet) -> str:
-        """Return a normalized iCalendar string."""
+    def get_year_range(self, activities: QuerySet) -> tuple[int, int]:
+        "Get the years covered by some activities (retrieved with one query)."
+        dates = activities.aggregate(min_start=Min('start'), max_end=Max('end'))
+        min_start = dates['min_start']
+        max_end = dates['max_end']
+
+        start_year = min_start.date().year if min_start else 2000
+        end_year = max_end.date().year if max_end else start_year + 10
+
+        return start_year, end_year
+
+    def iter_encode(self, activities: QuerySet) -> Iterator[str]:
+        """Generate a normalized iCalendar content, piece by piece (lines are
+        separated by '\n', including the separation between 2 pieces).
+        The activities are retrieved page by page, so a big calendar can be
+        streamed without being completely loaded in memory.
+        """
         tz = get_current_timezone()
-        activities = activities.prefetch_related(*self.prefetched_fields)
-        start_year = min(
-            (a.start.date().year for a in activities if a.start),
-            default=2000,
+        start_year, end_year = self.get_year_range(activities)
+        vtimezone = ZoneinfoToVtimezone.get_vtimezone(
+            timezone=tz, year_from=start_year, year_to=end_year,
         )
-        end_year = max(
-            (a.end.date().year for a in activities if a.end),
-            default=start_year + 10,
+
+        yield (
+            f'BEGIN:VCALENDAR\n'
+            f'VERSION:2.0\n'
+            f'PRODID:{self.product_id}\n'
+            f'CALSCALE:GREGORIAN\n'
+            f'{vtimezone}\n'
         )
 
-        return """BEGIN:VCALENDAR
-VERSION:2.0
-PRODID:{product_id}
-CALSCALE:GREGORIAN
-{vtimezone}
-{vevents}
-END:VCALENDAR""".format(
-            product_id=self.product_id,
-            vtimezone=ZoneinfoToVtimezone.generate_vtimezone(
-                timezone=tz,
-                date_from=datetime(year=start_year, month=1, day=1),
-                date_to=datetime(year=end_year, month=12, day=31),
-            ),
-            vevents='\n'.join(self.encode_activity(a, tz) for a in activities),
+        paginator = FlowPaginator(
+            queryset=activities.prefetch_related(*self.prefetched_fields),
+            per_page=self.page_size,
         )
+        encode_activity = self.encode_activity
+
+        for page in paginator.pages():
+            vevents = [encode_activity(activity, tz) for activity in page.object_list]
+
+            if vevents:
+                yield '\n'.join(vevents) + '\n'
+
+        yield 'END:VCALENDAR'
+
+    def encode(self, activities: QuerySet) -> str:
+        """Return a normalized iCalendar string."""
+        return ''.join(self.iter_encode(activities))
 
 
 ################################################################################
@@ -444,3 +683,21 @@ class ZoneinfoToVtimezone:
 
         # '\r\n' is standard, '\n' is better
         return '\n'.join(lines)
+
+    @classmethod
+    @functools.lru_cache(maxsize=64)
+    def get_vtimezone(cls,
+                      timezone: zoneinfo.ZoneInfo,
+                      year_from: int,
+                      year_to: int,
+                      ) -> str:
+        """Generate VTIMEZONE as a string, for the complete years between
+        "year_from" & "year_to" (included).
+        The searching of DST transitions is expensive, so the result is cached
+        per timezone & range of years.
+        """
+        return cls.generate_vtimezone(
+            timezone=timezone,
+            date_from=datetime(year=year_from, month=1, day=1),
+            date_to=datetime(year=year_to, month=12, day=31),
+        )
@@ -1,6 +1,6 @@
 ################################################################################
 #    Creme is a free/open-source Customer Relationship Management software
-#    Copyright (C) 2009-2025  Hybird
+#    Copyright (C) 2009-2026  Hybird
 #
 #    This program is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU Affero General Public License as published by
@@ -18,7 +18,6 @@
 
 import logging
 from collections import defaultdict
-from copy import copy
 from datetime import datetime, timedelta
 from functools import partial
 
@@ -30,6 +29,7 @@ from django.db.transaction import atomic
 from django.http import HttpResponse
 from django.shortcuts import get_object_or_404, render
 from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
 from django.utils.decorators import method_decorator
 from django.utils.timezone import get_current_timezone, make_naive, now
 from django.utils.translation import gettext
@@ -49,6 +49,7 @@ from creme.creme_core.views import generic
 from creme.creme_core.views.decorators import workflow_engine
 
 from .. import constants, get_activity_model
+from ..core.calendar_cache import calendar_cache
 from ..forms import calendar as calendar_forms
 from ..forms import config as config_forms
 from ..models import Calendar, CalendarConfigItem
@@ -238,26 +239,56 @@ class ActivitiesData(CalendarsMixin, generic.CheckedView):
     label = '{activity.title}'
     calendar_ids_session_key = CalendarView.calendar_ids_session_key
 
+    # If this argument is given, the response contains only the activities
+    # which have changed since the given token has been built (see
+    # get_activities_changes()) ; an empty value retrieves all the activities
+    # & a first token.
+    sync_token_arg = 'sync_token'
+
     def get(self, request, *args, **kwargs):
-        return self.response_class(
-            self.get_activities_data(request),
+        sync_token = request.GET.get(self.sync_token_arg)
+
+        if sync_token is not None:
+            return self.response_class(self.get_activities_changes(request, sync_token))
+
+        calendar_ids, start, end = self.get_calendar_ids_n_range(request)
+        state = calendar_cache.get_state(calendar_ids)
+        etag = calendar_cache.build_etag(
+            state=state, user=request.user, start=start, end=end, extra=[self.label],
+        )
+
+        if etag is not None:
+            not_modified = get_conditional_response(request, etag=etag)
+            if not_modified is not None:
+                return not_modified
+
+        response = self.response_class(
+            self.get_events(
+                user=request.user, calendar_ids=calendar_ids, start=start, end=end,
+                state=state,
+            ),
             safe=False,  # Result is not a dictionary
         )
 
+        if etag is not None:
+            response['ETag'] = etag
+            patch_cache_control(response, private=True, no_cache=True)
+
+        return response
+
     def get_activity_label(self, activity):
         return self.label.format(activity=activity)
 
     def _activity_2_dict(self, activity, user):
-        "Returns a 'jsonifiable' dictionary."
+        """Returns a 'jsonifiable' dictionary.
+        The data related to the calendar are added by _event_2_calendar().
+        """
         start = activity.start
         end = activity.end
 
         if activity.is_all_day:
             end += timedelta(minutes=1)
 
-        # NB: _get_one_activity_per_calendar() adds this 'attribute'
-        calendar = activity.calendar
-
         return {
             'id':    activity.id,
             'title': self.get_activity_label(activity),
@@ -268,13 +299,16 @@ class ActivitiesData(CalendarsMixin, generic.CheckedView):
 
             'url': reverse('activities__view_activity_popup', args=(activity.id,)),
 
-            'color':    f'#{calendar.color}',
             'editable': user.has_perm_to_change(activity),
-            'calendar': calendar.id,
             'type':     activity.type.name,
             'busy':     activity.busy,
         }
 
+    @staticmethod
+    def _event_2_calendar(event, calendar):
+        "Get the version of a serialized activity for one of its calendars."
+        return {**event, 'color': f'#{calendar.color}', 'calendar': calendar.id}
+
     @staticmethod
     def _get_datetime(*, request, key):
         timestamp = request.GET.get(key)
@@ -285,27 +319,18 @@ class ActivitiesData(CalendarsMixin, generic.CheckedView):
             except Exception:
                 logger.exception('ActivitiesData._get_datetime(key=%s)', key)
 
-    @staticmethod
-    def _get_one_activity_per_calendar(activities):
-        for activity in activities:
-            # "concerned_calendars" is added by get_activities_data()
-            for calendar in activity.concerned_calendars:
-                copied = copy(activity)
-                copied.calendar = calendar
-                yield copied
-
-    def get_activities_data(self, request):
-        user = request.user
-
-        calendar_ids = [cal.id for cal in self.get_calendars(request)]
-        self.save_calendar_ids(request, calendar_ids)
-
-        start = self.get_start(request)
-        end   = self.get_end(request=request, start=start)
+    def fetch_events(self, calendar_ids, *, user, start, end, activity_ids=None):
+        """Retrieve & serialize the activities of some calendars.
+        @param activity_ids: If not None, only these activities are retrieved.
+        @return: A dictionary with calendars' IDs as keys & lists of
+                 serialized activities as values.
+        """
+        events = {cal_id: [] for cal_id in calendar_ids}
+        if not calendar_ids:
+            return events
 
         # TODO: label when no calendar related to the participant of an unavailability
-        activities = EntityCredentials.filter(
-            user,
+        activities = (
             Activity.objects
                     .filter(is_deleted=False)
                     .filter(self.get_date_q(start=start, end=end))
@@ -321,12 +346,104 @@ class ActivitiesData(CalendarsMixin, generic.CheckedView):
                     ))
         )
 
+        if activity_ids is not None:
+            activities = activities.filter(id__in=activity_ids)
+
         activity_2_dict = partial(self._activity_2_dict, user=user)
+        event_2_calendar = self._event_2_calendar
 
-        return [
-            activity_2_dict(activity=a)
-            for a in self._get_one_activity_per_calendar(activities)
-        ]
+        # NB: each activity is serialized once, whatever the number of calendars
+        for activity in EntityCredentials.filter(user, activities):
+            event = activity_2_dict(activity=activity)
+
+            for calendar in activity.concerned_calendars:
+                events[calendar.id].append(event_2_calendar(event, calendar))
+
+        return events
+
+    def get_events(self, *, user, calendar_ids, start, end, state=None):
+        "Get the serialized activities of some calendars (the cache is used)."
+        events = calendar_cache.get_or_fetch(
+            state=state,
+            calendar_ids=calendar_ids,
+            user=user, start=start, end=end,
+            fetcher=partial(self.fetch_events, user=user, start=start, end=end),
+            extra=[self.label],
+        )
+
+        return [event for cal_id in calendar_ids for event in events[cal_id]]
+
+    def get_calendar_ids_n_range(self, request):
+        calendar_ids = [cal.id for cal in self.get_calendars(request)]
+        self.save_calendar_ids(request, calendar_ids)
+
+        start = self.get_start(request)
+        end   = self.get_end(request=request, start=start)
+
+        return calendar_ids, start, end
+
+    def get_activities_data(self, request):
+        calendar_ids, start, end = self.get_calendar_ids_n_range(request)
+
+        return self.get_events(
+            user=request.user, calendar_ids=calendar_ids, start=start, end=end,
+            state=calendar_cache.get_state(calendar_ids),
+        )
+
+    def get_activities_changes(self, request, sync_token):
+        """Get the activities which have changed since a sync token has been built.
+        @return: A 'jsonifiable' dictionary with the keys:
+            - "sync_token": the token to pass at the next synchronisation
+              (<None> if the cache is disabled).
+            - "reset": <True> means that the changes cannot be computed ;
+              "events" contains all the activities, & the previous ones must
+              be removed by the client.
+            - "events": list of (new or modified) serialized activities.
+            - "removed": list of dictionaries {"id": activity_id, "calendar": calendar_id}
+              (activities which are not in the calendar/range anymore).
+        """
+        user = request.user
+        calendar_ids, start, end = self.get_calendar_ids_n_range(request)
+        state = calendar_cache.get_state(calendar_ids)
+        changes = calendar_cache.get_changes(
+            state=state, sync_token=sync_token, start=start, end=end,
+        )
+        removed = []
+
+        if changes is None:
+            events = self.get_events(
+                user=user, calendar_ids=calendar_ids, start=start, end=end, state=state,
+            )
+        else:
+            changed_calendar_ids = [cal_id for cal_id in calendar_ids if changes[cal_id]]
+            fetched = self.fetch_events(
+                user=user, calendar_ids=changed_calendar_ids, start=start, end=end,
+                activity_ids={
+                    activity_id
+                    for cal_id in changed_calendar_ids
+                    for activity_id in changes[cal_id]
+                },
+            )
+            events = []
+
+            for cal_id in changed_calendar_ids:
+                changed_ids = changes[cal_id]
+                cal_events = [e for e in fetched[cal_id] if e['id'] in changed_ids]
+                events.extend(cal_events)
+
+                present_ids = {e['id'] for e in cal_events}
+                removed.extend(
+                    {'id': activity_id, 'calendar': cal_id}
+                    for activity_id in sorted(changed_ids)
+                    if activity_id not in present_ids
+                )
+
+        return {
+            'sync_token': calendar_cache.build_sync_token(state=state, start=start, end=end),
+            'reset': changes is None,
+            'events': events,
+            'removed': removed,
+        }
 
     @staticmethod
     def get_date_q(start, end):
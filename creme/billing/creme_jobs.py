@@ -0,0 +1,122 @@
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2026  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+
+from django.db.transaction import atomic
+from django.utils.translation import gettext
+from django.utils.translation import gettext_lazy as _
+from django.utils.translation import ngettext
+
+from creme.creme_core.core.paginator import FlowPaginator
+from creme.creme_core.creme_jobs.base import JobProgress, JobType
+from creme.creme_core.gui.job import EntityJobErrorsBrick
+from creme.creme_core.models import EntityJobResult
+
+from .core import BILLING_MODELS
+from .models import ReceivedTotal
+
+
+class _TotalsReconciliationType(JobType):
+    id = JobType.generate_id('billing', 'totals_reconciliation')
+    verbose_name = _('Check the totals of billing documents')
+    periodic = JobType.PERIODIC
+
+    # NB: the Credit Notes are first, because their totals are used by the
+    #     totals of Invoices.
+    models = BILLING_MODELS
+
+    def _execute(self, job):
+        for model in self.models:
+            paginator = FlowPaginator(
+                queryset=model.objects.order_by('id'), per_page=256,
+            )
+
+            for page in paginator.pages():
+                results = []
+
+                with atomic():
+                    for document in model.objects.filter(
+                        pk__in=page.object_list,
+                    ).select_for_update():
+                        old_no_vat = document.total_no_vat
+                        old_vat = document.total_vat
+
+                        if document.reconcile_totals():
+                            results.append(EntityJobResult(
+                                job=job,
+                                real_entity=document,
+                                messages=[
+                                    gettext(
+                                        'The total without VAT was {old} instead of {new}'
+                                    ).format(old=old_no_vat, new=document.total_no_vat),
+                                    gettext(
+                                        'The total with VAT was {old} instead of {new}'
+                                    ).format(old=old_vat, new=document.total_vat),
+                                ],
+                            ))
+
+                EntityJobResult.objects.bulk_create(results)
+
+        ReceivedTotal.objects.rebuild()
+
+    def _count_fixed_documents(self, job):
+        return EntityJobResult.objects.filter(job=job).count()
+
+    def progress(self, job):
+        count = self._count_fixed_documents(job)
+
+        return JobProgress(
+            percentage=None,
+            label=ngettext(
+                '{count} document has been fixed.',
+                '{count} documents have been fixed.',
+                count
+            ).format(count=count),
+        )
+
+    def get_description(self, job):
+        return [
+            gettext(
+                'The totals of the billing documents are updated when their '
+                'lines are modified; this job computes completely the totals '
+                'of all documents, & fixes the wrong ones.'
+            ),
+            gettext(
+                'The sums of totals used by the function fields (e.g. «Total '
+                'pending payment») are computed again too.'
+            ),
+        ]
+
+    def get_stats(self, job):
+        count = self._count_fixed_documents(job)
+
+        return [
+            ngettext(
+                '{count} document has been fixed.',
+                '{count} documents have been fixed.',
+                count
+            ).format(count=count),
+        ] if count else []
+
+    @property
+    def results_bricks(self):
+        return [EntityJobErrorsBrick()]
+
+
+totals_reconciliation_type = _TotalsReconciliationType()
+jobs = (totals_reconciliation_type,)
@@ -1,6 +1,6 @@
 ################################################################################
 #    Creme is a free/open-source Customer Relationship Management software
-#    Copyright (C) 2009-2025  Hybird
+#    Copyright (C) 2009-2026  Hybird
 #
 #    This program is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU Affero General Public License as published by
@@ -35,6 +35,7 @@ from creme.creme_core.core.function_field import (
 from creme.creme_core.models import FieldsConfig, Relation
 
 from .constants import REL_OBJ_BILL_ISSUED, REL_SUB_BILL_RECEIVED
+from .models import ReceivedTotal
 
 logger = logging.getLogger(__name__)
 
@@ -222,7 +223,10 @@ class _BaseTotalFunctionField(FunctionField):
         total = e_cache.get(user.id)
 
         if total is None:
-            total = e_cache[user.id] = self.single_func()(entity, user)
+            totals = self._get_received_totals([entity], user)
+            total = e_cache[user.id] = (
+                self.single_func()(entity, user) if totals is None else next(totals)[1]
+            )
 
         return (
             FunctionFieldDecimal(total)
@@ -230,13 +234,60 @@ class _BaseTotalFunctionField(FunctionField):
             FunctionFieldResult(total)
         )
 
+    def _get_received_totals(self, entities, user):
+        """Get the totals from the pre-computed ones (see the model ReceivedTotal).
+        They can be used only if the user can view all the documents (the
+        pre-computed totals are not filtered by credentials).
+        @return: Iterator of tuples (entity, total), or None if the
+                 pre-computed totals cannot be used.
+        """
+        filter_kwargs = self.received_totals_filter()
+        if filter_kwargs is None:
+            return None
+
+        model = self.document_model
+        if not user.is_superuser and not user.role.can_do_on_all(model, EntityCredentials.VIEW):
+            return None
+
+        if model.objects.filter(sandbox__isnull=False).exists():
+            return None
+
+        # NB: there are few pre-computed totals per entity (one per managed
+        #     Organisation), so we sum them in Python (it's more portable than
+        #     SUM() regarding the number of decimal places).
+        totals = defaultdict(int)
+        for target_id, total in ReceivedTotal.objects.filter(
+            target__in=[e.id for e in entities],
+            source__in=[
+                # NB: not values_list() to use the cache of filter_managed_by_creme()
+                o.id for o in Organisation.objects.filter_managed_by_creme()
+            ],
+            **filter_kwargs
+        ).values_list('target', 'total'):
+            totals[target_id] += total
+
+        return ((entity, totals.get(entity.id, 0)) for entity in entities)
+
     def populate_entities(self, entities, user):
         cache = self._cache
         user_id = user.id
+        entities = [entity for entity in entities if user_id not in cache[entity.id]]
+
+        if entities:
+            totals = self._get_received_totals(entities, user)
+            if totals is None:
+                totals = self.multi_func()(entities, user)
 
-        # TODO: only populate entities which are not already populated
-        for entity, total in self.multi_func()(entities, user):
-            cache[entity.id][user_id] = total
+            for entity, total in totals:
+                cache[entity.id][user_id] = total
+
+    @classmethod
+    def received_totals_filter(cls) -> dict | None:
+        """Get the arguments to filter the pre-computed totals (see the model
+        ReceivedTotal) ; <None> means that the pre-computed totals cannot be
+        used (the functions single_func() & multi_func() are used).
+        """
+        return None
 
     @classmethod
     def single_func(cls):
@@ -252,6 +303,11 @@ class _BaseTotalFunctionField(FunctionField):
 class _TotalPendingPayment(_BaseTotalFunctionField):
     name = 'total_pending_payment'
     verbose_name = _('Total pending payment')
+    document_model = Invoice
+
+    @classmethod
+    def received_totals_filter(cls):
+        return {'kind': ReceivedTotal.Kind.PENDING_PAYMENT}
 
     @classmethod
     def single_func(cls):
@@ -265,6 +321,14 @@ class _TotalPendingPayment(_BaseTotalFunctionField):
 class _TotalWonQuoteThisYear(_BaseTotalFunctionField):
     name = 'total_won_quote_this_year'
     verbose_name = _('Total won quotes this year')
+    document_model = Quote
+
+    @classmethod
+    def received_totals_filter(cls):
+        if FieldsConfig.objects.get_for_model(Quote).is_fieldname_hidden('acceptation_date'):
+            return None
+
+        return {'kind': ReceivedTotal.Kind.WON_QUOTES, 'year': datetime.date.today().year}
 
     @classmethod
     def single_func(cls):
@@ -278,6 +342,14 @@ class _TotalWonQuoteThisYear(_BaseTotalFunctionField):
 class _TotalWonQuoteLastYear(_BaseTotalFunctionField):
     name = 'total_won_quote_last_year'
     verbose_name = _('Total won Quotes last Year')
+    document_model = Quote
+
+    @classmethod
+    def received_totals_filter(cls):
+        if FieldsConfig.objects.get_for_model(Quote).is_fieldname_hidden('acceptation_date'):
+            return None
+
+        return {'kind': ReceivedTotal.Kind.WON_QUOTES, 'year': datetime.date.today().year - 1}
 
     @classmethod
     def single_func(cls):
@@ -0,0 +1,134 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_received_totals(apps, schema_editor):
+    # NB: the totals related to custom models are computed by the job
+    #     "billing-totals_reconciliation".
+    if (
+        settings.BILLING_INVOICE_MODEL != 'billing.Invoice'
+        or settings.BILLING_QUOTE_MODEL != 'billing.Quote'
+    ):
+        return
+
+    filter_relations = apps.get_model('creme_core', 'Relation').objects.filter
+    sources = dict(
+        filter_relations(
+            type_id='billing-subject_bill_issued',
+        ).values_list('subject_entity_id', 'object_entity_id')
+    )
+    targets = dict(
+        filter_relations(
+            type_id='billing-subject_bill_received',
+        ).values_list('subject_entity_id', 'object_entity_id')
+    )
+
+    # Key: (target ID, source ID, kind, year)
+    totals = defaultdict(Decimal)
+
+    def add_totals(kind, rows):
+        for doc_id, total, year in rows:
+            target_id = targets.get(doc_id)
+            source_id = sources.get(doc_id)
+
+            if target_id and source_id:
+                totals[(target_id, source_id, kind, year)] += total
+
+    add_totals(
+        1,  # ReceivedTotal.Kind.PENDING_PAYMENT
+        (
+            (doc_id, total, 0)
+            for doc_id, total in apps.get_model('billing', 'Invoice').objects.filter(
+                is_deleted=False,
+                status__pending_payment=True,
+                total_no_vat__isnull=False,
+            ).values_list('id', 'total_no_vat')
+        ),
+    )
+    add_totals(
+        2,  # ReceivedTotal.Kind.WON_QUOTES
+        (
+            (doc_id, total, acceptation_date.year)
+            for doc_id, total, acceptation_date in apps.get_model(
+                'billing', 'Quote',
+            ).objects.filter(
+                is_deleted=False,
+                status__won=True,
+                total_no_vat__isnull=False,
+                acceptation_date__isnull=False,
+            ).values_list('id', 'total_no_vat', 'acceptation_date')
+        ),
+    )
+
+    ReceivedTotal = apps.get_model('billing', 'ReceivedTotal')
+    ReceivedTotal.objects.bulk_create(
+        [
+            ReceivedTotal(
+                target_id=target_id, source_id=source_id, kind=kind, year=year, total=total,
+            )
+            for (target_id, source_id, kind, year), total in totals.items()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.PERSONS_ORGANISATION_MODEL),
+        ('creme_core', '0001_initial'),
+        ('billing', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReceivedTotal',
+            fields=[
+                (
+                    'id',
+                    models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name='ID',
+                    )
+                ),
+                (
+                    'target',
+                    models.ForeignKey(
+                        editable=False, on_delete=models.CASCADE,
+                        related_name='+', to='creme_core.cremeentity',
+                    )
+                ),
+                (
+                    'source',
+                    models.ForeignKey(
+                        editable=False, on_delete=models.CASCADE,
+                        related_name='+', to=settings.PERSONS_ORGANISATION_MODEL,
+                    )
+                ),
+                (
+                    'kind',
+                    models.PositiveSmallIntegerField(
+                        choices=[(1, 'Invoices pending payment'), (2, 'Won quotes')],
+                        editable=False,
+                    )
+                ),
+                ('year', models.PositiveSmallIntegerField(default=0, editable=False)),
+                ('total', models.DecimalField(decimal_places=2, editable=False, max_digits=14)),
+            ],
+            options={
+                'indexes': [
+                    models.Index(
+                        fields=['target', 'kind', 'year'], name='billing__received_total',
+                    ),
+                ],
+                'constraints': [
+                    models.UniqueConstraint(
+                        fields=['target', 'source', 'kind', 'year'],
+                        name='billing__received_total__unique',
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(fill_received_totals),
+    ]
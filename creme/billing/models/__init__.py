@@ -19,3 +19,4 @@ from .quote import AbstractQuote, Quote  # NOQA
 from .sales_order import AbstractSalesOrder, SalesOrder  # NOQA
 from .service_line import AbstractServiceLine, ServiceLine  # NOQA
 from .templatebase import AbstractTemplateBase, TemplateBase  # NOQA
+from .totals import ReceivedTotal  # NOQA
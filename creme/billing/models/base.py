@@ -26,6 +26,7 @@ from functools import partial
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import F
 from django.db.transaction import atomic
 from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
@@ -50,6 +51,7 @@ from ..constants import (
 from . import other_models
 from .fields import BillingDiscountField
 from .line import Line
+from .totals import ReceivedTotal
 
 logger = logging.getLogger(__name__)
 
@@ -150,6 +152,8 @@ class Base(CremeEntity):
     _target = None
     _target_rel = None
     _creditnotes_cache = None
+    # Set by _add_to_totals(), to save without computing the totals again
+    _totals_up_to_date = False
 
     class Meta:
         abstract = True
@@ -351,6 +355,75 @@ class Base(CremeEntity):
         self.total_vat = self._get_total_with_tax()
         self.total_no_vat = self._get_total()
 
+    def _refresh_received_totals(self):
+        "The totals are modified without save() => no signal is sent."
+        if isinstance(self, ReceivedTotal.objects.document_models):
+            ReceivedTotal.objects.refresh(document_ids=[self.id])
+
+    @atomic
+    def _add_to_totals(self, *, no_vat, vat) -> bool:
+        """Add some amounts to the totals stored in DB, with a single UPDATE
+        query (so concurrent modifications of the lines are safe) ; it avoids
+        the complete computation of the totals when a line is modified.
+        Notice that the totals can be clamped (see _get_total()) ; when a total
+        is not (or would not remain) strictly positive, the real sum of the
+        lines & credit notes is unknown, so nothing is done & the caller has to
+        compute completely the totals (see save()).
+
+        @param no_vat: Amount added to the total exclusive of tax (can be negative).
+        @param vat: Amount added to the total inclusive of tax (can be negative).
+        @return: True if the totals have been updated.
+        """
+        if not (no_vat or vat):
+            return True
+
+        if not type(self)._default_manager.filter(
+            id=self.id,
+            total_no_vat__gt=max(DEFAULT_DECIMAL, -no_vat),
+            total_vat__gt=max(DEFAULT_DECIMAL, -vat),
+        ).update(
+            total_no_vat=F('total_no_vat') + no_vat,
+            total_vat=F('total_vat') + vat,
+        ):
+            return False
+
+        # NB: the row is locked by the UPDATE until the end of the transaction,
+        #     so the refreshed totals can be saved safely.
+        #     The instance is saved (without computing the totals again) in
+        #     order to send the signals, which are used to update the dependent
+        #     data (history, workflows, Opportunity's sales...).
+        self.refresh_from_db(fields=('total_no_vat', 'total_vat'))
+        self._totals_up_to_date = True
+
+        try:
+            self.save()
+        finally:
+            self._totals_up_to_date = False
+
+        return True
+
+    def reconcile_totals(self) -> bool:
+        """Compute completely the totals & fix the values stored in DB if they
+        are wrong (e.g. because of a bug, or a manual edition of the DB).
+        Hint: see the job "billing-totals_reconciliation".
+
+        @return: True if the stored totals were wrong.
+        """
+        old_totals = (self.total_no_vat, self.total_vat)
+
+        self.invalidate_cache()
+        self._update_totals()
+
+        if old_totals == (self.total_no_vat, self.total_vat):
+            return False
+
+        type(self)._default_manager.filter(id=self.id).update(
+            total_no_vat=self.total_no_vat, total_vat=self.total_vat,
+        )
+        self._refresh_received_totals()
+
+        return True
+
     @atomic
     def save(self, *args, **kwargs):
         create_relation = partial(
@@ -382,7 +455,8 @@ class Base(CremeEntity):
             # which garanties the totals are updated, does not use <update_fields> :
             #    if update_fields is not None:
             #        update_fields = { 'total_vat', 'total_no_vat', *update_fields}
-            self._update_totals()
+            if not self._totals_up_to_date:
+                self._update_totals()
 
             super().save(*args, **kwargs)
 
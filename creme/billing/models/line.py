@@ -25,6 +25,7 @@ from django.db.transaction import atomic
 from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
 
+from creme.creme_core.core.snapshot import Snapshot
 from creme.creme_core.models import CremeEntity, Relation, Vat
 from creme.creme_core.models.vat import get_default_vat_pk
 from creme.creme_core.utils import round_decimal
@@ -35,8 +36,6 @@ from ..constants import ROUND_POLICY
 logger = logging.getLogger(__name__)
 
 
-# TODO: use a smarter system to update the BillingModel only once when
-#  several lines are edited for the moment when have to re-save the model manually.
 class Line(CremeEntity):
     class Discount(models.IntegerChoices):
         PERCENT     = 1, _('Percent'),
@@ -85,6 +84,9 @@ class Line(CremeEntity):
 
     _related_document = False
     _related_item = None
+    # Prices (exclusive & inclusive of tax) which are counted in the totals
+    # of the related document since the last save() (None means "unknown").
+    _document_prices = None
 
     class Meta:
         abstract = True
@@ -220,6 +222,48 @@ class Line(CremeEntity):
         """
         raise NotImplementedError
 
+    def get_document_prices(self, document=None):
+        """Get the amounts this line adds to the totals of its document.
+        @return: Tuple (price exclusive of tax, price inclusive of tax).
+        """
+        return (
+            self.get_price_exclusive_of_tax(document),
+            self.get_price_inclusive_of_tax(document),
+        )
+
+    def _get_saved_document_prices(self):
+        "Get the prices which are currently counted in the totals of the document."
+        prices = self._document_prices
+
+        if prices is None:
+            snapshot = Snapshot.get_for_instance(self)
+
+            if snapshot is not None:
+                initial = snapshot.get_initial_instance()
+
+                if initial.vat_value_id == self.vat_value_id:
+                    initial.vat_value = self.vat_value  # Avoid a query
+
+                prices = initial.get_document_prices(self.related_document)
+
+        return prices
+
+    def _update_document_totals(self, old_prices):
+        """Apply the difference between the old & the new prices to the totals
+        of the related document ; the totals are completely computed again only
+        when the difference cannot be applied.
+        """
+        document = self.related_document
+        document.invalidate_cache()
+        prices = self.get_document_prices(document)
+
+        if old_prices is None or not document._add_to_totals(
+            no_vat=prices[0] - old_prices[0], vat=prices[1] - old_prices[1],
+        ):
+            document.save()  # Update totals
+
+        self._document_prices = prices
+
     @atomic
     def save(self, *args, **kwargs):
         if not self.pk:  # Creation
@@ -244,9 +288,10 @@ class Line(CremeEntity):
                     type_id=constants.REL_SUB_LINE_RELATED_ITEM,
                     object_entity=self._related_item,
                 )
+
+            old_prices = (constants.DEFAULT_DECIMAL, constants.DEFAULT_DECIMAL)
         else:
+            old_prices = self._get_saved_document_prices()
             super().save(*args, **kwargs)
 
-        # TODO: problem, if several lines are added/edited at once, lots of
-        #  useless queries (workflow engine ??)
-        self.related_document.save()  # Update totals
+        self._update_document_totals(old_prices)
@@ -0,0 +1,165 @@
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2026  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+
+from django.conf import settings
+from django.db import models
+from django.db.models import F, FilteredRelation, Q, Sum
+from django.db.models.functions import ExtractYear
+from django.db.transaction import atomic
+
+from creme import billing
+from creme.creme_core.models import CremeEntity, Relation
+
+from ..constants import REL_SUB_BILL_ISSUED, REL_SUB_BILL_RECEIVED
+
+
+class ReceivedTotalManager(models.Manager):
+    # Fields of the documents which are used to compute the totals
+    document_field_names = ('total_no_vat', 'status', 'acceptation_date', 'is_deleted')
+
+    @property
+    def document_models(self) -> tuple[type[CremeEntity], ...]:
+        "Models of the documents which are summed."
+        return billing.get_invoice_model(), billing.get_quote_model()
+
+    def _compute(self, target_ids: Iterable[int] | None = None) -> Iterator[ReceivedTotal]:
+        Kind = self.model.Kind
+
+        for kind, model, q, values in (
+            (
+                Kind.PENDING_PAYMENT,
+                billing.get_invoice_model(),
+                Q(status__pending_payment=True),
+                {},
+            ),
+            (
+                Kind.WON_QUOTES,
+                billing.get_quote_model(),
+                Q(status__won=True, acceptation_date__isnull=False),
+                {'year': ExtractYear('acceptation_date')},
+            ),
+        ):
+            qs = model.objects.filter(
+                q, is_deleted=False, total_no_vat__isnull=False,
+            ).annotate(
+                target_rel=FilteredRelation(
+                    'relations', condition=Q(relations__type=REL_SUB_BILL_RECEIVED),
+                ),
+                source_rel=FilteredRelation(
+                    'relations', condition=Q(relations__type=REL_SUB_BILL_ISSUED),
+                ),
+            ).filter(
+                target_rel__isnull=False, source_rel__isnull=False,
+            )
+
+            if target_ids is not None:
+                qs = qs.filter(target_rel__object_entity__in=target_ids)
+
+            for row in qs.values(
+                target_id=F('target_rel__object_entity'),
+                source_id=F('source_rel__object_entity'),
+                **values
+            ).annotate(total=Sum('total_no_vat')).order_by():
+                yield self.model(kind=kind, **row)
+
+    def refresh(self, *, target_ids: Iterable[int] = (), document_ids: Iterable[int] = ()) -> None:
+        """Compute again the totals related to some receivers.
+        @param target_ids: IDs of receivers (Organisations, Contacts).
+        @param document_ids: IDs of documents (Invoices, Quotes...) ; their
+               receivers are refreshed.
+        """
+        target_ids = {*target_ids}
+        document_ids = [*document_ids]
+
+        if document_ids:
+            target_ids.update(
+                Relation.objects.filter(
+                    subject_entity__in=document_ids, type=REL_SUB_BILL_RECEIVED,
+                ).values_list('object_entity', flat=True)
+            )
+
+        if target_ids:
+            with atomic():
+                # NB: the receivers are locked, so the concurrent refreshes of
+                #     the same receiver are serialised (& cannot create duplicates).
+                [
+                    *CremeEntity.objects.select_for_update()
+                                        .filter(id__in=target_ids)
+                                        .order_by('id')
+                                        .values_list('id', flat=True)
+                ]
+                self.filter(target__in=target_ids).delete()
+                self.bulk_create(self._compute(target_ids))
+
+    def rebuild(self) -> None:
+        "Compute again all the totals."
+        with atomic():
+            self.all().delete()
+            self.bulk_create(self._compute())
+
+
+class ReceivedTotal(models.Model):
+    """Pre-computed sum of the totals (without VAT) of the documents received
+    by an entity (Organisation, Contact) & issued by an Organisation.
+    It's used by the function fields "total_pending_payment",
+    "total_won_quote_this_year" & "total_won_quote_last_year" ; the instances
+    are updated when the documents, their relationships & their statuses are
+    modified (see 'billing.signals').
+    """
+    class Kind(models.IntegerChoices):
+        PENDING_PAYMENT = 1, 'Invoices pending payment'
+        WON_QUOTES      = 2, 'Won quotes'
+
+    target = models.ForeignKey(
+        CremeEntity, related_name='+', editable=False, on_delete=models.CASCADE,
+    )
+    source = models.ForeignKey(
+        settings.PERSONS_ORGANISATION_MODEL,
+        related_name='+', editable=False, on_delete=models.CASCADE,
+    )
+    kind = models.PositiveSmallIntegerField(choices=Kind, editable=False)
+    # Year of acceptation of the Quotes (0 for the other kinds)
+    # NB: not nullable, because NULL values are not compared by the unique constraint.
+    year = models.PositiveSmallIntegerField(default=0, editable=False)
+    total = models.DecimalField(max_digits=14, decimal_places=2, editable=False)
+
+    objects = ReceivedTotalManager()
+
+    class Meta:
+        app_label = 'billing'
+        indexes = [
+            models.Index(fields=['target', 'kind', 'year'], name='billing__received_total'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['target', 'source', 'kind', 'year'],
+                name='billing__received_total__unique',
+            ),
+        ]
+
+    def __repr__(self):
+        return (
+            f'ReceivedTotal('
+            f'target_id={self.target_id}, source_id={self.source_id}, '
+            f'kind={self.kind}, year={self.year}, total={self.total}'
+            f')'
+        )
@@ -43,12 +43,14 @@ from creme.creme_core.models import (
     CustomBrickConfigItem,
     EntityFilter,
     HeaderFilter,
+    Job,
     MenuConfigItem,
     RelationType,
     SearchConfigItem,
     SettingValue,
     Workflow,
 )
+from creme.creme_core.utils.date_period import date_period_registry
 from creme.creme_core.workflows import (
     FirstRelatedEntitySource,
     ObjectEntitySource,
@@ -58,7 +60,15 @@ from creme.creme_core.workflows import (
 )
 from creme.persons.constants import REL_SUB_CUSTOMER_SUPPLIER, REL_SUB_PROSPECT
 
-from . import bricks, buttons, constants, custom_forms, menu, setting_keys
+from . import (
+    bricks,
+    buttons,
+    constants,
+    creme_jobs,
+    custom_forms,
+    menu,
+    setting_keys,
+)
 from .core import BILLING_MODELS
 from .core.line import line_registry
 from .models import (
@@ -300,6 +310,12 @@ class Populator(BasePopulator):
             ],
         ),
     ]
+    JOBS = [
+        Job(
+            type=creme_jobs.totals_reconciliation_type,
+            periodicity=date_period_registry.get_period('weeks', 1),
+        ),
+    ]
     CUSTOM_FORMS = [
         custom_forms.INVOICE_CREATION_CFORM,
         custom_forms.INVOICE_EDITION_CFORM,
@@ -1,6 +1,6 @@
 ################################################################################
 #    Creme is a free/open-source Customer Relationship Management software
-#    Copyright (C) 2015-2025  Hybird
+#    Copyright (C) 2015-2026  Hybird
 #
 #    This program is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU Affero General Public License as published by
@@ -32,7 +32,13 @@ from creme.creme_core.models.utils import assign_2_charfield
 
 from . import constants
 from .core.number_generation import number_generator_registry
-from .models import Base, NumberGeneratorItem
+from .models import (
+    Base,
+    InvoiceStatus,
+    NumberGeneratorItem,
+    QuoteStatus,
+    ReceivedTotal,
+)
 
 Organisation = persons.get_organisation_model()
 
@@ -178,7 +184,6 @@ def manage_linked_credit_notes(sender, instance, **kwargs):
         instance.real_object.save()
 
 
-# TODO: problem, if several lines are deleted at once, lots of useless queries (workflow engine ??)
 @receiver(signals.post_delete, sender=Relation, dispatch_uid='billing-manage_line_deletion')
 def manage_line_deletion(sender, instance, **kwargs):
     "The calculated totals (Invoice, Quote...) have to be refreshed."
@@ -187,4 +192,57 @@ def manage_line_deletion(sender, instance, **kwargs):
         # NB: see billing.models.base.Base._pre_delete() for this ugly hack
         and not getattr(instance, '_avoid_billing_total_update', False)
     ):
-        instance.subject_entity.get_real_entity().save()
+        document = instance.subject_entity.get_real_entity()
+        no_vat, vat = instance.real_object.get_document_prices(document)
+
+        if not document._add_to_totals(no_vat=-no_vat, vat=-vat):
+            document.save()
+
+
+@receiver(signals.post_save, sender=Invoice, dispatch_uid='billing-refresh_totals_of_invoice')
+@receiver(signals.post_save, sender=Quote,   dispatch_uid='billing-refresh_totals_of_quote')
+def refresh_received_totals(sender, instance, created, **kwargs):
+    # NB: the totals of a new document are refreshed when its relationships are created
+    if created:
+        return
+
+    # NB: the relationships are managed by refresh_received_totals_on_relation()
+    snapshot = Snapshot.get_for_instance(instance)
+    if snapshot is not None:
+        field_names = ReceivedTotal.objects.document_field_names
+
+        if not any(diff.field.name in field_names for diff in snapshot.compare(instance)):
+            return
+
+    ReceivedTotal.objects.refresh(document_ids=[instance.id])
+
+
+@receiver(
+    (signals.post_save, signals.post_delete),
+    sender=Relation, dispatch_uid='billing-refresh_received_totals_on_relation',
+)
+def refresh_received_totals_on_relation(sender, instance, **kwargs):
+    match instance.type_id:
+        case constants.REL_SUB_BILL_RECEIVED:
+            ReceivedTotal.objects.refresh(target_ids=[instance.object_entity_id])
+        case constants.REL_SUB_BILL_ISSUED:
+            ReceivedTotal.objects.refresh(document_ids=[instance.subject_entity_id])
+
+
+@receiver(
+    signals.post_save, sender=InvoiceStatus, dispatch_uid='billing-refresh_totals_of_istatus',
+)
+@receiver(
+    signals.post_save, sender=QuoteStatus, dispatch_uid='billing-refresh_totals_of_qstatus',
+)
+def refresh_received_totals_on_status(sender, instance, created, **kwargs):
+    if created:
+        return
+
+    model = Invoice if sender is InvoiceStatus else Quote
+    ReceivedTotal.objects.refresh(
+        target_ids=Relation.objects.filter(
+            type=constants.REL_SUB_BILL_RECEIVED,
+            subject_entity__in=model.objects.filter(status=instance.id).values('id'),
+        ).values_list('object_entity', flat=True),
+    )
@@ -3,6 +3,7 @@ from functools import partial
 
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
+from django.db.models.signals import post_save
 from django.urls import reverse
 from django.utils.translation import gettext as _
 
@@ -197,6 +198,144 @@ class LineTestCase(_BillingTestCase):
         self.assertFalse(self.refresh(invoice).get_lines(ProductLine))
         self.assertFalse(ProductLine.objects.exists())
 
+    @skipIfCustomProductLine
+    def test_totals__delta(self):
+        "The differences of prices are applied to the totals of the document."
+        user = self.login_as_root_and_get()
+
+        invoice = self.create_invoice_n_orgas(user=user, name='Invoice001', discount=0)[0]
+        create_pline = partial(
+            ProductLine.objects.create,
+            user=user, related_document=invoice,
+            vat_value=Vat.objects.get_or_create(value=Decimal('20.00'))[0],
+        )
+        create_pline(on_the_fly_item='Fly #1', unit_price=Decimal('100'))
+        line2 = create_pline(on_the_fly_item='Fly #2', unit_price=Decimal('50'), quantity=2)
+
+        invoice = self.refresh(invoice)
+        self.assertEqual(Decimal('200.00'), invoice.total_no_vat)
+        self.assertEqual(Decimal('240.00'), invoice.total_vat)
+
+        # The totals are not computed completely => the drift is kept
+        Invoice.objects.filter(id=invoice.id).update(
+            total_no_vat=Decimal('1000.00'), total_vat=Decimal('1200.00'),
+        )
+
+        line2 = self.refresh(line2)
+        line2.quantity = 3
+        line2.save()
+
+        invoice = line2.related_document
+        self.assertEqual(Decimal('1050.00'), invoice.total_no_vat)
+        self.assertEqual(Decimal('1260.00'), invoice.total_vat)
+
+        # Second edition of the same instance
+        line2.unit_price = Decimal('40')
+        line2.save()
+        self.assertEqual(Decimal('1020.00'), invoice.total_no_vat)
+        self.assertEqual(Decimal('1224.00'), invoice.total_vat)
+
+        invoice = self.refresh(invoice)
+        self.assertEqual(Decimal('1020.00'), invoice.total_no_vat)
+        self.assertEqual(Decimal('1224.00'), invoice.total_vat)
+
+        # Reconciliation
+        self.assertIs(True, invoice.reconcile_totals())
+        self.assertEqual(Decimal('220.00'), invoice.total_no_vat)
+        self.assertEqual(Decimal('264.00'), invoice.total_vat)
+
+        invoice = self.refresh(invoice)
+        self.assertEqual(Decimal('220.00'), invoice.total_no_vat)
+        self.assertEqual(Decimal('264.00'), invoice.total_vat)
+        self.assertIs(False, invoice.reconcile_totals())
+
+    @skipIfCustomProductLine
+    def test_totals__delta__deletion(self):
+        user = self.login_as_root_and_get()
+
+        invoice = self.create_invoice_n_orgas(user=user, name='Invoice001', discount=0)[0]
+        create_pline = partial(
+            ProductLine.objects.create,
+            user=user, related_document=invoice,
+            vat_value=Vat.objects.get_or_create(value=Decimal('20.00'))[0],
+        )
+        create_pline(on_the_fly_item='Fly #1', unit_price=Decimal('100'))
+        line2 = create_pline(on_the_fly_item='Fly #2', unit_price=Decimal('50'))
+
+        Invoice.objects.filter(id=invoice.id).update(
+            total_no_vat=Decimal('1000.00'), total_vat=Decimal('1200.00'),
+        )
+        self.refresh(line2).delete()
+
+        invoice = self.refresh(invoice)
+        self.assertEqual(Decimal('950.00'), invoice.total_no_vat)
+        self.assertEqual(Decimal('1140.00'), invoice.total_vat)
+
+    @skipIfCustomProductLine
+    def test_totals__delta__signal(self):
+        "The document is saved, so the dependent data can be updated."
+        user = self.login_as_root_and_get()
+
+        invoice = self.create_invoice_n_orgas(user=user, name='Invoice001', discount=0)[0]
+        create_pline = partial(
+            ProductLine.objects.create,
+            user=user, related_document=invoice,
+            vat_value=Vat.objects.get_or_create(value=Decimal('20.00'))[0],
+        )
+        create_pline(on_the_fly_item='Fly #1', unit_price=Decimal('100'))
+
+        saved_totals = []
+
+        def receiver(sender, instance, **kwargs):
+            saved_totals.append((instance.id, instance.total_no_vat, instance.total_vat))
+
+        post_save.connect(receiver, sender=Invoice)
+        self.addCleanup(post_save.disconnect, receiver, sender=Invoice)
+
+        line2 = create_pline(on_the_fly_item='Fly #2', unit_price=Decimal('50'))
+        self.assertListEqual(
+            [(invoice.id, Decimal('150.00'), Decimal('180.00'))], saved_totals,
+        )
+
+        saved_totals.clear()
+        self.refresh(line2).delete()
+        self.assertListEqual(
+            [(invoice.id, Decimal('100.00'), Decimal('120.00'))], saved_totals,
+        )
+
+    @skipIfCustomProductLine
+    def test_totals__delta__not_positive(self):
+        "The totals are computed completely when they are not (or would not remain) positive."
+        user = self.login_as_root_and_get()
+
+        invoice = self.create_invoice_n_orgas(user=user, name='Invoice001', discount=0)[0]
+        create_pline = partial(
+            ProductLine.objects.create,
+            user=user, related_document=invoice,
+            vat_value=Vat.objects.get_or_create(value=Decimal('0'))[0],
+        )
+        create_pline(on_the_fly_item='Fly #1', unit_price=Decimal('100'))
+        line2 = create_pline(on_the_fly_item='Fly #2', unit_price=Decimal('-150'))
+
+        invoice = self.refresh(invoice)
+        self.assertEqual(Decimal('-50.00'), invoice.total_no_vat)
+        self.assertEqual(Decimal('-50.00'), invoice.total_vat)
+
+        line2 = self.refresh(line2)
+        line2.unit_price = Decimal('-20')
+        line2.save()
+
+        invoice = self.refresh(invoice)
+        self.assertEqual(Decimal('80.00'), invoice.total_no_vat)
+        self.assertEqual(Decimal('80.00'), invoice.total_vat)
+
+        line2.unit_price = Decimal('-200')
+        line2.save()
+
+        invoice = self.refresh(invoice)
+        self.assertEqual(Decimal('-100.00'), invoice.total_no_vat)
+        self.assertEqual(Decimal('-100.00'), invoice.total_vat)
+
     @skipIfCustomProduct
     @skipIfCustomProductLine
     def test_related_item(self):
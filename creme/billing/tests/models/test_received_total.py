@@ -0,0 +1,245 @@
+from datetime import date
+from decimal import Decimal
+from functools import partial
+from unittest.mock import patch
+
+from django.db import IntegrityError
+
+from creme.persons.tests.base import skipIfCustomOrganisation
+
+from ...constants import REL_SUB_BILL_RECEIVED
+from ...models import InvoiceStatus, QuoteStatus, ReceivedTotal
+from ...models.totals import ReceivedTotalManager
+from ..base import (
+    Invoice,
+    Organisation,
+    ProductLine,
+    Quote,
+    _BillingTestCase,
+    skipIfCustomInvoice,
+    skipIfCustomProductLine,
+    skipIfCustomQuote,
+)
+
+
+@skipIfCustomOrganisation
+@skipIfCustomInvoice
+@skipIfCustomQuote
+@skipIfCustomProductLine
+class ReceivedTotalTestCase(_BillingTestCase):
+    def _create_line(self, *, user, document, unit_price):
+        return ProductLine.objects.create(
+            user=user, related_document=document,
+            on_the_fly_item='Fly', unit_price=Decimal(unit_price),
+        )
+
+    def _get_totals(self, target):
+        return {
+            (rt.source_id, rt.kind, rt.year): rt.total
+            for rt in ReceivedTotal.objects.filter(target=target)
+        }
+
+    def test_invoice(self):
+        user = self.get_root_user()
+        pending_status = InvoiceStatus.objects.create(name='Pending', pending_payment=True)
+        other_status = InvoiceStatus.objects.create(name='Other', pending_payment=False)
+
+        create_orga = partial(Organisation.objects.create, user=user)
+        source1 = create_orga(name='Source #1')
+        source2 = create_orga(name='Source #2')
+        target = create_orga(name='Target')
+
+        create_invoice = partial(
+            Invoice.objects.create,
+            user=user, status=pending_status, source=source1, target=target,
+        )
+        invoice1 = create_invoice(name='Invoice #1')
+        invoice2 = create_invoice(name='Invoice #2')
+        invoice3 = create_invoice(name='Invoice #3', source=source2)
+        invoice4 = create_invoice(name='Invoice #4', status=other_status)
+
+        self._create_line(user=user, document=invoice1, unit_price='1000')
+        line2 = self._create_line(user=user, document=invoice2, unit_price='200')
+        self._create_line(user=user, document=invoice3, unit_price='30')
+        self._create_line(user=user, document=invoice4, unit_price='4')
+
+        PENDING = ReceivedTotal.Kind.PENDING_PAYMENT
+        self.assertDictEqual(
+            {
+                (source1.id, PENDING, 0): Decimal('1200'),
+                (source2.id, PENDING, 0): Decimal('30'),
+            },
+            self._get_totals(target),
+        )
+
+        # Line edition ---
+        line2 = self.refresh(line2)
+        line2.unit_price = Decimal('300')
+        line2.save()
+        self.assertEqual(Decimal('1300'), self._get_totals(target)[(source1.id, PENDING, 0)])
+
+        # Status ---
+        invoice4 = self.refresh(invoice4)
+        invoice4.status = pending_status
+        invoice4.save()
+        self.assertEqual(Decimal('1304'), self._get_totals(target)[(source1.id, PENDING, 0)])
+
+        pending_status.pending_payment = False
+        pending_status.save()
+        self.assertFalse(self._get_totals(target))
+
+        pending_status.pending_payment = True
+        pending_status.save()
+        self.assertEqual(Decimal('1304'), self._get_totals(target)[(source1.id, PENDING, 0)])
+
+        # Trash ---
+        invoice4 = self.refresh(invoice4)
+        invoice4.trash()
+        self.assertEqual(Decimal('1300'), self._get_totals(target)[(source1.id, PENDING, 0)])
+
+    def test_invoice__no_change(self):
+        "The totals are not refreshed if the used fields have not been modified."
+        user = self.get_root_user()
+        pending_status = InvoiceStatus.objects.create(name='Pending', pending_payment=True)
+        other_status = InvoiceStatus.objects.create(name='Other', pending_payment=False)
+
+        create_orga = partial(Organisation.objects.create, user=user)
+        invoice = Invoice.objects.create(
+            user=user, name='Invoice #1', status=pending_status,
+            source=create_orga(name='Source'), target=create_orga(name='Target'),
+        )
+        self._create_line(user=user, document=invoice, unit_price='1000')
+
+        invoice = self.refresh(invoice)
+        invoice.name = 'Invoice #1 (edited)'
+
+        with patch.object(ReceivedTotalManager, 'refresh') as refresh_mock:
+            invoice.save()
+
+        refresh_mock.assert_not_called()
+
+        # ---
+        invoice = self.refresh(invoice)
+        invoice.status = other_status
+
+        with patch.object(ReceivedTotalManager, 'refresh') as refresh_mock:
+            invoice.save()
+
+        refresh_mock.assert_called_once_with(document_ids=[invoice.id])
+
+    def test_invoice__target_n_source(self):
+        user = self.get_root_user()
+        pending_status = InvoiceStatus.objects.create(name='Pending', pending_payment=True)
+
+        create_orga = partial(Organisation.objects.create, user=user)
+        source1 = create_orga(name='Source #1')
+        source2 = create_orga(name='Source #2')
+        target1 = create_orga(name='Target #1')
+        target2 = create_orga(name='Target #2')
+
+        invoice = Invoice.objects.create(
+            user=user, name='Invoice #1', status=pending_status,
+            source=source1, target=target1,
+        )
+        self._create_line(user=user, document=invoice, unit_price='1000')
+
+        PENDING = ReceivedTotal.Kind.PENDING_PAYMENT
+        self.assertDictEqual(
+            {(source1.id, PENDING, 0): Decimal('1000')},
+            self._get_totals(target1),
+        )
+
+        invoice = self.refresh(invoice)
+        invoice.source = source2
+        invoice.target = target2
+        invoice.save()
+        self.assertFalse(self._get_totals(target1))
+        self.assertDictEqual(
+            {(source2.id, PENDING, 0): Decimal('1000')},
+            self._get_totals(target2),
+        )
+
+        # Deletion ---
+        self.refresh(invoice).delete()
+        self.assertFalse(self._get_totals(target2))
+
+    def test_quote(self):
+        user = self.get_root_user()
+        won_status = QuoteStatus.objects.create(name='Won', won=True)
+
+        create_orga = partial(Organisation.objects.create, user=user)
+        source = create_orga(name='Source')
+        target = create_orga(name='Target')
+
+        create_quote = partial(
+            Quote.objects.create,
+            user=user, status=won_status, source=source, target=target,
+        )
+        quote1 = create_quote(name='Quote #1', acceptation_date=date(year=2025, month=3, day=1))
+        quote2 = create_quote(name='Quote #2', acceptation_date=date(year=2026, month=5, day=1))
+        quote3 = create_quote(name='Quote #3', acceptation_date=date(year=2026, month=6, day=1))
+        quote4 = create_quote(name='Quote #4')  # No acceptation date => ignored
+
+        self._create_line(user=user, document=quote1, unit_price='1000')
+        self._create_line(user=user, document=quote2, unit_price='200')
+        self._create_line(user=user, document=quote3, unit_price='30')
+        self._create_line(user=user, document=quote4, unit_price='4')
+
+        WON = ReceivedTotal.Kind.WON_QUOTES
+        self.assertDictEqual(
+            {
+                (source.id, WON, 2025): Decimal('1000'),
+                (source.id, WON, 2026): Decimal('230'),
+            },
+            self._get_totals(target),
+        )
+
+        quote4 = self.refresh(quote4)
+        quote4.acceptation_date = date(year=2025, month=1, day=1)
+        quote4.save()
+        self.assertEqual(Decimal('1004'), self._get_totals(target)[(source.id, WON, 2025)])
+
+    def test_unique(self):
+        user = self.get_root_user()
+
+        create_orga = partial(Organisation.objects.create, user=user)
+        source = create_orga(name='Source')
+        target = create_orga(name='Target')
+
+        create_total = partial(
+            ReceivedTotal.objects.create,
+            target=target, source=source, kind=ReceivedTotal.Kind.PENDING_PAYMENT,
+        )
+        create_total(total=Decimal('1000'))
+
+        with self.assertRaises(IntegrityError):
+            create_total(total=Decimal('1000'))
+
+    def test_rebuild(self):
+        user = self.get_root_user()
+        pending_status = InvoiceStatus.objects.create(name='Pending', pending_payment=True)
+
+        create_orga = partial(Organisation.objects.create, user=user)
+        source = create_orga(name='Source')
+        target = create_orga(name='Target')
+
+        invoice = Invoice.objects.create(
+            user=user, name='Invoice #1', status=pending_status, source=source, target=target,
+        )
+        self._create_line(user=user, document=invoice, unit_price='1000')
+
+        ReceivedTotal.objects.all().delete()
+        ReceivedTotal.objects.create(
+            target=self.get_root_user().linked_contact, source=source,
+            kind=ReceivedTotal.Kind.PENDING_PAYMENT, total=Decimal('12'),
+        )
+        self.assertHaveRelation(invoice, type=REL_SUB_BILL_RECEIVED, object=target)
+
+        ReceivedTotal.objects.rebuild()
+        self.assertListEqual(
+            [(target.id, source.id, Decimal('1000'))],
+            [
+                (rt.target_id, rt.source_id, rt.total)
+                for rt in ReceivedTotal.objects.all()
+            ],
+        )
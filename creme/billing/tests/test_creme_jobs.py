@@ -0,0 +1,116 @@
+from decimal import Decimal
+
+from django.utils.translation import gettext as _
+from django.utils.translation import ngettext
+
+from creme.creme_core.core.workflow import WorkflowEngine
+from creme.creme_core.models import EntityJobResult, Job, Vat
+
+from ..creme_jobs import totals_reconciliation_type
+from ..models import InvoiceStatus, ReceivedTotal
+from .base import (
+    Invoice,
+    ProductLine,
+    _BillingTestCase,
+    skipIfCustomInvoice,
+    skipIfCustomProductLine,
+)
+
+
+@skipIfCustomInvoice
+@skipIfCustomProductLine
+class TotalsReconciliationTestCase(_BillingTestCase):
+    def test_job(self):
+        user = self.login_as_root_and_get()
+
+        job = self.get_object_or_fail(Job, type_id=totals_reconciliation_type.id)
+        self.assertIsNone(job.user)
+        self.assertEqual(Job.STATUS_OK, job.status)
+        self.assertEqual('weeks', job.periodicity.name)
+
+        invoice1 = self.create_invoice_n_orgas(user=user, name='Invoice001', discount=0)[0]
+        invoice2 = self.create_invoice_n_orgas(user=user, name='Invoice002', discount=0)[0]
+
+        vat = Vat.objects.get_or_create(value=Decimal('20.00'))[0]
+
+        for invoice in (invoice1, invoice2):
+            ProductLine.objects.create(
+                user=user, related_document=invoice, vat_value=vat,
+                on_the_fly_item='Fly', unit_price=Decimal('100'),
+            )
+
+        Invoice.objects.filter(id=invoice2.id).update(
+            total_no_vat=Decimal('110.00'), total_vat=Decimal('132.00'),
+        )
+
+        # Empty the Queue to avoid log messages
+        WorkflowEngine.get_current()._queue.pickup()
+
+        totals_reconciliation_type.execute(job)
+
+        invoice2 = self.refresh(invoice2)
+        self.assertEqual(Decimal('100.00'), invoice2.total_no_vat)
+        self.assertEqual(Decimal('120.00'), invoice2.total_vat)
+
+        result = self.get_alone_element(EntityJobResult.objects.filter(job=job))
+        self.assertEqual(invoice2.id, result.entity_id)
+        self.assertListEqual(
+            [
+                _('The total without VAT was {old} instead of {new}').format(
+                    old=Decimal('110.00'), new=Decimal('100.00'),
+                ),
+                _('The total with VAT was {old} instead of {new}').format(
+                    old=Decimal('132.00'), new=Decimal('120.00'),
+                ),
+            ],
+            result.messages,
+        )
+
+        count_msg = ngettext(
+            '{count} document has been fixed.',
+            '{count} documents have been fixed.',
+            1
+        ).format(count=1)
+        self.assertListEqual([count_msg], totals_reconciliation_type.get_stats(job))
+        self.assertEqual(count_msg, totals_reconciliation_type.progress(job).label)
+
+    def test_job__no_drift(self):
+        user = self.login_as_root_and_get()
+        invoice = self.create_invoice_n_orgas(user=user, name='Invoice001')[0]
+        ProductLine.objects.create(
+            user=user, related_document=invoice,
+            on_the_fly_item='Fly', unit_price=Decimal('100'),
+        )
+
+        job = self.get_object_or_fail(Job, type_id=totals_reconciliation_type.id)
+        # Empty the Queue to avoid log messages
+        WorkflowEngine.get_current()._queue.pickup()
+
+        totals_reconciliation_type.execute(job)
+        self.assertFalse(EntityJobResult.objects.filter(job=job))
+        self.assertListEqual([], totals_reconciliation_type.get_stats(job))
+
+    def test_job__received_totals(self):
+        "The pre-computed totals are rebuilt."
+        user = self.login_as_root_and_get()
+        invoice, source, target = self.create_invoice_n_orgas(
+            user=user, name='Invoice001',
+            status=InvoiceStatus.objects.create(name='Pending', pending_payment=True),
+        )
+        ProductLine.objects.create(
+            user=user, related_document=invoice,
+            on_the_fly_item='Fly', unit_price=Decimal('100'),
+        )
+
+        ReceivedTotal.objects.all().delete()
+
+        WorkflowEngine.get_current()._queue.pickup()
+
+        job = self.get_object_or_fail(Job, type_id=totals_reconciliation_type.id)
+        totals_reconciliation_type.execute(job)
+
+        received_total = self.get_alone_element(ReceivedTotal.objects.all())
+        self.assertEqual(target.id, received_total.target_id)
+        self.assertEqual(source.id, received_total.source_id)
+        self.assertEqual(ReceivedTotal.Kind.PENDING_PAYMENT, received_total.kind)
+        self.assertEqual(Decimal('100.00'), received_total.total)
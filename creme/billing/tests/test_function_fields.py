@@ -1,10 +1,12 @@
 from datetime import date, timedelta
+from decimal import Decimal
 from functools import partial
 
 from django.conf import settings
 from django.utils.formats import number_format
 from django.utils.translation import gettext as _
 
+from creme.creme_core.auth.entity_credentials import EntityCredentials
 from creme.creme_core.core.entity_cell import EntityCellFunctionField
 from creme.creme_core.core.function_field import function_field_registry
 from creme.creme_core.gui.view_tag import ViewTag
@@ -16,7 +18,7 @@ from ..function_fields import (
     get_total_won_quote_last_year,
     get_total_won_quote_this_year,
 )
-from ..models import InvoiceStatus, QuoteStatus
+from ..models import InvoiceStatus, QuoteStatus, ReceivedTotal
 from .base import (
     Invoice,
     Organisation,
@@ -190,6 +192,36 @@ class TotalPendingPaymentTestCase(_BaseTotalFunctionFieldTestCase):
         self.assertEqual(number_format('3500.00'), total1)
         self.assertEqual(number_format('3300.00'), total2)
 
+    def test_received_totals(self):
+        "The pre-computed totals are used when the user can view all the invoices."
+        user = self.login_as_standard(allowed_apps=['persons', 'billing'])
+        self.add_credentials(user.role, all=['VIEW'])
+
+        create_orga = partial(Organisation.objects.create, user=user)
+        target = create_orga(name='Target')
+        source = self._set_managed(create_orga(name='Source'))
+
+        ReceivedTotal.objects.create(
+            target=target, source=source,
+            kind=ReceivedTotal.Kind.PENDING_PAYMENT, total=Decimal('1234.00'),
+        )
+
+        bool(Organisation.objects.filter_managed_by_creme())  # Fill cache
+        self.assertTrue(user.role.can_do_on_all(Invoice, EntityCredentials.VIEW))  # Fill cache
+
+        funf = function_field_registry.get(Organisation, 'total_pending_payment')
+        # 2 Queries:
+        #  - documents in sandboxes
+        #  - pre-computed totals
+        with self.assertNumQueries(2):
+            funf.populate_entities([target], user)
+
+        self.assertEqual(number_format('1234.00'), funf(target, user).render(ViewTag.TEXT_PLAIN))
+
+        # Already populated
+        with self.assertNumQueries(0):
+            funf.populate_entities([target], user)
+
     def test_credentials(self):
         user = self.login_as_standard(
             allowed_apps=['persons', 'billing'],
@@ -793,7 +793,10 @@ class GenericModelConfigTestCase(BrickTestCaseMixin, CremeTestCase):
             dcom,
         )
 
-        deletor_type.execute(dcom.job)
+        # NB: the buffered lines of history are inserted at the commit
+        with self.captureOnCommitCallbacks(execute=True):
+            deletor_type.execute(dcom.job)
+
         self.assertDoesNotExist(status2del)
         self.assertEqual(default_status, self.refresh(ticket1).status)
 
@@ -877,7 +880,10 @@ class GenericModelConfigTestCase(BrickTestCaseMixin, CremeTestCase):
         self.assertEqual(FakeTicket, replacer.model_field.model)
         self.assertEqual('priority', replacer.model_field.name)
 
-        deletor_type.execute(dcom.job)
+        # NB: the buffered lines of history are inserted at the commit
+        with self.captureOnCommitCallbacks(execute=True):
+            deletor_type.execute(dcom.job)
+
         self.assertDoesNotExist(prio2del)
 
         fallback_priority = self.refresh(ticket1).priority
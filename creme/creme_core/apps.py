@@ -479,6 +479,12 @@ class CremeCoreConfig(CremeAppConfig):
             from .tests.fake_apps import ready
             ready()
 
+        from .gui import brick_cache
+        from .gui.listview import count
+
+        brick_cache.connect_signal_handlers()
+        count.connect_signal_handlers()
+
         super().all_apps_ready()
 
     def register_menu_entries(self, menu_registry):
@@ -663,6 +669,8 @@ class CremeCoreConfig(CremeAppConfig):
             content_cls=core_notif.UpgradeAnnouncement,
         ).register_content(
             content_cls=core_notif.MassImportDoneContent,
+        ).register_content(
+            content_cls=core_notif.MassExportDoneContent,
         )
 
     def register_creme_config(self, config_registry):
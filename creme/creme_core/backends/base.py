@@ -1,6 +1,6 @@
 ################################################################################
 #    Creme is a free/open-source Customer Relationship Management software
-#    Copyright (C) 2013-2023  Hybird
+#    Copyright (C) 2013-2026  Hybird
 #
 #    This program is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU Affero General Public License as published by
@@ -16,6 +16,8 @@
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ################################################################################
 
+from collections.abc import Iterable
+
 from django.http.response import HttpResponseBase
 
 
@@ -51,6 +53,8 @@ class ExportBackend:
     id: unique export backend identifier: the file extension matching this backend.
     verbose_name: defines the backend for the user, used in the select backend popup.
     help_text: currently unused.
+    The backends which store the file in a <creme_core.models.FileRef> should
+    set the attribute "fileref" in save().
     """
     id: str = 'OVERRIDE ME'
     verbose_name: str = 'OVERRIDE ME'
@@ -71,3 +75,24 @@ class ExportBackend:
               instance of <django.contrib.auth.get_user_model()>.
         """
         raise NotImplementedError
+
+    def stream(self, rows: Iterable[list], filename: str, user) -> HttpResponseBase:
+        """Writes all the rows & saves the file.
+        The default implementation calls writerow() for each row & then save() ;
+        it can be overridden to build a response which consumes the rows lazily
+        (e.g. a <django.http.StreamingHttpResponse>), so the whole file is never
+        stored in memory.
+        @param rows: Iterable of rows (lists) ; it can be a generator which
+               performs queries when it's consumed.
+        @param filename: file name.
+        @param user: owner of the file ;
+              instance of <django.contrib.auth.get_user_model()>.
+        @return: The response (see the attribute "response").
+        """
+        writerow = self.writerow
+        for row in rows:
+            writerow(row)
+
+        self.save(filename, user)
+
+        return self.response
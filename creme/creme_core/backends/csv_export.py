@@ -1,6 +1,6 @@
 ################################################################################
 #    Creme is a free/open-source Customer Relationship Management software
-#    Copyright (C) 2013-2021  Hybird
+#    Copyright (C) 2013-2026  Hybird
 #
 #    This program is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU Affero General Public License as published by
@@ -17,8 +17,9 @@
 ################################################################################
 
 import csv
+from io import StringIO
 
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from django.template.defaultfilters import slugify
 from django.utils.translation import gettext_lazy as _
 
@@ -31,6 +32,9 @@ class CSVExportBackend(ExportBackend):
     delimiter: str = ','
     help_text = ''
 
+    # Minimal size (in characters) of the chunks yielded by stream().
+    chunk_size: int = 64 * 1024
+
     def __init__(self):
         self.response = HttpResponse(content_type='text/csv')
         self.writer = csv.writer(
@@ -45,6 +49,34 @@ class CSVExportBackend(ExportBackend):
     def save(self, filename, user):
         self.response['Content-Disposition'] = f'attachment; filename="{slugify(filename)}.csv"'
 
+    def _iter_chunks(self, rows):
+        buffer = StringIO()
+        writer = csv.writer(buffer, quoting=csv.QUOTE_ALL, delimiter=self.delimiter)
+        writerow = writer.writerow
+        chunk_size = self.chunk_size
+
+        for row in rows:
+            writerow(row)
+
+            if buffer.tell() >= chunk_size:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        last_chunk = buffer.getvalue()
+        if last_chunk:
+            yield last_chunk
+
+    def stream(self, rows, filename, user):
+        # NB: the rows are consumed by the WSGI server ; so only the current
+        #     chunk is stored in memory.
+        self.response = response = StreamingHttpResponse(
+            self._iter_chunks(rows), content_type='text/csv',
+        )
+        self.save(filename, user)
+
+        return response
+
 
 class SemiCSVExportBackend(CSVExportBackend):
     id = 'scsv'
@@ -1,6 +1,6 @@
 ################################################################################
 #    Creme is a free/open-source Customer Relationship Management software
-#    Copyright (C) 2013-2024  Hybird
+#    Copyright (C) 2013-2026  Hybird
 #
 #    This program is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU Affero General Public License as published by
@@ -44,7 +44,7 @@ class XLSExportBackend(ExportBackend):
     def save(self, filename, user):
         name = f'{slugify(filename)}.{self.id}'
         path = FileCreator(dir_path=self.dir_path, name=name).create()
-        fileref = FileRef.objects.create(
+        self.fileref = fileref = FileRef.objects.create(
             user=user,
             basename=name,
             filedata='{}/{}'.format(
@@ -1,6 +1,6 @@
 ################################################################################
 #    Creme is a free/open-source Customer Relationship Management software
-#    Copyright (C) 2024  Hybird
+#    Copyright (C) 2024-2026  Hybird
 #
 #    This program is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU Affero General Public License as published by
@@ -39,12 +39,15 @@ class XLSXExportBackend(ExportBackend):
     def __init__(self):
         super().__init__()
         self.dir_path = join(settings.MEDIA_ROOT, *self.dir_parts)
-        self._workbook = Workbook()
+        # NB: the "write-only" mode flushes the rows in a temporary file, so
+        #     the memory usage does not depend on the number of rows.
+        self._workbook = Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet()
 
     def save(self, filename, user):
         name = f'{slugify(filename)}.{self.id}'
         path = FileCreator(dir_path=self.dir_path, name=name).create()
-        fileref = FileRef.objects.create(
+        self.fileref = fileref = FileRef.objects.create(
             user=user,
             basename=name,
             filedata='{}/{}'.format(
@@ -57,4 +60,4 @@ class XLSXExportBackend(ExportBackend):
         self._workbook.save(path)
 
     def writerow(self, row):
-        self._workbook.active.append(row)
+        self._sheet.append(row)
@@ -1,6 +1,6 @@
 ################################################################################
 #    Creme is a free/open-source Customer Relationship Management software
-#    Copyright (C) 2009-2025  Hybird
+#    Copyright (C) 2009-2026  Hybird
 #
 #    This program is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU Affero General Public License as published by
@@ -227,6 +227,10 @@ class BatchAction:
                 )
             ) from e
 
+    @property
+    def field_name(self) -> str:
+        return self._field_name
+
     def __call__(self, entity: CremeEntity) -> bool:
         """The action's operator is computed with the given entity
         (on the field indicated by action-field and using the action-value),
@@ -0,0 +1,176 @@
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2026  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+from __future__ import annotations
+
+import logging
+from copy import deepcopy
+from typing import TYPE_CHECKING, Any
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import signals
+
+from ..global_info import get_per_request_cache
+
+if TYPE_CHECKING:
+    from django.core.cache.backends.base import BaseCache
+    from django.db.models import Model
+
+logger = logging.getLogger(__name__)
+
+
+class ConfigCache:
+    """Cache for the instances of configuration models (SettingValue,
+    FieldsConfig, CustomField...) which are read by (almost) all the requests
+    but are rarely modified.
+
+    There are 2 levels:
+      - the per-request cache (see 'creme_core.global_info'), used as before.
+      - a process-wide cache, which avoids to perform the same queries at each
+        request. A value is copied when it is moved into the per-request cache,
+        so a request can modify its instances without side effect.
+
+    The values of the process-wide cache are associated to a generation, stored
+    in a Django's cache (see the setting "CONFIG_CACHE_ALIAS"); the generation
+    is read once per request, & renewed when an instance of a watched model is
+    saved/deleted (see watch()). So several processes stay coherent if they
+    share the same Django's cache.
+
+    Notice that modifications which do not send signals (e.g. QuerySet.update())
+    are not detected ; call invalidate() after them.
+    """
+    generation_key = 'creme_core-config_cache-generation'
+
+    def __init__(self):
+        self._values: dict[str, Any] = {}
+        self._generation: str | None = None
+
+    @property
+    def cache(self) -> BaseCache | None:
+        """Get the Django's cache which stores the generation; <None> means the
+        process-wide cache is disabled.
+        """
+        alias = settings.CONFIG_CACHE_ALIAS
+
+        return caches[alias] if alias else None
+
+    def _get_generation(self, cache: BaseCache) -> str:
+        per_request_cache = get_per_request_cache()
+        generation = per_request_cache.get(self.generation_key)
+
+        if generation is None:
+            key = self.generation_key
+            generation = cache.get(key)
+
+            if generation is None:
+                generation = uuid4().hex
+                # NB: "add" => another process could have created the generation meanwhile
+                if not cache.add(key, generation, timeout=None):
+                    generation = cache.get(key, generation)
+
+            per_request_cache[key] = generation
+
+        return generation
+
+    def _get_values(self) -> dict[str, Any] | None:
+        "Get the values of the current generation (<None> if the cache is disabled)."
+        cache = self.cache
+        if cache is None:
+            return None
+
+        generation = self._get_generation(cache)
+        if generation != self._generation:
+            self._values = {}
+            self._generation = generation
+
+        return self._values
+
+    def get(self, key: str, default=None):
+        """Get a cached value.
+        @param key: String identifying the value.
+        @param default: Returned value if the key is not found.
+        """
+        per_request_cache = get_per_request_cache()
+
+        try:
+            return per_request_cache[key]
+        except KeyError:
+            pass
+
+        values = self._get_values()
+        if values is None or key not in values:
+            return default
+
+        value = per_request_cache[key] = deepcopy(values[key])
+
+        return value
+
+    def set(self, key: str, value, shared: bool = True) -> None:
+        """Store a value.
+        @param key: String identifying the value.
+        @param value: Stored value; it must be copiable.
+        @param shared: If False, the value is only stored in the per-request cache
+               (useful for values which have not been retrieved from the database).
+        """
+        get_per_request_cache()[key] = value
+
+        if shared:
+            values = self._get_values()
+
+            if values is not None:
+                values[key] = deepcopy(value)
+
+    def _renew_generation(self, cache: BaseCache) -> None:
+        cache.set(self.generation_key, uuid4().hex, timeout=None)
+        get_per_request_cache().pop(self.generation_key, None)
+        self._values = {}
+        self._generation = None
+
+    def invalidate(self) -> None:
+        """Invalidate the values of the process-wide cache, in all the processes
+        (the values in the per-request cache are not removed).
+        """
+        cache = self.cache
+
+        if cache is not None:
+            self._renew_generation(cache)
+
+            # NB: another process could store old values before the end of the
+            #     transaction; so we renew the generation again after the commit.
+            transaction.on_commit(lambda: self._renew_generation(cache))
+
+    def _invalidate_on_signal(self, sender, **kwargs) -> None:
+        logger.debug('ConfigCache: invalidation by a <%s>', sender.__name__)
+        self.invalidate()
+
+    def watch(self, model: type[Model]) -> None:
+        "The cache is invalidated when an instance of the model is saved/deleted."
+        dispatch_uid = f'creme_core-config_cache-{model._meta.label_lower}'
+
+        signals.post_save.connect(
+            self._invalidate_on_signal, sender=model, dispatch_uid=dispatch_uid,
+        )
+        signals.post_delete.connect(
+            self._invalidate_on_signal, sender=model, dispatch_uid=dispatch_uid,
+        )
+
+
+config_cache = ConfigCache()
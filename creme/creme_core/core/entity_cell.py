@@ -20,8 +20,8 @@ from __future__ import annotations
 
 import logging
 from collections import defaultdict
-from collections.abc import Collection, Iterable
-from typing import DefaultDict
+from collections.abc import Callable, Collection, Iterable
+from typing import Any, DefaultDict
 
 from django.conf import settings
 from django.core.exceptions import FieldDoesNotExist
@@ -238,6 +238,57 @@ class EntityCell:
     def render(self, entity: CremeEntity, user, tag: ViewTag) -> str:
         raise NotImplementedError
 
+    @staticmethod
+    def _render_all(render: Callable[[CremeEntity, Any], str],
+                    entities: Iterable[CremeEntity],
+                    user,
+                    ) -> list[str]:
+        results = []
+        append = results.append
+        failed = False
+
+        for entity in entities:
+            try:
+                append(render(entity, user))
+            except Exception:
+                # NB: the error is generally the same for all the entities
+                #     => we avoid to flood the log with a traceback per entity.
+                if failed:
+                    logger.debug('Error when rendering a cell for the entity id=%s', entity.id)
+                else:
+                    logger.exception(
+                        'Error when rendering a cell for the entity id=%s', entity.id,
+                    )
+                    failed = True
+
+                append('')
+
+        return results
+
+    def render_many(self,
+                    entities: Collection[CremeEntity],
+                    user,
+                    tag: ViewTag,
+                    ) -> list[str]:
+        """Render the cell for several entities (e.g. the page of a list-view),
+        which should have been populated with populate_entities().
+        The things which are common to all the entities (printers, credentials
+        on related entities...) are resolved only once, so it's faster than
+        calling render() for each entity.
+        If the rendering of an entity raises an exception, an empty string is
+        used (only the first error is logged with its traceback).
+
+        @param entities: Instances of CremeEntities (or subclass).
+        @param user: Instance of <contrib.auth.get_user_model()>.
+        @param tag: see render().
+        @return: A list of strings, in the same order as the entities.
+        """
+        render = self.render
+
+        return self._render_all(
+            lambda entity, user: render(entity, user, tag), entities, user,
+        )
+
     @property
     def description(self) -> str:
         return ''
@@ -519,7 +570,7 @@ class EntityCellRegularField(EntityCell):
     def populate_entities(cells, entities, user):
         populate_related(entities, [cell.value for cell in cells])
 
-    def render(self, entity, user, tag):
+    def _get_printer(self, model, tag):
         printer = self._printers.get(tag)
 
         if printer is None:
@@ -528,12 +579,24 @@ class EntityCellRegularField(EntityCell):
             from ..gui.field_printers import field_printer_registry
 
             self._printers[tag] = printer = field_printer_registry.build_field_printer(
-                model=entity.__class__,
+                model=model,
                 field_name=self.value,
                 tag=tag,
             )
 
-        return printer(entity, user)
+        return printer
+
+    def render(self, entity, user, tag):
+        return self._get_printer(model=entity.__class__, tag=tag)(entity, user)
+
+    def render_many(self, entities, user, tag):
+        if not entities:
+            return []
+
+        return self._render_all(
+            self._get_printer(model=next(iter(entities)).__class__, tag=tag),
+            entities, user,
+        )
 
     @property
     def description(self):
@@ -636,7 +699,7 @@ class EntityCellCustomField(EntityCell):
     def portable_value(self):
         return str(self._customfield.uuid)
 
-    def render(self, entity, user, tag):
+    def _get_printer(self, tag):
         printer = self._printers.get(tag)
 
         if printer is None:
@@ -669,7 +732,13 @@ class EntityCellCustomField(EntityCell):
 
             self._printers[tag] = printer
 
-        return printer(entity, user)
+        return printer
+
+    def render(self, entity, user, tag):
+        return self._get_printer(tag)(entity, user)
+
+    def render_many(self, entities, user, tag):
+        return self._render_all(self._get_printer(tag), entities, user)
 
     @staticmethod
     def populate_entities(cells, entities, user):
@@ -752,6 +821,13 @@ class EntityCellFunctionField(EntityCell):
     def render(self, entity, user, tag):
         return self.function_field(entity, user).render(tag)
 
+    def render_many(self, entities, user, tag):
+        ffield = self.function_field
+
+        return self._render_all(
+            lambda entity, user: ffield(entity, user).render(tag), entities, user,
+        )
+
     @cached_property
     def title(self):
         return str(self._functionfield.verbose_name)
@@ -762,6 +838,8 @@ class EntityCellRelation(EntityCell):
     type_id = 'relation'
     verbose_name = _('Relationships')
 
+    _HTML_TAGS = {ViewTag.HTML_DETAIL, ViewTag.HTML_LIST, ViewTag.HTML_FORM}
+
     def __init__(self,
                  model: type[Model],
                  rtype: RelationType,
@@ -810,13 +888,19 @@ class EntityCellRelation(EntityCell):
 
     @staticmethod
     def populate_entities(cells, entities, user):
-        CremeEntity.populate_relations(
-            entities,
-            [cell.relation_type.id for cell in cells]
+        rtype_ids = [cell.relation_type.id for cell in cells]
+        CremeEntity.populate_relations(entities, rtype_ids)
+
+        # NB: the related entities are rendered only if they can be viewed
+        user.populate_credentials(
+            relation.real_object
+            for entity in entities
+            for rtype_id in rtype_ids
+            for relation in entity.get_relations(rtype_id)
         )
 
     def render(self, entity, user, tag):
-        if tag in {ViewTag.HTML_DETAIL, ViewTag.HTML_LIST, ViewTag.HTML_FORM}:
+        if tag in self._HTML_TAGS:
             from ..templatetags.creme_widgets import widget_entity_hyperlink
 
             related_entities = entity.get_related_entities(self.value, True)
@@ -850,6 +934,37 @@ class EntityCellRelation(EntityCell):
                 key=collator.sort_key,
             ))
 
+    def render_many(self, entities, user, tag):
+        if tag in self._HTML_TAGS:
+            return super().render_many(entities=entities, user=user, tag=tag)
+
+        # NB: the same entities are often linked to several entities of the
+        #     page (e.g. the employer of many contacts), so we check the
+        #     credentials only once for each related entity.
+        has_perm = user.has_perm_to_view
+        allowed = {}
+        rtype_id = self.value
+        sort_key = collator.sort_key
+
+        def is_allowed(e):
+            perm = allowed.get(e.id)
+            if perm is None:
+                allowed[e.id] = perm = has_perm(e)
+
+            return perm
+
+        return self._render_all(
+            lambda entity, user: '/'.join(sorted(
+                (
+                    str(o)
+                    for o in entity.get_related_entities(rtype_id, True)
+                    if is_allowed(o)
+                ),
+                key=sort_key,
+            )),
+            entities, user,
+        )
+
     @property
     def title(self):
         return (
@@ -1,6 +1,6 @@
 ################################################################################
 #    Creme is a free/open-source Customer Relationship Management software
-#    Copyright (C) 2024-2025  Hybird
+#    Copyright (C) 2024-2026  Hybird
 #
 #    This program is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU Affero General Public License as published by
@@ -19,7 +19,12 @@
 from contextlib import ContextDecorator
 
 from ..global_info import get_per_request_cache
-from ..models.history import HISTORY_ENABLED_CACHE_KEY, is_history_enabled
+from ..models.history import (
+    HISTORY_BUFFER_CACHE_KEY,
+    HISTORY_ENABLED_CACHE_KEY,
+    HistoryBuffer,
+    is_history_enabled,
+)
 
 
 def do_toggle_history(*, enabled: bool) -> None:
@@ -63,3 +68,48 @@ class toggle_history(ContextDecorator):
         do_toggle_history(enabled=self.initial)
 
         return False  # Exceptions are not captured
+
+
+class buffered_history(ContextDecorator):
+    """ Decorator and context manager which buffers the new lines of history ;
+    the lines are inserted with bulk queries when their transaction is
+    committed (& at the exit), instead of one query per line.
+    It's useful when lots of entities are created/modified (mass import,
+    batch process...) ; notice that the jobs use it automatically.
+
+    Usages:
+
+    @buffered_history()
+    def do_something():
+        do()
+
+    or
+
+    with buffered_history():
+        do_something()
+
+    The nested usages use the buffer of the outermost one.
+    See 'creme_core.models.history.HistoryBuffer'.
+    """
+    def __init__(self, *, size: int = 500) -> None:
+        """Constructor.
+        @param size: Number of lines which are inserted with one query.
+        """
+        self.size = size
+
+    def __enter__(self):
+        cache = get_per_request_cache()
+
+        if cache.get(HISTORY_BUFFER_CACHE_KEY) is None:
+            self.buffer = cache[HISTORY_BUFFER_CACHE_KEY] = HistoryBuffer(size=self.size)
+        else:
+            self.buffer = None
+
+    def __exit__(self, *exc):
+        buffer = self.buffer
+
+        if buffer is not None:
+            get_per_request_cache().pop(HISTORY_BUFFER_CACHE_KEY, None)
+            buffer.close()
+
+        return False  # Exceptions are not captured
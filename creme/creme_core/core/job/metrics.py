@@ -0,0 +1,109 @@
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2026  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+from __future__ import annotations
+
+from collections import Counter, deque
+from collections.abc import Iterable
+from datetime import datetime
+
+from django.utils.timezone import now
+
+
+class JobSchedulerMetrics:
+    """Statistics about the activity of the JobScheduler ; they help to
+    understand why the jobs are late (too many jobs for the workers, long jobs...).
+
+    Latency: delay between the moment a job should start (waking up date for
+    system jobs, reception of the START command for user jobs) & its real start.
+    Duration: delay between the start & the end of a job.
+    The average/maximum values are computed on the last runs, & the details of
+    the last started jobs are kept (see 'history_size').
+    """
+    def __init__(self, history_size: int = 100):
+        self.history_size = history_size
+        self.started = now()
+        self.commands: Counter[str] = Counter()
+        self._latencies: deque[float] = deque(maxlen=history_size)
+        self._durations: deque[float] = deque(maxlen=history_size)
+        self._starts: dict[int, datetime] = {}  # Keys are Job IDs
+        self._jobs: dict[int, dict] = {}  # Keys are Job IDs
+
+    def command_received(self, cmd_type: str) -> None:
+        self.commands[cmd_type] += 1
+
+    def job_started(self, job_id: int, scheduled: datetime, started: datetime | None = None,
+                    ) -> None:
+        """Register the start of a job.
+        @param job_id: ID of the Job instance.
+        @param scheduled: when the job should have started.
+        @param started: when the job started really (default: now).
+        """
+        started = started or now()
+        latency = max((started - scheduled).total_seconds(), 0.0)
+
+        self._starts[job_id] = started
+        self._latencies.append(latency)
+
+        # NB: the job is moved at the end (most recent)
+        jobs = self._jobs
+        job_info = jobs.pop(job_id, None) or {'runs': 0}
+        jobs[job_id] = job_info
+        if len(jobs) > self.history_size:
+            del jobs[next(iter(jobs))]
+
+        job_info['runs'] += 1
+        job_info['last_start'] = started
+        job_info['last_latency'] = latency
+
+    def job_ended(self, job_id: int, ended: datetime | None = None) -> None:
+        started = self._starts.pop(job_id, None)
+
+        if started is not None:
+            duration = ((ended or now()) - started).total_seconds()
+            self._durations.append(duration)
+
+            job_info = self._jobs.get(job_id)
+            if job_info is not None:
+                job_info['last_duration'] = duration
+
+    @staticmethod
+    def _summary(values: Iterable[float]) -> dict:
+        values = [*values]
+
+        return {
+            'count':   len(values),
+            'average': round(sum(values) / len(values), 3) if values else None,
+            'maximum': round(max(values), 3) if values else None,
+        }
+
+    def as_dict(self) -> dict:
+        "Get the metrics as a JSON-compliant dictionary."
+        return {
+            'started': self.started.isoformat(),
+            'commands': dict(self.commands),
+            'latency': self._summary(self._latencies),
+            'duration': self._summary(self._durations),
+            'jobs': {
+                str(job_id): {
+                    **job_info,
+                    'last_start': job_info['last_start'].isoformat(),
+                    'running': job_id in self._starts,
+                } for job_id, job_info in self._jobs.items()
+            },
+        }
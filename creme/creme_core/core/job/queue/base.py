@@ -1,6 +1,6 @@
 ################################################################################
 #    Creme is a free/open-source Customer Relationship Management software
-#    Copyright (C) 2016-2022  Hybird
+#    Copyright (C) 2016-2026  Hybird
 #
 #    This program is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU Affero General Public License as published by
@@ -31,9 +31,10 @@ class Command:
     END     = 'END'
     REFRESH = 'REFRESH'
     PING    = 'PING'
+    STATS   = 'STATS'
 
     def __init__(self, cmd_type: str, data_id=None, data=None):
-        self.type = cmd_type  # START/END/REFRESH/PING
+        self.type = cmd_type  # START/END/REFRESH/PING/STATS
         self.data_id = data_id
         self.data = data
 
@@ -59,6 +60,10 @@ class Command:
     def _build_PING_command(cls, data) -> Command:
         return cls(cmd_type=cls.PING, data_id=data)
 
+    @classmethod
+    def _build_STATS_command(cls, data) -> Command:
+        return cls(cmd_type=cls.STATS, data_id=data)
+
     @classmethod
     def build(cls, cmd_type, data) -> Command:
         method = getattr(cls, f'_build_{cmd_type}_command', None)
@@ -125,9 +130,10 @@ class BaseJobSchedulerQueue:
         """Retrieved the sent command.
         @param timeout: Integer, in seconds.
         @return: An instance of Command or None (which means "time out").
-                 The command's type is in {CMD_START, CMD_END, CMD_REFRESH, CMD_PING}.
-                 The command's id is the related Job's id, excepted for the command CMD_PING,
-                 where it is a string which should be given to the pong() method.
+                 The command's type is in {CMD_START, CMD_END, CMD_REFRESH, CMD_PING, CMD_STATS}.
+                 The command's id is the related Job's id, excepted for the commands
+                 CMD_PING & CMD_STATS, where it is a string which should be given to
+                 the methods pong() & send_stats() respectively.
                  The command's data is only for CMD_REFRESH (dictionary with new values).
         """
         raise NotImplementedError
@@ -140,3 +146,16 @@ class BaseJobSchedulerQueue:
 
     def pong(self, ping_cmd: Command):
         raise NotImplementedError
+
+    def get_stats(self) -> dict | None:
+        """Ask the job manager for its metrics (see JobScheduler.get_metrics()).
+        @return A JSON-compliant dictionary, or 'None' if the job manager does not respond.
+        """
+        raise NotImplementedError
+
+    def send_stats(self, stats_cmd: Command, stats: dict):
+        """Answer to a STATS command (server side).
+        @param stats_cmd: Command returned by get_command().
+        @param stats: JSON-compliant dictionary.
+        """
+        raise NotImplementedError
@@ -9,11 +9,13 @@ class MockQueue(base.BaseJobSchedulerQueue):
         super().__init__(*args, **kwargs)
         self.started_jobs = []
         self.refreshed_jobs = []
+        self.sent_stats = []
 
     def clear(self):
         """Useful for test cases; clear the internal lists."""
         self.started_jobs.clear()
         self.refreshed_jobs.clear()
+        self.sent_stats.clear()
 
     def start_job(self, job):
         self.started_jobs.append(job)
@@ -34,3 +36,9 @@ class MockQueue(base.BaseJobSchedulerQueue):
 
     def pong(self, ping_cmd):
         pass
+
+    def get_stats(self):
+        pass
+
+    def send_stats(self, stats_cmd, stats):
+        self.sent_stats.append((stats_cmd, stats))
@@ -1,6 +1,6 @@
 ################################################################################
 #    Creme is a free/open-source Customer Relationship Management software
-#    Copyright (C) 2016-2022  Hybird
+#    Copyright (C) 2016-2026  Hybird
 #
 #    This program is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU Affero General Public License as published by
@@ -16,6 +16,7 @@
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ################################################################################
 
+import json
 import logging
 import traceback
 from functools import wraps
@@ -56,6 +57,7 @@ class RedisQueue(BaseJobSchedulerQueue):
     verbose_name = _('Redis queue')
     JOBS_COMMANDS_KEY = 'creme_jobs'
     JOBS_PONG_KEY_PREFIX = 'creme_jobs_pong'
+    JOBS_STATS_KEY_PREFIX = 'creme_jobs_stats'
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -132,3 +134,31 @@ class RedisQueue(BaseJobSchedulerQueue):
         # NB: '1' has no special meaning, because only the existence of the key is used.
         # TODO: '10' in settings ?
         self._redis.setex(self._build_pong_key(ping_cmd.data_id), value=1, time=10)
+
+    def _build_stats_key(self, stats_value):
+        return f'{self.JOBS_STATS_KEY_PREFIX}-{stats_value}'
+
+    def get_stats(self):
+        value = str(uuid1())
+        logger.info('Job scheduler queue: request STATS id="%s"', value)
+        _redis = self._redis
+        stats = None
+
+        try:
+            _redis.lpush(self.JOBS_COMMANDS_KEY, f'{Command.STATS}-{value}')
+
+            for i in range(3):
+                sleep(1)
+                stats = _redis.get(self._build_stats_key(value))
+
+                if stats is not None:
+                    break
+        except RedisError as e:
+            logger.warning('Job scheduler queue: error on stats (%s)', e)
+
+        return None if stats is None else json.loads(stats)
+
+    def send_stats(self, stats_cmd, stats):
+        self._redis.setex(
+            self._build_stats_key(stats_cmd.data_id), value=json_encode(stats), time=10,
+        )
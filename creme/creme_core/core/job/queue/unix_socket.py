@@ -1,6 +1,6 @@
 ################################################################################
 #    Creme is a free/open-source Customer Relationship Management software
-#    Copyright (C) 2021-2024  Hybird
+#    Copyright (C) 2021-2026  Hybird
 #
 #    This program is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU Affero General Public License as published by
@@ -16,6 +16,7 @@
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ################################################################################
 
+import json
 import logging
 import os
 import socket
@@ -45,6 +46,10 @@ class SocketCommand(Command):
     def _build_PING_command(cls, data):
         return cls(cmd_type=cls.PING, data_id=data, keep_connection=True)
 
+    @classmethod
+    def _build_STATS_command(cls, data):
+        return cls(cmd_type=cls.STATS, data_id=data, keep_connection=True)
+
 
 class UnixSocketQueue(BaseJobSchedulerQueue):
     verbose_name = _('Socket queue')
@@ -229,3 +234,45 @@ class UnixSocketQueue(BaseJobSchedulerQueue):
             ping_cmd.connection = None  # Should not be useful...
         except OSError as e:
             logger.warning('Job scheduler queue: error on pong (%s)', e)
+
+    def get_stats(self):
+        assert self._server is None
+
+        value = f'{os.getpid()}-{threading.get_ident()}'
+        logger.info('Job scheduler queue: request STATS id="%s"', value)
+        socket_path = self._socket_path
+
+        if not os_path.exists(socket_path):
+            logger.warning('Job scheduler queue: socket does not exist')
+            return None
+
+        chunks = []
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(3.0)  # seconds
+
+            try:
+                client.connect(socket_path)
+                client.send(f'{Command.STATS}-{value}'.encode())
+
+                # NB: the server closes the connection when all data are sent
+                while chunk := client.recv(4096):
+                    chunks.append(chunk)
+            except socket.timeout:
+                logger.warning('Job scheduler queue: time out on stats')
+                return None
+            except OSError as e:
+                logger.warning('Job scheduler queue: error on stats (%s)', e)
+                return None
+
+        return json.loads(b''.join(chunks)) if chunks else None
+
+    def send_stats(self, stats_cmd, stats):
+        assert isinstance(stats_cmd, SocketCommand) and stats_cmd.connection is not None
+
+        try:
+            conn = stats_cmd.connection
+            conn.sendall(json_encode(stats).encode('utf-8'))
+            conn.close()
+            stats_cmd.connection = None
+        except OSError as e:
+            logger.warning('Job scheduler queue: error on stats (%s)', e)
@@ -20,10 +20,13 @@ import logging
 from collections import deque
 from datetime import MAXYEAR, datetime, timedelta
 from heapq import heapify, heappop, heappush
+from multiprocessing.pool import AsyncResult
 from subprocess import Popen
 from typing import Deque
 
+from dateutil.relativedelta import relativedelta
 from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
 from django.db.models import Q
 from django.utils.formats import date_format
 from django.utils.timezone import localtime, make_aware, now
@@ -35,7 +38,9 @@ from creme.creme_core.utils.system import (
     python_subprocess,
 )
 
+from .metrics import JobSchedulerMetrics
 from .queue import Command, get_queue
+from .worker import JobWorkerPool
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +58,12 @@ class JobScheduler:
         - User jobs are executed with a pool of processes, and its size is given
           by settings.MAX_USER_JOBS.
 
+    By default, a new process is spawned for each execution of a Job. If
+    settings.JOBMANAGER_WORKERS is > 0, the Jobs are executed by a pool of
+    pre-started workers (see JobWorkerPool) ; in this case the number of
+    running user jobs is limited by the number of workers minus one, so a
+    worker is always available for the System Jobs.
+
     If the execution of a (pseudo-)periodic Job takes too long time (more than
     its period), the Job is scheduled to the next valid time, and not executed
     immediately (see _next_wakeup()).
@@ -60,6 +71,9 @@ class JobScheduler:
     The "period" of pseudo-periodic is computed each time they are run. But
     the manager runs them regularly (see settings.PSEUDO_PERIOD) in order to
     reduce the aftermath of a redis/... connection problem.
+
+    Some metrics about the activity of the scheduler are collected (see
+    get_metrics() & the command "creme_job_manager_stats").
     """
 
     class _DeferredJob:
@@ -92,7 +106,22 @@ class JobScheduler:
     def __init__(self) -> None:
         self._max_user_jobs = settings.MAX_USER_JOBS
         self._queue = get_queue()
-        self._procs: dict[int, Popen] = {}  # keys are Job IDs
+        self._procs: dict[int, Popen | AsyncResult] = {}  # keys are Job IDs
+
+        workers_count = settings.JOBMANAGER_WORKERS
+        if workers_count:
+            if workers_count < 2:
+                raise ImproperlyConfigured(
+                    f'settings.JOBMANAGER_WORKERS must be 0 or >= 2 '
+                    f'(a worker is reserved to the system jobs): {workers_count}'
+                )
+
+            self._pool = JobWorkerPool(
+                size=workers_count, max_jobs=settings.JOBMANAGER_WORKER_MAX_JOBS,
+            )
+            self._max_user_jobs = min(self._max_user_jobs, workers_count - 1)
+        else:
+            self._pool = None
 
         # Heap, which elements are (wakeup_date, job_instance)
         #   => closer wakeup in the first element.
@@ -102,6 +131,10 @@ class JobScheduler:
         self._system_jobs_starts: dict[int, datetime] = {}  # "int" is Job ID
         self._users_jobs: Deque[Job] = deque()
         self._running_userjob_ids: set[int] = set()
+        # When the user jobs have been pushed in the queue ("int" is Job ID)
+        self._users_jobs_pushes: dict[int, datetime] = {}
+
+        self._metrics = JobSchedulerMetrics()
 
     def _retrieve_jobs(self) -> None:
         users_jobs = self._users_jobs
@@ -111,7 +144,7 @@ class JobScheduler:
         #     (Meta.ordering is already OK, but it could change)
         for job in Job.objects.filter(
             Q(user__isnull=True) | Q(user__isnull=False, status=Job.STATUS_WAIT)
-        ).order_by('id'):
+        ).order_by('id').select_related('user'):
             jtype = job.type
 
             if jtype is None:
@@ -121,7 +154,7 @@ class JobScheduler:
                 )
                 continue
 
-            if job.user:
+            if job.user_id:
                 if jtype.periodic != JobType.NOT_PERIODIC:
                     logger.warning(
                         'JobScheduler: job %r is a user job and should be'
@@ -130,6 +163,7 @@ class JobScheduler:
                     )
 
                 users_jobs.appendleft(job)
+                self._users_jobs_pushes[job.id] = now()
             else:  # System jobs
                 if jtype.periodic != JobType.NOT_PERIODIC:
                     heappush(system_jobs, (self._next_wakeup(job), job.id, job))
@@ -150,14 +184,12 @@ class JobScheduler:
         next_wakeup: datetime
 
         if job.enabled:
-            next_wakeup = reference_run or job.reference_run
             now_value = now()
-            period = job.real_periodicity.as_timedelta()
-
-            # TODO: optimise this computing to avoid O(N) complexity;
-            #       we could probably remove the argument "reference_run".
-            while next_wakeup < now_value:
-                next_wakeup += period
+            next_wakeup = self._first_run_after(
+                reference=reference_run or job.reference_run,
+                now_value=now_value,
+                period=job.real_periodicity.as_timedelta(),
+            )
 
             # TODO: how to cleanly manage jobs with an invalid type?
             if job.type.periodic == JobType.PSEUDO_PERIODIC:
@@ -171,13 +203,48 @@ class JobScheduler:
 
         return next_wakeup
 
+    @staticmethod
+    def _first_run_after(reference: datetime,
+                         now_value: datetime,
+                         period: relativedelta,
+                         ) -> datetime:
+        """Get the first date on the form of <reference + N * period> (N >= 0)
+        which is >= now_value.
+        N is computed arithmetically, so the cost does not depend on the time
+        elapsed since the reference (e.g. the scheduler has been stopped during
+        several days, & the period is one minute).
+        """
+        if reference >= now_value:
+            return reference
+
+        months = period.years * 12 + period.months
+        if months:
+            # NB: can be one period too small (the day in the month is not used)
+            count = (
+                (now_value.year - reference.year) * 12 + now_value.month - reference.month
+            ) // months
+        else:
+            step = timedelta(
+                days=period.days, hours=period.hours, minutes=period.minutes,
+                seconds=period.seconds, microseconds=period.microseconds,
+            )
+            count = -((reference - now_value) // step)  # ceil((now - ref) / step)
+
+        next_run = reference + count * period
+        while next_run < now_value:
+            count += 1
+            next_run = reference + count * period
+
+        return next_run
+
     def _push_user_job(self, user_job: Job):
         users_jobs = self._users_jobs
 
-        if user_job.user:
+        if user_job.user_id:
             # Avoids a possible race condition: the job could be already in the list
             if user_job.id not in (j.id for j in users_jobs):
                 users_jobs.appendleft(user_job)
+                self._users_jobs_pushes[user_job.id] = now()
         else:
             logger.warning(
                 'JobScheduler: try to start the job %r, which is a'
@@ -185,18 +252,26 @@ class JobScheduler:
                 user_job,
             )
 
-    def _start_job(self, job: Job):
+    def _start_job(self, job: Job, scheduled: datetime | None = None):
+        "@param scheduled: When the job should start (for metrics) ; default: now."
         logger.info('JobScheduler: start %r', job)
-
-        self._procs[job.id] = python_subprocess(
-            f'import django; '
-            f'django.setup(); '
-            f'from creme.creme_core.core.job import job_type_registry; '
-            f'job_type_registry({job.id})'
-        )
+        started = now()
+        self._metrics.job_started(job.id, scheduled=scheduled or started, started=started)
+
+        pool = self._pool
+        if pool is None:
+            self._procs[job.id] = python_subprocess(
+                f'import django; '
+                f'django.setup(); '
+                f'from creme.creme_core.core.job import job_type_registry; '
+                f'job_type_registry({job.id})'
+            )
+        else:
+            self._procs[job.id] = pool.run(job.id)
 
     def _end_job(self, job: Job):
         logger.info('JobScheduler: end %r', job)
+        self._metrics.job_ended(job.id)
         proc = self._procs.pop(job.id, None)
         if proc is not None:
             proc.wait()  # TODO: use return code ??
@@ -204,6 +279,10 @@ class JobScheduler:
     def _handle_kill(self, *args):
         logger.info('Job manager stops: %d running job(s)', len(self._procs))
         self._queue.destroy()
+
+        if self._pool is not None:
+            self._pool.stop()
+
         exit()
 
     def _handle_command_end(self, cmd: Command):
@@ -214,7 +293,7 @@ class JobScheduler:
         except Job.DoesNotExist:
             logger.warning('JobScheduler.handle_command_end() -> invalid jod ID: %s', job_id)
         else:
-            if job.user:
+            if job.user_id:
                 self._running_userjob_ids.discard(job.id)
             else:
                 if job.type.periodic == JobType.NOT_PERIODIC:
@@ -262,6 +341,10 @@ class JobScheduler:
         logger.info('JobScheduler.handle_command_ping() -> PING id "%s"', ping_uid)
         self._queue.pong(cmd)
 
+    def _handle_command_stats(self, cmd: Command) -> None:
+        logger.info('JobScheduler.handle_command_stats() -> STATS id "%s"', cmd.data_id)
+        self._queue.send_stats(cmd, self.get_metrics())
+
     def _handle_command_refresh(self, cmd: Command) -> None:
         job_id = cmd.data_id
 
@@ -365,6 +448,34 @@ class JobScheduler:
         else:
             self._push_user_job(job)
 
+    def get_metrics(self) -> dict:
+        """Get the metrics of the scheduler (the collected ones & the current
+        state of the queues) as a JSON-compliant dictionary.
+        """
+        now_value = now()
+        system_jobs = [
+            (wakeup, job) for wakeup, __, job in self._system_jobs
+            if not isinstance(job, self._DeferredJob)
+        ]
+
+        return {
+            **self._metrics.as_dict(),
+            'now': now_value.isoformat(),
+            'processes': len(self._procs),
+            'workers': 0 if self._pool is None else self._pool.size,
+            'queue': {
+                'user_jobs_waiting': len(self._users_jobs),
+                'user_jobs_running': len(self._running_userjob_ids),
+                'max_user_jobs': self._max_user_jobs,
+                'system_jobs_scheduled': len(system_jobs),
+                'system_jobs_running': len(self._system_jobs_starts),
+                'system_jobs_late': sum(
+                    1 for wakeup, job in system_jobs if job.enabled and wakeup <= now_value
+                ),
+                'deferred_jobs': len(self._system_jobs) - len(system_jobs),
+            },
+        }
+
     def start(self, verbose: bool = True) -> None:
         logger.info('Job scheduler starts')
 
@@ -377,6 +488,9 @@ class JobScheduler:
 
         enable_exit_handler(self._handle_kill)
 
+        if self._pool is not None:
+            self._pool.start()
+
         users_jobs = self._users_jobs
         system_jobs = self._system_jobs
         system_jobs_starts = self._system_jobs_starts
@@ -412,6 +526,9 @@ class JobScheduler:
             else:
                 print('No user job at the moment.')
 
+            if self._pool is not None:
+                print(f'Jobs are run by {self._pool.size} worker(s).')
+
             print('\nQuit the server with CTRL-BREAK.')
 
         MAX_USER_JOBS = self._max_user_jobs
@@ -420,6 +537,7 @@ class JobScheduler:
             Command.PING:    self._handle_command_ping,
             Command.REFRESH: self._handle_command_refresh,
             Command.START:   self._handle_command_start,
+            Command.STATS:   self._handle_command_stats,
         }.get
 
         while True:
@@ -459,7 +577,7 @@ class JobScheduler:
                             )
                     else:
                         system_jobs_starts[job.id] = wakeup
-                        self._start_job(job)
+                        self._start_job(job, scheduled=wakeup)
 
                     continue  # In order to handle all system jobs which have to be run _now_
             else:
@@ -467,9 +585,11 @@ class JobScheduler:
                 # -- user-jobs are not periodic)
                 timeout = 0
 
-            while len(running_userjob_ids) <= MAX_USER_JOBS and users_jobs:
+            while len(running_userjob_ids) < MAX_USER_JOBS and users_jobs:
                 job = users_jobs.pop()
-                self._start_job(job)
+                self._start_job(
+                    job, scheduled=self._users_jobs_pushes.pop(job.id, now_value),
+                )
                 running_userjob_ids.add(job.id)
 
             cmd = self._queue.get_command(timeout)
@@ -477,6 +597,7 @@ class JobScheduler:
                 continue
 
             cmd_type = cmd.type
+            self._metrics.command_received(cmd_type)
             handler = get_handler(cmd_type)
 
             if handler:
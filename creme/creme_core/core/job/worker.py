@@ -0,0 +1,112 @@
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2026  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+from functools import partial
+from multiprocessing.pool import AsyncResult, Pool
+
+import django
+from django.db import close_old_connections
+from django.utils.translation import deactivate
+
+from creme.creme_core.global_info import clear_global_info
+
+logger = logging.getLogger(__name__)
+
+
+def run_job(job_id: int) -> None:
+    "Run a Job within a worker process, & clean the environment for the next job."
+    from . import job_type_registry
+
+    try:
+        job_type_registry(job_id)
+    finally:
+        clear_global_info()
+        deactivate()
+        # NB: like at the end of a request (CONN_MAX_AGE is respected)
+        close_old_connections()
+
+
+class JobWorkerPool:
+    """Pool of processes which run the Jobs for the JobScheduler.
+
+    The processes are started once (& Django is set up once per process), then
+    they get the IDs of the Jobs to run from an inter-process queue. So running
+    a Job does not start a new Python interpreter & load Django each time.
+    A worker is replaced by a new process after having run a given number of
+    Jobs, in order to release its memory regularly.
+
+    The processes are "spawned" (not forked) to avoid sharing the connections
+    (DB, broker...) of the scheduler.
+    """
+    def __init__(self, size: int, max_jobs: int = 0):
+        """Constructor.
+        @param size: Number of worker processes (must be >= 1).
+        @param max_jobs: Number of Jobs run by a worker before it is replaced;
+               0 means "never replaced".
+        """
+        if size < 1:
+            raise ValueError(f'{type(self).__name__}: the size must be >= 1 ({size})')
+
+        self.size = size
+        self.max_jobs = max_jobs
+        self._pool: Pool | None = None
+
+    @property
+    def started(self) -> bool:
+        return self._pool is not None
+
+    def start(self) -> None:
+        if self._pool is None:
+            logger.info('JobWorkerPool: start %s worker(s)', self.size)
+            self._pool = multiprocessing.get_context('spawn').Pool(
+                processes=self.size,
+                initializer=django.setup,
+                maxtasksperchild=self.max_jobs or None,
+            )
+
+    def stop(self) -> None:
+        pool = self._pool
+
+        if pool is not None:
+            logger.info('JobWorkerPool: stop the workers')
+            pool.terminate()
+            pool.join()
+            self._pool = None
+
+    @staticmethod
+    def _job_error(job_id: int, error: BaseException) -> None:
+        logger.critical(
+            'JobWorkerPool: the job id="%s" failed with an uncaught error: %s',
+            job_id, error,
+        )
+
+    def run(self, job_id: int) -> AsyncResult:
+        """Run a Job in a worker (the pool is started if needed).
+        If all the workers are busy, the Job waits for a free worker.
+        @param job_id: ID of the Job instance.
+        @return: An object with a method "wait()".
+        """
+        self.start()
+
+        return self._pool.apply_async(
+            run_job, (job_id,), error_callback=partial(self._job_error, job_id),
+        )
@@ -1,6 +1,6 @@
 ################################################################################
 #    Creme is a free/open-source Customer Relationship Management software
-#    Copyright (C) 2013-2025  Hybird
+#    Copyright (C) 2013-2026  Hybird
 #
 #    This program is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU Affero General Public License as published by
@@ -25,6 +25,7 @@ from django.db.models.query import Q, QuerySet
 from ..core import entity_cell
 from ..models import CustomField, FieldsConfig, SearchConfigItem
 from ..utils.string import smart_split
+from .search_index import get_search_index
 
 logger = logging.getLogger(__name__)
 
@@ -72,6 +73,9 @@ class Searcher:
     The search configuration (see the model SearchConfigItem) is used to know
     which fields to use.
     Hidden fields (see model FieldsConfig) are ignored.
+
+    If the search index is enabled (see 'creme_core.core.search_index'), it's
+    used instead of "icontains" lookups on the fields.
     """
     CELL_TO_Q = {
         entity_cell.EntityCellRegularField.type_id:
@@ -99,6 +103,7 @@ class Searcher:
                 search_map[model] = [*sci.refined_cells]
 
         self._search_map = search_map
+        self.index = get_search_index()
 
     def _build_query(self, words, cells) -> Q:
         """Build a Q with given fields for the given search.
@@ -146,9 +151,18 @@ class Searcher:
 
         assert cells is not None  # search on a disabled model ?
 
+        if not cells:
+            return None
+
         strings = smart_split(searched)
 
+        index = self.index
+        if index is not None:
+            index_q = index.build_q(model=model, cells=cells, words=strings)
+
+            if index_q is not None:
+                # NB: no JOIN => no distinct()
+                return model.objects.filter(index_q)
+
         # TODO: distinct() only if there is a JOIN...
-        return model.objects.filter(
-            self._build_query(strings, cells)
-        ).distinct() if cells else None
+        return model.objects.filter(self._build_query(strings, cells)).distinct()
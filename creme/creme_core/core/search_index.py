@@ -0,0 +1,275 @@
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2026  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+"""Index for the search (see 'creme_core.core.search.Searcher').
+
+Without index, the search performs some "icontains" lookups on each configured
+field (see the model SearchConfigItem) of each model ; it means a sequential
+scan of the tables (& some JOINs) at each search.
+
+An index backend stores denormalised values of the searchable fields of each
+entity, & builds queries on these values instead. The backend is chosen with
+the setting "SEARCH_INDEX_BACKEND" (disabled by default).
+
+The index is updated when the entities (& their custom values) are saved ;
+the modifications which do not send signals (e.g. QuerySet.update()), the
+modifications of related instances (e.g. renaming a sector searched with the
+field "sector__title") & the modifications of the search configuration are
+not detected ; use the command "creme_search_index" to rebuild the index.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from collections.abc import Iterable, Iterator, Sequence
+from functools import cache
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Q
+from django.utils.module_loading import import_string
+
+from ..global_info import get_per_request_cache
+from ..models import (
+    CremeEntity,
+    CustomField,
+    CustomFieldValue,
+    SearchConfigItem,
+    SearchIndexEntry,
+)
+from . import entity_cell
+
+logger = logging.getLogger(__name__)
+
+
+class SearchIndexBackend:
+    """Base class for the backends of the search index."""
+    def build_q(self, *,
+                model: type[CremeEntity],
+                cells: Sequence[entity_cell.EntityCell],
+                words: Iterable[str],
+                ) -> Q | None:
+        """Build a Q to search some words in the given cells.
+        Each word must be contained in (at least) one cell.
+        @return: An instance of Q, or <None> if the index cannot be used
+                 (the caller should perform a search without index).
+        """
+        raise NotImplementedError
+
+    def index_entities(self, entities: Iterable[CremeEntity]) -> None:
+        "(Re)Build the index for some entities (of any types)."
+        raise NotImplementedError
+
+    def index_custom_value(self, custom_value: CustomFieldValue, deleted: bool = False) -> None:
+        "Update the index when a custom value has been modified/deleted."
+        raise NotImplementedError
+
+    def clear(self, model: type[CremeEntity] | None = None) -> None:
+        "Clear the index (for a model, or for all the models)."
+        raise NotImplementedError
+
+    def rebuild(self, model: type[CremeEntity], chunk_size: int = 256) -> int:
+        """Rebuild the index of all the entities of a model.
+        @return: The number of indexed entities.
+        """
+        self.clear(model)
+        count = 0
+
+        # NB: we use the IDs as pagination key, in order to not load all the
+        #     entities in memory.
+        last_id = 0
+        qs = model._default_manager.order_by('id')
+
+        while True:
+            entities = [*qs.filter(id__gt=last_id)[:chunk_size]]
+            if not entities:
+                break
+
+            self.index_entities(entities)
+            count += len(entities)
+            last_id = entities[-1].id
+
+        return count
+
+
+class DatabaseSearchIndex(SearchIndexBackend):
+    """Backend which stores the values in the table of the model SearchIndexEntry
+    (one instance per entity & search cell).
+
+    The values are lower-cased, & the words are searched with a "contains"
+    lookup (i.e. "LIKE '%word%'") restricted to the cells of the user's search
+    configuration, without JOIN on the tables of the entities.
+    With PostgreSQL, the migration creates a trigram index on the values
+    (extension "pg_trgm") when it's possible, which makes these lookups fast.
+    """
+    # Types of cell which can be indexed
+    cell_types = {
+        entity_cell.EntityCellRegularField.type_id,
+        entity_cell.EntityCellCustomField.type_id,
+    }
+
+    @staticmethod
+    def normalize(value: str) -> str:
+        return value.lower()
+
+    def get_cells(self, model: type[CremeEntity]) -> list[entity_cell.EntityCell]:
+        """Get the cells which are indexed for a model ; it's the union of the
+        cells of all the search configurations for this model (hidden fields
+        included, because the configuration of the fields can change).
+        """
+        ctype = ContentType.objects.get_for_model(model)
+        cache = get_per_request_cache().setdefault('creme_core-search_index_cells', {})
+        cells = cache.get(ctype.id)
+
+        if cells is None:
+            cells_per_key = {}
+            cell_types = self.cell_types
+
+            for sci in SearchConfigItem.objects.filter(content_type=ctype):
+                for cell in (sci.refined_cells if sci.all_fields else sci.cells):
+                    if cell.type_id in cell_types:
+                        cells_per_key.setdefault(cell.key, cell)
+
+            cache[ctype.id] = cells = [*cells_per_key.values()]
+
+        return cells
+
+    def _regular_value(self,
+                       cell: entity_cell.EntityCellRegularField,
+                       entity: CremeEntity,
+                       ) -> Iterator[str]:
+        value = cell.field_info.value_from(entity)
+
+        for v in (value if isinstance(value, list) else [value]):
+            if v is not None and v != '':
+                yield str(v)
+
+    def _entries(self, entity, cells, cvalues) -> Iterator[SearchIndexEntry]:
+        for cell in cells:
+            if cell.type_id == entity_cell.EntityCellCustomField.type_id:
+                cvalue = cvalues.get(cell.custom_field.id)
+                values = [] if cvalue is None else [str(cvalue)]
+            else:
+                values = [*self._regular_value(cell, entity)]
+
+            if values:
+                yield SearchIndexEntry(
+                    entity_id=entity.id,
+                    entity_ctype_id=entity.entity_type_id,
+                    cell_key=cell.key,
+                    # NB: the searched words cannot contain a line-break
+                    #     (so a word cannot match across 2 values).
+                    value=self.normalize('\n'.join(values)),
+                )
+
+    def build_q(self, *, model, cells, words):
+        cell_types = self.cell_types
+        if any(cell.type_id not in cell_types for cell in cells):
+            return None
+
+        entries = SearchIndexEntry.objects.filter(
+            entity_ctype=ContentType.objects.get_for_model(model),
+            cell_key__in=[cell.key for cell in cells],
+        )
+        normalize = self.normalize
+        q = Q()
+
+        for word in words:
+            q &= Q(pk__in=entries.filter(
+                value__contains=normalize(word),
+            ).values('entity_id'))
+
+        return q
+
+    def index_entities(self, entities):
+        entities_per_model = defaultdict(list)
+        for entity in entities:
+            entities_per_model[type(entity)].append(entity)
+
+        new_entries = []
+
+        for model, model_entities in entities_per_model.items():
+            cells = self.get_cells(model)
+            cfields = [
+                cell.custom_field
+                for cell in cells
+                if cell.type_id == entity_cell.EntityCellCustomField.type_id
+            ]
+            cvalues_map = (
+                CustomField.get_custom_values_map(model_entities, cfields)
+                if cfields else
+                {}
+            )
+
+            for entity in model_entities:
+                new_entries.extend(self._entries(
+                    entity=entity, cells=cells, cvalues=cvalues_map.get(entity.id, {}),
+                ))
+
+        with transaction.atomic():
+            SearchIndexEntry.objects.filter(
+                entity__in=[entity.id for entity in entities],
+            ).delete()
+            SearchIndexEntry.objects.bulk_create(new_entries, batch_size=500)
+
+    def index_custom_value(self, custom_value, deleted=False):
+        cfield = custom_value.custom_field
+        model = cfield.content_type.model_class()
+        cell_key = entity_cell.EntityCellCustomField(cfield).key
+
+        if not any(cell.key == cell_key for cell in self.get_cells(model)):
+            return
+
+        entity_id = custom_value.entity_id
+
+        with transaction.atomic():
+            SearchIndexEntry.objects.filter(entity=entity_id, cell_key=cell_key).delete()
+
+            if not deleted:
+                value = str(custom_value)
+
+                if value:
+                    SearchIndexEntry.objects.create(
+                        entity_id=entity_id,
+                        entity_ctype_id=cfield.content_type_id,
+                        cell_key=cell_key,
+                        value=self.normalize(value),
+                    )
+
+    def clear(self, model=None):
+        entries = SearchIndexEntry.objects.all()
+        if model is not None:
+            entries = entries.filter(entity_ctype=ContentType.objects.get_for_model(model))
+
+        entries.delete()
+
+
+@cache
+def _get_backend(path: str) -> SearchIndexBackend:
+    return import_string(path)()
+
+
+def get_search_index() -> SearchIndexBackend | None:
+    """Get the backend of the search index, or <None> if the index is disabled
+    (see the setting "SEARCH_INDEX_BACKEND").
+    """
+    path = settings.SEARCH_INDEX_BACKEND
+
+    return _get_backend(path) if path else None
@@ -0,0 +1,140 @@
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2026  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+"""Tokens used to invalidate the values stored in a Django's cache.
+
+The keys of the cached values contain some tokens (e.g. a token per
+ContentType); renewing a token invalidates all the values built with it
+(the old values just expire).
+The tokens are stored in a Django's cache too; if you run several processes
+(e.g. gunicorn workers), this cache must use a shared backend (memcached,
+redis...) or a process could use outdated values.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Sequence
+from typing import TYPE_CHECKING
+from uuid import uuid4
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import signals
+
+if TYPE_CHECKING:
+    from django.core.cache.backends.base import BaseCache
+    from django.db.models import Model
+
+
+class TokenCache:
+    """Get & renew the tokens of a cache.
+
+    The renewal is performed immediately, & again when the current transaction
+    is committed: another process could build a value with the old data (not
+    committed yet) & the new token meanwhile.
+    """
+    def __init__(self, *, key_prefix: str, alias_setting: str):
+        """Constructor.
+        @param key_prefix: Prefix of the keys of the tokens.
+        @param alias_setting: Name of the setting which contains the alias of
+               the Django's cache (an empty alias means the cache is disabled).
+        """
+        self.key_prefix = key_prefix
+        self.alias_setting = alias_setting
+
+    @property
+    def cache(self) -> BaseCache | None:
+        "Get the Django's cache which is used; <None> means the cache is disabled."
+        alias = getattr(settings, self.alias_setting)
+
+        return caches[alias] if alias else None
+
+    def key(self, name: str) -> str:
+        return f'{self.key_prefix}-token-{name}'
+
+    def get_many(self, cache: BaseCache, names: Sequence[str]) -> list[str]:
+        "Get the tokens corresponding to some names; the missing tokens are created."
+        token_key = self.key
+        keys = [token_key(name) for name in names]
+        tokens = cache.get_many(keys)
+
+        for key in keys:
+            if key not in tokens:
+                token = uuid4().hex
+                # NB: "add" => another process could have created the token meanwhile
+                if not cache.add(key, token, timeout=None):
+                    token = cache.get(key, token)
+
+                tokens[key] = token
+
+        return [tokens[key] for key in keys]
+
+    def get(self, cache: BaseCache, name: str) -> str:
+        return self.get_many(cache, [name])[0]
+
+    def _renew(self, cache: BaseCache, names: Iterable[str]) -> None:
+        token_key = self.key
+        cache.set_many({token_key(name): uuid4().hex for name in names}, timeout=None)
+
+    def renew(self, *names: str) -> None:
+        "Renew some tokens (now & when the current transaction is committed)."
+        cache = self.cache
+
+        if cache is not None and names:
+            self._renew(cache, names)
+            transaction.on_commit(lambda: self._renew(cache, names))
+
+
+def concrete_models(*bases: type) -> list[type[Model]]:
+    """Get the installed models which inherit one of the given classes (the
+    classes themselves are included if they are concrete models).
+    """
+    return [model for model in apps.get_models() if issubclass(model, bases)]
+
+
+def watch_models(receiver: Callable, *,
+                 models: Iterable[type[Model]],
+                 dispatch_uid: str,
+                 ) -> None:
+    """Connect a receiver to the signals "post_save" & "post_delete" of some
+    models; the receiver is not called for the other models (contrarily to
+    a receiver connected without sender).
+    """
+    for model in models:
+        uid = f'{dispatch_uid}-{model._meta.label_lower}'
+
+        signals.post_save.connect(receiver, sender=model, dispatch_uid=uid)
+        signals.post_delete.connect(receiver, sender=model, dispatch_uid=uid)
+
+
+def watch_m2m(receiver: Callable, *,
+              models: Iterable[type[Model]],
+              dispatch_uid: str,
+              ) -> None:
+    "Connect a receiver to the signal \"m2m_changed\" of the ManyToManyFields of some models."
+    for model in models:
+        for field in model._meta.many_to_many:
+            through = field.remote_field.through
+
+            signals.m2m_changed.connect(
+                receiver,
+                sender=through,
+                dispatch_uid=f'{dispatch_uid}-{through._meta.label_lower}',
+            )
@@ -25,11 +25,11 @@ from __future__ import annotations
 import enum
 import logging
 import re
-from collections.abc import Iterable, Iterator
+from collections.abc import Hashable, Iterable, Iterator
 from typing import TYPE_CHECKING
 
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import Model, QuerySet, signals
+from django.db.models import Model, signals
 from django.dispatch import receiver
 from django.utils.html import format_html, format_html_join
 from django.utils.translation import gettext as _
@@ -42,6 +42,7 @@ from ..models import (
     Relation,
 )
 from ..models.utils import model_verbose_name
+from .config_cache import config_cache
 from .entity_filter import (
     EntityFilterRegistry,
     condition_handler,
@@ -54,7 +55,7 @@ if TYPE_CHECKING:
     from django.forms import Field as FormField
 
     from creme.creme_core.forms.workflows import BaseWorkflowActionForm
-    from creme.creme_core.models import CremeUser
+    from creme.creme_core.models import CremeUser, Workflow
 
 
 logger = logging.getLogger(__name__)
@@ -102,6 +103,12 @@ class WorkflowEvent:
         """Is this event preventing another event to be inserted in the same queue."""
         return False
 
+    def index_key(self) -> Hashable:
+        """Key used by the engine to retrieve the triggers which can be activated
+        by this event; see 'WorkflowTrigger.index_key()'.
+        """
+        return None
+
 
 class _EntityEvent(WorkflowEvent):
     """Event representing the creation of a CremeEntity instance."""
@@ -111,6 +118,9 @@ class _EntityEvent(WorkflowEvent):
     def __eq__(self, other):
         return isinstance(other, type(self)) and self._entity.id == other._entity.id
 
+    def __hash__(self):
+        return hash((type(self), self._entity.id))
+
     def __repr__(self):
         return f'{type(self).__name__}(entity={self._entity!r})'
 
@@ -118,6 +128,9 @@ class _EntityEvent(WorkflowEvent):
     def entity(self) -> CremeEntity:
         return self._entity
 
+    def index_key(self):
+        return self._entity.entity_type.model_class()
+
 
 class EntityCreated(_EntityEvent):
     """Event representing the creation of a CremeEntity instance."""
@@ -140,6 +153,9 @@ class PropertyAdded(WorkflowEvent):
     def __eq__(self, other):
         return isinstance(other, type(self)) and self._property.id == other._property.id
 
+    def __hash__(self):
+        return hash((type(self), self._property.id))
+
     def __repr__(self):
         return f'PropertyAdded(creme_property={self._property!r})'
 
@@ -147,6 +163,9 @@ class PropertyAdded(WorkflowEvent):
     def creme_property(self) -> CremeProperty:
         return self._property
 
+    def index_key(self):
+        return self._property.type.uuid
+
 
 class RelationAdded(WorkflowEvent):
     """Event representing the creation of a Relation instance."""
@@ -156,6 +175,9 @@ class RelationAdded(WorkflowEvent):
     def __eq__(self, other):
         return isinstance(other, type(self)) and self._relation.id == other._relation.id
 
+    def __hash__(self):
+        return hash((type(self), self._relation.id))
+
     def __repr__(self):
         return f'RelationAdded(relation={self._relation!r})'
 
@@ -163,6 +185,9 @@ class RelationAdded(WorkflowEvent):
     def relation(self) -> Relation:
         return self._relation
 
+    def index_key(self):
+        return self._relation.type_id
+
 
 class WorkflowEventQueue:
     """Queue containing instances of WorkflowEvent.
@@ -174,6 +199,7 @@ class WorkflowEventQueue:
 
     def __init__(self):
         self._events = []
+        self._reindex()
 
     def __bool__(self):
         return bool(self._events)
@@ -181,14 +207,47 @@ class WorkflowEventQueue:
     def __len__(self):
         return len(self._events)
 
+    # NB: the queue can contain a lot of events (e.g. the batch process saves
+    #     the entities by pages of 1024); so we avoid to compare a new event
+    #     with all the queued events.
+    def _reindex(self) -> None:
+        self._hashable_events: set[WorkflowEvent] = set()
+        self._unhashable_events: list[WorkflowEvent] = []
+        # Events which can inhibit other events
+        self._inhibitors: list[WorkflowEvent] = []
+
+        for event in self._events:
+            self._index(event)
+
+    def _index(self, event: WorkflowEvent) -> None:
+        try:
+            self._hashable_events.add(event)
+        except TypeError:
+            self._unhashable_events.append(event)
+
+        if type(event).inhibits is not WorkflowEvent.inhibits:
+            self._inhibitors.append(event)
+
+    def _contains(self, event: WorkflowEvent) -> bool:
+        if any(event == queued for queued in self._unhashable_events):
+            return True
+
+        try:
+            return event in self._hashable_events
+        except TypeError:
+            return any(event == queued for queued in self._hashable_events)
+
     def append(self, event: WorkflowEvent) -> WorkflowEventQueue:
         """Append a new event:
             - if not already here.
             - if not inhibited by another event in the queue.
          """
-        events = self._events
-        if not any(event == queued or queued.inhibits(event) for queued in events):
-            events.append(event)
+        if not (
+            self._contains(event)
+            or any(queued.inhibits(event) for queued in self._inhibitors)
+        ):
+            self._events.append(event)
+            self._index(event)
 
         return self
 
@@ -200,6 +259,8 @@ class WorkflowEventQueue:
         """
         events = self._events
         self._events, picked = events[:start], events[start:]
+        if picked:
+            self._reindex()
 
         return picked
 
@@ -235,6 +296,16 @@ class WorkflowTrigger:
         """
         return self._activate(event) if isinstance(event, self.event_class) else None
 
+    def index_key(self) -> Hashable:
+        """Key used by the engine (see WorkflowIndex) to avoid calling
+        'activate()' with events which cannot activate this trigger.
+        Only the instances of 'event_class' which method 'index_key()' returns
+        the same key are passed to 'activate()'.
+        @return A hashable object, or <None> (default behaviour) if all the
+                instances of 'event_class' must be passed to 'activate()'.
+        """
+        return None
+
     @classmethod
     def config_formfield(cls, model: type[CremeEntity]) -> FormField:
         """Returns a form field which builds an instance of this trigger class.
@@ -967,6 +1038,107 @@ workflow_registry = WorkflowRegistry()
 
 
 # Engine -----------------------------------------------------------------------
+class WorkflowIndex:
+    """The enabled Workflows, grouped by the events which can activate their
+    triggers (see 'WorkflowTrigger.index_key()'); so an event is only passed
+    to the triggers which can match it, instead of all the triggers.
+
+    The instance is stored in the configuration cache (see the method 'get()')
+    & so it's shared by the requests; it's invalidated when a Workflow is
+    saved/deleted. The index only contains the IDs of the Workflows & is
+    immutable, so it's shared without being copied; the instances of Workflow
+    are retrieved when they are needed, once per request (see 'workflows()').
+    """
+    cache_key = 'creme_core-workflow_index'
+    instances_cache_key = 'creme_core-workflow_instances'
+
+    def __init__(self, workflows: Iterable[Workflow]):
+        # Structure: {event_class: {trigger_key: ((position, workflow_id), ...)}}
+        #   NB: the position is used to keep the order of the workflows.
+        workflow_ids: dict[type[WorkflowEvent], dict[Hashable, list]] = {}
+        instances = {}
+
+        for position, workflow in enumerate(workflows):
+            trigger = workflow.trigger
+
+            if isinstance(trigger, BrokenTrigger):
+                continue
+
+            workflow_ids.setdefault(
+                trigger.event_class, {},
+            ).setdefault(
+                trigger.index_key(), [],
+            ).append((position, workflow.id))
+            instances[workflow.id] = workflow
+
+        self._workflow_ids: dict[type[WorkflowEvent], dict[Hashable, tuple]] = {
+            event_cls: {key: tuple(ids) for key, ids in ids_per_key.items()}
+            for event_cls, ids_per_key in workflow_ids.items()
+        }
+
+        # NB: the given instances are used by the current request
+        get_per_request_cache().setdefault(self.instances_cache_key, {}).update(instances)
+
+    def __deepcopy__(self, memo):
+        # The instance is immutable (see 'config_cache.get()')
+        return self
+
+    @classmethod
+    def get(cls) -> WorkflowIndex:
+        """Get the index of the enabled Workflows (cached)."""
+        index = config_cache.get(cls.cache_key)
+
+        if index is None:
+            from ..models import Workflow
+
+            index = cls(Workflow.objects.filter(enabled=True).order_by('id'))
+            config_cache.set(cls.cache_key, index)
+
+        return index
+
+    def _get_instances(self, workflow_ids: Iterable[int]) -> dict[int, Workflow]:
+        instances = get_per_request_cache().setdefault(self.instances_cache_key, {})
+        missing_ids = [wf_id for wf_id in workflow_ids if wf_id not in instances]
+
+        if missing_ids:
+            from ..models import Workflow
+
+            instances.update(Workflow.objects.in_bulk(missing_ids))
+
+        return instances
+
+    def workflows(self, event: WorkflowEvent) -> list[Workflow]:
+        """Get the Workflows which trigger can be activated by an event."""
+        found = []
+        event_keys = []  # NB: the key is computed lazily (it can perform a query)
+
+        for event_cls in type(event).__mro__:
+            ids_per_key = self._workflow_ids.get(event_cls)
+
+            if ids_per_key:
+                found.extend(ids_per_key.get(None, ()))
+
+                if not event_keys:
+                    event_keys.append(event.index_key())
+
+                event_key = event_keys[0]
+                if event_key is not None:
+                    found.extend(ids_per_key.get(event_key, ()))
+
+        if not found:
+            return []
+
+        found.sort(key=lambda t: t[0])
+        instances = self._get_instances(wf_id for __, wf_id in found)
+
+        # NB: a Workflow could have been deleted meanwhile
+        return [
+            workflow
+            for __, wf_id in found
+            if (workflow := instances.get(wf_id)) is not None
+        ]
+
+
 class WorkflowEngine:
     """Class which runs the configured Workflows.
 
@@ -1029,10 +1201,10 @@ class WorkflowEngine:
                 logger.debug('WorkflowEngine: inspecting %s events', len(events))
 
                 engine._is_executing_actions = True
-                workflows = engine._workflows
+                index = WorkflowIndex.get()
 
                 for event in events:
-                    for workflow in workflows:
+                    for workflow in index.workflows(event):
                         trigger = workflow.trigger
                         ctxt = trigger.activate(event)
 
@@ -1075,7 +1247,6 @@ class WorkflowEngine:
     _is_executing_actions = False
 
     _queue: WorkflowEventQueue
-    _workflows: QuerySet  # QuerySet[Workflow]
 
     @classmethod
     def get_current(cls) -> WorkflowEngine:
@@ -1087,11 +1258,8 @@ class WorkflowEngine:
         cache_key = cls.cache_key
         wf = cache.get(cache_key)
         if wf is None:
-            from ..models import Workflow
-
             wf = cache[cache_key] = cls()
             wf._queue = WorkflowEventQueue()
-            wf._workflows = Workflow.objects.filter(enabled=True)
 
         return wf
 
@@ -1,5 +1,6 @@
 from .batch_process import batch_process_type
 from .deletor import deletor_type
+from .mass_export import mass_export_type
 from .mass_import import mass_import_type
 from .notification_emails_sender import notification_emails_sender_type
 from .reminder import reminder_type
@@ -13,6 +14,7 @@ jobs = (
     trash_cleaner_type,
     batch_process_type,
     mass_import_type,
+    mass_export_type,
     notification_emails_sender_type,
     reminder_type,
     sessions_cleaner_type,
@@ -28,6 +28,7 @@ from django.template.loader import get_template
 from django.utils.timezone import now
 
 from ..apps import CremeAppConfig
+from ..core.history import buffered_history
 from ..core.workflow import WorkflowEngine
 from ..gui.job import JobErrorsBrick
 from ..models import Job, JobResult
@@ -131,7 +132,8 @@ class JobType:
         status = Job.STATUS_OK
         error = None
         try:
-            self._execute(job)
+            with buffered_history():
+                self._execute(job)
         except Exception as e:
             logger.exception(e)
 
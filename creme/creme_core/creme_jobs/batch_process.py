@@ -17,11 +17,11 @@
 ################################################################################
 
 import logging
-from functools import partial
 
 # TODO: move in function to do lazy loading ?
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.db.models import signals
 from django.db.transaction import atomic
 from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
@@ -39,9 +39,26 @@ logger = logging.getLogger(__name__)
 
 
 class _BatchProcessType(JobType):
+    """Apply some BatchActions on all the entities of a type (which can be
+    filtered).
+
+    The entities are processed page by page: the entities of a page are
+    locked & retrieved with one query, modified in memory, & the results are
+    created with one query.
+
+    The modified entities which allow it (see CremeEntity.allows_bulk_save())
+    are saved with one query (see _bulk_save()) ; the signals "pre_save" &
+    "post_save" are sent anyway, so the history & the Workflows (& the other
+    signal handlers) work like with save(). If this bulk saving fails, these
+    entities are saved one by one.
+    The other entities are saved with save(), each one in its own savepoint,
+    so an error only cancels the changes of the related entity.
+    """
     id = JobType.generate_id('creme_core', 'batch_process')
     verbose_name = _('Batch process')
 
+    page_size = 1024
+
     def _get_actions(self, model, job_data):
         for kwargs in job_data['actions']:
             yield BatchAction(model, **kwargs)
@@ -79,6 +96,54 @@ class _BatchProcessType(JobType):
 
         return humanized
 
+    @staticmethod
+    def _bulk_save(model, entities, field_names):
+        """Save some existing entities with bulk_update().
+        @param model: Class inheriting CremeEntity.
+        @param entities: Instances of model.
+        @param field_names: Names of the (regular) fields which have been modified.
+        """
+        manager = model._default_manager
+        using = manager.db
+        update_fields = frozenset((*field_names, 'modified', 'header_filter_search_field'))
+        fields = [model._meta.get_field(fname) for fname in update_fields]
+
+        # NB: we follow the order of the operations of save()
+        for entity in entities:
+            entity.update_search_field()
+            signals.pre_save.send(
+                sender=model, instance=entity, raw=False, using=using,
+                update_fields=update_fields,
+            )
+
+            for field in fields:
+                # NB: updates the fields like "modified"
+                setattr(entity, field.attname, field.pre_save(entity, add=False))
+
+        manager.bulk_update(entities, fields=update_fields)
+
+        for entity in entities:
+            signals.post_save.send(
+                sender=model, instance=entity, created=False, raw=False, using=using,
+                update_fields=update_fields,
+            )
+
+    def _build_error_result(self, job, entity, error):
+        if isinstance(error, ValidationError):
+            messages = self._humanize_validation_error(entity, error)
+        else:
+            logger.exception('BatchProcess: error with the entity id=%s', entity.id)
+            messages = [str(error)]
+
+        return EntityJobResult(job=job, real_entity=entity, messages=messages)
+
+    @staticmethod
+    def _save(entity, wf_engine):
+        # NB: the savepoint ensures that an error only cancels the changes
+        #     related to this entity (& not the ones of the whole page).
+        with atomic(), wf_engine.run(user=None):
+            entity.save()
+
     def _execute(self, job):
         job_data = job.data
         model = self._get_model(job_data)
@@ -98,40 +163,94 @@ class _BatchProcessType(JobType):
 
         entities = EntityCredentials.filter(job.user, entities, EntityCredentials.CHANGE)
         paginator = FlowPaginator(
-            queryset=entities.order_by('id'), per_page=1024,
+            queryset=entities.order_by('id'), per_page=self.page_size,
         )
         actions = [*self._get_actions(model, job_data)]
-        create_result = partial(EntityJobResult.objects.create, job=job)
+        modified_fnames = {action.field_name for action in actions}
+        # NB: the other fields have not been modified, so we do not validate
+        #     them (it avoids some queries, to validate ForeignKeys for example).
+        excluded_fnames = [
+            field.name for field in model._meta.fields if field.name not in modified_fnames
+        ]
+        # NB: a uniqueness check which involves a unique field which has not
+        #     been modified cannot fail (the DB already guarantees that the
+        #     value is unique); it avoids a query per entity (UUID...).
+        #     The other checks are performed, even if they involve fields which
+        #     are not validated.
+        unique_excluded_fnames = [
+            field.name
+            for field in model._meta.fields
+            if field.unique and field.name not in modified_fnames
+        ]
         wf_engine = WorkflowEngine.get_current()
 
         for entities_page in paginator.pages():
-            for entity in entities_page.object_list:
-                if entity.id in already_processed:
-                    continue
+            entity_ids = [
+                entity.id
+                for entity in entities_page.object_list
+                if entity.id not in already_processed
+            ]
+            if not entity_ids:
+                continue
+
+            with atomic():
+                results = []
+                entities_to_bulk_save = []
+
+                for entity in model.objects.select_for_update().filter(
+                    id__in=entity_ids,
+                ).order_by('id'):
+                    try:
+                        changed = False
+
+                        for action in actions:
+                            if action(entity):
+                                changed = True
+
+                        if not changed:
+                            continue
+
+                        entity.full_clean(
+                            exclude=excluded_fnames,
+                            validate_unique=False, validate_constraints=False,
+                        )
+                        entity.validate_unique(exclude=unique_excluded_fnames)
+                        entity.validate_constraints()
+
+                        if entity.allows_bulk_save(modified_fnames):
+                            entities_to_bulk_save.append(entity)
+                            continue
 
-                changed = False
+                        self._save(entity, wf_engine)
+                    except Exception as e:
+                        results.append(self._build_error_result(job, entity, e))
+                    else:
+                        results.append(EntityJobResult(job=job, real_entity=entity))
 
-                with atomic(), wf_engine.run(user=None):
+                if entities_to_bulk_save:
                     try:
-                        final_entity = model.objects.select_for_update().get(id=entity.id)
-                    except model.DoesNotExist:
-                        continue
-
-                    for action in actions:
-                        if action(final_entity):
-                            changed = True
-
-                    if changed:
-                        try:
-                            final_entity.full_clean()
-                        except ValidationError as e:
-                            create_result(
-                                real_entity=final_entity,
-                                messages=self._humanize_validation_error(final_entity, e)
-                            )
-                        else:
-                            final_entity.save()
-                            create_result(real_entity=final_entity)
+                        with atomic(), wf_engine.run(user=None):
+                            self._bulk_save(model, entities_to_bulk_save, modified_fnames)
+                    except Exception:
+                        logger.exception(
+                            'BatchProcess: error when saving the entities in bulk '
+                            '=> they are saved one by one'
+                        )
+
+                        for entity in entities_to_bulk_save:
+                            try:
+                                self._save(entity, wf_engine)
+                            except Exception as e:
+                                results.append(self._build_error_result(job, entity, e))
+                            else:
+                                results.append(EntityJobResult(job=job, real_entity=entity))
+                    else:
+                        results.extend(
+                            EntityJobResult(job=job, real_entity=entity)
+                            for entity in entities_to_bulk_save
+                        )
+
+                EntityJobResult.objects.bulk_create(results)
 
     def progress(self, job):
         count = EntityJobResult.objects.filter(job=job).count()
@@ -0,0 +1,286 @@
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2026  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+import csv
+import logging
+from os.path import basename, join
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, HttpRequest, QueryDict
+from django.template.defaultfilters import slugify
+from django.utils.encoding import smart_str
+from django.utils.translation import gettext
+from django.utils.translation import gettext_lazy as _
+from django.utils.translation import ngettext
+
+from ..backends.csv_export import CSVExportBackend
+from ..constants import UUID_CHANNEL_JOBS
+from ..core.paginator import LastPage
+from ..models import FileRef, Job, Notification
+from ..models.history import _HLTEntityExport
+from ..models.utils import model_verbose_name_plural
+from ..notification import MassExportDoneContent
+from ..utils.file_handling import FileCreator
+from .base import JobProgress, JobType
+
+logger = logging.getLogger(__name__)
+
+
+class _MassExportType(JobType):
+    """Asynchronous version of the view <creme_core.views.mass_export.MassExport>.
+
+    The rows are written page by page in a CSV "spool" file, & the position in
+    the pagination is stored in the job's data after each page ; so if the job
+    manager is stopped (or crashes), the export is resumed from the last
+    written page instead of restarting from scratch.
+    When the job ends with an error, the spool is marked as temporary, so it
+    is removed by the temporary files cleaner if the export is not resumed
+    meanwhile (e.g. the job has been deleted).
+    When all the rows have been written, the spool is converted with the
+    wanted export backend (the spool is the final file with CSV backends).
+
+    Data of the job:
+        - "GET": the GET arguments of the view (URL-encoded string).
+        - "page": info of the next page to export (see FlowPage.info()) ;
+           None means "first page".
+        - "count": number of exported entities.
+        - "spool": ID of the FileRef used as spool.
+        - "spool_size": size of the spool which corresponds to the page info.
+        - "fileref": ID of the final FileRef.
+    """
+    id           = JobType.generate_id('creme_core', 'mass_export')
+    verbose_name = _('Mass export')
+
+    dir_parts = ('mass_export',)  # Sub-directory under settings.MEDIA_ROOT
+
+    def _build_GET(self, job_data):
+        return QueryDict(job_data['GET'])
+
+    def _get_view(self, job):
+        from ..views.mass_export import MassExport
+
+        request = HttpRequest()
+        request.GET = self._build_GET(job.data)
+        request.user = job.user
+
+        view = MassExport()
+        view.setup(request)
+
+        return view
+
+    def _update_data(self, job, **data):
+        job.data.update(data)
+        # NB: see JobType.execute() for the use of update()
+        Job.objects.filter(id=job.id).update(data=job.data)
+
+    def _get_spool(self, job, delimiter, header):
+        job_data = job.data
+        spool_id = job_data.get('spool')
+
+        if spool_id is not None:
+            try:
+                fileref = FileRef.objects.get(id=spool_id)
+            except FileRef.DoesNotExist:
+                logger.warning('MassExport: spool file of job %s has been removed', job.id)
+            else:
+                if fileref.temporary:  # The previous execution ended with an error
+                    FileRef.objects.filter(id=fileref.id).update(temporary=False)
+                    fileref.temporary = False
+
+                # The last page has not been entirely registered => we remove
+                # the beginning of this page.
+                with open(fileref.filedata.path, 'r+b') as f:
+                    f.truncate(job_data.get('spool_size', 0))
+
+                logger.info('MassExport: resuming job %s', job.id)
+
+                return fileref
+
+        dir_path = join(settings.MEDIA_ROOT, *self.dir_parts)
+        path = FileCreator(dir_path=dir_path, name=f'job-{job.id}.csv').create()
+        fileref = FileRef.objects.create(
+            user=job.user,
+            filedata='{}/{}'.format('/'.join(self.dir_parts), basename(path)),
+            description=gettext('Mass export'),
+            # NB: the spool must not be removed by the temporary files cleaner
+            #     while the job is paused (it becomes temporary when the
+            #     final file is produced, or when the job fails).
+            temporary=False,
+        )
+
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            csv.writer(f, quoting=csv.QUOTE_ALL, delimiter=delimiter).writerow(header)
+            size = f.tell()
+
+        self._update_data(job, spool=fileref.id, spool_size=size, page=None, count=0)
+
+        return fileref
+
+    def _release_spool(self, job):
+        spool_id = (job.data or {}).get('spool')
+
+        if spool_id is not None:
+            FileRef.objects.filter(id=spool_id).update(temporary=True)
+
+    def _execute(self, job):
+        try:
+            self._export(job)
+        except Exception:
+            self._release_spool(job)
+            raise
+
+    def _export(self, job):
+        view = self._get_view(job)
+
+        try:
+            backend_cls = view.get_backend_class()
+            ctype = view.get_ctype()
+            hf = view.get_header_filter()
+            efilter = view.get_entity_filter()
+        except Http404 as e:
+            raise self.Error(
+                gettext('The export cannot be performed anymore [{}]').format(e)
+            ) from e
+        except PermissionDenied as e:
+            raise self.Error(str(e)) from e
+
+        model = ctype.model_class()
+        cells = view.get_cells(header_filter=hf)
+        paginator = view.get_paginator(
+            queryset=view.get_queryset(model=model, cells=cells, efilter=efilter),
+            ordering=view.get_ordering(model=model, cells=cells),
+        )
+
+        is_csv = issubclass(backend_cls, CSVExportBackend)
+        delimiter = backend_cls.delimiter if is_csv else CSVExportBackend.delimiter
+        spool = self._get_spool(
+            job, delimiter=delimiter, header=[smart_str(cell.title) for cell in cells],
+        )
+        job_data = job.data
+        page_info = job_data['page']
+        count = job_data['count']
+
+        # TODO: option to stop if the page info is invalid (the entities have
+        #       been modified between the crash & the resuming)?
+        with open(spool.filedata.path, 'a', newline='', encoding='utf-8') as f:
+            writerow = csv.writer(f, quoting=csv.QUOTE_ALL, delimiter=delimiter).writerow
+
+            while True:
+                try:
+                    page = paginator.page(page_info)
+                except LastPage:
+                    break
+
+                for row in view.iter_page_rows(
+                    entities=page.object_list, header_filter=hf, cells=cells,
+                ):
+                    writerow(row)
+                    count += 1
+
+                f.flush()
+                page_info = page.next_page_info()
+                self._update_data(job, page=page_info, count=count, spool_size=f.tell())
+
+                if page_info is None:
+                    break
+
+        _HLTEntityExport.create_line(
+            ctype=ctype, user=job.user, count=count, hfilter=hf, efilter=efilter,
+        )
+
+        filename = slugify(ctype.model)
+        if is_csv:
+            spool.basename = f'{filename}.csv'
+            spool.temporary = True
+            spool.save()
+            fileref = spool
+        else:
+            backend = backend_cls()
+            writerow = backend.writerow
+
+            with open(spool.filedata.path, newline='', encoding='utf-8') as f:
+                for row in csv.reader(f, delimiter=delimiter):
+                    writerow(row)
+
+            backend.save(filename, job.user)
+            fileref = getattr(backend, 'fileref', None)
+            if fileref is None:
+                raise self.Error(
+                    f'The export backend "{backend_cls.id}" does not store a file.'
+                )
+
+            spool.filedata.delete(save=False)
+            spool.delete()
+
+        self._update_data(job, fileref=fileref.id)
+
+        Notification.objects.send(
+            channel=UUID_CHANNEL_JOBS,
+            users=[job.user],
+            content=MassExportDoneContent(instance=fileref),
+        )
+
+    def get_fileref(self, job):
+        "Get the exported file ; <None> if the job is not finished (or if the file is deleted)."
+        fileref_id = (job.data or {}).get('fileref')
+
+        return None if fileref_id is None else FileRef.objects.filter(id=fileref_id).first()
+
+    def progress(self, job):
+        count = (job.data or {}).get('count', 0)
+
+        return JobProgress(
+            percentage=None,
+            label=ngettext(
+                '{count} entity has been exported.',
+                '{count} entities have been exported.',
+                count
+            ).format(count=count),
+        )
+
+    def get_description(self, job):
+        try:
+            view = self._get_view(job)
+            desc = [
+                gettext('Export «{model}»').format(
+                    model=model_verbose_name_plural(view.get_ctype().model_class()),
+                ),
+                gettext('View: {}').format(view.get_header_filter()),
+            ]
+
+            efilter = view.get_entity_filter()
+            if efilter is not None:
+                desc.append(gettext('Filter: {}').format(efilter))
+        except Exception:
+            logger.exception('Error in _MassExportType.get_description')
+            desc = ['?']
+
+        return desc
+
+    def get_stats(self, job):
+        stats = []
+        fileref = self.get_fileref(job)
+
+        if fileref is not None:
+            stats.append(gettext('File: {}').format(fileref.basename))
+
+        return stats
+
+
+mass_export_type = _MassExportType()
@@ -17,10 +17,12 @@
 ################################################################################
 
 import logging
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
 
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import PermissionDenied
-from django.db.models import F, ProtectedError
+from django.db.models import PROTECT, RESTRICT, F, ForeignKey, ProtectedError
 from django.db.transaction import atomic
 from django.db.utils import NotSupportedError
 from django.utils.translation import gettext as _
@@ -30,9 +32,14 @@ from creme.creme_core.auth.entity_credentials import EntityCredentials
 
 from ..core.deletion import entity_deletor_registry
 from ..core.exceptions import ConflictError
-from ..core.paginator import FlowPaginator
 from ..gui.job import EntityJobErrorsBrick
-from ..models import CremeEntity, EntityJobResult, TrashCleaningCommand
+from ..models import (
+    CremeEntity,
+    EntityJobResult,
+    Relation,
+    TrashCleaningCommand,
+)
+from ..utils.chunktools import iter_as_chunk
 from .base import JobProgress, JobType
 
 logger = logging.getLogger(__name__)
@@ -44,17 +51,172 @@ class TrashCleanerJobErrorsBrick(EntityJobErrorsBrick):
     template_name = 'creme_core/bricks/trash-cleaner-errors.html'
 
 
+class TrashDeletionPlanner:
+    """Orders the deletion of the entities in the trash.
+
+    Some deleted entities can only be deleted after other ones:
+      - an entity which is referenced by another deleted entity through a
+        protecting ForeignKey (i.e. PROTECT/RESTRICT).
+      - an entity which is the subject of an internal relationship which
+        can only be removed by the deletion of the object entity.
+    These dependencies among all the deleted entities are retrieved up front
+    (one query per protecting ForeignKey & one query for the relationships),
+    & the entities are split in successive levels (topological sort):
+    the entities of a level only depend on the entities of the previous levels.
+    So the trash can be emptied in one pass, whatever the length of the
+    chains of dependencies.
+
+    Notice that the entities which are in a cycle of dependencies are put in
+    the last level (their deletion will fail).
+    """
+    def __init__(self, *, user, entity_classes: Iterable[type[CremeEntity]]):
+        """Constructor.
+        @param user: The entities which this user cannot delete are ignored.
+        @param entity_classes: Classes of the entities to delete.
+        """
+        self.user = user
+        self.entity_classes = [*entity_classes]
+
+    @staticmethod
+    def protecting_fields(model: type[CremeEntity]) -> list[ForeignKey]:
+        "Get the ForeignKeys which prevent the referenced entities from being deleted."
+        return [
+            field
+            for field in model._meta.get_fields()
+            if isinstance(field, ForeignKey)
+            and field.remote_field.on_delete in (PROTECT, RESTRICT)
+            and issubclass(field.related_model, CremeEntity)
+        ]
+
+    def levels(self) -> list[dict[type[CremeEntity], list[int]]]:
+        """Get the IDs of the entities to delete, level by level.
+        @return: A list of levels, each level being a dictionary with entity
+                 classes as keys & lists of IDs as values.
+        """
+        user = self.user
+        classes = {}  # Entity classes, by ID of entity
+
+        for entity_class in self.entity_classes:
+            classes.update(
+                (entity_id, entity_class)
+                for entity_id in EntityCredentials.filter(
+                    user,
+                    entity_class.objects.filter(is_deleted=True),
+                    EntityCredentials.DELETE,
+                ).order_by('id').values_list('id', flat=True)
+            )
+
+        # IDs of the entities which must be deleted after a given entity, by ID of entity
+        followers = defaultdict(list)
+        # Number of entities which must be deleted before a given entity, by ID of entity
+        blockers_counts = defaultdict(int)
+
+        def add_dependency(first_id, then_id):
+            if first_id != then_id and first_id in classes and then_id in classes:
+                followers[first_id].append(then_id)
+                blockers_counts[then_id] += 1
+
+        # An entity referenced by a protecting ForeignKey is deleted after
+        # the referencing entity.
+        for entity_class in self.entity_classes:
+            for field in self.protecting_fields(entity_class):
+                for entity_id, referenced_id in entity_class.objects.filter(
+                    is_deleted=True, **{f'{field.name}__is_deleted': True},
+                ).values_list('id', field.attname):
+                    add_dependency(entity_id, referenced_id)
+
+        # An internal relationship which cannot be deleted by its subject
+        # (see CremeEntity._DELETABLE_INTERNAL_RTYPE_IDS) but which can be
+        # deleted by its object (e.g. participants of an Activity) => the
+        # object is deleted before the subject.
+        deletable_rtype_ids = {
+            entity_class: {*entity_class._DELETABLE_INTERNAL_RTYPE_IDS}
+            for entity_class in self.entity_classes
+        }
+        all_deletable_rtype_ids = {
+            rtype_id
+            for rtype_ids in deletable_rtype_ids.values()
+            for rtype_id in rtype_ids
+        }
+
+        if all_deletable_rtype_ids:
+            for subject_id, rtype_id, sym_rtype_id, object_id in Relation.objects.filter(
+                type__is_internal=True,
+                type__symmetric_type__in=all_deletable_rtype_ids,
+                subject_entity__is_deleted=True,
+                object_entity__is_deleted=True,
+            ).values_list(
+                'subject_entity_id', 'type_id', 'type__symmetric_type_id', 'object_entity_id',
+            ):
+                subject_class = classes.get(subject_id)
+                object_class = classes.get(object_id)
+
+                if (
+                    subject_class is not None
+                    and object_class is not None
+                    and rtype_id not in deletable_rtype_ids[subject_class]
+                    and sym_rtype_id in deletable_rtype_ids[object_class]
+                ):
+                    add_dependency(object_id, subject_id)
+
+        levels = []
+        current_ids = [
+            entity_id for entity_id in classes if not blockers_counts[entity_id]
+        ]
+        planned_count = 0
+
+        while current_ids:
+            level = defaultdict(list)
+            next_ids = []
+
+            for entity_id in current_ids:
+                level[classes[entity_id]].append(entity_id)
+
+                for follower_id in followers[entity_id]:
+                    blockers_counts[follower_id] -= 1
+
+                    if not blockers_counts[follower_id]:
+                        next_ids.append(follower_id)
+
+            levels.append(level)
+            planned_count += len(current_ids)
+            current_ids = next_ids
+
+        if planned_count != len(classes):
+            # Cycles of dependencies
+            level = defaultdict(list)
+
+            for entity_id, entity_class in classes.items():
+                if blockers_counts[entity_id] > 0:
+                    level[entity_class].append(entity_id)
+
+            levels.append(level)
+
+        return levels
+
+    def batches(self, size: int = 256) -> Iterator[tuple[type[CremeEntity], list[int]]]:
+        """Get the IDs of the entities to delete, as ordered batches.
+        @param size: Maximum number of IDs in a batch.
+        @return: Iterator of tuples (entity class, list of IDs).
+        """
+        for level in self.levels():
+            for entity_class, entity_ids in level.items():
+                for ids_chunk in iter_as_chunk(entity_ids, size):
+                    yield entity_class, ids_chunk
+
+
 class _TrashCleanerType(JobType):
     id = JobType.generate_id('creme_core', 'trash_cleaner')
     verbose_name = gettext_lazy('Trash cleaner')
 
     deletor_registry = entity_deletor_registry
+    planner_class = TrashDeletionPlanner
+    batch_size = 256
 
     def _execute(self, job):
-        # NB 1: we try to delete the remaining entities (which could not be deleted
-        #       because of relationships) when there are errors, while the previous
-        #       iteration managed to remove some entities.
-        #       It will not work with cyclic references (but it is certainly very unusual).
+        # NB 1: the entities are deleted in an order which respects the links
+        #       between them (see TrashDeletionPlanner), so nearly all the
+        #       entities which can be deleted are deleted in the main pass.
         # NB 2: we do not use delete() method of queryset in order to send signals.
         user = job.user
         cmd_qs = TrashCleaningCommand.objects.filter(job=job)
@@ -74,93 +236,87 @@ class _TrashCleanerType(JobType):
             for ct in map(ContentType.objects.get_fresh_for_id, ctype_ids)
         ]
 
-        while True:
-            errors = False
-            progress = False
-
-            def create_error(entity, msg):
-                nonlocal errors
-                errors = True
-                EntityJobResult.objects.update_or_create(
-                    job=job,
-                    entity=entity,
-                    defaults={
-                        'entity_ctype': entity.entity_type,
-                        'messages': [msg],
-                    },
-                )
-
-            # NB: 'SELECT FOR UPDATE' in a query using an 'OUTER JOIN'
-            #       and nullable ids will fail with postgresql (both 9.6 & 10.x).
-            # TODO: This bug may be fixed in django > 2.2
-            #  (see https://code.djangoproject.com/ticket/28010)
-
-            # for entity_class in entity_classes:
-            #     paginator = FlowPaginator(
-            #         queryset=EntityCredentials.filter(
-            #             user,
-            #             entity_class.objects.filter(is_deleted=True),
-            #             EntityCredentials.DELETE,
-            #         ).order_by('id').select_for_update(),
-            #         per_page=256,
-            #     )
-            #
-            #     with atomic():
-            #         for entities_page in paginator.pages():
-            #             for entity in entities_page.object_list:
-            #                 entity = entity.get_real_entity()
-            for entity_class in entity_classes:
-                paginator = FlowPaginator(
-                    queryset=EntityCredentials.filter(
-                        user,
-                        entity_class.objects.filter(is_deleted=True),
-                        EntityCredentials.DELETE,
-                    ).order_by('id'),  # .select_for_update()
-                    per_page=256,
-                )
-
-                for entities_page in paginator.pages():
-                    with atomic():
-                        # NB (#60): Move 'SELECT FOR UPDATE' here for now (see above).
-                        for entity in entity_class.objects.filter(
-                            pk__in=entities_page.object_list
-                        ).select_for_update():
-                            deletor = self.deletor = self.deletor_registry.get(model=type(entity))
-                            if deletor is None:
-                                create_error(
-                                    entity,
-                                    _(
-                                        'This type of entity does not use the '
-                                        'generic deletion way.'
-                                    ),
-                                )
-                                continue
-
-                            try:
-                                deletor.check_permissions(user=user, entity=entity)
-                            except (PermissionDenied, ConflictError) as e:
-                                create_error(entity, e.args[0])
-                                continue
-
-                            try:
-                                deletor.perform(entity=entity, user=user)
-                            except ProtectedError:
-                                create_error(
-                                    entity,
-                                    _('Can not be deleted because of links with other entities.'),
-                                )
-                            except Exception as e:
-                                logger.exception('Error when trying to empty the trash')
-                                create_error(
-                                    entity,
-                                    _('Deletion caused an unexpected error [{}].').format(e),
-                                )
-                            else:
-                                progress = True
-                                cmd_qs.update(deleted_count=F('deleted_count') + 1)
-
-            if not errors or not progress:
-                break
+        def create_error(entity, msg):
+            EntityJobResult.objects.update_or_create(
+                job=job,
+                entity=entity,
+                defaults={
+                    'entity_ctype': entity.entity_type,
+                    'messages': [msg],
+                },
+            )
+
+        protection_msg = _('Can not be deleted because of links with other entities.')
+
+        def delete_batch(entity_class, entity_ids, protected_ids):
+            "Returns the number of deleted entities; the protected IDs are stored."
+            deleted_count = 0
+
+            with atomic():
+                # NB (#60): 'SELECT FOR UPDATE' in a query using an 'OUTER JOIN'
+                #           and nullable ids will fail with postgresql (both 9.6 & 10.x),
+                #           so the credentials are checked by the planner.
+                # NB: the entities which have been deleted meanwhile (by the
+                #     deletion of other entities) are ignored.
+                for entity in entity_class.objects.filter(
+                    pk__in=entity_ids,
+                ).order_by('id').select_for_update():
+                    deletor = self.deletor = self.deletor_registry.get(model=type(entity))
+                    if deletor is None:
+                        create_error(
+                            entity,
+                            _(
+                                'This type of entity does not use the '
+                                'generic deletion way.'
+                            ),
+                        )
+                        continue
+
+                    try:
+                        deletor.check_permissions(user=user, entity=entity)
+                    except (PermissionDenied, ConflictError) as e:
+                        create_error(entity, e.args[0])
+                        continue
+
+                    try:
+                        deletor.perform(entity=entity, user=user)
+                    except ProtectedError:
+                        protected_ids.append(entity.id)
+                    except Exception as e:
+                        logger.exception('Error when trying to empty the trash')
+                        create_error(
+                            entity,
+                            _('Deletion caused an unexpected error [{}].').format(e),
+                        )
+                    else:
+                        deleted_count += 1
+
+                if deleted_count:
+                    cmd_qs.update(deleted_count=F('deleted_count') + deleted_count)
+
+            return deleted_count
+
+        planner = self.planner_class(user=user, entity_classes=entity_classes)
+        protected = defaultdict(list)  # Entity class => IDs
+        deleted_count = 0
+
+        for entity_class, entity_ids in planner.batches(size=self.batch_size):
+            deleted_count += delete_batch(entity_class, entity_ids, protected[entity_class])
+
+        # The planner does not know all the links between entities (e.g. the
+        # entities linked by a custom ForeignKey, or created meanwhile); the
+        # entities which were protected by deleted entities are retried once.
+        if deleted_count:
+            retried = protected
+            protected = defaultdict(list)
+
+            for entity_class, entity_ids in retried.items():
+                for ids_chunk in iter_as_chunk(entity_ids, self.batch_size):
+                    delete_batch(entity_class, ids_chunk, protected[entity_class])
+
+        for entity_class, entity_ids in protected.items():
+            for entity in entity_class.objects.filter(pk__in=entity_ids):
+                create_error(entity, protection_msg)
 
     def progress(self, job):
         count = TrashCleaningCommand.objects.get(job=job).deleted_count
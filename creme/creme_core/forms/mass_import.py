@@ -20,7 +20,7 @@ from __future__ import annotations
 
 import logging
 from functools import partial
-from itertools import zip_longest
+from itertools import islice, zip_longest
 from os.path import splitext
 from typing import TYPE_CHECKING
 
@@ -74,9 +74,11 @@ from .widgets import (
 )
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Sequence
+    from collections.abc import Callable, Iterable, Iterator, Sequence
     from typing import Any, Optional, Tuple
 
+    from django.db.models import QuerySet
+
     Line = Sequence[str]
     ExtractedTuple = Tuple[Any, Optional[str]]
     ValueCastor = Callable[[str], Any]
@@ -168,15 +170,96 @@ class UploadForm(CremeForm):
 
 # Base Extractors (+ widget) ---------------------------------------------------
 
+class LookupCache:
+    """Cache for the instances searched by the extractors; the keys are the
+    values (i.e. strings) found in the imported file.
+
+    The instances are retrieved for a block of lines with one query (see
+    fill()) ; the values which are not found are not stored, so the extractors
+    perform their regular search for them (the database could find a value
+    the cache cannot, with a case-insensitive collation for example), & the
+    instances created during the import are found by this search.
+    """
+    def __init__(self, max_size: int = 10_000):
+        """Constructor.
+        @param max_size: Maximum number of stored values; the cache is emptied
+               when it would be exceeded.
+        """
+        self.max_size = max_size
+        self._instances: dict[str, list[Model]] = {}
+
+    def __len__(self):
+        return len(self._instances)
+
+    def clear(self) -> None:
+        self._instances.clear()
+
+    def get(self, value: str) -> list[Model] | None:
+        "@return The instances corresponding to the value, or None if it's unknown."
+        return self._instances.get(value)
+
+    def fill(self, queryset: QuerySet, field_name: str, values: Iterable[str]) -> None:
+        """Retrieve the instances corresponding to some values with one query.
+        @param queryset: Searched instances; if it is not ordered, the
+               instances are ordered by ID (like with QuerySet.first()).
+        @param field_name: Name of the searched field.
+        @param values: Searched values ; the empty & already known values are ignored.
+        """
+        instances = self._instances
+        values = {value for value in values if value and value not in instances}
+        if not values:
+            return
+
+        try:
+            field = queryset.model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            return
+
+        if len(instances) + len(values) > self.max_size:
+            instances.clear()
+
+        attname = field.attname
+        found: dict[str, list[Model]] = {}
+
+        try:
+            for instance in (
+                queryset if queryset.ordered else queryset.order_by('pk')
+            ).filter(**{f'{field_name}__in': values}):
+                found.setdefault(str(getattr(instance, attname)), []).append(instance)
+        except Exception as e:
+            # NB: the values are invalid (e.g. not integers for an IntegerField);
+            #     the regular search will build the error messages.
+            logger.info('LookupCache.fill(): %s', e)
+            return
+
+        for value in values:
+            instances_found = found.get(value)
+            if instances_found:
+                instances[value] = instances_found
+
+
 class BaseExtractor:
     def extract_value(self, line: Line, user) -> ExtractedTuple:
         raise NotImplementedError
 
+    def prefetch(self, lines: Sequence[Line], user) -> None:
+        """Retrieve the data needed by a block of lines, in order to reduce the
+        number of queries performed by extract_value() (does nothing by default).
+        """
+        pass
+
 
 class SingleColumnExtractor(BaseExtractor):
     def __init__(self, column_index: int):
         self._column_index = column_index
 
+    def _get_column_values(self, lines: Sequence[Line]) -> set[str]:
+        index = self._column_index
+        if not index:  # 0 -> not in csv
+            return set()
+
+        return {line[index - 1] for line in lines}
+
 
 class BaseExtractorWidget(Widget):
     def __init__(self, *args, **kwargs):
@@ -207,6 +290,7 @@ class RegularFieldExtractor(SingleColumnExtractor):
         self._fk_model: type[Model] | None = None
         self._m2m: bool | None = None
         self._fk_form: type[CremeModelForm] | None = None
+        self._lookup_cache = LookupCache()
 
     def set_subfield_search(self,
                             subfield_search: str,
@@ -219,6 +303,14 @@ class RegularFieldExtractor(SingleColumnExtractor):
         self._m2m = multiple
         self._fk_form = creation_form_class
 
+    def prefetch(self, lines, user):
+        if self._subfield_search:
+            self._lookup_cache.fill(
+                queryset=self._fk_model.objects.all(),
+                field_name=self._subfield_search,
+                values=self._get_column_values(lines),
+            )
+
     def extract_value(self, line, user) -> ExtractedTuple:
         value = self._default_value
         err_msg = None
@@ -228,6 +320,14 @@ class RegularFieldExtractor(SingleColumnExtractor):
 
             if line_value:
                 if self._subfield_search:
+                    cached = self._lookup_cache.get(line_value)
+                    if cached is not None:
+                        if self._m2m:
+                            return cached, None
+
+                        if len(cached) == 1:
+                            return cached[0], None
+
                     data = {self._subfield_search: line_value}
                     retriever = (
                         self._fk_model.objects.filter
@@ -553,8 +653,25 @@ class EntityExtractor(BaseExtractor):
     def __init__(self, extraction_cmds: list[EntityExtractionCommand]):
         "@params extraction_cmds: List of EntityExtractionCommands."
         self._commands = extraction_cmds
+        self._lookup_caches = [LookupCache() for __ in extraction_cmds]
+
+    def prefetch(self, lines, user):
+        for command, cache in zip(self._commands, self._lookup_caches):
+            index = command.column_index
 
-    def _extract_entity(self, line: Line, user, command: EntityExtractionCommand):
+            if index:
+                cache.fill(
+                    queryset=command.model.objects.all(),
+                    field_name=command.field_name,
+                    values={line[index - 1] for line in lines},
+                )
+
+    def _extract_entity(self,
+                        line: Line,
+                        user,
+                        command: EntityExtractionCommand,
+                        lookup_cache: LookupCache | None = None,
+                        ):
         index = command.column_index
 
         # TODO: manage credentials (linkable (& viewable ?))
@@ -565,6 +682,11 @@ class EntityExtractor(BaseExtractor):
         if not value:
             return None, None
 
+        if lookup_cache is not None:
+            cached = lookup_cache.get(value)
+            if cached is not None and len(cached) == 1:
+                return cached[0], None
+
         model = command.model
         error_msg = None
         extracted = None
@@ -608,8 +730,8 @@ class EntityExtractor(BaseExtractor):
         err_msg = None
         error_parts = []
 
-        for cmd in self._commands:
-            extracted, error_part = extract_entity(cmd)
+        for cmd, cache in zip(self._commands, self._lookup_caches):
+            extracted, error_part = extract_entity(cmd, cache)
 
             if extracted is not None:
                 break
@@ -777,12 +899,27 @@ class RelationExtractor(SingleColumnExtractor):
         self._related_form = modelform_factory(
             related_model, fields='__all__',
         ) if create_if_unfound else None
+        self._lookup_cache = LookupCache()
+        self._lookup_user_id = None  # The found entities depend on the credentials
 
     related_model = property(lambda self: self._related_model)
 
     def create_if_unfound(self):
         return self._related_form is not None
 
+    def prefetch(self, lines, user):
+        cache = self._lookup_cache
+
+        if self._lookup_user_id != user.id:
+            cache.clear()
+            self._lookup_user_id = user.id
+
+        cache.fill(
+            queryset=EntityCredentials.filter(user, self._related_model.objects.all()),
+            field_name=self._subfield_search,
+            values=self._get_column_values(lines),
+        )
+
     # TODO: link credentials
     # TODO: constraint on properties for relationtypes (wait for cache in RelationType)
     def extract_value(self, line, user):
@@ -791,6 +928,11 @@ class RelationExtractor(SingleColumnExtractor):
         value = line[self._column_index - 1]
 
         if value:
+            if user.id == self._lookup_user_id:
+                cached = self._lookup_cache.get(value)
+                if cached is not None:
+                    return (self._rtype, cached[0]), None
+
             data = {self._subfield_search: value}
             model = self._related_model
 
@@ -852,6 +994,10 @@ class MultiRelationsExtractor:
         for extractor in self._extractors:
             yield extractor.extract_value(line, user)
 
+    def prefetch(self, lines, user):
+        for extractor in self._extractors:
+            extractor.prefetch(lines, user)
+
     def __iter__(self):
         return iter(self._extractors)
 
@@ -1050,6 +1196,8 @@ class CustomFieldExtractor(SingleColumnExtractor):
 
         self._custom_field = custom_field
         self._create_if_unfound = create_if_unfound
+        # Keys are values in lower case; values are IDs of CustomFieldEnumValues
+        self._enum_ids: dict[str, int] = {}
 
         match self._custom_field.field_type:
             case CustomField.ENUM:
@@ -1059,6 +1207,19 @@ class CustomFieldExtractor(SingleColumnExtractor):
             case _:
                 self._manage_enum = None
 
+    def prefetch(self, lines, user):
+        if self._manage_enum and self._column_index:
+            # NB: the choices are retrieved again for each block, in order to
+            #     get the ones which have been created.
+            enum_ids = self._enum_ids
+            enum_ids.clear()
+
+            for enum_id, enum_value in CustomFieldEnumValue.objects.filter(
+                custom_field=self._custom_field,
+            ).order_by('-id').values_list('id', 'value'):
+                # NB: reversed order => the first choice overrides the next ones
+                enum_ids[enum_value.lower()] = enum_id
+
     def extract_value(self, line, user):
         value = self._default_value
         err_msg = None
@@ -1068,6 +1229,10 @@ class CustomFieldExtractor(SingleColumnExtractor):
 
             if line_value:
                 if self._manage_enum:
+                    enum_id = self._enum_ids.get(line_value.lower())
+                    if enum_id is not None:
+                        return self._manage_enum(enum_id), err_msg
+
                     enum_value = CustomFieldEnumValue.objects.filter(
                         custom_field=self._custom_field,
                         value__iexact=line_value,
@@ -1252,6 +1417,10 @@ class ImportForm(CremeModelForm):
     ]  # Overridden by factory
     header_dict: dict[str, int] = {}  # Idem
 
+    # The lines are read by blocks of this size; the extractors retrieve the
+    # instances referenced by a block with few queries (see _prefetch_lines()).
+    lines_block_size = 256
+
     blocks = FieldBlockManager(
         {
             'id': 'general',
@@ -1341,6 +1510,23 @@ class ImportForm(CremeModelForm):
     def _pre_instance_save(self, instance, line):  # Overload me
         pass
 
+    def _prefetch_lines(self, lines: Sequence[Line]) -> None:
+        "Call the method prefetch() of the extractors for a block of lines."
+        user = self.user
+
+        for value in self.cleaned_data.values():
+            if isinstance(value, BaseExtractor):
+                value.prefetch(lines=lines, user=user)
+
+    def _iter_lines(self, lines: Iterable[Line]) -> Iterator[Line]:
+        "Iterate over the not-empty lines, which are prefetched block by block."
+        lines = filter(None, lines)
+        block_size = self.lines_block_size
+
+        while block := [*islice(lines, block_size)]:
+            self._prefetch_lines(block)
+            yield from block
+
     def process(self, job: Job):
         model_class = self._meta.model
         get_cleaned = self.cleaned_data.get
@@ -1394,7 +1580,7 @@ class ImportForm(CremeModelForm):
             def is_empty_value(s):
                 return s is None or isinstance(s, str) and not s.strip()
 
-            for i, line in enumerate(filter(None, lines), start=1):
+            for line in self._iter_lines(lines):
                 job_result = MassImportJobResult(job=job, line=line)
 
                 try:
@@ -1569,6 +1755,13 @@ class ImportForm4CremeEntity(ImportForm):
 
         return extractors
 
+    def _prefetch_lines(self, lines):
+        super()._prefetch_lines(lines)
+
+        # NB: the relationships are built with the owner of the entities
+        #     (see _post_instance_creation()).
+        self.cleaned_data['dyn_relations'].prefetch(lines=lines, user=self.cleaned_data['user'])
+
     def _find_existing_instances(self, model, field_names, extracted_values):
         qs = super()._find_existing_instances(
             model=model, field_names=field_names,
@@ -52,6 +52,15 @@ def set_global_info(**kwargs) -> None:
     _globals[current_thread()].update(kwargs)
 
 
+def copy_global_info() -> dict:
+    """Get a (shallow) copy of the global values of the current thread ; it's
+    useful to pass them to another thread (see set_global_info()).
+
+    @return A dictionary.
+    """
+    return {**_globals.get(current_thread(), {})}
+
+
 def clear_global_info() -> None:
     # Don't use del _globals[current_thread()], it causes problems with dev server.
     _globals.pop(current_thread(), None)
@@ -0,0 +1,248 @@
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2026  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+from __future__ import annotations
+
+import json
+import logging
+from hashlib import sha1
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.db.models import Model
+from django.utils.timezone import get_current_timezone_name
+from django.utils.translation import get_language
+
+from .. import models as core_models
+from ..core.token_cache import (
+    TokenCache,
+    concrete_models,
+    watch_m2m,
+    watch_models,
+)
+from .bricks import Brick, BrickManager
+
+if TYPE_CHECKING:
+    from django.core.cache.backends.base import BaseCache
+
+logger = logging.getLogger(__name__)
+
+
+class BrickCache:
+    """Cache for the HTML of the bricks which set their attribute
+    'fragment_cache' to True; it avoids rendering again the bricks which have
+    not changed between 2 displays of a page (or 2 reloadings).
+
+    The HTML is stored in a Django's cache (see the settings
+    "BRICKS_CACHE_ALIAS" & "BRICKS_CACHE_TIMEOUT"). The key of a fragment
+    contains:
+      - the brick's ID & the render method (detail-view, home).
+      - the ID & the modification date of the displayed entity (if any).
+      - the user & its permissions (role, superuser, staff, teams).
+      - the state (BrickState) & the context (pagination...) of the brick.
+      - the reloading information, the language, the time zone.
+      - a token per model in the brick's dependencies (a token per
+        RelationType for the model Relation if 'relation_type_deps' is set);
+        the tokens are renewed when an instance of the model is
+        created/modified/deleted (see the signal handlers at the end of the
+        module & 'creme_core.core.token_cache').
+      - a global token, renewed when the credentials or the configuration of
+        the fields are modified.
+
+    So a brick must only use the cache if its content only depends on these
+    information ; the bricks with the wildcard dependencies ("*") are never
+    cached.
+
+    Notice that modifications which do not send signals (e.g. QuerySet.update())
+    are not detected ; so use a timeout if you use such things.
+    """
+    key_prefix = 'creme_core-brick'
+
+    # Modifying an instance of these models invalidates all the fragments
+    global_models: list[type[Model]] = [
+        core_models.UserRole,
+        core_models.SetCredentials,
+        core_models.FieldsConfig,
+        core_models.CustomField,
+        core_models.SettingValue,
+    ]
+
+    tokens = TokenCache(key_prefix=key_prefix, alias_setting='BRICKS_CACHE_ALIAS')
+
+    @property
+    def cache(self) -> BaseCache | None:
+        "Get the Django's cache which is used; <None> means the cache is disabled."
+        return self.tokens.cache
+
+    @staticmethod
+    def _model_token_name(model: type[Model]) -> str:
+        return f'model-{model._meta.label_lower}'
+
+    def _get_token_names(self, brick: Brick) -> list[str] | None:
+        dependencies = brick.dependencies
+        if not isinstance(dependencies, list | tuple):  # i.e. '*'
+            return None
+
+        names = ['global']
+        model_token_name = self._model_token_name
+
+        for model in dependencies:
+            if model == core_models.Relation and brick.relation_type_deps:
+                names.extend(f'rtype-{rtype_id}' for rtype_id in brick.relation_type_deps)
+            else:
+                names.append(model_token_name(model))
+
+        return names
+
+    @staticmethod
+    def _user_signature(user) -> str:
+        # NB: the teams change the credentials (entities owned by a team...)
+        teams = ','.join(sorted(str(team.id) for team in user.teams))
+
+        return f'{user.id}-{user.role_id}-{int(user.is_superuser)}-{int(user.is_staff)}-{teams}'
+
+    def _build_key(self, *,
+                   cache: BaseCache,
+                   brick: Brick,
+                   method: str,
+                   context: dict,
+                   ) -> str | None:
+        token_names = self._get_token_names(brick)
+        if token_names is None:
+            return None
+
+        user = context['user']
+        request = context['request']
+        base_url = request.GET.get('base_url', request.path)
+
+        entity = context.get('object')
+        entity_signature = (
+            f'{entity.id}-{entity.modified.isoformat()}'
+            if isinstance(entity, core_models.CremeEntity) and entity.modified else
+            ''
+        )
+
+        state = BrickManager.get(context).get_state(brick.id, user)
+
+        try:
+            brick_context = request.session['brickcontexts_manager'][base_url][brick.id]
+        except KeyError:
+            brick_context = None
+
+        try:
+            signature = json.dumps(
+                [
+                    self.tokens.get_many(cache, token_names),
+                    method, entity_signature, self._user_signature(user),
+                    state.is_open, state.show_empty_fields, state.json_extra_data,
+                    base_url, brick_context, brick.reloading_info,
+                    get_language(), get_current_timezone_name(),
+                ],
+                sort_keys=True,
+            )
+        except TypeError as e:
+            logger.debug('BrickCache: the key of the brick %s cannot be built (%s)', brick.id, e)
+            return None
+
+        # NB: the brick's ID is hashed too, because it can contain characters
+        #     which are forbidden by some backends (e.g. spaces with memcached).
+        return f'{self.key_prefix}-{sha1(f"{brick.id}#{signature}".encode()).hexdigest()}'
+
+    def render(self, *, brick: Brick, method: str, context: dict) -> str:
+        """Render a brick ; the HTML is retrieved from the cache if it's possible.
+        @param brick: Instance of Brick.
+        @param method: Name of the render method (e.g. "detailview_display").
+        @param context: Template context (as a dictionary).
+        @return: HTML string.
+        """
+        render = getattr(brick, method)
+
+        cache = self.cache if brick.fragment_cache else None
+        key = None if cache is None else self._build_key(
+            cache=cache, brick=brick, method=method, context=context,
+        )
+
+        if key is None:
+            return render(context)
+
+        html = cache.get(key)
+
+        if html is None:
+            html = render(context)
+            cache.set(key, html, timeout=settings.BRICKS_CACHE_TIMEOUT)
+        else:
+            logger.debug('BrickCache: the brick %s is retrieved from the cache', brick.id)
+
+        return html
+
+    @classmethod
+    def invalidate_models(cls, *models: type[Model]) -> None:
+        "Invalidate the fragments of the bricks which depend on some models."
+        cls.tokens.renew(*map(cls._model_token_name, models))
+
+    @classmethod
+    def invalidate_relation_type(cls, rtype_id: str) -> None:
+        "Invalidate the fragments of the bricks which depend on a RelationType (ID)."
+        cls.tokens.renew(
+            cls._model_token_name(core_models.Relation), f'rtype-{rtype_id}',
+        )
+
+    @classmethod
+    def invalidate_all(cls) -> None:
+        "Invalidate all the fragments."
+        cls.tokens.renew('global')
+
+
+brick_cache = BrickCache()
+
+
+def _invalidate_bricks(sender, instance, **kwargs):
+    if not settings.BRICKS_CACHE_ALIAS:
+        return
+
+    if isinstance(instance, core_models.Relation):
+        BrickCache.invalidate_relation_type(instance.type_id)
+    elif isinstance(instance, tuple(BrickCache.global_models)):
+        BrickCache.invalidate_all()
+    elif type(instance) is core_models.CremeEntity:
+        # NB: save() of the base class (e.g. CremeEntity.trash())
+        BrickCache.invalidate_models(
+            core_models.CremeEntity, instance.entity_type.model_class(),
+        )
+    else:
+        BrickCache.invalidate_models(sender)
+
+
+def _invalidate_bricks_on_m2m(sender, instance, action, model, **kwargs):
+    if action.startswith('post_') and settings.BRICKS_CACHE_ALIAS:
+        BrickCache.invalidate_models(type(instance), model)
+
+
+def connect_signal_handlers() -> None:
+    """Connect the signal handlers which invalidate the fragments; it's called
+    when all the apps are ready (the models must be loaded).
+    """
+    # NB: any model can be a dependency of a brick
+    models = concrete_models(Model)
+    watch_models(
+        _invalidate_bricks, models=models, dispatch_uid='creme_core-invalidate_bricks_cache',
+    )
+    watch_m2m(
+        _invalidate_bricks_on_m2m,
+        models=models, dispatch_uid='creme_core-invalidate_bricks_cache_on_m2m',
+    )
@@ -0,0 +1,269 @@
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2026  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Iterable
+from concurrent import futures
+from functools import cache
+from time import monotonic
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.template.loader import get_template
+from django.utils import timezone, translation
+
+from ..global_info import clear_global_info, copy_global_info, set_global_info
+from .brick_cache import brick_cache
+from .bricks import Brick, BrickManager
+
+logger = logging.getLogger(__name__)
+
+# Used to know if the current thread is a worker (the bricks rendered by a
+# worker are not rendered concurrently, to avoid dead-locks in the pool).
+_worker_local = threading.local()
+
+
+@cache
+def _get_executor(max_workers: int) -> futures.ThreadPoolExecutor:
+    return futures.ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix='creme-bricks',
+    )
+
+
+class _Rendering:
+    "Rendering of a brick which has been submitted to the pool of workers."
+    def __init__(self, *, deadline: float):
+        # The rendering must be started before this time (see monotonic())
+        self.deadline = deadline
+        self.started = threading.Event()
+        self.start_time = 0.0
+        self.future: futures.Future | None = None
+
+
+def _render_in_worker(*,
+                      rendering: _Rendering,
+                      brick: Brick,
+                      method: str,
+                      context: dict,
+                      global_info: dict,
+                      language: str | None,
+                      tz,
+                      ) -> str | None:
+    rendering.start_time = start_time = monotonic()
+    rendering.started.set()
+
+    if start_time > rendering.deadline:
+        # The brick has waited in the queue for too long; the request's thread
+        # renders it by itself (so the pool is not overloaded by old pages).
+        return None
+
+    _worker_local.active = True
+
+    # NB: each worker gets its own per-request cache (the values which were
+    #     cached before the submission are shared).
+    per_request_cache = global_info.get('per_request_cache')
+    set_global_info(**{
+        **global_info,
+        'per_request_cache': {} if per_request_cache is None else {**per_request_cache},
+    })
+
+    # NB: the connections to the DB are per-thread; we manage them like
+    #     Django does at the beginning/end of a request (see CONN_MAX_AGE).
+    close_old_connections()
+
+    try:
+        with translation.override(language), timezone.override(tz):
+            return brick_cache.render(brick=brick, method=method, context=context)
+    finally:
+        close_old_connections()
+        clear_global_info()
+
+
+class ConcurrentBricksRenderer:
+    """Render the bricks of a page concurrently, with a pool of threads.
+
+    The renderings of all the bricks declared in the page (see the template
+    tags {% brick_import %} & {% brick_declare %}) are started when the first
+    brick is displayed (see {% brick_display %}) ; so a page costs roughly the
+    time of its slowest brick, instead of the sum of the times of its bricks.
+
+    Each worker uses its own connection to the DB, the language & the time zone
+    of the request, and a copy of the global information of the request's
+    thread (user, per-request cache...).
+    The timeout (see the setting "BRICKS_RENDERING_TIMEOUT") is used in 2 ways:
+      - a brick which is still waiting for a free worker after this delay is
+        rendered by the request's thread (like when the concurrent rendering
+        is disabled).
+      - when the rendering of a brick takes more time than this delay (since
+        its start), a placeholder is displayed instead ; the browser loads the
+        brick with the reloading view afterwards. Notice that the worker
+        continues the rendering (a thread cannot be stopped), so the timeout
+        should be large enough to only stop pathological bricks.
+
+    Notice that the bricks get a copy of the template context of the first
+    {% brick_display %} ; so they must not use variables which are set between
+    the different calls to {% brick_display %} (e.g. with {% with %}).
+
+    BEWARE: the objects of the context (the user, the entity of a detail-view,
+    the values cached before the submission in the per-request cache...) are
+    shared by the bricks which are rendered concurrently. The bricks must not
+    modify these objects (fields, relationships...) ; filling their lazy caches
+    (e.g. prefetched data, credentials, real entity) is OK, because all the
+    workers compute the same values. A brick which needs to modify an object
+    must work on its own instance (e.g. retrieved from the DB).
+    """
+    placeholder_template_name = 'creme_core/bricks/generic/deferred.html'
+
+    def __init__(self, *, executor: futures.Executor, timeout: float):
+        self._executor = executor
+        self.timeout = timeout
+
+        self._submitted: set[tuple[str, str]] = set()
+        # Key: (brick ID, method)
+        self._renderings: dict[tuple[str, str], _Rendering] = {}
+
+    @classmethod
+    def get(cls, context) -> ConcurrentBricksRenderer | None:
+        """Get the renderer of the page (it's stored in the BrickManager).
+        @param context: Template context.
+        @return: An instance of ConcurrentBricksRenderer, or <None> if the
+                 concurrent rendering is disabled (see the setting
+                 "BRICKS_RENDERING_WORKERS"), or if we are already in a worker.
+        """
+        workers = settings.BRICKS_RENDERING_WORKERS
+        if workers <= 0 or getattr(_worker_local, 'active', False):
+            return None
+
+        bricks_manager = BrickManager.get(context)
+        renderer = bricks_manager.concurrent_renderer
+
+        if renderer is None:
+            renderer = bricks_manager.concurrent_renderer = cls(
+                executor=_get_executor(workers),
+                timeout=settings.BRICKS_RENDERING_TIMEOUT,
+            )
+
+        return renderer
+
+    @staticmethod
+    def _prepare(bricks: list[Brick], context: dict) -> None:
+        "Fill the lazy caches of the request's thread, which are shared with the workers."
+        user = context.get('user')
+        if user is not None:
+            # NB: the states of all the declared bricks are retrieved at once.
+            BrickManager.get(context).get_state(bricks[0].id, user)
+
+        request = context.get('request')
+        if request is not None:
+            request.session.get('brickcontexts_manager')  # Loads the session
+
+    def submit(self, *, bricks: Iterable[Brick], method: str, context: dict) -> None:
+        """Start the rendering of some bricks (the bricks which have already
+        been submitted are ignored).
+        @param bricks: Instances of Brick.
+        @param method: Name of the render method (e.g. "detailview_display").
+        @param context: Template context (as a dictionary).
+        """
+        submitted = self._submitted
+        bricks = [
+            brick
+            for brick in bricks
+            if (brick.id, method) not in submitted and hasattr(brick, method)
+        ]
+        if not bricks:
+            return
+
+        self._prepare(bricks, context)
+
+        submit = self._executor.submit
+        global_info = copy_global_info()
+        language = translation.get_language()
+        tz = timezone.get_current_timezone()
+        deadline = monotonic() + self.timeout
+
+        for brick in bricks:
+            key = (brick.id, method)
+            submitted.add(key)
+            self._renderings[key] = rendering = _Rendering(deadline=deadline)
+            rendering.future = submit(
+                _render_in_worker,
+                rendering=rendering,
+                brick=brick, method=method,
+                # NB: the context is copied in order to get a 'fresh' one
+                #     for each brick
+                context={**context},
+                global_info=global_info, language=language, tz=tz,
+            )
+
+    def render_placeholder(self, brick: Brick, context: dict) -> str:
+        return get_template(self.placeholder_template_name).render({
+            **context,
+            'brick_id': brick.id,
+            'verbose_name': brick.verbose_name,
+            'reloading_info': brick.reloading_info,
+        })
+
+    def render(self, *, brick: Brick, method: str, context: dict) -> str:
+        """Get the HTML of a brick ; if the brick has not been submitted, it's
+        rendered in the current thread.
+        @param brick: Instance of Brick.
+        @param method: Name of the render method (e.g. "detailview_display").
+        @param context: Template context (as a dictionary).
+        @return: HTML string.
+        """
+        try:
+            rendering = self._renderings.pop((brick.id, method))
+        except KeyError:
+            return brick_cache.render(brick=brick, method=method, context=context)
+
+        future = rendering.future
+        started = rendering.started
+
+        if not started.wait(timeout=max(0.0, rendering.deadline - monotonic())):
+            if future.cancel():
+                logger.info(
+                    'ConcurrentBricksRenderer: no worker is available for the '
+                    'brick "%s"; it is rendered by the current thread.',
+                    brick.id,
+                )
+
+                return brick_cache.render(brick=brick, method=method, context=context)
+
+            # The rendering has just been started
+            started.wait()
+
+        try:
+            html = future.result(
+                timeout=max(0.0, rendering.start_time + self.timeout - monotonic()),
+            )
+        except futures.TimeoutError:
+            logger.warning(
+                'ConcurrentBricksRenderer: the rendering of the brick "%s" has '
+                'timed out; it will be loaded by the browser.',
+                brick.id,
+            )
+
+            return self.render_placeholder(brick, context)
+
+        if html is None:  # The worker has started too late
+            return brick_cache.render(brick=brick, method=method, context=context)
+
+        return html
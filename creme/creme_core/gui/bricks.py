@@ -172,6 +172,13 @@ class Brick:
     # An empty value (like the default empty string) means "No special permission required".
     permissions: str | Collection[str] = ''
 
+    # True means that the HTML of the brick can be stored in a cache
+    # (see 'creme_core.gui.brick_cache.BrickCache' to know when a fragment is
+    # invalidated) ; use it only if the content of the brick only depends on
+    # the displayed entity, the user, the state/context of the brick & the
+    # instances of the models in 'dependencies'.
+    fragment_cache: bool = False
+
     GENERIC_HAT_BRICK_ID: str = 'hat'
 
     def __init__(self):
@@ -714,6 +721,9 @@ class BrickManager:
         self._used_relationtypes: set[str] | None = None
         self._state_cache: dict[str, BrickState] | None = None
 
+        # See 'creme_core.gui.brick_rendering.ConcurrentBricksRenderer'
+        self.concurrent_renderer = None
+
     def add_group(self, group_name: str, *bricks: Brick) -> None:
         group = self._bricks_groups[group_name]
         if group:
@@ -1,5 +1,6 @@
 from .aggregator import ListViewAggregatorRegistry, aggregator_registry  # NOQA
 from .buttons import *  # NOQA
+from .count import EntitiesCount, counter_classes  # NOQA
 from .search import ListViewSearchFieldRegistry, search_field_registry  # NOQA
 from .smart_columns import smart_columns_registry  # NOQA
 from .state import ListViewState, NoHeaderFilterAvailable  # NOQA
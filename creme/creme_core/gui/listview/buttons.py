@@ -1,6 +1,6 @@
 ################################################################################
 #    Creme is a free/open-source Customer Relationship Management software
-#    Copyright (C) 2019-2025  Hybird
+#    Copyright (C) 2019-2026  Hybird
 #
 #    This program is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU Affero General Public License as published by
@@ -35,7 +35,8 @@ __all__ = (
     'ListViewButton',
     'BatchProcessButton',
     'CreationButton',
-    'MassExportButton', 'MassExportHeaderButton', 'MassImportButton',
+    'MassExportButton', 'MassExportHeaderButton', 'MassExportJobButton',
+    'MassImportButton',
     'VisitorModeButton',
     'ListViewButtonList',
 )
@@ -115,6 +116,14 @@ class MassExportHeaderButton(MassExportButton):
     template_name = 'creme_core/listview/buttons/mass-export-header.html'
 
 
+class MassExportJobButton(MassExportButton):
+    """Export the content of the list in a job (useful for big lists).
+    It's not used by default; add it to the attribute "button_classes" of
+    your list-views (or use get_buttons()).
+    """
+    template_name = 'creme_core/listview/buttons/mass-export-job.html'
+
+
 class MassImportButton(ListViewButton):
     template_name = 'creme_core/listview/buttons/mass-import.html'
 
@@ -0,0 +1,246 @@
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2026  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+"""Strategies to count the entities displayed by a list-view.
+
+The COUNT query (with the credentials, the filter & the search) is often the
+slowest query of a list-view with a lot of entities; the strategies avoid to
+perform it at each display/page change:
+ - ExactCounter: the query is performed each time (historical behaviour).
+ - CachedCounter: the exact counts are stored in a Django's cache.
+ - EstimatedCounter: the row estimate of the database planner is used for big
+   lists (PostgreSQL only).
+
+The strategy is chosen with the setting "LISTVIEW_COUNT_MODE".
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass
+from hashlib import sha1
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import connections
+
+from creme.creme_core import models as core_models
+from creme.creme_core.core.token_cache import (
+    TokenCache,
+    concrete_models,
+    watch_m2m,
+    watch_models,
+)
+
+if TYPE_CHECKING:
+    from django.core.cache.backends.base import BaseCache
+    from django.db.models import QuerySet
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, kw_only=True)
+class EntitiesCount:
+    """Number of entities in a list-view."""
+    value: int
+    # <True> means the value comes from the planner's estimate
+    estimated: bool = False
+
+
+class ExactCounter:
+    """Count the entities with a COUNT query each time."""
+    def count(self, queryset: QuerySet, *,
+              model: type[core_models.CremeEntity],
+              ) -> EntitiesCount:
+        """Count the entities of a list-view.
+        @param queryset: QuerySet (with credentials, filters...) to count;
+               notice that its model can be CremeEntity (optimisation to
+               avoid a JOIN).
+        @param model: Model of the list-view.
+        """
+        return EntitiesCount(value=queryset.count())
+
+
+class CachedCounter(ExactCounter):
+    """Count the entities with a COUNT query, & store the result in a Django's
+    cache (see the settings "LISTVIEW_COUNT_CACHE_ALIAS" &
+    "LISTVIEW_COUNT_CACHE_TIMEOUT").
+
+    The key of a count is built from the SQL of the queryset, so it contains
+    the credentials of the user, the filter, the search... (users with the same
+    credentials share their counts).
+    The key contains a token per ContentType too, renewed when an entity of
+    this type is created/modified/deleted (or one of its relationships,
+    properties...) ; see the signal handlers at the end of the module &
+    'creme_core.core.token_cache'.
+
+    Notice that modifications which do not send signals (e.g. QuerySet.update())
+    are not detected ; so keep a short timeout.
+    """
+    key_prefix = 'creme_core-listview_count'
+    tokens = TokenCache(key_prefix=key_prefix, alias_setting='LISTVIEW_COUNT_CACHE_ALIAS')
+
+    @property
+    def cache(self) -> BaseCache | None:
+        "Get the Django's cache which is used; <None> means the cache is disabled."
+        return self.tokens.cache
+
+    def _build_key(self, *,
+                   cache: BaseCache,
+                   queryset: QuerySet,
+                   model: type[core_models.CremeEntity],
+                   ) -> str | None:
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except Exception as e:  # e.g. EmptyResultSet
+            logger.debug('CachedCounter: the SQL query cannot be built (%s)', e)
+            return None
+
+        ctype_id = ContentType.objects.get_for_model(model).id
+        signature = json.dumps([
+            *self.tokens.get_many(cache, ['global', f'ctype-{ctype_id}']),
+            queryset.db, sql, [str(param) for param in params],
+        ])
+
+        return f'{self.key_prefix}-{ctype_id}-{sha1(signature.encode()).hexdigest()}'
+
+    def count(self, queryset, *, model):
+        cache = self.cache
+        key = None if cache is None else self._build_key(
+            cache=cache, queryset=queryset, model=model,
+        )
+
+        if key is None:
+            return super().count(queryset, model=model)
+
+        value = cache.get(key)
+
+        if value is None:
+            value = super().count(queryset, model=model).value
+            cache.set(key, value, timeout=settings.LISTVIEW_COUNT_CACHE_TIMEOUT)
+
+        return EntitiesCount(value=value)
+
+    @classmethod
+    def invalidate_ctype(cls, ctype_id: int) -> None:
+        "Invalidate the counts related to a ContentType (ID)."
+        cls.tokens.renew(f'ctype-{ctype_id}')
+
+    @classmethod
+    def invalidate_all(cls) -> None:
+        "Invalidate all the counts."
+        cls.tokens.renew('global')
+
+
+class EstimatedCounter(CachedCounter):
+    """Use the row estimate of the database planner when it reaches the
+    setting "FAST_QUERY_MODE_THRESHOLD" (the exact value has few interest for
+    such big lists); the smaller lists are counted like with CachedCounter.
+
+    Only PostgreSQL is supported currently; with the other DBMS the behaviour
+    is the one of CachedCounter.
+    """
+    def estimate(self, queryset: QuerySet) -> int | None:
+        "Get the planner's estimate for the queryset (<None> if not available)."
+        if connections[queryset.db].vendor != 'postgresql':
+            return None
+
+        try:
+            plan = json.loads(queryset.explain(format='json'))
+            if isinstance(plan, list):
+                plan = plan[0]
+
+            return int(plan['Plan']['Plan Rows'])
+        except Exception as e:
+            logger.warning('EstimatedCounter: the estimate is not available (%s)', e)
+            return None
+
+    def count(self, queryset, *, model):
+        estimate = self.estimate(queryset)
+
+        if estimate is not None and estimate >= settings.FAST_QUERY_MODE_THRESHOLD:
+            return EntitiesCount(value=estimate, estimated=True)
+
+        return super().count(queryset, model=model)
+
+
+counter_classes: dict[str, type[ExactCounter]] = {
+    'exact':     ExactCounter,
+    'cached':    CachedCounter,
+    'estimated': EstimatedCounter,
+}
+
+
+def _use_cache() -> bool:
+    return settings.LISTVIEW_COUNT_MODE != 'exact' and bool(settings.LISTVIEW_COUNT_CACHE_ALIAS)
+
+
+def _invalidate_counts(sender, instance, **kwargs):
+    if not _use_cache():
+        return
+
+    if isinstance(instance, core_models.CremeEntity):
+        CachedCounter.invalidate_ctype(instance.entity_type_id)
+    elif isinstance(instance, core_models.Relation):
+        # NB: the symmetrical relation manages the type of the subject
+        CachedCounter.invalidate_ctype(instance.object_ctype_id)
+    elif isinstance(instance, core_models.CremeProperty):
+        if type(instance).creme_entity.is_cached(instance):
+            CachedCounter.invalidate_ctype(instance.creme_entity.entity_type_id)
+        else:
+            CachedCounter.invalidate_all()
+    elif isinstance(instance, core_models.CustomFieldValue):
+        if type(instance).custom_field.is_cached(instance):
+            CachedCounter.invalidate_ctype(instance.custom_field.content_type_id)
+        else:
+            CachedCounter.invalidate_all()
+
+
+def _invalidate_counts_on_m2m(sender, instance, action, **kwargs):
+    if (
+        action.startswith('post_')
+        and isinstance(instance, core_models.CremeEntity)
+        and _use_cache()
+    ):
+        CachedCounter.invalidate_ctype(instance.entity_type_id)
+
+
+def connect_signal_handlers() -> None:
+    """Connect the signal handlers which invalidate the cached counts; it's
+    called when all the apps are ready (the models must be loaded).
+    """
+    # NB: "sender=CremeEntity" does not work (the signal is sent for final class)
+    entity_models = concrete_models(core_models.CremeEntity)
+    watch_models(
+        _invalidate_counts,
+        models=[
+            *entity_models,
+            *concrete_models(
+                core_models.Relation,
+                core_models.CremeProperty,
+                core_models.CustomFieldValue,
+            ),
+        ],
+        dispatch_uid='creme_core-invalidate_listview_counts',
+    )
+    watch_m2m(
+        _invalidate_counts_on_m2m,
+        models=entity_models, dispatch_uid='creme_core-invalidate_listview_counts_on_m2m',
+    )
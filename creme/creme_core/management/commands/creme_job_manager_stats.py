@@ -0,0 +1,98 @@
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2026  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from creme.creme_core.models import Job
+
+
+class Command(BaseCommand):
+    help = (
+        'Display the metrics of the running job manager '
+        '(queues, latency & duration of the jobs...).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--json', action='store_true', dest='json',
+            help='Display the raw metrics in JSON format.',
+        )
+
+    @staticmethod
+    def _format_summary(summary):
+        if not summary['count']:
+            return 'no run'
+
+        return (
+            f'average={summary["average"]}s maximum={summary["maximum"]}s '
+            f'(last {summary["count"]} run(s))'
+        )
+
+    def handle(self, **options):
+        from creme.creme_core.core.job import get_queue
+
+        stats = get_queue().get_stats()
+        if stats is None:
+            raise CommandError('The job manager does not respond.')
+
+        write = self.stdout.write
+
+        if options['json']:
+            write(json.dumps(stats, indent=2))
+            return
+
+        queue = stats['queue']
+        write(f'Job manager started at: {stats["started"]} (now: {stats["now"]})')
+        write(f'Processes: {stats["processes"]} (workers: {stats["workers"] or "none"})')
+        write(
+            f'User jobs: {queue["user_jobs_running"]} running (maximum: '
+            f'{queue["max_user_jobs"]}), {queue["user_jobs_waiting"]} waiting'
+        )
+        write(
+            f'System jobs: {queue["system_jobs_scheduled"]} scheduled, '
+            f'{queue["system_jobs_running"]} running, {queue["system_jobs_late"]} late'
+        )
+        write(f'Deferred jobs: {queue["deferred_jobs"]}')
+        write(f'Latency: {self._format_summary(stats["latency"])}')
+        write(f'Duration: {self._format_summary(stats["duration"])}')
+        write('Commands: {}'.format(
+            ', '.join(f'{k}={v}' for k, v in sorted(stats['commands'].items())) or 'none'
+        ))
+
+        jobs_stats = stats['jobs']
+        if jobs_stats:
+            write('Jobs:')
+            jobs = Job.objects.in_bulk([int(job_id) for job_id in jobs_stats])
+
+            for job_id, job_stats in jobs_stats.items():
+                job = jobs.get(int(job_id))
+                duration = job_stats.get('last_duration')
+                write(
+                    ' - {job} (id={id}): {runs} run(s); last start={start} '
+                    'latency={latency}s duration={duration}{running}'.format(
+                        job=job if job is not None else '?',
+                        id=job_id,
+                        runs=job_stats['runs'],
+                        start=job_stats['last_start'],
+                        latency=round(job_stats['last_latency'], 3),
+                        duration='?' if duration is None else f'{round(duration, 3)}s',
+                        running=' [running]' if job_stats['running'] else '',
+                    )
+                )
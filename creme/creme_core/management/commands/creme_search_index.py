@@ -0,0 +1,79 @@
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2026  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from creme.creme_core.models import CremeEntity
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the search index (see the setting SEARCH_INDEX_BACKEND). '
+        'Run it when you enable the index, or when you modify the search '
+        'configuration.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'models', metavar='app_label.ModelName', nargs='*',
+            help='Rebuild only the index of these models (all the entities models by default).',
+        )
+        parser.add_argument(
+            '--chunk-size', action='store', dest='chunk_size', type=int, default=256,
+            help='Number of entities indexed at once [default: %(default)s].',
+        )
+
+    def _get_models(self, labels):
+        if not labels:
+            from creme.creme_core.registry import creme_registry
+
+            return [*creme_registry.iter_entity_models()]
+
+        models = []
+
+        for label in labels:
+            try:
+                model = apps.get_model(label)
+            except (LookupError, ValueError) as e:
+                raise CommandError(f'Invalid model "{label}": {e}') from e
+
+            if not issubclass(model, CremeEntity) or model is CremeEntity:
+                raise CommandError(f'The model "{label}" is not an entity model.')
+
+            models.append(model)
+
+        return models
+
+    def handle(self, **options):
+        from creme.creme_core.core.search_index import get_search_index
+
+        index = get_search_index()
+        if index is None:
+            raise CommandError(
+                'The search index is disabled (see the setting SEARCH_INDEX_BACKEND).'
+            )
+
+        verbosity = options['verbosity']
+        chunk_size = options['chunk_size']
+
+        for model in self._get_models(options['models']):
+            count = index.rebuild(model, chunk_size=chunk_size)
+
+            if verbosity:
+                self.stdout.write(f'{model._meta.label}: {count} entities indexed.')
@@ -0,0 +1,80 @@
+import logging
+
+from django.db import DatabaseError, migrations, models, transaction
+
+import creme.creme_core.models.fields as core_fields
+
+logger = logging.getLogger(__name__)
+
+
+def create_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    # NB: the extension "pg_trgm" can require some privileges ; the index is
+    #     optional (the search works without it, slower), so we do not fail.
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            schema_editor.execute(
+                'CREATE INDEX core__search_index__trgm '
+                'ON creme_core_searchindexentry USING gin (value gin_trgm_ops)'
+            )
+    except DatabaseError as e:
+        logger.warning(
+            'The trigram index for the search cannot be created (%s); '
+            'create the extension "pg_trgm" & run this SQL query to get a faster search: '
+            'CREATE INDEX core__search_index__trgm '
+            'ON creme_core_searchindexentry USING gin (value gin_trgm_ops)',
+            e,
+        )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS core__search_index__trgm')
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('creme_core', '0187_v3_0__clean_roles_data'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchIndexEntry',
+            fields=[
+                (
+                    'id',
+                    models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name='ID',
+                    )
+                ),
+                (
+                    'entity',
+                    models.ForeignKey(
+                        editable=False, on_delete=models.CASCADE,
+                        related_name='+', to='creme_core.cremeentity',
+                    )
+                ),
+                (
+                    'entity_ctype',
+                    core_fields.EntityCTypeForeignKey(
+                        editable=False, on_delete=models.CASCADE,
+                        related_name='+', to='contenttypes.contenttype',
+                    )
+                ),
+                ('cell_key', models.CharField(editable=False, max_length=100)),
+                ('value', models.TextField(editable=False)),
+            ],
+            options={
+                'indexes': [
+                    models.Index(
+                        fields=['entity_ctype', 'cell_key'], name='core__search_index__cells',
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
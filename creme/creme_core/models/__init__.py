@@ -41,7 +41,7 @@ from .notification import (  # NOQA
 )
 from .pinned_entity import PinnedEntity  # NOQA
 from .relation import Relation, RelationType, SemiFixedRelationType  # NOQA
-from .search import SearchConfigItem  # NOQA
+from .search import SearchConfigItem, SearchIndexEntry  # NOQA
 from .setting_value import SettingValue  # NOQA
 from .vat import Vat  # NOQA
 from .version import Version  # NOQA
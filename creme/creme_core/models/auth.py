@@ -46,6 +46,7 @@ from django.utils.translation import gettext_lazy as _
 from ..auth import EntityCredentials
 from ..auth.special import SpecialPermission, special_perm_registry
 from ..core.setting_key import UserSettingValueManager
+from ..global_info import get_per_request_cache
 from ..utils.content_type import as_ctype, as_model
 from ..utils.unicode_collation import collator
 from . import fields as core_fields
@@ -337,6 +338,31 @@ class UserRole(models.Model):
 
         return SetCredentials._can_do(self._get_setcredentials(), user, model, owner, perm)
 
+    def can_do_on_all(self, model: type[CremeEntity], perm: int) -> bool:
+        """Can the users with this role execute an action (VIEW, CHANGE etc..)
+        on all the instances of a model, i.e. without any condition on the
+        owner or with a filter.
+        Hint: it's useful to know if some data computed for all the instances
+        can be used (Sandboxes are not taken into account).
+        @param model: Class inheriting CremeEntity.
+        @param perm: See <EntityCredentials.{VIEW, CHANGE, ...}> .
+        """
+        if not self.is_app_allowed_or_administrable(model._meta.app_label):
+            return False
+
+        allowed_ctype_ids = (None, ContentType.objects.get_for_model(model).id)
+        allowed_found = False
+
+        for sc in self._get_setcredentials():
+            if sc.ctype_id in allowed_ctype_ids and sc.value & perm:
+                if sc.forbidden:
+                    return False
+
+                if sc.set_type == SetCredentials.ESET_ALL:
+                    allowed_found = True
+
+        return allowed_found
+
     def _get_setcredentials(self) -> list[SetCredentials]:
         setcredentials = self._setcredentials
 
@@ -359,6 +385,24 @@ class UserRole(models.Model):
 
         return perms
 
+    def get_perms_many(self, user, entities: Iterable[CremeEntity]) -> dict[int, int]:
+        """Get the permissions for several entities in an optimised way.
+        The filters of the credentials (see SetCredentials.ESET_FILTER) are
+        evaluated with one query per filter for all the entities, & the results
+        are cached for the request; so the next calls to get_perms() for these
+        entities perform no query.
+        @return A dictionary with entities' IDs as keys & permissions as values
+                (see get_perms()).
+        """
+        entities = [*entities]
+        setcredentials = self._get_setcredentials()
+
+        for sc in setcredentials:
+            if sc.set_type == SetCredentials.ESET_FILTER:
+                sc._populate_filter_results(user, entities)
+
+        return {entity.id: self.get_perms(user, entity) for entity in entities}
+
     # TODO: factorise
     def filter(self,
                user,
@@ -559,11 +603,60 @@ class SetCredentials(models.Model):
                     if user.id == user_id or any(user_id == t.id for t in user.teams):
                         return self.value
                 case _:  # SetCredentials.ESET_FILTER
-                    if self.efilter.accept(entity=entity.get_real_entity(), user=user):
+                    if self._accept(user, entity):
                         return self.value
 
         return EntityCredentials.NONE
 
+    def _get_filter_results(self, user) -> dict[tuple, bool]:
+        """Get the results of the filter for a user, cached per request.
+        Keys are tuples (entity's ID, entity's modification date) ; so the
+        results are computed again for the entities modified during the request.
+        """
+        return get_per_request_cache().setdefault(
+            'creme_core-credentials_filters', {},
+        ).setdefault((self.efilter_id, user.id), {})
+
+    def _accept(self, user, entity: CremeEntity) -> bool:
+        "Is the entity accepted by the filter (ESET_FILTER)?"
+        results = self._get_filter_results(user)
+        key = (entity.id, entity.modified)
+        accepted = results.get(key)
+
+        if accepted is None:
+            results[key] = accepted = self.efilter.accept(
+                entity=entity.get_real_entity(), user=user,
+            )
+
+        return accepted
+
+    def _populate_filter_results(self, user, entities: Iterable[CremeEntity]) -> None:
+        "Evaluate the filter (ESET_FILTER) for several entities with one query."
+        ctype_id = self.ctype_id
+        results = self._get_filter_results(user)
+        entities = [
+            entity
+            for entity in entities
+            if (not ctype_id or entity.entity_type_id == ctype_id)
+            and (entity.id, entity.modified) not in results
+        ]
+
+        if entities:
+            model = (
+                ContentType.objects.get_for_id(ctype_id).model_class()
+                if ctype_id else
+                CremeEntity
+            )
+            accepted_ids = {
+                *self.efilter.filter(
+                    model.objects.filter(id__in=[entity.id for entity in entities]),
+                    user=user,
+                ).values_list('id', flat=True)
+            }
+
+            for entity in entities:
+                results[(entity.id, entity.modified)] = entity.id in accepted_ids
+
     @staticmethod
     def get_perms(sc_sequence: Sequence[SetCredentials],
                   user,
@@ -1305,6 +1398,24 @@ class CremeUser(AbstractBaseUser):
 
         return creds
 
+    def populate_credentials(self, entities: Iterable[CremeEntity]) -> None:
+        """Compute the credentials of the user for several entities in an
+        optimised way (see UserRole.get_perms_many()) ; the next checks of
+        permissions on these instances (e.g. has_perm_to_view()) perform no query.
+        """
+        entities = [
+            entity
+            for entity in entities
+            if self.id not in getattr(entity, '_credentials_map', ())
+        ]
+
+        if entities:
+            if not self.is_superuser:
+                self.role.get_perms_many(self, entities)
+
+            for entity in entities:
+                self._get_credentials(entity)
+
     def has_perm(self, perm: str, obj=None) -> bool:
         """
         Returns True if the user has the specified permission. This method
@@ -1,6 +1,6 @@
 ################################################################################
 #    Creme is a free/open-source Customer Relationship Management software
-#    Copyright (C) 2024-2025  Hybird
+#    Copyright (C) 2024-2026  Hybird
 #
 #    This program is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU Affero General Public License as published by
@@ -23,7 +23,7 @@ from collections.abc import Iterator
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
-from ..global_info import get_per_request_cache
+from ..core.config_cache import config_cache
 from .entity import CremeEntity
 
 
@@ -31,10 +31,10 @@ class CustomEntityTypeManager(models.Manager):
     cache_key = 'creme_core-custom_entities'
 
     def _cached_types(self):
-        cache = get_per_request_cache()
-        types = cache.get(self.cache_key)
+        types = config_cache.get(self.cache_key)
         if types is None:
-            types = cache[self.cache_key] = {ce_type.id: ce_type for ce_type in self.all()}
+            types = {ce_type.id: ce_type for ce_type in self.all()}
+            config_cache.set(self.cache_key, types)
 
         return types
 
@@ -112,3 +112,6 @@ class CustomEntityType(models.Model):
     def entity_model(self) -> type[CremeEntity]:
         """Get the model corresponding to this instance."""
         return self.custom_classes[self.id]
+
+
+config_cache.watch(CustomEntityType)
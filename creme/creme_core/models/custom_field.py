@@ -31,8 +31,8 @@ from django.utils.timezone import localtime
 from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
 
+from ..core.config_cache import config_cache
 from ..core.value_maker import ValueMaker, value_maker_registry
-from ..global_info import get_per_request_cache
 from ..utils.content_type import as_ctype
 from .base import CremeModel
 from .entity import CremeEntity
@@ -56,12 +56,12 @@ class CustomFieldManager(models.Manager):
     # TODO: exclude deleted fields?
     def get_for_model(self, ct_or_model, /) -> dict[int, CustomField]:
         ct = as_ctype(ct_or_model)
-        cache = get_per_request_cache()
         key = f'creme_core-custom_fields-{ct.id}'
 
-        cached_cfields = cache.get(key)
+        cached_cfields = config_cache.get(key)
         if cached_cfields is None:
-            cached_cfields = cache[key] = [*self.filter(content_type=ct)]
+            cached_cfields = [*self.filter(content_type=ct)]
+            config_cache.set(key, cached_cfields)
 
         return OrderedDict((cfield.id, cfield) for cfield in cached_cfields)
 
@@ -567,3 +567,6 @@ _TABLES: dict[int, type[CustomFieldValue]] = OrderedDict([
     (CustomField.ENUM,       CustomFieldEnum),
     (CustomField.MULTI_ENUM, CustomFieldMultiEnum),
 ])
+
+
+config_cache.watch(CustomField)
@@ -419,7 +419,7 @@ class CremeEntity(CremeModel):
     def save(self, *args,
              force_insert=False, force_update=False, using=None, update_fields=None,
              ):
-        self.header_filter_search_field = self._search_field_value()[:_SEARCH_FIELD_MAX_LENGTH]
+        self.update_search_field()
 
         if update_fields is not None:
             update_fields = {
@@ -446,6 +446,24 @@ class CremeEntity(CremeModel):
         """
         return str(self)
 
+    def update_search_field(self) -> None:
+        """Update the value of the field "header_filter_search_field".
+        It's called by save() ; you should not need it, excepted if you save
+        some entities without save() (e.g. with QuerySet.bulk_update()).
+        """
+        self.header_filter_search_field = self._search_field_value()[:_SEARCH_FIELD_MAX_LENGTH]
+
+    def allows_bulk_save(self, field_names: Collection[str]) -> bool:
+        """Can this (existing) entity be saved with QuerySet.bulk_update()
+        instead of save(), when the given fields have been modified?
+        The signals "pre_save" & "post_save" are sent anyway. It's used by the
+        batch process to save many entities with a few queries.
+        By default, it's allowed only if the method save() is not overridden ;
+        override this method if your save() does not need to be called in some
+        cases (e.g. it only does things at creation).
+        """
+        return type(self).save is CremeEntity.save
+
     def restore(self) -> None:
         self.is_deleted = False
         self.save()
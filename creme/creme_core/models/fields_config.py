@@ -32,8 +32,8 @@ from django.utils.functional import cached_property
 from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
 
+from ..core.config_cache import config_cache
 from ..core.field_tags import FieldTag
-from ..global_info import get_per_request_cache
 from ..utils.meta import FieldInfo
 from .base import CremeModel
 from .fields import CTypeOneToOneField
@@ -115,12 +115,10 @@ class FieldsConfigManager(models.Manager):
         cache_key_fmt = 'creme_core-fields_config-{}'.format
         not_cached_ctypes = []
 
-        cache = get_per_request_cache()
-
         # Step 1: fill 'result' with cached configs
         for model in models:
             ct = get_ct(model)
-            fc = cache.get(cache_key_fmt(ct.id))
+            fc = config_cache.get(cache_key_fmt(ct.id))
 
             if fc is None:
                 if self.has_configurable_fields(model):  # Avoid useless queries
@@ -129,18 +127,20 @@ class FieldsConfigManager(models.Manager):
                 result[model] = fc
 
         # Step 2: fill 'result' with configs in DB
-        for fc in self.filter(content_type__in=not_cached_ctypes):
-            ct = fc.content_type
-            result[ct.model_class()] = cache[cache_key_fmt(ct.id)] = fc
+        # NB: the test avoids to build a query at each call (e.g. full_clean()
+        #     is called for each entity by the batch process).
+        if not_cached_ctypes:
+            for fc in self.filter(content_type__in=not_cached_ctypes):
+                ct = fc.content_type
+                result[ct.model_class()] = fc
+                config_cache.set(cache_key_fmt(ct.id), fc)
 
         # Step 3: fill 'result' with empty configs for remaining models
         for model in models:
             if model not in result:
                 ct = get_ct(model)
-                result[model] = cache[cache_key_fmt(ct.id)] = self.model(
-                    content_type=ct,
-                    descriptions=(),
-                )
+                result[model] = fc = self.model(content_type=ct, descriptions=())
+                config_cache.set(cache_key_fmt(ct.id), fc)
 
         return result
 
@@ -519,3 +519,6 @@ class FieldsConfig(CremeModel):
 
     def natural_key(self):
         return self.content_type.natural_key()
+
+
+config_cache.watch(FieldsConfig)
@@ -23,14 +23,15 @@ from collections.abc import Collection, Container, Iterable, Iterator
 from datetime import date, datetime, time
 from decimal import Decimal
 from functools import partial
+from itertools import chain
 from json import JSONEncoder
 from json import loads as json_load
 
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
-from django.db import models
+from django.db import connections, models, router
 from django.db.models import Model, signals
-from django.db.transaction import atomic
+from django.db.transaction import atomic, on_commit
 from django.dispatch import receiver
 from django.utils.translation import gettext_lazy as _
 
@@ -482,7 +483,7 @@ class _HLTRelatedEntity(_HistoryLineType):
             object_entities = [r.object_entity for r in relations]
             create_line = partial(
                 HistoryLine._create_line_4_instance,
-                ltype=cls.type_id, date=entity.modified, related_line_id=related_line.id,
+                ltype=cls.type_id, date=entity.modified, related_line=related_line,
             )
 
             CremeEntity.populate_real_entities(object_entities)  # Optimisation
@@ -534,12 +535,9 @@ class _HLTRelation(_HistoryLineType):
         hline_sym = create_line(
             relation.object_entity, sym_cls.type_id,
             modifs=[relation.type.symmetric_type_id],
-            related_line_id=hline.id,
-        )
-        hline.value = HistoryLine._encode_attrs(
-            hline.entity,
-            modifs=[relation.type_id], related_line_id=hline_sym.id,
+            related_line=hline,
         )
+        hline._link(hline.entity, modifs=[relation.type_id], related_line=hline_sym)
         hline.save()
 
     @classmethod
@@ -704,6 +702,7 @@ class _HLTEntityExport(_HistoryLineType):
         return HistoryLine.objects.create(
             entity_ctype=ctype,
             entity_owner=user,
+            username=user.username,
             type=cls.type_id,
             value=HistoryLine._encode_attrs(instance='', modifs=modifs),
         )
@@ -728,6 +727,118 @@ def is_history_enabled() -> bool:
     return True
 
 
+HISTORY_BUFFER_CACHE_KEY = 'creme_core-history-buffer'
+
+
+class HistoryBuffer:
+    """Buffer for the new HistoryLines ; the lines are inserted with bulk
+    queries instead of one query per line.
+
+    A line is ready to be inserted when the transaction in which it has been
+    created is committed (the lines created in a transaction which is rolled
+    back are dropped) ; the lines created outside a transaction are ready
+    immediately. The ready lines are inserted when they are numerous enough
+    (see 'size') & when the buffer is closed (the lines which are still
+    waiting for their transaction are inserted at its commit).
+
+    Hint: use the context manager 'creme_core.core.history.buffered_history'.
+    """
+    def __init__(self, size: int = 500):
+        """Constructor.
+        @param size: Number of ready lines which causes an insertion.
+        """
+        self.size = size
+        self._ready: list[HistoryLine] = []
+        # Lines waiting for the commit of their transaction
+        #   key: id of the line instance.
+        #   values: line, DB alias.
+        # NB: the lines of a rolled back transaction/savepoint stay here (their
+        #     "on_commit" callbacks are just dropped by Django).
+        self._waiting: dict[int, tuple[HistoryLine, str]] = {}
+        self._closed = False
+
+    @staticmethod
+    def get_current() -> HistoryBuffer | None:
+        "Get the buffer used by the current request/job (<None> means no buffer)."
+        return get_per_request_cache().get(HISTORY_BUFFER_CACHE_KEY)
+
+    def add(self, line: HistoryLine, using: str) -> None:
+        "Add a new line (several calls with the same line are OK)."
+        if line._buffered:
+            return
+
+        line._buffered = True
+
+        if connections[using].in_atomic_block:
+            self._waiting[id(line)] = (line, using)
+            on_commit(partial(self._commit_line, line), using=using)
+        else:
+            self._append(line)
+
+    def _commit_line(self, line: HistoryLine) -> None:
+        if self._waiting.pop(id(line), None) is not None:
+            self._append(line)
+
+    def _append(self, line: HistoryLine) -> None:
+        ready = self._ready
+        ready.append(line)
+
+        if len(ready) >= self.size:
+            if self._closed:
+                self._flush_closed()
+            else:
+                self.flush()
+
+    def forget_entity(self, entity_id: int) -> None:
+        "Detach the lines from a deleted entity (like 'on_delete=SET_NULL' does)."
+        for line in chain(self._ready, (info[0] for info in self._waiting.values())):
+            if line.entity_id == entity_id:
+                line.entity = None
+
+    def flush(self) -> None:
+        "Insert the ready lines."
+        lines = self._ready
+
+        if lines:
+            self._ready = []
+            HistoryLine._bulk_insert(lines)
+
+    def _flush_closed(self) -> None:
+        # NB: the buffer is not used anymore to create the lines, so it's not
+        #     notified of the deletions of entities (see forget_entity()).
+        lines = self._ready
+        entity_ids = {line.entity_id for line in lines if line.entity_id}
+
+        if entity_ids:
+            existing_ids = {
+                *CremeEntity.objects.filter(id__in=entity_ids).values_list('id', flat=True)
+            }
+
+            for line in lines:
+                if line.entity_id and line.entity_id not in existing_ids:
+                    line.entity = None
+
+        self.flush()
+
+    def close(self) -> None:
+        """Insert the remaining lines.
+        The lines which are waiting for the commit of a transaction which is
+        still in progress are inserted when this transaction is committed (so
+        the lines of a rolled back savepoint are dropped as usual).
+        """
+        self.flush()
+
+        if not self._closed:
+            self._closed = True
+
+            for using in {info[1] for info in self._waiting.values()}:
+                # NB: registered after the callbacks of the waiting lines, so
+                #     called after them. The buffer is opened & closed in the
+                #     same atomic block (see 'buffered_history'), so this
+                #     callback is dropped only if the waiting lines are too.
+                on_commit(self._flush_closed, using=using)
+
+
 class HistoryLine(Model):
     entity = models.ForeignKey(CremeEntity, null=True, on_delete=models.SET_NULL)
 
@@ -753,6 +864,9 @@ class HistoryLine(Model):
     _modifications: list | None = None
     _related_line_id: int | None = None
     _related_line: HistoryLine | bool | None = False
+    # Used by HistoryBuffer
+    _buffered: bool = False
+    _buffered_link: tuple[str, Collection, HistoryLine] | None = None
 
     class Meta:
         app_label = 'creme_core'
@@ -854,6 +968,48 @@ class HistoryLine(Model):
 
         return attrs
 
+    @classmethod
+    @atomic
+    def _bulk_insert(cls, lines: list[HistoryLine]) -> None:
+        "Insert some new lines (see HistoryBuffer)."
+        if connections[router.db_for_write(cls)].features.can_return_rows_from_bulk_insert:
+            cls._default_manager.bulk_create(lines)
+        else:
+            # NB: we need the IDs to link the lines
+            for line in lines:
+                Model.save(line, force_insert=True)
+
+        linked_lines = []
+        for line in lines:
+            line._buffered = False
+            link = line._buffered_link
+
+            if link is not None:
+                instance_repr, modifs, related_line = link
+                line._buffered_link = None
+                line.value = cls._encode_attrs(
+                    instance_repr, modifs=modifs, related_line_id=related_line.id,
+                )
+                linked_lines.append(line)
+
+        if linked_lines:
+            cls._default_manager.bulk_update(linked_lines, fields=['value'])
+
+    def _link(self, instance, related_line: HistoryLine, modifs=()) -> None:
+        """Set the value of a line which references another line.
+        @param instance: Instance related to the line.
+        @param related_line: Line which is referenced ; if it's waiting in the
+               buffer (i.e. no ID yet), the value is completed at its insertion.
+        @param modifs: See _encode_attrs().
+        """
+        related_line_id = related_line.id
+        if related_line_id is None:
+            self._buffered_link = (str(instance), modifs, related_line)
+
+        self.value = self._encode_attrs(
+            instance, modifs=modifs, related_line_id=related_line_id,
+        )
+
     def _read_attrs(self) -> None:
         value = json_load(self.value)
         self._entity_repr = value.pop(0)
@@ -955,12 +1111,15 @@ class HistoryLine(Model):
                                 date=None,
                                 modifs=(),
                                 related_line_id=None,
+                                related_line: HistoryLine | None = None,
                                 ):
         """Builder.
         @param ltype: See TYPE_*
         @param date: If not given, will be 'now'.
         @param modifs: List of tuples containing JSONifiable values.
         @param related_line_id: HistoryLine.id.
+        @param related_line: HistoryLine instance (which can be buffered) ;
+               use it instead of "related_line_id".
         """
         kwargs = {
             'entity': instance,
@@ -977,7 +1136,13 @@ class HistoryLine(Model):
         if date:
             kwargs['date'] = date
 
-        return cls.objects.create(**kwargs)
+        line = cls(**kwargs)
+        if related_line is not None:
+            line._link(instance, modifs=modifs, related_line=related_line)
+
+        line.save(force_insert=True)
+
+        return line
 
     def save(self, *args,
              force_insert=False, force_update=False, using=None, update_fields=None,
@@ -988,12 +1153,21 @@ class HistoryLine(Model):
         if is_history_enabled():
             from ..core.workflow import WorkflowEngine
 
-            # if self.pk is None: TODO ?
-            user = get_global_info('user')
-            self.username = user.username if user else ''
+            # NB: the user can be given explicitly (see _HLTEntityExport)
+            if not self.username:
+                # if self.pk is None: TODO ?
+                user = get_global_info('user')
+                self.username = user.username if user else ''
 
             self.by_wf_engine = WorkflowEngine.get_current().is_executing_actions
 
+            if self.pk is None:
+                buffer = HistoryBuffer.get_current()
+
+                if buffer is not None:
+                    buffer.add(self, using=using or router.db_for_write(type(self)))
+                    return
+
             super().save(
                 *args,
                 force_insert=force_insert,
@@ -1141,6 +1315,10 @@ def _log_deletion(sender, instance, **kwargs):
         elif isinstance(instance, CremeEntity) and _final_entity(instance):
             _get_deleted_entity_ids().add(instance.id)
             _HLTEntityDeletion.create_line(instance)
+
+            buffer = HistoryBuffer.get_current()
+            if buffer is not None:
+                buffer.forget_entity(instance.id)
         elif isinstance(instance, CustomFieldValue):
             _HLTCustomFieldsEdition.create_lines(instance, emptied=True)
     except Exception:
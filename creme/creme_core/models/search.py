@@ -26,14 +26,19 @@ from typing import TYPE_CHECKING, DefaultDict
 
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
+from django.db.models import signals
 from django.db.models.query_utils import Q
+from django.dispatch import receiver
 from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
 from django.utils.translation import pgettext_lazy
 
+from ..global_info import get_per_request_cache
+from ..signals import pre_merge_related
 from ..utils.meta import ModelFieldEnumerator
 from .auth import UserRole
 from .base import CremeModel
+from .custom_field import CustomFieldMultiEnum, CustomFieldValue
 from .entity import CremeEntity
 from .fields import DatePeriodField, EntityCTypeForeignKey
 
@@ -390,3 +395,94 @@ class SearchConfigItem(CremeModel):
             raise ValueError('"role" must be NULL if "superuser" is True')
 
         super().save(*args, **kwargs)
+
+
+class SearchIndexEntry(models.Model):
+    """Denormalised value of a searchable field (regular or custom) of an entity.
+    See 'creme_core.core.search_index.DatabaseSearchIndex'.
+    """
+    entity = models.ForeignKey(
+        CremeEntity, related_name='+', editable=False, on_delete=models.CASCADE,
+    )
+    entity_ctype = EntityCTypeForeignKey(related_name='+', editable=False)
+    cell_key = models.CharField(max_length=100, editable=False)
+    value = models.TextField(editable=False)
+
+    class Meta:
+        app_label = 'creme_core'
+        indexes = [
+            models.Index(
+                fields=['entity_ctype', 'cell_key'],
+                name='core__search_index__cells',
+            ),
+        ]
+
+    def __repr__(self):
+        return (
+            f'SearchIndexEntry('
+            f'entity_id={self.entity_id}, cell_key="{self.cell_key}", value="{self.value}"'
+            f')'
+        )
+
+
+def _get_search_index():
+    from ..core.search_index import get_search_index
+
+    return get_search_index()
+
+
+def _clear_search_index_cells():
+    # NB: the indexed cells are cached (see DatabaseSearchIndex.get_cells())
+    get_per_request_cache().pop('creme_core-search_index_cells', None)
+
+
+@receiver(signals.post_save, dispatch_uid='creme_core-update_search_index')
+def _update_search_index(sender, instance, **kwargs):
+    if isinstance(instance, CremeEntity):
+        index = _get_search_index()
+
+        # NB: we ignore the save() of the base class (e.g. CremeEntity.trash()
+        #     does not update the searched fields).
+        if index is not None and type(instance) is not CremeEntity:
+            index.index_entities([instance])
+    elif isinstance(instance, CustomFieldValue) and not isinstance(
+        instance, CustomFieldMultiEnum,  # NB: see _update_search_index_on_m2m()
+    ):
+        index = _get_search_index()
+        if index is not None:
+            index.index_custom_value(instance)
+    elif isinstance(instance, SearchConfigItem):
+        _clear_search_index_cells()
+
+
+@receiver(signals.post_delete, dispatch_uid='creme_core-update_search_index_on_deletion')
+def _update_search_index_on_deletion(sender, instance, **kwargs):
+    # NB: the entries of a deleted entity are deleted by the "CASCADE" constraint
+    if isinstance(instance, CustomFieldValue):
+        index = _get_search_index()
+        if index is not None:
+            index.index_custom_value(instance, deleted=True)
+    elif isinstance(instance, SearchConfigItem):
+        _clear_search_index_cells()
+
+
+@receiver(signals.m2m_changed, dispatch_uid='creme_core-update_search_index_on_m2m')
+def _update_search_index_on_m2m(sender, instance, action, reverse, **kwargs):
+    if reverse or not action.startswith('post_'):
+        return
+
+    if isinstance(instance, CremeEntity):
+        index = _get_search_index()
+        if index is not None:
+            index.index_entities([instance])
+    elif isinstance(instance, CustomFieldMultiEnum):
+        index = _get_search_index()
+        if index is not None:
+            index.index_custom_value(instance)
+
+
+@receiver(pre_merge_related, dispatch_uid='creme_core-update_search_index_on_merge')
+def _update_search_index_on_merge(sender, other_entity, **kwargs):
+    # We do not want these entries to be re-assigned to the remaining entity
+    # (its entries are rebuilt when it's saved).
+    SearchIndexEntry.objects.filter(entity=other_entity.id).delete()
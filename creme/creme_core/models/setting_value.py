@@ -1,6 +1,6 @@
 ################################################################################
 #    Creme is a free/open-source Customer Relationship Management software
-#    Copyright (C) 2009-2025  Hybird
+#    Copyright (C) 2009-2026  Hybird
 #
 #    This program is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU Affero General Public License as published by
@@ -23,6 +23,7 @@ import logging
 from django.core.validators import EMPTY_VALUES
 from django.db import models, transaction
 
+from ..core.config_cache import config_cache
 from ..core.setting_key import (
     SettingKey,
     SettingKeyRegistry,
@@ -88,7 +89,8 @@ class SettingValueManager(models.Manager):
             return default
 
     def get_4_key(self, key: SettingKey | str, **kwargs) -> SettingValue:
-        """Get the SettingValue corresponding to a SettingKey. Results are cached (per request).
+        """Get the SettingValue corresponding to a SettingKey.
+        Results are cached (see 'creme_core.core.config_cache').
 
         @param key: A SettingKey instance, or an ID of SettingKey (string).
         @param default: (optional) If given & the SettingValue does not exist,
@@ -106,7 +108,7 @@ class SettingValueManager(models.Manager):
         """Get several SettingValue corresponding to several SettingKeys at once.
          It's faster than calling 'get_4_key()' several times, because only one
          SQL query is performed (in the worst case)
-         Results are cached (per request).
+         Results are cached (see 'creme_core.core.config_cache').
 
         @param values_info: Each argument must be dictionary with these keys:
                "key": A SettingKey instance, or an ID of SettingKey (string).
@@ -127,7 +129,6 @@ class SettingValueManager(models.Manager):
         {sk1.id: SettingValue(...), sk2.id: SettingValue(...)}
         """
         svalues = {}
-        cache = get_per_request_cache()
         uncached_info = []
         format_cache_key = self.cache_key_fmt.format
 
@@ -142,7 +143,7 @@ class SettingValueManager(models.Manager):
                 # self.key_registry[key_id] TODO ?
 
             cache_key = format_cache_key(key_id)
-            sv = cache.get(cache_key)
+            sv = config_cache.get(cache_key)
 
             if sv is None:
                 uncached_info.append((key_id, cache_key, value_info))
@@ -172,7 +173,10 @@ class SettingValueManager(models.Manager):
 
                     sv = self.DummySettingValue(key_id=key_id, value=value_info['default'])
 
-                svalues[key_id] = cache[cache_key] = sv
+                svalues[key_id] = sv
+                config_cache.set(
+                    cache_key, sv, shared=not isinstance(sv, self.DummySettingValue),
+                )
 
         return svalues
 
@@ -218,3 +222,6 @@ class SettingValue(models.Model):
         value = self.value
 
         return self.key.value_as_html(value) if value is not None else ''
+
+
+config_cache.watch(SettingValue)
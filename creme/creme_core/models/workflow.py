@@ -20,14 +20,19 @@ from collections.abc import Iterable
 from uuid import uuid4
 
 from django.db import models
+from django.db.models import signals
+from django.dispatch import receiver
 from django.utils.translation import gettext_lazy as _
 
+from ..core.config_cache import config_cache
 from ..core.workflow import (
     WorkflowAction,
     WorkflowConditions,
+    WorkflowIndex,
     WorkflowTrigger,
     workflow_registry,
 )
+from ..global_info import get_per_request_cache
 from .base import CremeModel
 from .fields import EntityCTypeForeignKey
 
@@ -129,3 +134,18 @@ class Workflow(CremeModel):
     def trigger(self, value: WorkflowTrigger) -> None:
         self._trigger = None
         self.json_trigger = value.to_dict()
+
+
+config_cache.watch(Workflow)
+
+
+@receiver(
+    (signals.post_save, signals.post_delete),
+    sender=Workflow, dispatch_uid='creme_core-clear_workflow_index',
+)
+def _clear_workflow_index(sender, instance, **kwargs):
+    # NB: the configuration cache does not remove the values of the current
+    #     request; we want the modification to be used by the current request.
+    cache = get_per_request_cache()
+    cache.pop(WorkflowIndex.cache_key, None)
+    cache.pop(WorkflowIndex.instances_cache_key, None)
@@ -1,6 +1,6 @@
 ################################################################################
 #    Creme is a free/open-source Customer Relationship Management software
-#    Copyright (C) 2024  Hybird
+#    Copyright (C) 2024-2026  Hybird
 #
 #    This program is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU Affero General Public License as published by
@@ -28,6 +28,7 @@ from .core.notification import (
     RelatedToModelBaseContent,
     TemplateBaseContent,
 )
+from .models import FileRef
 from .utils import dates
 
 
@@ -110,3 +111,12 @@ class MassImportDoneContent(RelatedToModelBaseContent):
     html_body_template_name: str = 'creme_core/notifications/mass_import/body.html'
 
     model = get_document_model()
+
+
+class MassExportDoneContent(RelatedToModelBaseContent):
+    id = RelatedToModelBaseContent.generate_id('creme_core', 'mass_export_done')
+    subject_template_name: str = 'creme_core/notifications/mass_export/subject.txt'
+    body_template_name: str = 'creme_core/notifications/mass_export/body.txt'
+    html_body_template_name: str = 'creme_core/notifications/mass_export/body.html'
+
+    model = FileRef
@@ -1074,6 +1074,12 @@ creme.bricks.BrickLauncher = creme.widget.declare('brick', {
 
         element.addClass('widget-ready');
         brick.trigger('ready', [options]);
+
+        // The content of a deferred brick has not been rendered with the page
+        // (see ConcurrentBricksRenderer) ; it's loaded now.
+        if (element.is('[data-brick-deferred]')) {
+            brick.refresh();
+        }
     },
 
     _destroy: function(element) {
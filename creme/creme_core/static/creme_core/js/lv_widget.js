@@ -46,6 +46,7 @@ creme.lv_widget.ExportAction = creme.component.Action.sub({
 
         var self = this;
         var formats = options.formats || [['', 'No backend found']];
+        var posted = false;
 
         creme.dialogs.choice(gettext("Select the export format"), {
             title: gettext("Export"),
@@ -54,11 +55,36 @@ creme.lv_widget.ExportAction = creme.component.Action.sub({
             }),
             required: true
         }).onOk(function(event, data) {
-           creme.utils.goTo(options.url, {type: data});
-           self.done();
+           if (options.method === 'POST') {
+               posted = true;
+               self._post(options.url, {type: data});
+           } else {
+               creme.utils.goTo(options.url, {type: data});
+               self.done();
+           }
         }).onClose(function() {
-            self.cancel();
+            if (!posted) {
+                self.cancel();
+            }
         }).open();
+    },
+
+    _post: function(url, data) {
+        var self = this;
+        var urlinfo = _.toRelativeURL(url);
+
+        // NB: the arguments stay in the URL ; the view returns the URL of the next page.
+        urlinfo.searchData($.extend({}, urlinfo.searchData(), data));
+
+        creme.utils.ajaxQuery(urlinfo.href(), {action: 'post', warnOnFail: true})
+                   .onDone(function(event, nextUrl) {
+                       creme.utils.goTo(nextUrl);
+                       self.done();
+                   })
+                   .onFail(function() {
+                       self.fail();
+                   })
+                   .start();
     }
 });
 
@@ -939,4 +939,25 @@ QUnit.test('creme.bricks.Brick.refresh (wildcard deps)', function(assert) {
     ], this.mockBackendUrlCalls('mock/brick/all/reload'));
 });
 
+QUnit.test('creme.bricks.BrickLauncher (deferred)', function(assert) {
+    var html = '<div class="brick ui-creme-widget" widget="brick" id="brick-A" data-brick-id="A"><span class="brick-loaded"></span></div>';
+    var element = $(
+        '<div class="brick ui-creme-widget" widget="brick" id="brick-A" data-brick-id="A" data-brick-deferred="true"></div>'
+    ).appendTo(this.qunitFixture());
+
+    this.setBrickReloadContent('brick-A', html);
+
+    creme.widget.create(element);
+
+    assert.deepEqual([
+        ['GET', {"brick_id": ["A"], "extra_data": "{}"}]
+    ], this.mockBackendUrlCalls('mock/brick/all/reload'));
+    assert.equal(1, this.qunitFixture().find('#brick-A .brick-loaded').length);
+
+    // The loaded brick is not deferred => no other query
+    this.resetMockBackendCalls();
+    assert.equal(true, this.qunitFixture().find('#brick-A').creme().widget().brick().isBound());
+    assert.deepEqual([], this.mockBackendUrlCalls('mock/brick/all/reload'));
+});
+
 }(jQuery));
@@ -872,6 +872,37 @@ QUnit.test('creme.listview.ExportAction (ok)', function(assert) {
     assert.deepEqual(['/mock/entity/export?type=csv'], this.mockRedirectCalls());
 });
 
+QUnit.test('creme.listview.ExportAction (ok, POST)', function(assert) {
+    var list = this.createDefaultListView().controller();
+
+    this.setMockBackendPOST({
+        '/mock/entity/export/job?ct_id=12&type=csv': this.backend.response(200, '/mock/job/1')
+    });
+
+    var action = new creme.lv_widget.ExportAction(list, {
+        url: '/mock/entity/export/job?ct_id=12',
+        formats: [
+             ['csv', 'CSV File format']
+        ],
+        method: 'POST'
+    }).on(this.listviewActionListeners);
+
+    action.start();
+
+    this.assertOpenedDialog().find('button[name="ok"]').trigger('click');
+    this.assertClosedDialog();
+
+    assert.deepEqual([
+        ['POST', {}]
+    ], this.mockBackendUrlCalls('/mock/entity/export/job?ct_id=12&type=csv'));
+
+    assert.deepEqual([], this.mockListenerCalls('action-fail'));
+    assert.deepEqual([], this.mockListenerCalls('action-cancel'));
+    assert.deepEqual([['done']], this.mockListenerCalls('action-done'));
+
+    assert.deepEqual(['/mock/job/1'], this.mockRedirectCalls());
+});
+
 QUnit.test('creme.listview.actionregistry', function(assert) {
     var list = this.createListView().controller();
     var registry = list.actionBuilders();
@@ -1,6 +1,6 @@
 ################################################################################
 #    Creme is a free/open-source Customer Relationship Management software
-#    Copyright (C) 2015-2025  Hybird
+#    Copyright (C) 2015-2026  Hybird
 #
 #    This program is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU Affero General Public License as published by
@@ -29,6 +29,8 @@ from ..core import sorter
 from ..core.entity_cell import EntityCellRegularField
 # NB: do not import registries directly to facilitate unit tests
 from ..gui import bricks, bulk_update
+from ..gui.brick_cache import brick_cache
+from ..gui.brick_rendering import ConcurrentBricksRenderer
 from ..gui.bricks import Brick, BrickManager
 from ..gui.pager import PagerContext
 from ..gui.view_tag import ViewTag
@@ -1028,13 +1030,17 @@ def brick_display(context, *bricks, **kwargs):
             )
         ) from e
 
+    renderer = ConcurrentBricksRenderer.get(context)
+
     def render(brick):
         fun = getattr(brick, brick_render_method, None)
 
         if fun:
             # NB: the context is copied is order to a 'fresh' one for each brick,
             #     & so avoid annoying side-effects.
-            return fun({**context_dict})
+            return (renderer or brick_cache).render(
+                brick=brick, method=brick_render_method, context={**context_dict},
+            )
 
         logger.warning(
             'Brick without %s(): %s (id=%s)',
@@ -1067,6 +1073,15 @@ def brick_display(context, *bricks, **kwargs):
             pop_group(brick_or_seq.id)
             bricks_to_render.append(brick_or_seq)
 
+    if renderer is not None:
+        # NB: all the declared bricks are submitted (not only the bricks of
+        #     this call), so they are rendered while we wait for these ones.
+        renderer.submit(
+            bricks=BrickManager.get(context).bricks,
+            method=brick_render_method,
+            context=context_dict,
+        )
+
     return mark_safe(''.join(filter(
         None,
         (render(brick) for brick in bricks_to_render)
@@ -38,6 +38,7 @@ from ..views.generic import EntitiesList
 if TYPE_CHECKING:
     from ..core.entity_cell import EntityCell, EntityCellActions
     from ..gui.listview import ListViewButtonList
+    from ..gui.view_tag import ViewTag
     from ..models import CremeEntity, CremeUser
     from ..models.entity_filter import EntityFilterList
     from ..models.header_filter import HeaderFilterList
@@ -224,6 +225,33 @@ def listview_td_action_for_cell(*, cell: EntityCell, instance: CremeEntity, user
     }
 
 
+@register.simple_tag
+def listview_cell_content(*,
+                          cells_contents: dict | None,
+                          cell: EntityCell,
+                          instance: CremeEntity,
+                          user: CremeUser,
+                          tag: ViewTag,
+                          ):
+    """Get the content of a cell which has been rendered by the list-view (see
+    EntitiesList.get_cells_contents()) ; the cell is rendered here if it has
+    not been (e.g. a view which does not provide the context variable).
+
+    {% listview_cell_content cells_contents=cells_contents cell=cell instance=entity user=user tag=view_tag as cell_content %}
+    """  # NOQA
+    try:
+        return cells_contents[cell.key][instance.id]
+    except (KeyError, TypeError):
+        pass
+
+    try:
+        return cell.render(instance, user, tag)
+    except Exception:
+        logger.exception('Error when rendering cell in {% listview_cell_content %}')
+
+    return ''
+
+
 @register.inclusion_tag('creme_core/templatetags/listview/entity-actions.html')
 def listview_entity_actions(*, cell: EntityCellActions, instance: CremeEntity, user: CremeUser):
     actions = cell.instance_actions(instance=instance, user=user)
@@ -0,0 +1,210 @@
+from django.core.cache import caches
+from django.test.utils import override_settings
+
+from creme.creme_core.core.config_cache import ConfigCache, config_cache
+from creme.creme_core.core.setting_key import SettingKey, setting_key_registry
+from creme.creme_core.global_info import get_per_request_cache
+from creme.creme_core.models import (
+    CustomField,
+    FakeContact,
+    FakeOrganisation,
+    FieldsConfig,
+    SettingValue,
+)
+
+from ..base import CremeTestCase
+
+
+class ConfigCacheTestCase(CremeTestCase):
+    CACHE_ALIAS = 'default'
+
+    def setUp(self):
+        super().setUp()
+        # NB: the instances created by the tests are removed by a rollback,
+        #     which sends no signal.
+        self._invalidate()
+        self.addCleanup(self._invalidate)
+
+    def _invalidate(self):
+        with override_settings(CONFIG_CACHE_ALIAS=self.CACHE_ALIAS):
+            config_cache.invalidate()
+
+        self.clear_global_info()
+
+    def _register_key(self, skey):
+        setting_key_registry.register(skey)
+        self.addCleanup(setting_key_registry.unregister, skey)
+
+    @override_settings(CONFIG_CACHE_ALIAS='')
+    def test_disabled(self):
+        cache = ConfigCache()
+        self.assertIsNone(cache.cache)
+        self.assertIsNone(cache.get('creme_core-test'))
+        self.assertEqual(12, cache.get('creme_core-test', 12))
+
+        value = {'foo': 1}
+        cache.set('creme_core-test', value)
+        self.assertIs(value, cache.get('creme_core-test'))
+        self.assertIs(value, get_per_request_cache().get('creme_core-test'))
+
+        self.clear_global_info()
+        self.assertIsNone(cache.get('creme_core-test'))
+
+        with self.assertNoException():
+            cache.invalidate()
+
+    @override_settings(CONFIG_CACHE_ALIAS=CACHE_ALIAS)
+    def test_enabled(self):
+        cache = ConfigCache()
+        self.assertEqual(caches[self.CACHE_ALIAS], cache.cache)
+
+        value = {'foo': [1, 2]}
+        cache.set('creme_core-test', value)
+        self.assertIs(value, cache.get('creme_core-test'))
+
+        # Next request
+        self.clear_global_info()
+        cached_value = cache.get('creme_core-test')
+        self.assertDictEqual(value, cached_value)
+        self.assertIsNot(value, cached_value)
+
+        # The value of the request can be modified without side effect
+        cached_value['foo'].append(3)
+        self.assertIs(cached_value, cache.get('creme_core-test'))
+
+        self.clear_global_info()
+        self.assertDictEqual({'foo': [1, 2]}, cache.get('creme_core-test'))
+
+    @override_settings(CONFIG_CACHE_ALIAS=CACHE_ALIAS)
+    def test_not_shared(self):
+        cache = ConfigCache()
+        value = {'foo': 1}
+        cache.set('creme_core-test', value, shared=False)
+        self.assertIs(value, cache.get('creme_core-test'))
+
+        self.clear_global_info()
+        self.assertIsNone(cache.get('creme_core-test'))
+
+    @override_settings(CONFIG_CACHE_ALIAS=CACHE_ALIAS)
+    def test_invalidate(self):
+        cache = ConfigCache()
+        cache.set('creme_core-test', 'foo')
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            cache.invalidate()
+
+        self.assertEqual(1, len(callbacks))
+
+        # The value of the current request is kept
+        self.assertEqual('foo', cache.get('creme_core-test'))
+
+        self.clear_global_info()
+        self.assertIsNone(cache.get('creme_core-test'))
+
+    @override_settings(CONFIG_CACHE_ALIAS=CACHE_ALIAS)
+    def test_invalidate__other_process(self):
+        cache = ConfigCache()
+        cache.set('creme_core-test', 'foo')
+
+        other_cache = ConfigCache()
+        other_cache.invalidate()
+
+        # The generation is read once per request
+        self.assertEqual('foo', cache.get('creme_core-test'))
+
+        self.clear_global_info()
+        self.assertIsNone(cache.get('creme_core-test'))
+
+    @override_settings(CONFIG_CACHE_ALIAS=CACHE_ALIAS)
+    def test_setting_value(self):
+        sk = SettingKey(
+            id='creme_core-test_config_cache', description='Display logo?',
+            app_label='creme_core', type=SettingKey.BOOL,
+        )
+        self._register_key(sk)
+        SettingValue.objects.set_4_key(sk, True)
+
+        with self.assertNumQueries(1):
+            self.assertIs(True, SettingValue.objects.value_4_key(sk))
+
+        self.clear_global_info()
+
+        with self.assertNumQueries(0):
+            self.assertIs(True, SettingValue.objects.value_4_key(sk))
+
+        # Invalidation by signal
+        SettingValue.objects.set_4_key(sk, False)
+        self.clear_global_info()
+
+        with self.assertNumQueries(1):
+            self.assertIs(False, SettingValue.objects.value_4_key(sk))
+
+    @override_settings(CONFIG_CACHE_ALIAS=CACHE_ALIAS)
+    def test_setting_value__default(self):
+        "The default values are not shared."
+        sk = SettingKey(
+            id='creme_core-test_config_cache', description='Display logo?',
+            app_label='creme_core', type=SettingKey.BOOL,
+        )
+        self._register_key(sk)
+
+        self.assertEqual(12, SettingValue.objects.value_4_key(sk, default=12))
+
+        self.clear_global_info()
+        self.assertEqual(13, SettingValue.objects.value_4_key(sk, default=13))
+
+    @override_settings(CONFIG_CACHE_ALIAS=CACHE_ALIAS)
+    def test_fields_config(self):
+        FieldsConfig.objects.create(
+            content_type=FakeContact,
+            descriptions=[('phone', {FieldsConfig.HIDDEN: True})],
+        )
+        FieldsConfig.objects.get_for_models([FakeContact, FakeOrganisation])
+        self.clear_global_info()
+
+        with self.assertNumQueries(0):
+            fconfigs = FieldsConfig.objects.get_for_models([FakeContact, FakeOrganisation])
+
+        self.assertTrue(fconfigs[FakeContact].is_fieldname_hidden('phone'))
+        self.assertFalse(fconfigs[FakeOrganisation].is_fieldname_hidden('phone'))
+
+        # Invalidation by signal
+        fconf = fconfigs[FakeContact]
+        fconf.descriptions = [('phone', {FieldsConfig.HIDDEN: False})]
+        fconf.save()
+        self.clear_global_info()
+
+        self.assertFalse(
+            FieldsConfig.objects.get_for_model(FakeContact).is_fieldname_hidden('phone')
+        )
+
+    @override_settings(CONFIG_CACHE_ALIAS=CACHE_ALIAS)
+    def test_custom_fields(self):
+        create_cfield = CustomField.objects.create
+        cfield1 = create_cfield(
+            content_type=FakeContact, name='Hobby', field_type=CustomField.STR,
+        )
+
+        self.assertListEqual(
+            [cfield1.id], [*CustomField.objects.get_for_model(FakeContact)],
+        )
+        self.clear_global_info()
+
+        with self.assertNumQueries(0):
+            cfields = CustomField.objects.get_for_model(FakeContact)
+        self.assertListEqual([cfield1.id], [*cfields])
+
+        # Invalidation by signal
+        cfield2 = create_cfield(
+            content_type=FakeContact, name='Age', field_type=CustomField.INT,
+        )
+        self.clear_global_info()
+        self.assertListEqual(
+            [cfield1.id, cfield2.id], [*CustomField.objects.get_for_model(FakeContact)],
+        )
+
+        cfield1.delete()
+        self.clear_global_info()
+        self.assertListEqual(
+            [cfield2.id], [*CustomField.objects.get_for_model(FakeContact)],
+        )
@@ -1,10 +1,15 @@
+import logging
+import os
 from copy import deepcopy
 from datetime import date
 from decimal import Decimal
 from functools import partial
+from time import perf_counter
+from unittest import skipUnless
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.test import tag as test_tag
 from django.test.utils import override_settings
 from django.utils.formats import date_format, number_format
 from django.utils.timezone import localtime
@@ -50,6 +55,8 @@ from creme.creme_core.models import (
 
 from ..base import CremeTestCase
 
+logger = logging.getLogger(__name__)
+
 
 class EntityCellRegistryTestCase(CremeTestCase):
     def test_global(self):
@@ -607,6 +614,27 @@ class EntityCellRegularFieldTestCase(CremeTestCase):
             contacts[0].civility  # NOQA
             contacts[1].civility  # NOQA
 
+    def test_render_many(self):
+        user = self.get_root_user()
+        position = FakePosition.objects.all()[0]
+        create_contact = partial(FakeContact.objects.create, user=user)
+        contacts = [
+            create_contact(first_name='Yoko', last_name='Littner', position=position),
+            create_contact(first_name='Kamina', last_name='Jigai', email='kamina@gurren.jp'),
+        ]
+
+        for field_name in ('last_name', 'email', 'position'):
+            cell = EntityCellRegularField.build(model=FakeContact, name=field_name)
+
+            for tag in (ViewTag.HTML_LIST, ViewTag.TEXT_PLAIN):
+                self.assertListEqual(
+                    [cell.render(entity=c, user=user, tag=tag) for c in contacts],
+                    cell.render_many(contacts, user=user, tag=tag),
+                )
+
+        cell = EntityCellRegularField.build(model=FakeContact, name='last_name')
+        self.assertListEqual([], cell.render_many([], user=user, tag=ViewTag.HTML_LIST))
+
 
 @override_settings(CELL_SIZE=50)
 class EntityCellCustomFieldTestCase(CremeTestCase):
@@ -948,6 +976,27 @@ class EntityCellCustomFieldTestCase(CremeTestCase):
         self.assertIs(cell.is_hidden, False)
         self.assertIs(cell.is_excluded, True)
 
+    def test_render_many(self):
+        cfield = CustomField.objects.create(
+            name='Size (cm)', field_type=CustomField.INT, content_type=FakeContact,
+        )
+        cell = EntityCellCustomField(cfield)
+
+        user = self.get_root_user()
+        create_contact = partial(FakeContact.objects.create, user=user)
+        yoko = create_contact(first_name='Yoko', last_name='Littner')
+        kamina = create_contact(first_name='Kamina', last_name='Jigai')
+        cfield.value_class.objects.create(entity=yoko, custom_field=cfield, value=152)
+
+        contacts = [self.refresh(yoko), self.refresh(kamina)]
+        EntityCellCustomField.populate_entities(cells=[cell], entities=contacts, user=user)
+        self.assertListEqual(
+            ['152', ''], cell.render_many(contacts, user=user, tag=ViewTag.HTML_LIST),
+        )
+        self.assertListEqual(
+            ['152', ''], cell.render_many(contacts, user=user, tag=ViewTag.TEXT_PLAIN),
+        )
+
 
 @override_settings(CELL_SIZE=50)
 class EntityCellRelationTestCase(CremeTestCase):
@@ -1155,6 +1204,45 @@ class EntityCellRelationTestCase(CremeTestCase):
         with self.assertNumQueries(0):
             r1[0].real_object  # NOQA
 
+    def test_render_many(self):
+        user = self.login_as_standard(allowed_apps=['creme_core'])
+        self.add_credentials(user.role, own=['VIEW'])
+
+        loves = RelationType.objects.builder(
+            id='test-subject_love', predicate='Is loving',
+        ).symmetric(id='test-object_love', predicate='Is loved by').get_or_create()[0]
+        cell = EntityCellRelation(model=FakeContact, rtype=loves)
+
+        create_contact = partial(FakeContact.objects.create, user=user)
+        nagate  = create_contact(first_name='Nagate',  last_name='Tanikaze')
+        shizuka = create_contact(first_name='Shizuka', last_name='Hoshijiro')
+        izana   = create_contact(first_name='Izana',   last_name='Shinatose')
+        norio   = create_contact(first_name='Norio',   last_name='Kunato')
+        hidden  = create_contact(
+            first_name='Kobayashi', last_name='Yuhata', user=self.get_root_user(),
+        )
+
+        create_rel = partial(Relation.objects.create, user=user, type=loves)
+        create_rel(subject_entity=nagate,  object_entity=izana)
+        create_rel(subject_entity=nagate,  object_entity=norio)
+        create_rel(subject_entity=nagate,  object_entity=hidden)
+        create_rel(subject_entity=shizuka, object_entity=norio)
+        create_rel(subject_entity=shizuka, object_entity=hidden)
+
+        contacts = [nagate, shizuka, izana]
+        EntityCellRelation.populate_entities(cells=[cell], entities=contacts, user=user)
+
+        self.assertListEqual(
+            [f'{izana}/{norio}', f'{norio}', ''],
+            cell.render_many(contacts, user=user, tag=ViewTag.TEXT_PLAIN),
+        )
+
+        for tag in (ViewTag.HTML_LIST, ViewTag.TEXT_PLAIN):
+            self.assertListEqual(
+                [cell.render(entity=c, user=user, tag=tag) for c in contacts],
+                cell.render_many(contacts, user=user, tag=tag),
+            )
+
 
 @override_settings(CELL_SIZE=50)
 class EntityCellFunctionFieldTestCase(CremeTestCase):
@@ -1228,6 +1316,50 @@ class EntityCellFunctionFieldTestCase(CremeTestCase):
         self.assertEqual(funfield.verbose_name, cell.title)
         self.assertFalse(cell.is_multiline)
 
+    def test_render_many(self):
+        user = self.get_root_user()
+        create_contact = partial(FakeContact.objects.create, user=user)
+        contacts = [
+            create_contact(first_name='Nagate',  last_name='Tanikaze'),
+            create_contact(first_name='Shizuka', last_name='Hoshijiro'),
+        ]
+
+        ptype = CremePropertyType.objects.create(text='Is a pilot')
+        CremeProperty.objects.create(type=ptype, creme_entity=contacts[0])
+
+        cell = EntityCellFunctionField.build(FakeContact, 'get_pretty_properties')
+        self.assertListEqual(
+            ['Is a pilot', ''],
+            cell.render_many(contacts, user=user, tag=ViewTag.TEXT_PLAIN),
+        )
+
+    def test_render_many__error(self):
+        class PhoneFunctionField(FunctionField):
+            name = 'phone_or_error'
+            verbose_name = 'Phone'
+
+            def __call__(self, entity, user):
+                if not entity.phone:
+                    raise ValueError('No phone')
+
+                return FunctionFieldResult(entity.phone)
+
+        cell = EntityCellFunctionField(model=FakeContact, func_field=PhoneFunctionField())
+
+        user = self.get_root_user()
+        create_contact = partial(FakeContact.objects.create, user=user)
+        contacts = [
+            create_contact(first_name='Nagate',  last_name='Tanikaze', phone='123456'),
+            create_contact(first_name='Shizuka', last_name='Hoshijiro'),
+            create_contact(first_name='Izana',   last_name='Shinatose'),
+        ]
+
+        with self.assertLogs(level='ERROR') as logs_manager:
+            rendered = cell.render_many(contacts, user=user, tag=ViewTag.TEXT_PLAIN)
+
+        self.assertListEqual(['123456', '', ''], rendered)
+        self.assertEqual(1, len(logs_manager.records))  # Only one traceback per cell
+
 
 class EntityCellTestCase(CremeTestCase):
     def test_eq(self):
@@ -1304,3 +1436,136 @@ class EntityCellTestCase(CremeTestCase):
 
         with self.assertNumQueries(0):
             contacts[0].get_relations(loves.id,  real_obj_entities=True)
+
+    def test_render_many__queries(self):
+        "Column by column rendering of populated entities; no extra query."
+        user = self.get_root_user()
+        loves = RelationType.objects.builder(
+            id='test-subject_love', predicate='Is loving',
+        ).symmetric(id='test-object_love', predicate='Is loved by').get_or_create()[0]
+
+        position = FakePosition.objects.all()[0]
+        create_contact = partial(FakeContact.objects.create, user=user)
+        loved = create_contact(first_name='Izana', last_name='Shinatose')
+        contacts = [
+            create_contact(first_name='Nagate', last_name=f'Tanikaze #{i}', position=position)
+            for i in range(5)
+        ]
+        for c in contacts:
+            Relation.objects.create(user=user, subject_entity=c, type=loves, object_entity=loved)
+
+        build_rfield = partial(EntityCellRegularField.build, model=FakeContact)
+        cells = [
+            build_rfield(name='first_name'),
+            build_rfield(name='last_name'),
+            build_rfield(name='birthday'),
+            build_rfield(name='position'),
+            EntityCellRelation(model=FakeContact, rtype=loves),
+            EntityCellFunctionField.build(FakeContact, 'get_pretty_properties'),
+        ]
+        contacts = [*FakeContact.objects.filter(id__in=[c.id for c in contacts])]
+        EntityCell.mixed_populate_entities(cells, contacts, user)
+
+        for tag in (ViewTag.HTML_LIST, ViewTag.TEXT_PLAIN):
+            with self.assertNumQueries(0):
+                rows = [
+                    *zip(*[cell.render_many(contacts, user=user, tag=tag) for cell in cells]),
+                ]
+
+            self.assertListEqual(
+                [
+                    [cell.render(entity=c, user=user, tag=tag) for cell in cells]
+                    for c in contacts
+                ],
+                [[*row] for row in rows],
+            )
+
+
+@test_tag('benchmark')
+@skipUnless(
+    os.environ.get('CREME_BENCHMARKS'),
+    'Benchmark: set the environment variable CREME_BENCHMARKS to run it',
+)
+class EntityCellRenderingBenchmark(CremeTestCase):
+    """Compare the rendering column by column (EntityCell.render_many()) with
+    the rendering cell by cell, on a page of list-view.
+    The timings are logged (level WARNING, so they are displayed by default).
+
+    Usage:
+        CREME_BENCHMARKS=1 creme test --tag benchmark creme.creme_core.tests.core.test_entity_cell
+    """
+    ROWS = 1024
+    REPEAT = 5
+
+    def test_render_many(self):
+        user = self.get_root_user()
+
+        loves = RelationType.objects.builder(
+            id='test-subject_love', predicate='Is loving',
+        ).symmetric(id='test-object_love', predicate='Is loved by').get_or_create()[0]
+        cfield = CustomField.objects.create(
+            name='Size (cm)', field_type=CustomField.INT, content_type=FakeContact,
+        )
+
+        position = FakePosition.objects.all()[0]
+        create_contact = partial(
+            FakeContact.objects.create,
+            user=user, position=position, birthday=date(year=2001, month=4, day=1),
+        )
+        loved = create_contact(first_name='Izana', last_name='Shinatose')
+        contact_ids = []
+
+        for i in range(self.ROWS):
+            contact = create_contact(first_name='Nagate', last_name=f'Tanikaze #{i}')
+            contact_ids.append(contact.id)
+
+            if i % 2:
+                Relation.objects.create(
+                    user=user, subject_entity=contact, type=loves, object_entity=loved,
+                )
+            if i % 3:
+                cfield.value_class.objects.create(
+                    entity=contact, custom_field=cfield, value=i,
+                )
+
+        build_rfield = partial(EntityCellRegularField.build, model=FakeContact)
+        cells = [
+            build_rfield(name='first_name'),
+            build_rfield(name='last_name'),
+            build_rfield(name='birthday'),
+            build_rfield(name='position'),
+            build_rfield(name='user'),
+            EntityCellCustomField(cfield),
+            EntityCellRelation(model=FakeContact, rtype=loves),
+            EntityCellFunctionField.build(FakeContact, 'get_pretty_properties'),
+        ]
+        contacts = [*FakeContact.objects.filter(id__in=contact_ids).order_by('id')]
+        EntityCell.mixed_populate_entities(cells, contacts, user)
+
+        def best_time(func):
+            timings = []
+
+            for _i in range(self.REPEAT):
+                start = perf_counter()
+                result = func()
+                timings.append(perf_counter() - start)
+
+            return min(timings), result
+
+        for view_tag in (ViewTag.HTML_LIST, ViewTag.TEXT_PLAIN):
+            per_cell_time, per_cell_rows = best_time(lambda: [
+                [cell.render(entity=c, user=user, tag=view_tag) for cell in cells]
+                for c in contacts
+            ])
+            many_time, columns = best_time(lambda: [
+                cell.render_many(contacts, user=user, tag=view_tag) for cell in cells
+            ])
+
+            self.assertListEqual(per_cell_rows, [[*row] for row in zip(*columns)])
+            logger.warning(
+                'EntityCell rendering of %s rows x %s cells (tag=%s, best of %s): '
+                'per cell=%.1fms, render_many()=%.1fms (x%.2f)',
+                len(contacts), len(cells), view_tag.name, self.REPEAT,
+                per_cell_time * 1000, many_time * 1000,
+                per_cell_time / many_time,
+            )
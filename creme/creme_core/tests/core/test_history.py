@@ -1,8 +1,30 @@
 from functools import partial
 
-from creme.creme_core.core.history import do_toggle_history, toggle_history
-from creme.creme_core.models import FakeContact, HistoryLine, Language
-from creme.creme_core.models.history import TYPE_CREATION, is_history_enabled
+from django.db.transaction import atomic
+
+from creme.creme_core.core.history import (
+    buffered_history,
+    do_toggle_history,
+    toggle_history,
+)
+from creme.creme_core.models import (
+    FakeContact,
+    FakeOrganisation,
+    HistoryConfigItem,
+    HistoryLine,
+    Language,
+    Relation,
+    RelationType,
+)
+from creme.creme_core.models.history import (
+    TYPE_CREATION,
+    TYPE_EDITION,
+    TYPE_RELATED,
+    TYPE_RELATION,
+    TYPE_SYM_RELATION,
+    HistoryBuffer,
+    is_history_enabled,
+)
 
 from ..base import CremeTestCase
 
@@ -109,3 +131,168 @@ class HistoryTestCase(CremeTestCase):
         hline = HistoryLine.objects.order_by('-id').first()
         self.assertEqual(TYPE_CREATION, hline.type)
         self.assertEqual(fry.id, hline.entity.id)
+
+    def test_buffered_history(self):
+        user = self.get_root_user()
+        last_id = HistoryLine.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+        rtype = RelationType.objects.builder(
+            id='test-subject_employed', predicate='is employed',
+        ).symmetric(id='test-object_employed', predicate='employs').get_or_create()[0]
+        HistoryConfigItem.objects.create(relation_type=rtype)
+
+        self.assertIsNone(HistoryBuffer.get_current())
+
+        # NB: the lines are waiting for the commit of the test's transaction
+        with self.captureOnCommitCallbacks(execute=True), buffered_history():
+            self.assertIsInstance(HistoryBuffer.get_current(), HistoryBuffer)
+
+            fry = FakeContact.objects.create(user=user, first_name='Phillip', last_name='Fry')
+            orga = FakeOrganisation.objects.create(user=user, name='Planet Express')
+            Relation.objects.create(
+                user=user, subject_entity=fry, object_entity=orga, type=rtype,
+            )
+
+            # Lines are merged
+            fry = self.refresh(fry)
+            fry.phone = '123'
+            fry.save()
+            fry.email = 'fry@planet.exp'
+            fry.save()
+
+            self.assertFalse(HistoryLine.objects.filter(id__gt=last_id))
+
+        self.assertIsNone(HistoryBuffer.get_current())
+
+        hlines = [*HistoryLine.objects.filter(id__gt=last_id).order_by('id')]
+        self.assertListEqual(
+            [
+                TYPE_CREATION, TYPE_CREATION, TYPE_RELATION, TYPE_SYM_RELATION,
+                TYPE_EDITION, TYPE_RELATED,
+            ],
+            [hline.type for hline in hlines],
+        )
+        self.assertListEqual(
+            [fry.id, orga.id, fry.id, orga.id, fry.id, orga.id],
+            [hline.entity_id for hline in hlines],
+        )
+        self.assertEqual(user, hlines[0].entity_owner)
+
+        rel_hline = hlines[2]
+        sym_hline = hlines[3]
+        self.assertEqual(sym_hline.id, rel_hline.related_line.id)
+        self.assertEqual(rel_hline.id, sym_hline.related_line.id)
+        self.assertListEqual([rtype.id], rel_hline.modifications)
+
+        edition_hline = hlines[4]
+        self.assertListEqual(
+            [['phone', '123'], ['email', 'fry@planet.exp']],
+            edition_hline.modifications,
+        )
+        self.assertEqual(edition_hline.id, hlines[5].related_line.id)
+
+    def test_buffered_history__commit(self):
+        user = self.get_root_user()
+        count = HistoryLine.objects.count()
+
+        with buffered_history(size=2):
+            # Not committed => not inserted
+            with self.captureOnCommitCallbacks(execute=False):
+                with atomic():
+                    FakeContact.objects.create(user=user, first_name='Amy', last_name='Wong')
+                    FakeContact.objects.create(user=user, first_name='Leela', last_name='Turanga')
+
+            self.assertEqual(count, HistoryLine.objects.count())
+
+            with self.captureOnCommitCallbacks(execute=True):
+                with atomic():
+                    FakeContact.objects.create(user=user, first_name='Phillip', last_name='Fry')
+                    FakeContact.objects.create(user=user, first_name='Hubert', last_name='Fry')
+
+                self.assertEqual(count, HistoryLine.objects.count())
+
+            self.assertEqual(count + 2, HistoryLine.objects.count())
+
+    def test_buffered_history__rollback(self):
+        user = self.get_root_user()
+        count = HistoryLine.objects.count()
+
+        with self.captureOnCommitCallbacks(execute=True), buffered_history():
+            FakeContact.objects.create(user=user, first_name='Amy', last_name='Wong')
+
+            with self.assertRaises(ValueError):
+                with atomic():
+                    FakeContact.objects.create(user=user, first_name='Leela', last_name='Turanga')
+                    raise ValueError('Rollback')
+
+        hlines = [*HistoryLine.objects.order_by('id')[count:]]
+        self.assertEqual(1, len(hlines))
+        self.assertEqual('Amy Wong', hlines[0].entity_repr)
+
+    def test_buffered_history__deletion(self):
+        user = self.get_root_user()
+        count = HistoryLine.objects.count()
+
+        with self.captureOnCommitCallbacks(execute=True), buffered_history():
+            amy = FakeContact.objects.create(user=user, first_name='Amy', last_name='Wong')
+            amy.delete()
+
+        hlines = [*HistoryLine.objects.order_by('id')[count:]]
+        self.assertEqual(2, len(hlines))
+        self.assertIsNone(hlines[0].entity)
+        self.assertIsNone(hlines[1].entity)
+
+    def test_buffered_history__nested(self):
+        user = self.get_root_user()
+        count = HistoryLine.objects.count()
+
+        with self.captureOnCommitCallbacks(execute=True), buffered_history():
+            buffer = HistoryBuffer.get_current()
+
+            with buffered_history():
+                self.assertIs(buffer, HistoryBuffer.get_current())
+                FakeContact.objects.create(user=user, first_name='Amy', last_name='Wong')
+
+            self.assertIs(buffer, HistoryBuffer.get_current())
+            self.assertEqual(count, HistoryLine.objects.count())
+
+        self.assertEqual(count + 1, HistoryLine.objects.count())
+
+    def test_buffered_history__close_before_commit(self):
+        "The waiting lines are inserted at the commit, after the closing."
+        user = self.get_root_user()
+        count = HistoryLine.objects.count()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with buffered_history():
+                FakeContact.objects.create(user=user, first_name='Amy', last_name='Wong')
+
+                with self.assertRaises(ValueError):
+                    with atomic():
+                        FakeContact.objects.create(
+                            user=user, first_name='Leela', last_name='Turanga',
+                        )
+                        raise ValueError('Rollback')
+
+            self.assertEqual(count, HistoryLine.objects.count())
+
+        hlines = [*HistoryLine.objects.order_by('id')[count:]]
+        self.assertEqual(1, len(hlines))
+        self.assertEqual('Amy Wong', hlines[0].entity_repr)
+
+    def test_buffered_history__close_before_commit__deletion(self):
+        "Entity deleted after the closing, before the commit."
+        user = self.get_root_user()
+        count = HistoryLine.objects.count()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with buffered_history():
+                amy = FakeContact.objects.create(user=user, first_name='Amy', last_name='Wong')
+
+            amy.delete()
+
+        hlines = [*HistoryLine.objects.order_by('id')[count:]]
+        self.assertEqual(2, len(hlines))
+        self.assertIsNone(hlines[0].entity)
+        self.assertEqual('Amy Wong', hlines[0].entity_repr)
+        self.assertIsNone(hlines[1].entity)
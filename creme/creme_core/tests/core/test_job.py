@@ -1,18 +1,26 @@
+import multiprocessing
 import os
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
 from shutil import rmtree
 from tempfile import mkdtemp
 from unittest import skipIf
+from unittest.mock import patch
 
+import django
+from dateutil.relativedelta import relativedelta
 from django.core.exceptions import ImproperlyConfigured
 from django.test.utils import override_settings
 from django.utils.timezone import now
 
-from creme.creme_core.core.job import JobScheduler, _JobTypeRegistry
+from creme.creme_core.core.job import JobScheduler, _JobTypeRegistry, get_queue
+from creme.creme_core.core.job.metrics import JobSchedulerMetrics
+from creme.creme_core.core.job.queue import Command
 from creme.creme_core.core.job.queue.unix_socket import UnixSocketQueue
+from creme.creme_core.core.job.worker import JobWorkerPool, run_job
 from creme.creme_core.core.reminder import Reminder, reminder_registry
 from creme.creme_core.creme_jobs import reminder_type
 from creme.creme_core.creme_jobs.base import JobType
+from creme.creme_core.global_info import get_global_info, set_global_info
 from creme.creme_core.models import Job
 from creme.creme_core.utils.date_period import HoursPeriod
 from creme.creme_core.utils.dates import round_hour
@@ -56,6 +64,20 @@ class UnixSocketQueueTestCase(CremeTestCase):
             UnixSocketQueue(setting='unix_socket://')
 
 
+class CommandTestCase(CremeTestCase):
+    def test_build(self):
+        cmd = Command.build('START', '12')
+        self.assertEqual(Command.START, cmd.type)
+        self.assertEqual(12, cmd.data_id)
+
+        stats_cmd = Command.build('STATS', 'abc-123')
+        self.assertEqual(Command.STATS, stats_cmd.type)
+        self.assertEqual('abc-123', stats_cmd.data_id)
+
+        with self.assertRaises(ValueError):
+            Command.build('INVALID', '12')
+
+
 class JobTypeRegistryTestCase(CremeTestCase):
     def test_register__not_registered(self):
         class TestJobType(JobType):
@@ -150,6 +172,130 @@ class JobTypeRegistryTestCase(CremeTestCase):
         )
 
 
+class JobWorkerPoolTestCase(CremeTestCase):
+    def test_init(self):
+        pool = JobWorkerPool(size=3, max_jobs=10)
+        self.assertEqual(3, pool.size)
+        self.assertEqual(10, pool.max_jobs)
+        self.assertFalse(pool.started)
+
+        with self.assertRaises(ValueError):
+            JobWorkerPool(size=0)
+
+    def test_start_stop(self):
+        pool = JobWorkerPool(size=2, max_jobs=10)
+        ctxt_cls = type(multiprocessing.get_context('spawn'))
+
+        with patch.object(ctxt_cls, 'Pool') as pool_mock:
+            pool.start()
+            pool.start()  # Already started => no new pool
+
+        pool_mock.assert_called_once_with(
+            processes=2, initializer=django.setup, maxtasksperchild=10,
+        )
+        self.assertTrue(pool.started)
+
+        pool.run(job_id=12)
+        apply_async = pool_mock.return_value.apply_async
+        apply_async.assert_called_once()
+        self.assertEqual((run_job, (12,)), apply_async.call_args.args)
+
+        pool.stop()
+        self.assertFalse(pool.started)
+        pool_mock.return_value.terminate.assert_called_once()
+
+    def test_start__no_max_jobs(self):
+        pool = JobWorkerPool(size=1, max_jobs=0)
+
+        with patch.object(type(multiprocessing.get_context('spawn')), 'Pool') as pool_mock:
+            pool.start()
+
+        pool_mock.assert_called_once_with(
+            processes=1, initializer=django.setup, maxtasksperchild=None,
+        )
+
+    def test_run_job(self):
+        "The environment is cleaned between 2 jobs."
+        job = Job.objects.get(type_id=reminder_type.id)
+        set_global_info(test_worker='foo')
+
+        with patch.object(_JobTypeRegistry, '__call__') as call_mock:
+            with patch('creme.creme_core.core.job.worker.close_old_connections') as close_mock:
+                run_job(job.id)
+
+        call_mock.assert_called_once_with(job.id)
+        close_mock.assert_called_once()
+        self.assertIsNone(get_global_info('test_worker'))
+
+
+class JobSchedulerMetricsTestCase(CremeTestCase):
+    def test_empty(self):
+        metrics = JobSchedulerMetrics()
+        self.assertDictEqual(
+            {
+                'started': metrics.started.isoformat(),
+                'commands': {},
+                'latency': {'count': 0, 'average': None, 'maximum': None},
+                'duration': {'count': 0, 'average': None, 'maximum': None},
+                'jobs': {},
+            },
+            metrics.as_dict(),
+        )
+
+    def test_jobs(self):
+        metrics = JobSchedulerMetrics()
+        metrics.command_received(Command.START)
+        metrics.command_received(Command.START)
+        metrics.command_received(Command.END)
+
+        start = self.create_datetime(year=2026, month=3, day=1, hour=12, utc=True)
+        metrics.job_started(1, scheduled=start, started=start + timedelta(seconds=2))
+        metrics.job_started(2, scheduled=start, started=start + timedelta(seconds=4))
+        metrics.job_ended(1, ended=start + timedelta(seconds=12))
+
+        data = metrics.as_dict()
+        self.assertDictEqual({'START': 2, 'END': 1}, data['commands'])
+        self.assertDictEqual({'count': 2, 'average': 3.0, 'maximum': 4.0}, data['latency'])
+        self.assertDictEqual({'count': 1, 'average': 10.0, 'maximum': 10.0}, data['duration'])
+        self.assertDictEqual(
+            {
+                '1': {
+                    'runs': 1,
+                    'last_start': (start + timedelta(seconds=2)).isoformat(),
+                    'last_latency': 2.0,
+                    'last_duration': 10.0,
+                    'running': False,
+                },
+                '2': {
+                    'runs': 1,
+                    'last_start': (start + timedelta(seconds=4)).isoformat(),
+                    'last_latency': 4.0,
+                    'running': True,
+                },
+            },
+            data['jobs'],
+        )
+
+        # Early start => no negative latency
+        metrics.job_started(1, scheduled=start + timedelta(hours=1), started=start)
+        self.assertEqual(0, metrics.as_dict()['jobs']['1']['last_latency'])
+
+    def test_history(self):
+        metrics = JobSchedulerMetrics(history_size=2)
+        start = now()
+
+        for job_id in (1, 2, 1, 3):
+            metrics.job_started(job_id, scheduled=start)
+            metrics.job_ended(job_id)
+
+        data = metrics.as_dict()
+        self.assertEqual(2, data['latency']['count'])
+        self.assertEqual(2, data['duration']['count'])
+        # The job "2" is the oldest one
+        self.assertListEqual(['1', '3'], [*data['jobs']])
+        self.assertEqual(2, data['jobs']['1']['runs'])
+
+
 class JobSchedulerTestCase(CremeTestCase):
     def setUp(self):
         super().setUp()
@@ -225,3 +371,180 @@ class JobSchedulerTestCase(CremeTestCase):
             rounded_hour + timedelta(hours=1),
             JobScheduler()._next_wakeup(job),
         )
+
+    @override_settings(JOBMANAGER_WORKERS=0, MAX_USER_JOBS=5)
+    def test_workers__disabled(self):
+        scheduler = JobScheduler()
+        self.assertIsNone(scheduler._pool)
+        self.assertEqual(5, scheduler._max_user_jobs)
+
+    @override_settings(JOBMANAGER_WORKERS=3, JOBMANAGER_WORKER_MAX_JOBS=20, MAX_USER_JOBS=5)
+    def test_workers(self):
+        scheduler = JobScheduler()
+        pool = scheduler._pool
+        self.assertIsInstance(pool, JobWorkerPool)
+        self.assertEqual(3, pool.size)
+        self.assertEqual(20, pool.max_jobs)
+        self.assertFalse(pool.started)
+
+        # A worker is reserved to the system jobs
+        self.assertEqual(2, scheduler._max_user_jobs)
+
+        job = Job.objects.get(type_id=reminder_type.id)
+        with patch.object(JobWorkerPool, 'run') as run_mock:
+            scheduler._start_job(job)
+
+        run_mock.assert_called_once_with(job.id)
+        self.assertIs(run_mock.return_value, scheduler._procs[job.id])
+
+    @override_settings(JOBMANAGER_WORKERS=3, MAX_USER_JOBS=2)
+    def test_workers__max_user_jobs(self):
+        self.assertEqual(2, JobScheduler()._max_user_jobs)
+
+    @override_settings(JOBMANAGER_WORKERS=2, MAX_USER_JOBS=5)
+    def test_workers__minimum(self):
+        scheduler = JobScheduler()
+        self.assertEqual(2, scheduler._pool.size)
+        self.assertEqual(1, scheduler._max_user_jobs)
+
+    @override_settings(JOBMANAGER_WORKERS=1)
+    def test_workers__not_enough(self):
+        with self.assertRaises(ImproperlyConfigured):
+            JobScheduler()
+
+    def test_first_run_after(self):
+        first_run_after = JobScheduler._first_run_after
+        reference = datetime(
+            year=2020, month=1, day=1, hour=0, minute=0, second=30, tzinfo=timezone.utc,
+        )
+
+        # Reference in the future
+        self.assertEqual(
+            reference,
+            first_run_after(
+                reference=reference, now_value=reference - timedelta(hours=1),
+                period=relativedelta(minutes=1),
+            ),
+        )
+
+        # Long downtime with a short period
+        now_value = datetime(year=2026, month=10, day=17, hour=8, minute=5, tzinfo=timezone.utc)
+        self.assertEqual(
+            now_value + timedelta(seconds=30),
+            first_run_after(
+                reference=reference, now_value=now_value, period=relativedelta(minutes=1),
+            ),
+        )
+        self.assertEqual(
+            datetime(
+                year=2026, month=10, day=17, hour=9, minute=0, second=30, tzinfo=timezone.utc,
+            ),
+            first_run_after(
+                reference=reference, now_value=now_value, period=relativedelta(hours=3),
+            ),
+        )
+
+        # Exact multiple
+        self.assertEqual(
+            now_value,
+            first_run_after(
+                reference=now_value - timedelta(days=21), now_value=now_value,
+                period=relativedelta(weeks=1),
+            ),
+        )
+
+    def test_first_run_after__months(self):
+        first_run_after = JobScheduler._first_run_after
+        reference = datetime(year=2025, month=1, day=31, hour=12, tzinfo=timezone.utc)
+
+        self.assertEqual(
+            # NB: the day is not "clamped" to 28 (February)
+            datetime(year=2025, month=4, day=30, hour=12, tzinfo=timezone.utc),
+            first_run_after(
+                reference=reference,
+                now_value=datetime(year=2025, month=4, day=15, tzinfo=timezone.utc),
+                period=relativedelta(months=1),
+            ),
+        )
+        self.assertEqual(
+            datetime(year=2025, month=5, day=31, hour=12, tzinfo=timezone.utc),
+            first_run_after(
+                reference=reference,
+                now_value=datetime(year=2025, month=4, day=30, hour=13, tzinfo=timezone.utc),
+                period=relativedelta(months=1),
+            ),
+        )
+        self.assertEqual(
+            datetime(year=2027, month=1, day=31, hour=12, tzinfo=timezone.utc),
+            first_run_after(
+                reference=reference,
+                now_value=datetime(year=2026, month=10, day=17, tzinfo=timezone.utc),
+                period=relativedelta(years=1),
+            ),
+        )
+
+    def test_metrics(self):
+        scheduler = JobScheduler()
+        job = Job.objects.get(type_id=reminder_type.id)
+        scheduled = now() - timedelta(minutes=1)
+
+        with patch('creme.creme_core.core.job.scheduler.python_subprocess') as sub_mock:
+            scheduler._start_job(job, scheduled=scheduled)
+
+        sub_mock.assert_called_once()
+
+        metrics = scheduler.get_metrics()
+        self.assertEqual(1, metrics['processes'])
+        self.assertEqual(0, metrics['workers'])
+        self.assertDictEqual(
+            {
+                'user_jobs_waiting': 0,
+                'user_jobs_running': 0,
+                'max_user_jobs': scheduler._max_user_jobs,
+                'system_jobs_scheduled': 0,
+                'system_jobs_running': 0,
+                'system_jobs_late': 0,
+                'deferred_jobs': 0,
+            },
+            metrics['queue'],
+        )
+        self.assertEqual(1, metrics['latency']['count'])
+        self.assertGreaterEqual(metrics['latency']['average'], 60)
+
+        job_metrics = metrics['jobs'].get(str(job.id))
+        self.assertIsNotNone(job_metrics)
+        self.assertTrue(job_metrics['running'])
+
+        scheduler._end_job(job)
+        metrics = scheduler.get_metrics()
+        self.assertEqual(0, metrics['processes'])
+        self.assertEqual(1, metrics['duration']['count'])
+        self.assertFalse(metrics['jobs'][str(job.id)]['running'])
+
+    def test_metrics__queue(self):
+        scheduler = JobScheduler()
+        scheduler._retrieve_jobs()
+
+        metrics = scheduler.get_metrics()
+        queue_metrics = metrics['queue']
+        self.assertEqual(
+            Job.objects.filter(user__isnull=True).count(),
+            queue_metrics['system_jobs_scheduled'],
+        )
+        self.assertEqual(0, queue_metrics['user_jobs_waiting'])
+
+    def test_command_stats(self):
+        queue = get_queue()
+        queue.clear()
+
+        scheduler = JobScheduler()
+        cmd = Command.build(Command.STATS, 'abc')
+        scheduler._handle_command_stats(cmd)
+
+        sent_stats = queue.sent_stats
+        self.assertEqual(1, len(sent_stats))
+
+        sent_cmd, stats = sent_stats[0]
+        self.assertIs(cmd, sent_cmd)
+        self.assertIn('queue', stats)
+        self.assertIn('latency', stats)
@@ -0,0 +1,329 @@
+from functools import partial
+
+from django.test.utils import override_settings
+
+from creme.creme_core.core.entity_cell import (
+    EntityCellCustomField,
+    EntityCellFunctionField,
+    EntityCellRegularField,
+)
+from creme.creme_core.core.search import Searcher
+from creme.creme_core.core.search_index import (
+    DatabaseSearchIndex,
+    get_search_index,
+)
+from creme.creme_core.models import (
+    CustomField,
+    CustomFieldEnumValue,
+    CustomFieldInteger,
+    CustomFieldMultiEnum,
+    CustomFieldString,
+    FakeContact,
+    FakeImage,
+    FakeImageCategory,
+    FakeOrganisation,
+    FakeSector,
+    SearchConfigItem,
+    SearchIndexEntry,
+)
+
+from ..base import CremeTestCase
+
+BACKEND_PATH = 'creme.creme_core.core.search_index.DatabaseSearchIndex'
+
+
+@override_settings(SEARCH_INDEX_BACKEND=BACKEND_PATH)
+class DatabaseSearchIndexTestCase(CremeTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        cls._sci_backup = [*SearchConfigItem.objects.all()]
+        SearchConfigItem.objects.all().delete()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+
+        SearchConfigItem.objects.all().delete()
+        SearchConfigItem.objects.bulk_create(cls._sci_backup)
+
+    def _get_values(self, entity):
+        return dict(
+            SearchIndexEntry.objects.filter(entity=entity.id).values_list('cell_key', 'value')
+        )
+
+    def test_get_search_index(self):
+        index = get_search_index()
+        self.assertIsInstance(index, DatabaseSearchIndex)
+        self.assertIs(index, get_search_index())
+
+        with override_settings(SEARCH_INDEX_BACKEND=''):
+            self.assertIsNone(get_search_index())
+
+    def test_index_regular_fields(self):
+        user = self.get_root_user()
+        SearchConfigItem.objects.builder(
+            model=FakeContact, fields=['first_name', 'last_name', 'sector__title'],
+        ).get_or_create()
+
+        sector = FakeSector.objects.create(title='Linux dev')
+        contact = FakeContact.objects.create(
+            user=user, first_name='Linus', last_name='Torvalds', sector=sector,
+        )
+        self.assertDictEqual(
+            {
+                'regular_field-first_name': 'linus',
+                'regular_field-last_name': 'torvalds',
+                'regular_field-sector__title': 'linux dev',
+            },
+            self._get_values(contact),
+        )
+
+        entry = SearchIndexEntry.objects.filter(entity=contact.id).first()
+        self.assertEqual(contact.entity_type_id, entry.entity_ctype_id)
+
+        # Edition
+        contact.first_name = 'Linux'
+        contact.sector = None
+        contact.save()
+        self.assertDictEqual(
+            {
+                'regular_field-first_name': 'linux',
+                'regular_field-last_name': 'torvalds',
+            },
+            self._get_values(contact),
+        )
+
+        # Deletion
+        contact_id = contact.id
+        contact.delete()
+        self.assertFalse(SearchIndexEntry.objects.filter(entity=contact_id))
+
+    def test_index_regular_fields__all_fields(self):
+        "No configured cell => all the fields are indexed."
+        user = self.get_root_user()
+        SearchConfigItem.objects.create(content_type=FakeOrganisation)
+
+        orga = FakeOrganisation.objects.create(user=user, name='Bebop', phone='0123')
+        values = self._get_values(orga)
+        self.assertEqual('bebop', values.get('regular_field-name'))
+        self.assertEqual('0123',  values.get('regular_field-phone'))
+
+    def test_index_regular_fields__union(self):
+        "The cells of all the configurations are indexed."
+        user = self.get_root_user()
+        role = self.create_role(name='Basic')
+
+        builder = partial(SearchConfigItem.objects.builder, model=FakeContact)
+        builder(fields=['last_name']).get_or_create()
+        builder(fields=['first_name'], role=role).get_or_create()
+        builder(fields=['description'], role='superuser').get_or_create()
+
+        contact = FakeContact.objects.create(
+            user=user, first_name='Spike', last_name='Spiegel', description='Cowboy',
+        )
+        self.assertDictEqual(
+            {
+                'regular_field-first_name': 'spike',
+                'regular_field-last_name': 'spiegel',
+                'regular_field-description': 'cowboy',
+            },
+            self._get_values(contact),
+        )
+
+    def test_index_m2m(self):
+        user = self.get_root_user()
+        SearchConfigItem.objects.builder(
+            model=FakeImage, fields=['name', 'categories__name'],
+        ).get_or_create()
+
+        create_cat = FakeImageCategory.objects.create
+        cat1 = create_cat(name='Portrait')
+        cat2 = create_cat(name='Landscape')
+
+        img = FakeImage.objects.create(user=user, name='Bebop')
+        self.assertDictEqual({'regular_field-name': 'bebop'}, self._get_values(img))
+
+        img.categories.set([cat1, cat2])
+        self.assertDictEqual(
+            {
+                'regular_field-name': 'bebop',
+                'regular_field-categories__name': 'landscape\nportrait',
+            },
+            self._get_values(img),
+        )
+
+    def test_index_custom_fields(self):
+        user = self.get_root_user()
+
+        create_cfield = partial(CustomField.objects.create, content_type=FakeOrganisation)
+        cfield1 = create_cfield(name='Motto',     field_type=CustomField.STR)
+        cfield2 = create_cfield(name='Countries', field_type=CustomField.MULTI_ENUM)
+        cfield3 = create_cfield(name='Size',      field_type=CustomField.INT)  # Not configured
+
+        create_evalue = partial(CustomFieldEnumValue.objects.create, custom_field=cfield2)
+        eval_fr = create_evalue(value='France')
+        eval_ger = create_evalue(value='Germany')
+
+        SearchConfigItem.objects.create(
+            content_type=FakeOrganisation,
+            cells=[
+                EntityCellRegularField.build(FakeOrganisation, 'name'),
+                EntityCellCustomField(cfield1),
+                EntityCellCustomField(cfield2),
+            ],
+        )
+
+        orga = FakeOrganisation.objects.create(user=user, name='Bebop')
+        key1 = f'custom_field-{cfield1.id}'
+        key2 = f'custom_field-{cfield2.id}'
+
+        cf_value1 = CustomFieldString.objects.create(
+            custom_field=cfield1, entity=orga, value='Bang',
+        )
+        CustomFieldMultiEnum(custom_field=cfield2, entity=orga).set_value_n_save(
+            [eval_fr, eval_ger],
+        )
+        CustomFieldInteger.objects.create(custom_field=cfield3, entity=orga, value=12)
+        self.assertDictEqual(
+            {
+                'regular_field-name': 'bebop',
+                key1: 'bang',
+                key2: 'france / germany',
+            },
+            self._get_values(orga),
+        )
+
+        # Re-indexing of the entity
+        orga.save()
+        self.assertDictEqual(
+            {'regular_field-name': 'bebop', key1: 'bang', key2: 'france / germany'},
+            self._get_values(orga),
+        )
+
+        # Edition & deletion of the custom values
+        cf_value1.value = 'Boom'
+        cf_value1.save()
+        self.assertEqual('boom', self._get_values(orga).get(key1))
+
+        cf_value1.delete()
+        self.assertNotIn(key1, self._get_values(orga))
+
+    def test_build_q(self):
+        user = self.get_root_user()
+        SearchConfigItem.objects.builder(
+            model=FakeContact, fields=['first_name', 'last_name'],
+        ).get_or_create()
+
+        create_contact = partial(FakeContact.objects.create, user=user)
+        spike = create_contact(first_name='Spike', last_name='Spiegel')
+        jet   = create_contact(first_name='Jet',   last_name='Black')
+        faye  = create_contact(first_name='Faye',  last_name='Valentine')
+        FakeOrganisation.objects.create(user=user, name='Spike & co')
+
+        index = get_search_index()
+        build_cell = partial(EntityCellRegularField.build, FakeContact)
+        cells = [build_cell('first_name'), build_cell('last_name')]
+
+        def search(*words):
+            return {
+                *FakeContact.objects.filter(
+                    index.build_q(model=FakeContact, cells=cells, words=words),
+                    id__in=[spike.id, jet.id, faye.id],
+                ),
+            }
+
+        self.assertSetEqual({spike}, search('SPI'))
+        self.assertSetEqual({spike, faye}, search('i', 'L'))
+        self.assertSetEqual({jet}, search('jet', 'black'))
+        self.assertSetEqual(set(), search('spike', 'black'))
+
+        # Only the given cells are used
+        self.assertSetEqual(
+            set(),
+            {
+                *FakeContact.objects.filter(index.build_q(
+                    model=FakeContact, cells=[build_cell('first_name')], words=['spiegel'],
+                )),
+            },
+        )
+
+    def test_build_q__not_managed_cell(self):
+        self.assertIsNone(get_search_index().build_q(
+            model=FakeContact,
+            cells=[
+                EntityCellRegularField.build(FakeContact, 'last_name'),
+                EntityCellFunctionField.build(FakeContact, 'get_pretty_properties'),
+            ],
+            words=['foo'],
+        ))
+
+    def test_searcher(self):
+        user = self.get_root_user()
+        SearchConfigItem.objects.builder(
+            model=FakeContact, fields=['first_name', 'last_name'],
+        ).get_or_create()
+
+        create_contact = partial(FakeContact.objects.create, user=user)
+        spike = create_contact(first_name='Spike', last_name='Spiegel')
+        create_contact(first_name='Jet', last_name='Black')
+
+        searcher = Searcher([FakeContact], user=user)
+        self.assertIsInstance(searcher.index, DatabaseSearchIndex)
+
+        qs = searcher.search(FakeContact, 'spie')
+        self.assertIn('creme_core_searchindexentry', str(qs.query))
+        self.assertListEqual([spike], [*qs])
+
+        with override_settings(SEARCH_INDEX_BACKEND=''):
+            searcher = Searcher([FakeContact], user=user)
+
+        self.assertIsNone(searcher.index)
+        qs = searcher.search(FakeContact, 'spie')
+        self.assertNotIn('creme_core_searchindexentry', str(qs.query))
+        self.assertListEqual([spike], [*qs])
+
+    def test_rebuild_n_clear(self):
+        user = self.get_root_user()
+
+        create_contact = partial(FakeContact.objects.create, user=user)
+        spike = create_contact(first_name='Spike', last_name='Spiegel')
+        jet = create_contact(first_name='Jet', last_name='Black')
+        orga = FakeOrganisation.objects.create(user=user, name='Bebop')
+        self.assertFalse(self._get_values(spike))
+
+        # Configuration after the creation of the entities
+        SearchConfigItem.objects.builder(
+            model=FakeContact, fields=['last_name'],
+        ).get_or_create()
+        SearchConfigItem.objects.builder(
+            model=FakeOrganisation, fields=['name'],
+        ).get_or_create()
+
+        index = get_search_index()
+        count = FakeContact.objects.count()
+        self.assertEqual(count, index.rebuild(FakeContact, chunk_size=1))
+        self.assertDictEqual({'regular_field-last_name': 'spiegel'}, self._get_values(spike))
+        self.assertDictEqual({'regular_field-last_name': 'black'},   self._get_values(jet))
+        self.assertFalse(self._get_values(orga))
+
+        index.rebuild(FakeOrganisation)
+        self.assertDictEqual({'regular_field-name': 'bebop'}, self._get_values(orga))
+
+        index.clear(FakeContact)
+        self.assertFalse(self._get_values(spike))
+        self.assertTrue(self._get_values(orga))
+
+        index.clear()
+        self.assertFalse(SearchIndexEntry.objects.exists())
+
+    @override_settings(SEARCH_INDEX_BACKEND='')
+    def test_disabled(self):
+        user = self.get_root_user()
+        SearchConfigItem.objects.builder(
+            model=FakeContact, fields=['last_name'],
+        ).get_or_create()
+
+        contact = FakeContact.objects.create(user=user, first_name='Spike', last_name='Spiegel')
+        self.assertFalse(self._get_values(contact))
@@ -0,0 +1,139 @@
+from django.core.cache import caches
+from django.db.models import signals
+from django.test.utils import override_settings
+
+from creme.creme_core.core.token_cache import (
+    TokenCache,
+    concrete_models,
+    watch_m2m,
+    watch_models,
+)
+from creme.creme_core.models import (
+    CremeEntity,
+    FakeContact,
+    FakeDocument,
+    FakeDocumentCategory,
+    FakeFolder,
+    FakeOrganisation,
+    FakePosition,
+    FakeSector,
+)
+
+from ..base import CremeTestCase
+
+
+class TokenCacheTestCase(CremeTestCase):
+    CACHE_ALIAS = 'default'
+
+    def setUp(self):
+        super().setUp()
+        caches[self.CACHE_ALIAS].clear()
+
+    @override_settings(LISTVIEW_COUNT_CACHE_ALIAS='')
+    def test_disabled(self):
+        tokens = TokenCache(
+            key_prefix='creme_core-tests', alias_setting='LISTVIEW_COUNT_CACHE_ALIAS',
+        )
+        self.assertIsNone(tokens.cache)
+
+        with self.assertNoException():
+            tokens.renew('global')
+
+    @override_settings(LISTVIEW_COUNT_CACHE_ALIAS=CACHE_ALIAS)
+    def test_get(self):
+        tokens = TokenCache(
+            key_prefix='creme_core-tests', alias_setting='LISTVIEW_COUNT_CACHE_ALIAS',
+        )
+        cache = tokens.cache
+        self.assertIs(caches[self.CACHE_ALIAS], cache)
+        self.assertEqual('creme_core-tests-token-global', tokens.key('global'))
+
+        token1 = tokens.get(cache, 'global')
+        self.assertIsInstance(token1, str)
+        self.assertEqual(token1, cache.get('creme_core-tests-token-global'))
+        self.assertEqual(token1, tokens.get(cache, 'global'))
+
+        token2, token3 = tokens.get_many(cache, ['ctype-1', 'global'])
+        self.assertEqual(token1, token3)
+        self.assertNotEqual(token1, token2)
+        self.assertListEqual([token2], tokens.get_many(cache, ['ctype-1']))
+
+    @override_settings(LISTVIEW_COUNT_CACHE_ALIAS=CACHE_ALIAS)
+    def test_renew(self):
+        tokens = TokenCache(
+            key_prefix='creme_core-tests', alias_setting='LISTVIEW_COUNT_CACHE_ALIAS',
+        )
+        cache = tokens.cache
+        token1, other_token = tokens.get_many(cache, ['ctype-1', 'ctype-2'])
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            tokens.renew('ctype-1')
+            token2 = tokens.get(cache, 'ctype-1')
+            self.assertNotEqual(token1, token2)
+
+        self.assertEqual(1, len(callbacks))
+
+        # Renewed again by the commit
+        token3 = tokens.get(cache, 'ctype-1')
+        self.assertNotEqual(token1, token3)
+        self.assertNotEqual(token2, token3)
+
+        self.assertEqual(other_token, tokens.get(cache, 'ctype-2'))
+
+    def test_concrete_models(self):
+        entity_models = concrete_models(CremeEntity)
+        self.assertIn(CremeEntity, entity_models)
+        self.assertIn(FakeContact, entity_models)
+        self.assertIn(FakeOrganisation, entity_models)
+        self.assertNotIn(FakeSector, entity_models)
+
+        models = concrete_models(FakeSector, FakePosition)
+        self.assertIn(FakeSector, models)
+        self.assertIn(FakePosition, models)
+        self.assertNotIn(FakeContact, models)
+
+    def test_watch_models(self):
+        senders = []
+
+        def receiver(sender, instance, **kwargs):
+            senders.append(sender)
+
+        watch_models(receiver, models=[FakeSector], dispatch_uid='creme_core-tests')
+        self.addCleanup(
+            signals.post_save.disconnect,
+            sender=FakeSector, dispatch_uid='creme_core-tests-creme_core.fakesector',
+        )
+        self.addCleanup(
+            signals.post_delete.disconnect,
+            sender=FakeSector, dispatch_uid='creme_core-tests-creme_core.fakesector',
+        )
+
+        sector = FakeSector.objects.create(title='Mechanics')
+        FakePosition.objects.create(title='Pilot')
+        self.assertListEqual([FakeSector], senders)
+
+        sector.delete()
+        self.assertListEqual([FakeSector, FakeSector], senders)
+
+    def test_watch_m2m(self):
+        actions = []
+
+        def receiver(sender, instance, action, **kwargs):
+            actions.append(action)
+
+        watch_m2m(receiver, models=[FakeDocument], dispatch_uid='creme_core-tests')
+        through = FakeDocument.categories.through
+        self.addCleanup(
+            signals.m2m_changed.disconnect,
+            sender=through, dispatch_uid=f'creme_core-tests-{through._meta.label_lower}',
+        )
+
+        user = self.get_root_user()
+        doc = FakeDocument.objects.create(
+            user=user, title='Manual',
+            linked_folder=FakeFolder.objects.create(user=user, title='Manuals'),
+        )
+        self.assertFalse(actions)
+
+        doc.categories.add(FakeDocumentCategory.objects.create(name='Manuals'))
+        self.assertListEqual(['pre_add', 'post_add'], actions)
@@ -2,9 +2,11 @@ from functools import partial
 
 from django.db.transaction import atomic
 from django.db.utils import IntegrityError
+from django.test.utils import override_settings
 from django.utils.translation import gettext as _
 
 from creme.creme_core.constants import REL_SUB_HAS
+from creme.creme_core.core.config_cache import config_cache
 from creme.creme_core.core.entity_filter import condition_handler
 from creme.creme_core.core.entity_filter.operators import EndsWithOperator
 from creme.creme_core.core.workflow import (
@@ -21,6 +23,7 @@ from creme.creme_core.core.workflow import (
     WorkflowEngine,
     WorkflowEvent,
     WorkflowEventQueue,
+    WorkflowIndex,
     WorkflowRegistry,
     WorkflowSource,
     WorkflowTrigger,
@@ -98,6 +101,7 @@ class WorkflowEventsTestCase(CremeTestCase):
         evt = EntityCreated(entity=entity1)
         self.assertIsInstance(evt, WorkflowEvent)
         self.assertEqual(entity1, evt.entity)
+        self.assertEqual(FakeOrganisation, evt.index_key())
         self.assertEqual(f'EntityCreated(entity=FakeOrganisation(id={entity1.id}))', repr(evt))
 
         # eq ---
@@ -142,6 +146,7 @@ class WorkflowEventsTestCase(CremeTestCase):
         evt = PropertyAdded(creme_property=prop11)
         self.assertIsInstance(evt, WorkflowEvent)
         self.assertEqual(prop11, evt.creme_property)
+        self.assertEqual(ptype1.uuid, evt.index_key())
         self.assertEqual(
             f'PropertyAdded(creme_property=CremeProperty('
             f'type=CremePropertyType(text="Is cool"), '
@@ -177,6 +182,7 @@ class WorkflowEventsTestCase(CremeTestCase):
         evt = RelationAdded(relation=rel)
         self.assertIsInstance(evt, WorkflowEvent)
         self.assertEqual(rel, evt.relation)
+        self.assertEqual(REL_SUB_HAS, evt.index_key())
         self.maxDiff = None
         self.assertEqual(
             f'RelationAdded(relation=Relation('
@@ -266,6 +272,50 @@ class WorkflowEventQueueTestCase(CremeTestCase):
             queue.pickup(),
         )
 
+    def test_duplicate__after_slice(self):
+        queue = WorkflowEventQueue().append(
+            EntityCreated(entity=self.entity1)
+        ).append(
+            EntityEdited(entity=self.entity2)
+        )
+        self.assertListEqual([EntityEdited(entity=self.entity2)], queue.pickup(start=1))
+
+        queue.append(
+            EntityEdited(entity=self.entity2)  # Has been picked up => appended again
+        ).append(
+            EntityEdited(entity=self.entity1)  # Should not be appended
+        )
+        self.assertListEqual(
+            [EntityCreated(entity=self.entity1), EntityEdited(entity=self.entity2)],
+            queue.pickup(),
+        )
+
+    def test_duplicate__unhashable(self):
+        class TestEvent(WorkflowEvent):
+            def __init__(self, value):
+                self.value = value
+
+            def __eq__(self, other):
+                return isinstance(other, type(self)) and self.value == other.value
+
+        self.assertIsNone(TestEvent.__hash__)
+
+        queue = WorkflowEventQueue().append(
+            TestEvent(1)
+        ).append(
+            EntityEdited(entity=self.entity1)
+        ).append(
+            TestEvent(2)
+        ).append(
+            TestEvent(1)  # Should not be appended
+        ).append(
+            EntityEdited(entity=self.entity1)  # Should not be appended
+        )
+        self.assertListEqual(
+            [TestEvent(1), EntityEdited(entity=self.entity1), TestEvent(2)],
+            queue.pickup(),
+        )
+
 
 class SignalHandlersTestCase(CremeTestCase):
     def test_entity_created(self):
@@ -839,6 +889,176 @@ class WorkflowRegistryTestCase(CremeTestCase):
         self.assertIn(RelationAddingAction, actions)
 
 
+class WorkflowIndexTestCase(CremeTestCase):
+    def test_workflows(self):
+        user = self.get_root_user()
+
+        ptype1 = CremePropertyType.objects.create(text='Is cool')
+        ptype2 = CremePropertyType.objects.create(text='Is nice')
+        rtype = RelationType.objects.get(id=REL_SUB_HAS)
+
+        create_wf = partial(Workflow.objects.create, content_type=FakeOrganisation)
+        wf1 = create_wf(
+            title='Created Organisations #1',
+            trigger=EntityCreationTrigger(model=FakeOrganisation),
+        )
+        wf2 = create_wf(
+            title='Created Contacts',
+            content_type=FakeContact,
+            trigger=EntityCreationTrigger(model=FakeContact),
+        )
+        wf3 = create_wf(
+            title='Edited Organisations',
+            trigger=EntityEditionTrigger(model=FakeOrganisation),
+        )
+        wf4 = create_wf(
+            title='Cool Organisations',
+            trigger=PropertyAddingTrigger(entity_model=FakeOrganisation, ptype=ptype1),
+        )
+        wf5 = create_wf(
+            title='Organisations which have',
+            trigger=RelationAddingTrigger(
+                subject_model=FakeOrganisation, rtype=rtype, object_model=FakeContact,
+            ),
+        )
+        wf6 = create_wf(
+            title='Created Organisations #2',
+            trigger=EntityCreationTrigger(model=FakeOrganisation),
+        )
+        create_wf(
+            title='Disabled',
+            trigger=EntityCreationTrigger(model=FakeOrganisation),
+            enabled=False,
+        )
+        create_wf(title='Broken', json_trigger={'type': 'uninstalled_app-trigger'})
+
+        index = WorkflowIndex.get()
+        self.assertIsInstance(index, WorkflowIndex)
+
+        with self.assertNumQueries(0):
+            self.assertIs(index, WorkflowIndex.get())
+
+        orga = FakeOrganisation.objects.create(user=user, name='Acme')
+        contact = FakeContact.objects.create(user=user, first_name='Jed', last_name='Goshi')
+        self.assertListEqual([wf1, wf6], index.workflows(EntityCreated(entity=orga)))
+        self.assertListEqual([wf2], index.workflows(EntityCreated(entity=contact)))
+        self.assertListEqual([wf3], index.workflows(EntityEdited(entity=orga)))
+        self.assertListEqual([], index.workflows(EntityEdited(entity=contact)))
+
+        create_prop = partial(CremeProperty.objects.create, creme_entity=orga)
+        self.assertListEqual(
+            [wf4], index.workflows(PropertyAdded(creme_property=create_prop(type=ptype1))),
+        )
+        self.assertListEqual(
+            [], index.workflows(PropertyAdded(creme_property=create_prop(type=ptype2))),
+        )
+
+        create_rel = partial(
+            Relation.objects.create, user=user, subject_entity=orga, object_entity=contact,
+        )
+        self.assertListEqual(
+            [wf5], index.workflows(RelationAdded(relation=create_rel(type=rtype))),
+        )
+        self.assertListEqual(
+            [],
+            index.workflows(RelationAdded(relation=create_rel(type=rtype.symmetric_type))),
+        )
+
+    def test_not_indexed_trigger(self):
+        "Triggers without key are activated for all the events of their class."
+        class AnyCreationTrigger(EntityCreationTrigger):
+            type_id = 'creme_core-test_any_creation'
+
+            def index_key(self):
+                return None
+
+        workflow_registry.register_triggers(AnyCreationTrigger)
+        self.addCleanup(workflow_registry.unregister_triggers, AnyCreationTrigger)
+
+        create_wf = partial(Workflow.objects.create, content_type=FakeOrganisation)
+        wf1 = create_wf(
+            title='Any creation', trigger=AnyCreationTrigger(model=FakeOrganisation),
+        )
+        wf2 = create_wf(
+            title='Created Organisations',
+            trigger=EntityCreationTrigger(model=FakeOrganisation),
+        )
+
+        user = self.get_root_user()
+        index = WorkflowIndex.get()
+        self.assertListEqual(
+            [wf1, wf2],
+            index.workflows(EntityCreated(
+                entity=FakeOrganisation.objects.create(user=user, name='Acme'),
+            )),
+        )
+        self.assertListEqual(
+            [wf1],
+            index.workflows(EntityCreated(
+                entity=FakeContact.objects.create(user=user, last_name='Goshi'),
+            )),
+        )
+
+    def test_invalidation(self):
+        user = self.get_root_user()
+        orga = FakeOrganisation.objects.create(user=user, name='Acme')
+
+        index1 = WorkflowIndex.get()
+        self.assertListEqual([], index1.workflows(EntityCreated(entity=orga)))
+
+        wf = Workflow.objects.create(
+            title='Created Organisations',
+            content_type=FakeOrganisation,
+            trigger=EntityCreationTrigger(model=FakeOrganisation),
+        )
+        index2 = WorkflowIndex.get()
+        self.assertIsNot(index1, index2)
+        self.assertListEqual([wf], index2.workflows(EntityCreated(entity=orga)))
+
+        wf.delete()
+        self.assertListEqual([], WorkflowIndex.get().workflows(EntityCreated(entity=orga)))
+
+    @override_settings(CONFIG_CACHE_ALIAS='default')
+    def test_shared(self):
+        def invalidate():
+            with override_settings(CONFIG_CACHE_ALIAS='default'):
+                config_cache.invalidate()
+
+        invalidate()
+        self.addCleanup(invalidate)
+
+        user = self.get_root_user()
+        orga = FakeOrganisation.objects.create(user=user, name='Acme')
+        wf = Workflow.objects.create(
+            title='Created Organisations',
+            content_type=FakeOrganisation,
+            trigger=EntityCreationTrigger(model=FakeOrganisation),
+        )
+        WorkflowIndex.get()
+
+        self.clear_global_info()  # New request
+
+        with self.assertNumQueries(0):
+            index = WorkflowIndex.get()
+
+        # The Workflows are retrieved once per request
+        event = EntityCreated(entity=orga)
+        event.index_key()
+        with self.assertNumQueries(1):
+            self.assertListEqual([wf], index.workflows(event))
+        with self.assertNumQueries(0):
+            self.assertListEqual([wf], index.workflows(event))
+
+        # The index is immutable & not copied
+        self.clear_global_info()
+        self.assertIs(index, WorkflowIndex.get())
+
+        wf.enabled = False
+        wf.save()
+        self.clear_global_info()
+        self.assertListEqual([], WorkflowIndex.get().workflows(EntityCreated(entity=orga)))
+
+
 class WorkflowEngineTestCase(CremeTestCase):
     def test_simple(self):
         user1 = self.get_root_user()
@@ -0,0 +1,139 @@
+from functools import partial
+from unittest.mock import patch
+
+from creme.creme_core.creme_jobs.trash_cleaner import TrashDeletionPlanner
+from creme.creme_core.models import (
+    FakeContact,
+    FakeDocument,
+    FakeFolder,
+    FakeOrganisation,
+    Relation,
+    RelationType,
+)
+
+from ..base import CremeTestCase
+
+
+class TrashDeletionPlannerTestCase(CremeTestCase):
+    def test_protecting_fields(self):
+        self.assertListEqual(
+            [FakeDocument._meta.get_field('linked_folder')],
+            TrashDeletionPlanner.protecting_fields(FakeDocument),
+        )
+        self.assertListEqual([], TrashDeletionPlanner.protecting_fields(FakeContact))
+        # "parent" uses CASCADE
+        self.assertListEqual([], TrashDeletionPlanner.protecting_fields(FakeFolder))
+
+    def test_levels(self):
+        user = self.get_root_user()
+
+        create_folder = partial(FakeFolder.objects.create, user=user, is_deleted=True)
+        folder1 = create_folder(title='Earth maps')
+        folder2 = create_folder(title='Mars maps')
+        folder3 = create_folder(title='Venus maps', is_deleted=False)
+
+        create_doc = partial(FakeDocument.objects.create, user=user, is_deleted=True)
+        doc1 = create_doc(title='Japan map', linked_folder=folder1)
+        doc2 = create_doc(title='France map', linked_folder=folder1)
+        create_doc(title='Olympus Mons', linked_folder=folder2, is_deleted=False)  # Not deleted
+        doc4 = create_doc(title='Maxwell Montes', linked_folder=folder3)
+
+        contact = FakeContact.objects.create(
+            user=user, first_name='Spike', last_name='Spiegel', is_deleted=True,
+        )
+
+        planner = TrashDeletionPlanner(
+            user=user, entity_classes=[FakeFolder, FakeDocument, FakeContact],
+        )
+        self.assertListEqual(
+            [
+                {
+                    FakeFolder: [folder2.id],
+                    FakeDocument: [doc1.id, doc2.id, doc4.id],
+                    FakeContact: [contact.id],
+                },
+                {FakeFolder: [folder1.id]},
+            ],
+            planner.levels(),
+        )
+
+        self.assertListEqual(
+            [
+                (FakeFolder, [folder2.id]),
+                (FakeDocument, [doc1.id, doc2.id]),
+                (FakeDocument, [doc4.id]),
+                (FakeContact, [contact.id]),
+                (FakeFolder, [folder1.id]),
+            ],
+            [*planner.batches(size=2)],
+        )
+
+    def test_levels__queries(self):
+        "The number of queries does not depend on the number of entities."
+        user = self.get_root_user()
+
+        folder = FakeFolder.objects.create(user=user, title='Earth maps', is_deleted=True)
+        docs = [
+            FakeDocument.objects.create(
+                user=user, title=f'Map #{i}', linked_folder=folder, is_deleted=True,
+            ) for i in range(3)
+        ]
+
+        planner = TrashDeletionPlanner(user=user, entity_classes=[FakeFolder, FakeDocument])
+
+        # 1 query per class + 1 query per protecting ForeignKey
+        with self.assertNumQueries(3):
+            levels = planner.levels()
+
+        self.assertListEqual(
+            [{FakeDocument: [doc.id for doc in docs]}, {FakeFolder: [folder.id]}],
+            levels,
+        )
+
+    def test_levels__internal_relations(self):
+        user = self.get_root_user()
+
+        rtype = RelationType.objects.builder(
+            id='test-subject_employee', predicate='is employed by', is_internal=True,
+        ).symmetric(
+            id='test-object_employee', predicate='employs',
+        ).get_or_create()[0]
+
+        orga = FakeOrganisation.objects.create(user=user, name='Nerv', is_deleted=True)
+        create_contact = partial(FakeContact.objects.create, user=user, is_deleted=True)
+        contact1 = create_contact(first_name='Shinji', last_name='Ikari')
+        contact2 = create_contact(first_name='Rei', last_name='Ayanami')
+        Relation.objects.create(
+            user=user, subject_entity=contact1, type=rtype, object_entity=orga,
+        )
+
+        entity_classes = [FakeContact, FakeOrganisation]
+        self.assertListEqual(
+            [{FakeContact: [contact1.id, contact2.id], FakeOrganisation: [orga.id]}],
+            TrashDeletionPlanner(user=user, entity_classes=entity_classes).levels(),
+        )
+
+        # The organisation removes the relationships => it's deleted first
+        with patch.object(
+            FakeOrganisation, '_DELETABLE_INTERNAL_RTYPE_IDS', (rtype.symmetric_type_id,),
+        ):
+            levels = TrashDeletionPlanner(user=user, entity_classes=entity_classes).levels()
+
+        self.assertListEqual(
+            [
+                {FakeContact: [contact2.id], FakeOrganisation: [orga.id]},
+                {FakeContact: [contact1.id]},
+            ],
+            levels,
+        )
+
+    def test_levels__credentials(self):
+        user = self.login_as_standard()
+        self.add_credentials(user.role, own='*')
+
+        create_orga = partial(FakeOrganisation.objects.create, is_deleted=True)
+        orga1 = create_orga(user=user, name='Nerv')
+        create_orga(user=self.get_root_user(), name='Seele')
+
+        planner = TrashDeletionPlanner(user=user, entity_classes=[FakeOrganisation])
+        self.assertListEqual([{FakeOrganisation: [orga1.id]}], planner.levels())
@@ -9,18 +9,25 @@ from creme.creme_core.forms.mass_import import (
     CustomFieldExtractor,
     CustomfieldExtractorField,
     CustomFieldExtractorWidget,
+    EntityExtractionCommand,
+    EntityExtractor,
+    LookupCache,
     RegularFieldExtractor,
     RegularFieldExtractorField,
     RegularFieldExtractorWidget,
+    RelationExtractor,
 )
 from creme.creme_core.models import (
     CustomField,
     CustomFieldEnumValue,
     FakeContact,
+    FakeOrganisation,
     FakeSector,
+    RelationType,
 )
 
 from ..base import CremeTestCase
+from ..fake_constants import FAKE_REL_SUB_EMPLOYED_BY
 
 # TODO: complete
 #    - complete existing test cases
@@ -31,6 +38,89 @@ from ..base import CremeTestCase
 #    - test widgets ?
 
 
+class LookupCacheTestCase(CremeTestCase):
+    def test_fill(self):
+        sector1, sector2 = FakeSector.objects.order_by('id')[:2]
+
+        cache = LookupCache()
+        self.assertEqual(0, len(cache))
+        self.assertIsNone(cache.get(sector1.title))
+
+        with self.assertNumQueries(1):
+            cache.fill(
+                queryset=FakeSector.objects.all(),
+                field_name='title',
+                values=[sector1.title, sector2.title, 'Unknown', ''],
+            )
+
+        self.assertEqual(2, len(cache))
+        self.assertListEqual([sector1], cache.get(sector1.title))
+        self.assertListEqual([sector2], cache.get(sector2.title))
+        self.assertIsNone(cache.get('Unknown'))
+
+        # Known values are not retrieved again
+        with self.assertNumQueries(0):
+            cache.fill(
+                queryset=FakeSector.objects.all(), field_name='title', values=[sector1.title],
+            )
+
+    def test_fill__several_instances(self):
+        "The order of the QuerySet is respected."
+        user = self.get_root_user()
+        create_orga = partial(FakeOrganisation.objects.create, user=user, name='Nerv')
+        orga1 = create_orga(description='B')
+        orga2 = create_orga(description='A')
+
+        cache = LookupCache()
+        cache.fill(queryset=FakeOrganisation.objects.all(), field_name='name', values=['Nerv'])
+        self.assertListEqual([orga1, orga2], cache.get('Nerv'))
+
+        cache.clear()
+        cache.fill(
+            queryset=FakeOrganisation.objects.order_by('description'),
+            field_name='name', values=['Nerv'],
+        )
+        self.assertListEqual([orga2, orga1], cache.get('Nerv'))
+
+    def test_fill__foreign_key(self):
+        user = self.get_root_user()
+        sector = FakeSector.objects.first()
+        orga = FakeOrganisation.objects.create(user=user, name='Nerv', sector=sector)
+
+        cache = LookupCache()
+        cache.fill(
+            queryset=FakeOrganisation.objects.all(),
+            field_name='sector', values=[str(sector.id)],
+        )
+        self.assertListEqual([orga], cache.get(str(sector.id)))
+
+    def test_fill__invalid_values(self):
+        cache = LookupCache()
+
+        with self.assertNoException():
+            cache.fill(
+                queryset=FakeSector.objects.all(), field_name='id', values=['notanint'],
+            )
+            cache.fill(
+                queryset=FakeSector.objects.all(), field_name='invalid', values=['foo'],
+            )
+
+        self.assertEqual(0, len(cache))
+
+    def test_fill__max_size(self):
+        sector1, sector2, sector3 = FakeSector.objects.order_by('id')[:3]
+
+        cache = LookupCache(max_size=2)
+        fill = partial(cache.fill, queryset=FakeSector.objects.all(), field_name='title')
+        fill(values=[sector1.title, sector2.title])
+        self.assertEqual(2, len(cache))
+
+        fill(values=[sector3.title])
+        self.assertEqual(1, len(cache))
+        self.assertIsNone(cache.get(sector1.title))
+        self.assertListEqual([sector3], cache.get(sector3.title))
+
+
 class ExtractorTestCase(CremeTestCase):
     # TODO: factorise
     @classmethod
@@ -150,11 +240,128 @@ class ExtractorTestCase(CremeTestCase):
         sector = self.get_object_or_fail(FakeSector, title=title)
         self.assertEqual(sector, value)
 
+    def test_extract__sub_field__prefetch(self):
+        user = self.user
+        extractor = RegularFieldExtractor(
+            column_index=3,
+            default_value=None,
+            value_castor=int,
+        )
+        extractor.set_subfield_search(
+            subfield_search='title',
+            subfield_model=FakeSector,
+            multiple=False,
+            creation_form_class=None,
+        )
+
+        sector1, sector2 = FakeSector.objects.all()[:2]
+        line1 = ['Claus', 'Valca', sector1.title]
+        line2 = ['Lavie', 'Head', sector2.title]
+        line3 = ['Alex', 'Row', 'Unknown sector']
+
+        with self.assertNumQueries(1):
+            extractor.prefetch([line1, line2, line3], user)
+
+        with self.assertNumQueries(0):
+            self.assertEqual((sector1, None), extractor.extract_value(line1, user))
+            self.assertEqual((sector2, None), extractor.extract_value(line2, user))
+
+        # Unknown values are searched again
+        with self.assertNumQueries(1):
+            value3, err_msg3 = extractor.extract_value(line3, user)
+
+        self.assertIsNone(value3)
+        self.assertTrue(err_msg3)
+
+    def test_extract__sub_field__prefetch__multiple(self):
+        user = self.user
+        extractor = RegularFieldExtractor(
+            column_index=1,
+            default_value=None,
+            value_castor=int,
+        )
+        extractor.set_subfield_search(
+            subfield_search='title',
+            subfield_model=FakeSector,
+            multiple=True,
+            creation_form_class=None,
+        )
+
+        sector = FakeSector.objects.first()
+        line = [sector.title]
+        extractor.prefetch([line], user)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(([sector], None), extractor.extract_value(line, user))
+
     # TODO: creation error
     # TODO: multiple=True
     # TODO: value_castor + ValidationError
 
 
+class EntityExtractorTestCase(CremeTestCase):
+    def test_extract__prefetch(self):
+        user = self.get_root_user()
+        create_orga = partial(FakeOrganisation.objects.create, user=user)
+        orga1 = create_orga(name='Nerv')
+        orga2 = create_orga(name='Seele')
+
+        cmd = EntityExtractionCommand(
+            model=FakeOrganisation, field_name='name', column_index='2', create=False,
+        )
+        cmd.build_column_index()
+        extractor = EntityExtractor([cmd])
+
+        line1 = ['Ikari', orga1.name]
+        line2 = ['Kihl', orga2.name]
+        line3 = ['Ayanami', 'Unknown']
+
+        with self.assertNumQueries(1):
+            extractor.prefetch([line1, line2, line3], user)
+
+        with self.assertNumQueries(0):
+            self.assertEqual((orga1, None), extractor.extract_value(line1, user))
+            self.assertEqual((orga2, None), extractor.extract_value(line2, user))
+
+        value3, err_msg3 = extractor.extract_value(line3, user)
+        self.assertIsNone(value3)
+        self.assertTrue(err_msg3)
+
+
+class RelationExtractorTestCase(CremeTestCase):
+    def test_extract__prefetch(self):
+        user = self.get_root_user()
+        create_orga = partial(FakeOrganisation.objects.create, user=user)
+        orga1 = create_orga(name='Nerv')
+        orga2 = create_orga(name='Seele')
+
+        rtype = RelationType.objects.get(pk=FAKE_REL_SUB_EMPLOYED_BY)
+        extractor = RelationExtractor(
+            column_index=1,
+            rtype=rtype,
+            subfield_search='name',
+            related_model=FakeOrganisation,
+            create_if_unfound=False,
+        )
+
+        line1 = [orga1.name]
+        line2 = [orga2.name]
+
+        with self.assertNumQueries(1):
+            extractor.prefetch([line1, line2], user)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(((rtype, orga1), None), extractor.extract_value(line1, user))
+            self.assertEqual(((rtype, orga2), None), extractor.extract_value(line2, user))
+
+        # The cache is not used with another user (credentials)
+        other_user = self.create_user(index=1)
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                ((rtype, orga1), None), extractor.extract_value(line1, other_user),
+            )
+
+
 class CustomFieldExtractorTestCase(CremeTestCase):
     @classmethod
     def setUpClass(cls):
@@ -365,6 +572,45 @@ class CustomFieldExtractorTestCase(CremeTestCase):
         eval_id, err_msg = extractor.extract_value(line, user=self.user)
         self.assertIsNone(err_msg)
 
+    def test_extract__enum__prefetch(self):
+        user = self.user
+        cfield = CustomField.objects.create(
+            name='Hobby',
+            field_type=CustomField.ENUM,
+            content_type=FakeContact,
+        )
+
+        create_evalue = partial(CustomFieldEnumValue.objects.create, custom_field=cfield)
+        eval1 = create_evalue(value='Piloting')
+        create_evalue(value='piloting')
+        eval3 = create_evalue(value='Mechanic')
+
+        extractor = CustomFieldExtractor(
+            column_index=3,
+            default_value='',
+            value_castor=cfield.get_formfield(None).clean,
+            custom_field=cfield,
+            create_if_unfound=False,
+        )
+
+        line1 = ['Claus', 'Valca', 'PILOTING']
+        line2 = ['Lavie', 'Head', eval3.value]
+        line3 = ['Alvis', 'Hamilton', 'Cooking']
+
+        with self.assertNumQueries(1):
+            extractor.prefetch([line1, line2, line3], user)
+
+        with self.assertNumQueries(0):
+            self.assertEqual((eval1.id, None), extractor.extract_value(line1, user))
+            self.assertEqual((eval3.id, None), extractor.extract_value(line2, user))
+
+        # Unknown choices are searched again
+        with self.assertNumQueries(1):
+            value3, err_msg3 = extractor.extract_value(line3, user)
+
+        self.assertEqual('', value3)
+        self.assertTrue(err_msg3)
+
     def test_extract__multi_enum(self):
         user = self.user
         cfield = CustomField.objects.create(
@@ -0,0 +1,166 @@
+from unittest import skipUnless
+from unittest.mock import patch
+
+from django.db import connection
+from django.test.utils import override_settings
+
+from creme.creme_core.gui.listview import counter_classes
+from creme.creme_core.gui.listview.count import (
+    CachedCounter,
+    EntitiesCount,
+    EstimatedCounter,
+    ExactCounter,
+)
+from creme.creme_core.models import (
+    CremeProperty,
+    CremePropertyType,
+    FakeContact,
+    FakeOrganisation,
+    Relation,
+    RelationType,
+)
+from creme.creme_core.tests.base import CremeTestCase
+
+
+class ListViewCountTestCase(CremeTestCase):
+    def setUp(self):
+        super().setUp()
+        with override_settings(LISTVIEW_COUNT_CACHE_ALIAS='default'):
+            CachedCounter.invalidate_all()
+
+    def test_classes(self):
+        self.assertEqual(ExactCounter,     counter_classes['exact'])
+        self.assertEqual(CachedCounter,    counter_classes['cached'])
+        self.assertEqual(EstimatedCounter, counter_classes['estimated'])
+
+    def test_exact(self):
+        user = self.get_root_user()
+        create_orga = FakeOrganisation.objects.create
+        create_orga(user=user, name='Bebop')
+        create_orga(user=user, name='Swordfish')
+
+        qs = FakeOrganisation.objects.all()
+
+        with self.assertNumQueries(1):
+            count = ExactCounter().count(qs, model=FakeOrganisation)
+
+        self.assertEqual(EntitiesCount(value=qs.count()), count)
+        self.assertFalse(count.estimated)
+
+    @override_settings(LISTVIEW_COUNT_CACHE_ALIAS='')
+    def test_cached__disabled(self):
+        counter = CachedCounter()
+        self.assertIsNone(counter.cache)
+
+        qs = FakeOrganisation.objects.all()
+        counter.count(qs, model=FakeOrganisation)
+
+        with self.assertNumQueries(1):
+            counter.count(qs, model=FakeOrganisation)
+
+    @override_settings(LISTVIEW_COUNT_MODE='cached', LISTVIEW_COUNT_CACHE_ALIAS='default')
+    def test_cached(self):
+        user = self.get_root_user()
+        FakeOrganisation.objects.create(user=user, name='Bebop')
+
+        counter = CachedCounter()
+        qs = FakeOrganisation.objects.all()
+        expected = qs.count()
+
+        with self.assertNumQueries(1):
+            count1 = counter.count(qs, model=FakeOrganisation)
+        self.assertEqual(EntitiesCount(value=expected), count1)
+
+        with self.assertNumQueries(0):
+            count2 = counter.count(qs, model=FakeOrganisation)
+        self.assertEqual(count1, count2)
+
+        # Other query => other count
+        with self.assertNumQueries(1):
+            count3 = counter.count(qs.filter(name='Bebop'), model=FakeOrganisation)
+        self.assertEqual(1, count3.value)
+
+        # Invalidation by signal
+        FakeOrganisation.objects.create(user=user, name='Swordfish')
+
+        with self.assertNumQueries(1):
+            count4 = counter.count(qs, model=FakeOrganisation)
+        self.assertEqual(expected + 1, count4.value)
+
+        # Another type is not invalidated
+        FakeContact.objects.create(user=user, last_name='Spiegel')
+
+        with self.assertNumQueries(0):
+            counter.count(qs, model=FakeOrganisation)
+
+    @override_settings(LISTVIEW_COUNT_MODE='cached', LISTVIEW_COUNT_CACHE_ALIAS='default')
+    def test_cached__relations_n_properties(self):
+        user = self.get_root_user()
+        orga = FakeOrganisation.objects.create(user=user, name='Bebop')
+        contact = FakeContact.objects.create(user=user, last_name='Spiegel')
+
+        counter = CachedCounter()
+        qs = FakeOrganisation.objects.all()
+        counter.count(qs, model=FakeOrganisation)
+
+        rtype = RelationType.objects.smart_update_or_create(
+            ('test-subject_employed_by', 'is employed by'),
+            ('test-object_employed_by',  'employs'),
+        )[0]
+        Relation.objects.create(
+            user=user, subject_entity=contact, type=rtype, object_entity=orga,
+        )
+
+        with self.assertNumQueries(1):
+            counter.count(qs, model=FakeOrganisation)
+
+        ptype = CremePropertyType.objects.create(text='Is cool')
+        CremeProperty.objects.create(type=ptype, creme_entity=orga)
+
+        with self.assertNumQueries(1):
+            counter.count(qs, model=FakeOrganisation)
+
+    @override_settings(LISTVIEW_COUNT_MODE='exact', LISTVIEW_COUNT_CACHE_ALIAS='default')
+    def test_cached__exact_mode(self):
+        "The signals do not renew the tokens in 'exact' mode."
+        user = self.get_root_user()
+        counter = CachedCounter()
+        qs = FakeOrganisation.objects.all()
+        counter.count(qs, model=FakeOrganisation)
+
+        FakeOrganisation.objects.create(user=user, name='Bebop')
+
+        with self.assertNumQueries(0):
+            counter.count(qs, model=FakeOrganisation)
+
+        CachedCounter.invalidate_all()
+
+        with self.assertNumQueries(1):
+            counter.count(qs, model=FakeOrganisation)
+
+    @override_settings(LISTVIEW_COUNT_CACHE_ALIAS='', FAST_QUERY_MODE_THRESHOLD=100)
+    def test_estimated(self):
+        counter = EstimatedCounter()
+        qs = FakeOrganisation.objects.all()
+
+        with patch.object(EstimatedCounter, 'estimate', return_value=100):
+            count1 = counter.count(qs, model=FakeOrganisation)
+        self.assertEqual(EntitiesCount(value=100, estimated=True), count1)
+
+        with patch.object(EstimatedCounter, 'estimate', return_value=99):
+            count2 = counter.count(qs, model=FakeOrganisation)
+        self.assertEqual(EntitiesCount(value=qs.count()), count2)
+
+        with patch.object(EstimatedCounter, 'estimate', return_value=None):
+            count3 = counter.count(qs, model=FakeOrganisation)
+        self.assertEqual(EntitiesCount(value=qs.count()), count3)
+
+    @skipUnless(connection.vendor != 'postgresql', 'Only for the DBMS without estimation')
+    def test_estimate__not_available(self):
+        self.assertIsNone(EstimatedCounter().estimate(FakeOrganisation.objects.all()))
+
+    @skipUnless(connection.vendor == 'postgresql', 'Only PostgreSQL supports estimation')
+    def test_estimate__postgresql(self):
+        estimate = EstimatedCounter().estimate(FakeOrganisation.objects.all())
+        self.assertIsInstance(estimate, int)
+        self.assertGreaterEqual(estimate, 0)
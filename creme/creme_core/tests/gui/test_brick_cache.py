@@ -0,0 +1,200 @@
+from django.test.utils import override_settings
+
+from creme.creme_core.gui.brick_cache import BrickCache, brick_cache
+from creme.creme_core.gui.bricks import BrickManager, SimpleBrick
+from creme.creme_core.models import (
+    BrickState,
+    FakeContact,
+    FakeOrganisation,
+    Relation,
+    RelationType,
+)
+
+from ..base import CremeTestCase
+from ..fake_constants import FAKE_REL_SUB_EMPLOYED_BY
+
+
+class _CountingBrick(SimpleBrick):
+    fragment_cache = True
+
+    def __init__(self):
+        super().__init__()
+        self.renders = 0
+
+    def detailview_display(self, context):
+        self.renders += 1
+        return f'<div>#{self.renders}</div>'
+
+
+class OrganisationsBrick(_CountingBrick):
+    id = SimpleBrick.generate_id('creme_core', 'test_brick_cache_orgas')
+    dependencies = (FakeOrganisation,)
+
+
+class EmployeesBrick(_CountingBrick):
+    id = SimpleBrick.generate_id('creme_core', 'test_brick_cache_employees')
+    dependencies = (Relation,)
+    relation_type_deps = (FAKE_REL_SUB_EMPLOYED_BY,)
+
+
+class WildcardBrick(_CountingBrick):
+    id = SimpleBrick.generate_id('creme_core', 'test_brick_cache_wildcard')
+    dependencies = '*'
+
+
+@override_settings(BRICKS_CACHE_ALIAS='default', BRICKS_CACHE_TIMEOUT=None)
+class BrickCacheTestCase(CremeTestCase):
+    def setUp(self):
+        super().setUp()
+        BrickCache.invalidate_all()
+
+    def _render(self, brick, user, instance=None, url=None):
+        context = self.build_context(user=user, instance=instance, url=url)
+        BrickManager.get(context).add_group(brick.id, brick)
+
+        return brick_cache.render(brick=brick, method='detailview_display', context=context)
+
+    @override_settings(BRICKS_CACHE_ALIAS='')
+    def test_disabled(self):
+        self.assertIsNone(brick_cache.cache)
+
+        user = self.get_root_user()
+        brick = OrganisationsBrick()
+        self.assertEqual('<div>#1</div>', self._render(brick, user))
+        self.assertEqual('<div>#2</div>', self._render(brick, user))
+
+    def test_not_enabled_by_brick(self):
+        class NotCachedBrick(OrganisationsBrick):
+            fragment_cache = False
+
+        user = self.get_root_user()
+        brick = NotCachedBrick()
+        self._render(brick, user)
+        self._render(brick, user)
+        self.assertEqual(2, brick.renders)
+
+    def test_model_dependencies(self):
+        user = self.get_root_user()
+        brick = OrganisationsBrick()
+
+        self.assertEqual('<div>#1</div>', self._render(brick, user))
+        self.assertEqual('<div>#1</div>', self._render(brick, user))
+        self.assertEqual(1, brick.renders)
+
+        # Not a dependency
+        FakeContact.objects.create(user=user, first_name='Spike', last_name='Spiegel')
+        self._render(brick, user)
+        self.assertEqual(1, brick.renders)
+
+        # Dependency
+        orga = FakeOrganisation.objects.create(user=user, name='Bebop')
+        self.assertEqual('<div>#2</div>', self._render(brick, user))
+
+        orga.delete()
+        self._render(brick, user)
+        self.assertEqual(3, brick.renders)
+
+    def test_relation_type_dependencies(self):
+        user = self.get_root_user()
+        brick = EmployeesBrick()
+        self._render(brick, user)
+
+        create_contact = FakeContact.objects.create
+        contact1 = create_contact(user=user, first_name='Spike', last_name='Spiegel')
+        contact2 = create_contact(user=user, first_name='Jet', last_name='Black')
+        orga = FakeOrganisation.objects.create(user=user, name='Bebop')
+
+        rtype = RelationType.objects.builder(
+            id='test-subject_loves', predicate='loves',
+        ).symmetric(id='test-object_loves', predicate='is loved by').get_or_create()[0]
+        Relation.objects.create(
+            user=user, subject_entity=contact1, type=rtype, object_entity=contact2,
+        )
+        self._render(brick, user)
+        self.assertEqual(1, brick.renders)
+
+        Relation.objects.create(
+            user=user, subject_entity=contact1, object_entity=orga,
+            type_id=FAKE_REL_SUB_EMPLOYED_BY,
+        )
+        self._render(brick, user)
+        self.assertEqual(2, brick.renders)
+
+    def test_wildcard_dependencies(self):
+        user = self.get_root_user()
+        brick = WildcardBrick()
+        self._render(brick, user)
+        self._render(brick, user)
+        self.assertEqual(2, brick.renders)
+
+    def test_entity(self):
+        user = self.get_root_user()
+        contact = FakeContact.objects.create(
+            user=user, first_name='Spike', last_name='Spiegel',
+        )
+
+        brick = OrganisationsBrick()
+        self._render(brick, user, instance=contact)
+        self._render(brick, user, instance=contact)
+        self.assertEqual(1, brick.renders)
+
+        # Other entity
+        other = FakeContact.objects.create(user=user, first_name='Jet', last_name='Black')
+        self._render(brick, user, instance=other)
+        self.assertEqual(2, brick.renders)
+
+        # Modified entity (NB: the model is not a dependency)
+        contact = self.refresh(contact)
+        contact.modified = self.create_datetime(year=2026, month=1, day=1)
+        contact.save()
+        self._render(brick, user, instance=self.refresh(contact))
+        self.assertEqual(3, brick.renders)
+
+    def test_user_n_state(self):
+        user1 = self.get_root_user()
+        user2 = self.create_user()
+
+        brick = OrganisationsBrick()
+        self._render(brick, user1)
+        self._render(brick, user2)
+        self.assertEqual(2, brick.renders)
+
+        self._render(brick, user1)
+        self.assertEqual(2, brick.renders)
+
+        # Other URL
+        self._render(brick, user1, url='/tests/contacts')
+        self.assertEqual(3, brick.renders)
+
+        # State
+        BrickState.objects.create(user=user1, brick_id=brick.id, is_open=False)
+        self._render(brick, user1)
+        self.assertEqual(4, brick.renders)
+
+    def test_teams(self):
+        "The teams change the credentials."
+        user = self.create_user()
+        brick = OrganisationsBrick()
+        self._render(brick, user)
+        self.assertEqual(1, brick.renders)
+
+        team = self.create_team('Team', user)
+        self._render(brick, self.refresh(user))
+        self.assertEqual(2, brick.renders)
+
+        team.teammates = []
+        self._render(brick, self.refresh(user))
+        self.assertEqual(2, brick.renders)  # Same signature as the beginning
+
+    def test_global_invalidation(self):
+        user = self.get_root_user()
+        brick = OrganisationsBrick()
+        self._render(brick, user)
+
+        self.create_role(name='Basic')
+        self._render(brick, user)
+        self.assertEqual(2, brick.renders)
+
+        BrickCache.invalidate_all()
+        self._render(brick, user)
+        self.assertEqual(3, brick.renders)
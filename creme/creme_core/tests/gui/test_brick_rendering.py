@@ -0,0 +1,318 @@
+from functools import partial
+from threading import Barrier, Event, current_thread
+from time import sleep
+
+from django.template import Context, Template
+from django.test.utils import override_settings
+from django.utils.translation import get_language, override
+
+from creme.creme_core.global_info import (
+    clear_global_info,
+    get_global_info,
+    get_per_request_cache,
+    set_global_info,
+)
+from creme.creme_core.gui.brick_rendering import ConcurrentBricksRenderer
+from creme.creme_core.gui.bricks import BrickManager, SimpleBrick
+from creme.creme_core.models import FakeOrganisation
+
+from ..base import CremeTestCase, CremeTransactionTestCase
+from ..views.base import BrickTestCaseMixin
+
+
+class _TestBrick(SimpleBrick):
+    def __init__(self, *, name, fun=None):
+        super().__init__()
+        self.id = SimpleBrick.generate_id('creme_core', f'test_brick_rendering_{name}')
+        self.verbose_name = f'Brick {name}'
+        self.fun = fun or (lambda: f'<div>{name}</div>')
+        self.thread_name = None
+
+    def detailview_display(self, context):
+        self.thread_name = current_thread().name
+        return self.fun()
+
+
+@override_settings(BRICKS_RENDERING_WORKERS=2, BRICKS_RENDERING_TIMEOUT=5)
+class ConcurrentBricksRendererTestCase(BrickTestCaseMixin, CremeTestCase):
+    def _build_context(self, *bricks):
+        context = self.build_context(user=self.get_root_user())
+        add_group = BrickManager.get(context).add_group
+
+        for brick in bricks:
+            add_group(brick.id, brick)
+
+        return context
+
+    @override_settings(BRICKS_RENDERING_WORKERS=0)
+    def test_disabled(self):
+        self.assertIsNone(ConcurrentBricksRenderer.get(self._build_context()))
+
+    def test_get(self):
+        context = self._build_context()
+
+        renderer = ConcurrentBricksRenderer.get(context)
+        self.assertIsInstance(renderer, ConcurrentBricksRenderer)
+        self.assertEqual(5, renderer.timeout)
+        self.assertIs(renderer, ConcurrentBricksRenderer.get(context))
+        self.assertIsNot(renderer, ConcurrentBricksRenderer.get(self._build_context()))
+
+    def test_render(self):
+        # NB: the bricks wait for each other => they must be rendered concurrently
+        barrier = Barrier(2, timeout=5)
+
+        def wait_n_return(value):
+            barrier.wait()
+            return value
+
+        brick1 = _TestBrick(name='1', fun=lambda: wait_n_return('<div>1</div>'))
+        brick2 = _TestBrick(name='2', fun=lambda: wait_n_return('<div>2</div>'))
+        context = self._build_context(brick1, brick2)
+
+        renderer = ConcurrentBricksRenderer.get(context)
+        method = 'detailview_display'
+        renderer.submit(bricks=[brick1, brick2], method=method, context=context)
+
+        render = partial(renderer.render, method=method, context=context)
+        self.assertEqual('<div>1</div>', render(brick=brick1))
+        self.assertEqual('<div>2</div>', render(brick=brick2))
+
+        main_thread_name = current_thread().name
+        self.assertNotEqual(main_thread_name, brick1.thread_name)
+        self.assertNotEqual(main_thread_name, brick2.thread_name)
+        self.assertNotEqual(brick1.thread_name, brick2.thread_name)
+
+    def test_render__not_submitted(self):
+        brick = _TestBrick(name='1')
+        context = self._build_context(brick)
+
+        renderer = ConcurrentBricksRenderer.get(context)
+        self.assertEqual(
+            '<div>1</div>',
+            renderer.render(brick=brick, method='detailview_display', context=context),
+        )
+        self.assertEqual(current_thread().name, brick.thread_name)
+
+    @override_settings(BRICKS_RENDERING_TIMEOUT=0.05)
+    def test_render__no_free_worker(self):
+        "The bricks which are still waiting for a worker are rendered by the current thread."
+        event = Event()
+        barrier = Barrier(3, timeout=5)
+
+        def block():
+            barrier.wait()
+            event.wait(5)
+            return '<div>blocking</div>'
+
+        # NB: they hold the 2 workers
+        brick1 = _TestBrick(name='1', fun=block)
+        brick2 = _TestBrick(name='2', fun=block)
+        brick3 = _TestBrick(name='3')
+        context = self._build_context(brick1, brick2, brick3)
+
+        renderer = ConcurrentBricksRenderer.get(context)
+        method = 'detailview_display'
+
+        try:
+            renderer.submit(bricks=[brick1, brick2], method=method, context=context)
+            barrier.wait()
+            renderer.submit(bricks=[brick3], method=method, context=context)
+
+            with self.assertLogs(level='INFO'):
+                html = renderer.render(brick=brick3, method=method, context=context)
+        finally:
+            event.set()
+
+        self.assertEqual('<div>3</div>', html)
+        self.assertEqual(current_thread().name, brick3.thread_name)
+
+    @override_settings(BRICKS_RENDERING_TIMEOUT=0.05)
+    def test_render__late_worker(self):
+        "A worker does not render a brick which has waited for too long."
+        event = Event()
+        barrier = Barrier(3, timeout=5)
+        calls = []
+
+        def block():
+            barrier.wait()
+            event.wait(5)
+            return '<div>blocking</div>'
+
+        def render3():
+            calls.append(current_thread().name)
+            return '<div>3</div>'
+
+        brick1 = _TestBrick(name='1', fun=block)
+        brick2 = _TestBrick(name='2', fun=block)
+        brick3 = _TestBrick(name='3', fun=render3)
+        context = self._build_context(brick1, brick2, brick3)
+
+        renderer = ConcurrentBricksRenderer.get(context)
+        method = 'detailview_display'
+
+        renderer.submit(bricks=[brick1, brick2], method=method, context=context)
+        barrier.wait()
+        renderer.submit(bricks=[brick3], method=method, context=context)
+        sleep(0.1)  # The deadline of brick3 is passed
+        event.set()  # The workers are free => brick3 can be skipped by a worker
+
+        self.assertEqual(
+            '<div>3</div>',
+            renderer.render(brick=brick3, method=method, context=context),
+        )
+        self.assertListEqual([current_thread().name], calls)
+
+    def test_render__thread_information(self):
+        "Language & global information are given to the workers."
+        user = self.get_root_user()
+        set_global_info(user=user)
+        self.addCleanup(clear_global_info)
+        get_per_request_cache()['test_brick_rendering'] = 'cached'
+
+        brick = _TestBrick(
+            name='1',
+            fun=lambda: '{}#{}#{}'.format(
+                get_language(),
+                get_global_info('user'),
+                get_per_request_cache().get('test_brick_rendering'),
+            ),
+        )
+        context = self._build_context(brick)
+
+        renderer = ConcurrentBricksRenderer.get(context)
+        method = 'detailview_display'
+
+        with override('fr'):
+            renderer.submit(bricks=[brick], method=method, context=context)
+
+        self.assertEqual(
+            f'fr#{user}#cached',
+            renderer.render(brick=brick, method=method, context=context),
+        )
+
+    def test_render__per_request_cache(self):
+        "Each worker gets its own per-request cache."
+        set_global_info(user=self.get_root_user())
+        self.addCleanup(clear_global_info)
+        cache = get_per_request_cache()
+        cache['test_brick_rendering'] = 'cached'
+
+        barrier = Barrier(2, timeout=5)
+
+        def fill_cache(name):
+            worker_cache = get_per_request_cache()
+            worker_cache[f'test_brick_rendering_{name}'] = name
+            barrier.wait()
+
+            return ','.join(
+                sorted(k for k in worker_cache.keys() if k.startswith('test_brick_rendering'))
+            )
+
+        brick1 = _TestBrick(name='1', fun=lambda: fill_cache('1'))
+        brick2 = _TestBrick(name='2', fun=lambda: fill_cache('2'))
+        context = self._build_context(brick1, brick2)
+
+        renderer = ConcurrentBricksRenderer.get(context)
+        method = 'detailview_display'
+        renderer.submit(bricks=[brick1, brick2], method=method, context=context)
+
+        render = partial(renderer.render, method=method, context=context)
+        self.assertEqual(
+            'test_brick_rendering,test_brick_rendering_1', render(brick=brick1),
+        )
+        self.assertEqual(
+            'test_brick_rendering,test_brick_rendering_2', render(brick=brick2),
+        )
+        self.assertNotIn('test_brick_rendering_1', cache)
+
+    def test_render__timeout(self):
+        event = Event()
+        barrier = Barrier(2, timeout=5)
+
+        def block():
+            barrier.wait()
+            event.wait(5)
+            return '<div>1</div>'
+
+        brick = _TestBrick(name='1', fun=block)
+        context = self._build_context(brick)
+
+        renderer = ConcurrentBricksRenderer.get(context)
+        method = 'detailview_display'
+        renderer.submit(bricks=[brick], method=method, context=context)
+        barrier.wait()  # The rendering has started in the worker
+        renderer.timeout = 0.01
+
+        try:
+            with self.assertLogs(level='WARNING'):
+                html = renderer.render(brick=brick, method=method, context=context)
+        finally:
+            event.set()
+
+        brick_node = self.get_brick_node(self.get_html_tree(html), brick=brick)
+        self.assertEqual('true', brick_node.attrib.get('data-brick-deferred'))
+        self.assertIn('brick-deferred', brick_node.attrib.get('class'))
+
+    def test_templatetag(self):
+        "All the declared bricks are submitted by the first {% brick_display %}."
+        # NB: the bricks wait for each other => brick2 must be rendered while
+        #     the first tag waits for brick1.
+        barrier = Barrier(2, timeout=5)
+
+        def wait_n_return(value):
+            barrier.wait()
+            return value
+
+        brick1 = _TestBrick(name='1', fun=lambda: wait_n_return('<div>1</div>'))
+        brick2 = _TestBrick(name='2', fun=lambda: wait_n_return('<div>2</div>'))
+        brick3 = _TestBrick(name='3')
+
+        context = self.build_context(user=self.get_root_user())
+        render = Template(
+            '{% load creme_bricks %}'
+            '{% brick_declare brick1 brick2 brick3 %}'
+            '{% brick_display brick1 %}'
+            '{% brick_display brick2 brick3 %}'
+        ).render(Context({**context, 'brick1': brick1, 'brick2': brick2, 'brick3': brick3}))
+        self.assertEqual('<div>1</div><div>2</div><div>3</div>', render)
+
+
+@override_settings(BRICKS_RENDERING_WORKERS=2, BRICKS_RENDERING_TIMEOUT=5)
+class ConcurrentBricksRendererQueriesTestCase(BrickTestCaseMixin, CremeTransactionTestCase):
+    def setUp(self):
+        super().setUp()
+        self.populate('creme_core')
+
+    def test_render__queries(self):
+        "The workers use their own connection to the DB."
+        user = self.create_user()
+        FakeOrganisation.objects.create(user=user, name='NERV')
+        FakeOrganisation.objects.create(user=user, name='Seele')
+
+        barrier = Barrier(2, timeout=5)
+
+        def count(name):
+            count = FakeOrganisation.objects.filter(name=name).count()
+            barrier.wait()
+
+            return f'<div>{name}: {count}</div>'
+
+        brick1 = _TestBrick(name='1', fun=lambda: count('NERV'))
+        brick2 = _TestBrick(name='2', fun=lambda: count('Wille'))
+
+        context = self.build_context(user=user)
+        add_group = BrickManager.get(context).add_group
+        add_group(brick1.id, brick1)
+        add_group(brick2.id, brick2)
+
+        renderer = ConcurrentBricksRenderer.get(context)
+        method = 'detailview_display'
+        renderer.submit(bricks=[brick1, brick2], method=method, context=context)
+
+        render = partial(renderer.render, method=method, context=context)
+        self.assertEqual('<div>NERV: 1</div>', render(brick=brick1))
+        self.assertEqual('<div>Wille: 0</div>', render(brick=brick2))
+
+        main_thread_name = current_thread().name
+        self.assertNotEqual(main_thread_name, brick1.thread_name)
+        self.assertNotEqual(main_thread_name, brick2.thread_name)
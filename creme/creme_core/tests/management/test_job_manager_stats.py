@@ -0,0 +1,84 @@
+import json
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from creme.creme_core.core.job.queue.mock import MockQueue
+from creme.creme_core.creme_jobs import reminder_type
+from creme.creme_core.management.commands.creme_job_manager_stats import (
+    Command as StatsCommand,
+)
+from creme.creme_core.models import Job
+
+from .. import base
+
+
+class JobManagerStatsTestCase(base.CremeTestCase):
+    @staticmethod
+    def call_command(**kwargs):
+        stdout = StringIO()
+        call_command(StatsCommand(), verbosity=0, stdout=stdout, **kwargs)
+
+        return stdout.getvalue()
+
+    def _build_stats(self, job):
+        return {
+            'started': '2026-03-01T12:00:00+00:00',
+            'now': '2026-03-01T13:00:00+00:00',
+            'commands': {'START': 2, 'END': 1},
+            'latency': {'count': 2, 'average': 3.0, 'maximum': 4.0},
+            'duration': {'count': 0, 'average': None, 'maximum': None},
+            'jobs': {
+                str(job.id): {
+                    'runs': 2,
+                    'last_start': '2026-03-01T12:30:00+00:00',
+                    'last_latency': 4.0,
+                    'running': True,
+                },
+            },
+            'processes': 1,
+            'workers': 0,
+            'queue': {
+                'user_jobs_waiting': 3,
+                'user_jobs_running': 1,
+                'max_user_jobs': 5,
+                'system_jobs_scheduled': 6,
+                'system_jobs_running': 1,
+                'system_jobs_late': 2,
+                'deferred_jobs': 0,
+            },
+        }
+
+    def test_stats(self):
+        job = Job.objects.get(type_id=reminder_type.id)
+
+        with patch.object(MockQueue, 'get_stats', return_value=self._build_stats(job)):
+            output = self.call_command()
+
+        self.assertIn('Processes: 1 (workers: none)', output)
+        self.assertIn('User jobs: 1 running (maximum: 5), 3 waiting', output)
+        self.assertIn('System jobs: 6 scheduled, 1 running, 2 late', output)
+        self.assertIn('Latency: average=3.0s maximum=4.0s (last 2 run(s))', output)
+        self.assertIn('Duration: no run', output)
+        self.assertIn('Commands: END=1, START=2', output)
+        self.assertIn(
+            f' - {job} (id={job.id}): 2 run(s); last start=2026-03-01T12:30:00+00:00 '
+            f'latency=4.0s duration=? [running]',
+            output,
+        )
+
+    def test_stats__json(self):
+        stats = self._build_stats(Job.objects.get(type_id=reminder_type.id))
+
+        with patch.object(MockQueue, 'get_stats', return_value=stats):
+            output = self.call_command(json=True)
+
+        self.assertDictEqual(stats, json.loads(output))
+
+    def test_no_response(self):
+        with self.assertRaises(CommandError) as cm:
+            self.call_command()
+
+        self.assertEqual('The job manager does not respond.', str(cm.exception))
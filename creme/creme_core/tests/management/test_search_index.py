@@ -0,0 +1,74 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test.utils import override_settings
+
+from creme.creme_core.management.commands.creme_search_index import (
+    Command as SearchIndexCommand,
+)
+from creme.creme_core.models import (
+    FakeContact,
+    FakeOrganisation,
+    SearchConfigItem,
+    SearchIndexEntry,
+)
+
+from .. import base
+
+
+class SearchIndexCommandTestCase(base.CremeTestCase):
+    @staticmethod
+    def call_command(*args, verbosity=0):
+        stdout = StringIO()
+        call_command(SearchIndexCommand(), *args, verbosity=verbosity, stdout=stdout)
+
+        return stdout.getvalue()
+
+    @override_settings(SEARCH_INDEX_BACKEND='')
+    def test_disabled(self):
+        with self.assertRaises(CommandError):
+            self.call_command()
+
+    @override_settings(
+        SEARCH_INDEX_BACKEND='creme.creme_core.core.search_index.DatabaseSearchIndex',
+    )
+    def test_rebuild(self):
+        user = self.get_root_user()
+        contact = FakeContact.objects.create(
+            user=user, first_name='Spike', last_name='Spiegel',
+        )
+
+        SearchIndexEntry.objects.filter(entity=contact.id).delete()
+        SearchConfigItem.objects.builder(
+            model=FakeContact, fields=['last_name'],
+        ).get_or_create()
+
+        output = self.call_command('creme_core.FakeContact', verbosity=1)
+        self.assertEqual(
+            f'creme_core.FakeContact: {FakeContact.objects.count()} entities indexed.\n',
+            output,
+        )
+        self.assertListEqual(
+            ['spiegel'],
+            [
+                *SearchIndexEntry.objects.filter(
+                    entity=contact.id, cell_key='regular_field-last_name',
+                ).values_list('value', flat=True),
+            ],
+        )
+
+    @override_settings(
+        SEARCH_INDEX_BACKEND='creme.creme_core.core.search_index.DatabaseSearchIndex',
+    )
+    def test_invalid_models(self):
+        with self.assertRaises(CommandError):
+            self.call_command('creme_core.Unknown')
+
+        with self.assertRaises(CommandError):
+            self.call_command('creme_core.SearchConfigItem')
+
+        with self.assertRaises(CommandError):
+            self.call_command('creme_core.CremeEntity')
+
+        self.assertEqual('', self.call_command(FakeOrganisation._meta.label))
@@ -2472,6 +2472,172 @@ class PermissionsTestCase(BaseAuthTestCase):
 
         self.assertListEqual([contact1.id, contact4.id], ids_list)
 
+    def _create_efilter_role(self, ctype=FakeContact, efilter_model=FakeContact):
+        self._create_users_n_contacts()
+        user = self.user
+
+        efilter = EntityFilter.objects.create(
+            id='creme_core-test_auth',
+            entity_type=efilter_model,
+            filter_type=EF_CREDENTIALS,
+        ).set_conditions(
+            [
+                condition_handler.RegularFieldConditionHandler.build_condition(
+                    model=efilter_model,
+                    operator=operators.EQUALS,
+                    field_name='user',
+                    values=[operands.CurrentUserOperand.type_id],
+                    filter_type=EF_CREDENTIALS,
+                ),
+            ],
+            check_cycles=False,  # There cannot be a cycle without sub-filter.
+            check_privacy=False,  # No sense here.
+        )
+
+        self._create_role(
+            'Coder', ['creme_core'], users=[user],
+            set_creds=[
+                SetCredentials(
+                    value=EntityCredentials.VIEW | EntityCredentials.CHANGE,
+                    set_type=SetCredentials.ESET_FILTER,
+                    ctype=ctype,
+                    efilter=efilter,
+                ),
+                SetCredentials(value=EntityCredentials.VIEW, set_type=SetCredentials.ESET_OWN),
+            ],
+        )
+
+        return self.refresh(user)
+
+    def test_get_perms_many(self):
+        "ESET_FILTER with ContentType."
+        user = self._create_efilter_role()
+        other_user = self.other_user
+
+        create_contact = partial(FakeContact.objects.create, last_name='Doe')
+        contacts = [
+            self.contact1,  # Owned by user
+            self.contact2,  # Owned by other_user
+            create_contact(user=user, first_name='John'),
+            create_contact(user=other_user, first_name='Jane'),
+        ]
+        orga = FakeOrganisation.objects.create(user=user, name='Ryuu')
+
+        role = user.role
+        # Retrieve credentials, filter, conditions & teams
+        role.get_perms_many(user, [create_contact(user=user, first_name='Jim')])
+
+        VIEW_CHANGE = EntityCredentials.VIEW | EntityCredentials.CHANGE
+        with self.assertNumQueries(1):  # Filtering
+            perms = role.get_perms_many(user, [*contacts, orga])
+
+        self.assertDictEqual(
+            {
+                contacts[0].id: VIEW_CHANGE,
+                contacts[1].id: EntityCredentials.NONE,
+                contacts[2].id: VIEW_CHANGE,
+                contacts[3].id: EntityCredentials.NONE,
+                orga.id:        EntityCredentials.VIEW,
+            },
+            perms,
+        )
+
+        # Results are cached
+        with self.assertNumQueries(0):
+            for contact in contacts:
+                role.get_perms(user, contact)
+
+            role.get_perms_many(user, contacts)
+
+        # Another user
+        self.assertEqual(
+            EntityCredentials.NONE,
+            role.get_perms_many(other_user, [contacts[0]])[contacts[0].id],
+        )
+
+    def test_get_perms_many__modified_entity(self):
+        "The results are computed again for modified entities."
+        user = self._create_efilter_role()
+        contact = self.contact1
+
+        role = user.role
+        self.assertEqual(
+            EntityCredentials.VIEW | EntityCredentials.CHANGE,
+            role.get_perms_many(user, [contact])[contact.id],
+        )
+
+        contact.user = self.other_user
+        contact.save()
+        self.assertEqual(EntityCredentials.NONE, role.get_perms(user, contact))
+
+    def test_get_perms_many__no_ctype(self):
+        "ESET_FILTER on CremeEntity."
+        user = self._create_efilter_role(ctype=None, efilter_model=CremeEntity)
+
+        create_orga = FakeOrganisation.objects.create
+        orga1 = create_orga(user=user,            name='Orga1')
+        orga2 = create_orga(user=self.other_user, name='Orga2')
+        entities = [self.contact1, self.contact2, orga1, orga2]
+
+        role = user.role
+        VIEW_CHANGE = EntityCredentials.VIEW | EntityCredentials.CHANGE
+        self.assertDictEqual(
+            {
+                self.contact1.id: VIEW_CHANGE,
+                self.contact2.id: EntityCredentials.NONE,
+                orga1.id:         VIEW_CHANGE,
+                orga2.id:         EntityCredentials.NONE,
+            },
+            role.get_perms_many(user, entities),
+        )
+
+        with self.assertNumQueries(0):
+            for entity in entities:
+                role.get_perms(user, entity)
+
+    def test_can_do_on_all(self):
+        VIEW = EntityCredentials.VIEW
+        CHANGE = EntityCredentials.CHANGE
+        role = self._create_role(
+            'Coder', allowed_apps=['creme_core'],
+            set_creds=[
+                SetCredentials(value=VIEW, set_type=SetCredentials.ESET_ALL),
+                SetCredentials(value=CHANGE, set_type=SetCredentials.ESET_OWN),
+                SetCredentials(
+                    value=VIEW, set_type=SetCredentials.ESET_ALL,
+                    ctype=FakeOrganisation, forbidden=True,
+                ),
+            ],
+        )
+        self.assertTrue(role.can_do_on_all(FakeContact, VIEW))
+        self.assertFalse(role.can_do_on_all(FakeContact, CHANGE))
+        self.assertFalse(role.can_do_on_all(FakeOrganisation, VIEW))
+
+        # App not allowed
+        role = self._create_role(
+            'Salesman',
+            set_creds=[SetCredentials(value=VIEW, set_type=SetCredentials.ESET_ALL)],
+        )
+        self.assertFalse(role.can_do_on_all(FakeContact, VIEW))
+
+    def test_populate_credentials(self):
+        user = self._create_efilter_role()
+        contact1 = self.contact1
+        contact2 = self.contact2
+
+        user.populate_credentials([contact1, contact2])
+
+        with self.assertNumQueries(0):
+            self.assertTrue(user.has_perm_to_change(contact1))
+            self.assertFalse(user.has_perm_to_view(contact2))
+
+        # Superuser
+        root = self.get_root_user()
+
+        with self.assertNumQueries(0):
+            root.populate_credentials([contact1, contact2])
+            self.assertTrue(root.has_perm_to_change(contact2))
+
     def test_creation_creds(self):
         user = self.create_user()
         role = self._create_role('Coder', users=[user])
@@ -1,4 +1,11 @@
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.encoding import force_str
+
 from creme.creme_core.backends import _BackendRegistry, base
+from creme.creme_core.backends.csv_export import (
+    CSVExportBackend,
+    SemiCSVExportBackend,
+)
 from creme.creme_core.backends.csv_import import CSVImportBackend
 from creme.creme_core.backends.xls_import import XLSImportBackend
 
@@ -60,3 +67,35 @@ class BackendsTestCase(CremeTestCase):
 
         with self.assertRaises(registry.InvalidClass):
             registry.get_backend_class(CSVImportBackend.id)
+
+    def test_csv_export__writerow(self):
+        backend = CSVExportBackend()
+        backend.writerow(['Name', 'Age'])
+        backend.writerow(['Spike', '27'])
+        backend.save('my file', user=None)
+
+        response = backend.response
+        self.assertIsInstance(response, HttpResponse)
+        self.assertEqual('attachment; filename="my-file.csv"', response['Content-Disposition'])
+        self.assertEqual('"Name","Age"\r\n"Spike","27"\r\n', force_str(response.content))
+
+    def test_csv_export__stream(self):
+        consumed = []
+
+        def rows():
+            for row in [['Name', 'Age'], ['Spike', '27'], ['Jet', '36']]:
+                consumed.append(row)
+                yield row
+
+        backend = SemiCSVExportBackend()
+        backend.chunk_size = 16
+        response = backend.stream(rows(), filename='my file', user=None)
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertIs(response, backend.response)
+        self.assertEqual('attachment; filename="my-file.csv"', response['Content-Disposition'])
+        self.assertFalse(consumed)
+
+        self.assertListEqual(
+            ['"Name";"Age"\r\n"Spike";"27"\r\n', '"Jet";"36"\r\n'],
+            [force_str(chunk) for chunk in response.streaming_content],
+        )
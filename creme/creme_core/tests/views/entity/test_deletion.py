@@ -1,4 +1,5 @@
 from functools import partial
+from unittest.mock import patch
 
 from django.test.utils import override_settings
 from django.urls import reverse
@@ -7,9 +8,11 @@ from django.utils.translation import ngettext
 from parameterized import parameterized
 
 from creme.creme_core.bricks import TrashBrick
+from creme.creme_core.core.deletion import EntityDeletorRegistry
 from creme.creme_core.creme_jobs import reminder_type
 from creme.creme_core.creme_jobs.trash_cleaner import (
     TrashCleanerJobErrorsBrick,
+    TrashDeletionPlanner,
     trash_cleaner_type,
 )
 from creme.creme_core.models import (
@@ -17,6 +20,8 @@ from creme.creme_core.models import (
     CremePropertyType,
     EntityJobResult,
     FakeContact,
+    FakeDocument,
+    FakeFolder,
     FakeInvoice,
     FakeInvoiceLine,
     FakeOrganisation,
@@ -958,6 +963,93 @@ class EntityDeletionViewsTestCase(BrickTestCaseMixin, CremeTestCase):
         result_brick = self.get_alone_element(trash_cleaner_type.results_bricks)
         self.assertIsInstance(result_brick, TrashCleanerJobErrorsBrick)
 
+    def test_empty_trash__protecting_fk(self):
+        "Entities referenced by other deleted entities are deleted after them."
+        user = self.login_as_root_and_get()
+
+        create_folder = partial(FakeFolder.objects.create, user=user, is_deleted=True)
+        folder1 = create_folder(title='Earth maps')
+        folder2 = create_folder(title='Mars maps')
+
+        create_doc = partial(FakeDocument.objects.create, user=user, is_deleted=True)
+        doc1 = create_doc(title='Japan map', linked_folder=folder1)
+        doc2 = create_doc(title='France map', linked_folder=folder1)
+        doc3 = create_doc(title='Olympus Mons', linked_folder=folder2, is_deleted=False)
+
+        self.assertPOST200(self.EMPTY_TRASH_URL)
+        job = self.get_object_or_fail(Job, type_id=trash_cleaner_type.id)
+
+        registry = EntityDeletorRegistry().register(
+            model=FakeFolder,
+        ).register(
+            model=FakeDocument,
+        )
+
+        with patch.object(trash_cleaner_type, 'deletor_registry', registry):
+            trash_cleaner_type.execute(job)
+
+        self.assertDoesNotExist(doc1)
+        self.assertDoesNotExist(doc2)
+        self.assertDoesNotExist(folder1)
+        self.assertStillExists(doc3)
+        self.assertStillExists(folder2)
+
+        jresult = self.get_alone_element(EntityJobResult.objects.filter(job=job))
+        self.assertEqual(folder2.id, jresult.entity_id)
+        self.assertListEqual(
+            [_('Can not be deleted because of links with other entities.')],
+            jresult.messages,
+        )
+        self.assertEqual(
+            3, self.get_object_or_fail(TrashCleaningCommand, job=job).deleted_count,
+        )
+
+    def test_empty_trash__protecting_fk__retry(self):
+        "Entities which were protected by deleted entities are retried."
+        user = self.login_as_root_and_get()
+
+        folder1 = FakeFolder.objects.create(user=user, title='Earth maps', is_deleted=True)
+        folder2 = FakeFolder.objects.create(user=user, title='Mars maps', is_deleted=True)
+
+        create_doc = partial(FakeDocument.objects.create, user=user, is_deleted=True)
+        doc1 = create_doc(title='Japan map', linked_folder=folder1)
+        doc2 = create_doc(title='Olympus Mons', linked_folder=folder2, is_deleted=False)
+
+        self.assertPOST200(self.EMPTY_TRASH_URL)
+        job = self.get_object_or_fail(Job, type_id=trash_cleaner_type.id)
+
+        registry = EntityDeletorRegistry().register(
+            model=FakeFolder,
+        ).register(
+            model=FakeDocument,
+        )
+
+        class ReversedPlanner(TrashDeletionPlanner):
+            "The folders are deleted before their documents."
+            def levels(self):
+                return [*reversed(super().levels())]
+
+        with (
+            patch.object(trash_cleaner_type, 'deletor_registry', registry),
+            patch.object(trash_cleaner_type, 'planner_class', ReversedPlanner),
+        ):
+            trash_cleaner_type.execute(job)
+
+        self.assertDoesNotExist(doc1)
+        self.assertDoesNotExist(folder1)
+        self.assertStillExists(doc2)
+        self.assertStillExists(folder2)
+
+        jresult = self.get_alone_element(EntityJobResult.objects.filter(job=job))
+        self.assertEqual(folder2.id, jresult.entity_id)
+        self.assertListEqual(
+            [_('Can not be deleted because of links with other entities.')],
+            jresult.messages,
+        )
+        self.assertEqual(
+            2, self.get_object_or_fail(TrashCleaningCommand, job=job).deleted_count,
+        )
+
     def test_empty_trash__perms(self):
         "Credentials on specific ContentType."
         # NB: can delete ESET_OWN
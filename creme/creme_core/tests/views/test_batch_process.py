@@ -1,9 +1,11 @@
 from functools import partial
 from json import dumps as json_dump
+from unittest.mock import patch
 
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
-from django.test.utils import override_settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
 from django.urls import reverse
 from django.utils.timezone import now
 from django.utils.translation import gettext as _
@@ -14,19 +16,25 @@ from creme.creme_core.core.entity_filter import operands, operators
 from creme.creme_core.core.entity_filter.condition_handler import (
     RegularFieldConditionHandler,
 )
+from creme.creme_core.core.history import toggle_history
 # Should be a test queue
 from creme.creme_core.core.job import get_queue, job_type_registry
 from creme.creme_core.core.workflow import WorkflowConditions, WorkflowEngine
-from creme.creme_core.creme_jobs.batch_process import batch_process_type
+from creme.creme_core.creme_jobs.batch_process import (
+    _BatchProcessType,
+    batch_process_type,
+)
 from creme.creme_core.models import (
     CremePropertyType,
     EntityFilter,
     EntityJobResult,
     FakeContact,
     FakeOrganisation,
+    HistoryLine,
     Job,
     Workflow,
 )
+from creme.creme_core.models.history import TYPE_EDITION
 
 from ..base import CremeTestCase
 
@@ -68,6 +76,22 @@ class BatchProcessViewsTestCase(CremeTestCase):
     def _execute_job(self, response):
         batch_process_type.execute(self._get_job(response))
 
+    def _create_job(self, user, model, actions, efilter=None):
+        data = {
+            'ctype': ContentType.objects.get_for_model(model).id,
+            'actions': [
+                {'field_name': fname, 'operator_name': op, 'value': value}
+                for fname, op, value in actions
+            ],
+        }
+        if efilter:
+            data['efilter'] = efilter.id
+
+        # Empty the Queue to avoid warnings (the entities have been created in the test)
+        WorkflowEngine.get_current()._queue.pickup()
+
+        return Job.objects.create(type_id=batch_process_type.id, user=user, data=data)
+
     def test_no_app_perm(self):
         # Not 'creme_core'
         self.login_as_standard(allowed_apps=['documents'])
@@ -546,6 +570,166 @@ class BatchProcessViewsTestCase(CremeTestCase):
         self.assertEqual(10_500, orga2.capital)
         self.assertHasProperty(entity=orga2, ptype=ptype)
 
+    def test_bulk_save(self):
+        "History, modification date, search field..."
+        user = self.login_as_root_and_get()
+        self.assertTrue(FakeOrganisation(user=user).allows_bulk_save(['name']))
+
+        create_orga = partial(FakeOrganisation.objects.create, user=user)
+        orga1 = create_orga(name='Genshiken')
+        orga2 = create_orga(name='Manga club')
+
+        job = self._create_job(user, FakeOrganisation, [('name', 'upper', '')])
+
+        # NB: the buffered lines of history are inserted at the commit
+        with self.captureOnCommitCallbacks(execute=True):
+            batch_process_type.execute(job)
+
+        orga1 = self.refresh(orga1)
+        self.assertEqual('GENSHIKEN', orga1.name)
+        self.assertEqual('GENSHIKEN', orga1.header_filter_search_field)
+        self.assertDatetimesAlmostEqual(now(), orga1.modified)
+
+        hline = HistoryLine.objects.filter(entity=orga1.id).order_by('-id').first()
+        self.assertEqual(TYPE_EDITION, hline.type)
+        self.assertListEqual([['name', 'Genshiken', 'GENSHIKEN']], hline.modifications)
+
+        self.assertEqual('MANGA CLUB', self.refresh(orga2).name)
+        self.assertCountEqual(
+            [orga1.id, orga2.id],
+            EntityJobResult.objects.filter(job=job).values_list('entity_id', flat=True),
+        )
+
+    def test_bulk_save__disabled(self):
+        "The entities are saved one by one with save()."
+        user = self.login_as_root_and_get()
+
+        create_orga = partial(FakeOrganisation.objects.create, user=user)
+        orga1 = create_orga(name='Genshiken')
+        orga2 = create_orga(name='Manga club')
+
+        job = self._create_job(user, FakeOrganisation, [('name', 'upper', '')])
+
+        with patch.object(FakeOrganisation, 'allows_bulk_save', return_value=False):
+            with patch.object(_BatchProcessType, '_bulk_save') as bulk_save_mock:
+                batch_process_type.execute(job)
+
+        bulk_save_mock.assert_not_called()
+        self.assertEqual('GENSHIKEN',  self.refresh(orga1).name)
+        self.assertEqual('MANGA CLUB', self.refresh(orga2).name)
+        self.assertEqual(2, EntityJobResult.objects.filter(job=job).count())
+
+    def test_bulk_save__error(self):
+        "The entities are saved one by one if the bulk saving fails."
+        user = self.login_as_root_and_get()
+
+        create_orga = partial(FakeOrganisation.objects.create, user=user)
+        orga1 = create_orga(name='Genshiken')
+        orga2 = create_orga(name='Manga club')
+
+        job = self._create_job(user, FakeOrganisation, [('name', 'upper', '')])
+
+        with patch.object(
+            _BatchProcessType, '_bulk_save', side_effect=RuntimeError('Bulk error'),
+        ):
+            with self.assertLogs(level='ERROR'):
+                batch_process_type.execute(job)
+
+        self.assertEqual('GENSHIKEN',  self.refresh(orga1).name)
+        self.assertEqual('MANGA CLUB', self.refresh(orga2).name)
+        self.assertListEqual(
+            [None, None],
+            [
+                *EntityJobResult.objects.filter(job=job).order_by('entity_id')
+                                                        .values_list('messages', flat=True),
+            ],
+        )
+
+    def test_save__error(self):
+        "An unexpected error only cancels the changes of its entity."
+        user = self.login_as_root_and_get()
+
+        create_orga = partial(FakeOrganisation.objects.create, user=user)
+        orga1 = create_orga(name='Genshiken')
+        orga2 = create_orga(name='Manga club')
+        orga3 = create_orga(name='Anime club')
+
+        job = self._create_job(user, FakeOrganisation, [('name', 'upper', '')])
+        save_orig = FakeOrganisation.save
+
+        def save(entity, *args, **kwargs):
+            save_orig(entity, *args, **kwargs)
+
+            if entity.id == orga2.id:
+                raise ValueError('Invalid name')
+
+        # NB: overridden save() => no bulk saving
+        with patch.object(FakeOrganisation, 'save', save):
+            with self.assertLogs(level='ERROR'):
+                batch_process_type.execute(job)
+
+        self.assertEqual('GENSHIKEN',  self.refresh(orga1).name)
+        self.assertEqual('Manga club', self.refresh(orga2).name)
+        self.assertEqual('ANIME CLUB', self.refresh(orga3).name)
+
+        self.assertIsNone(self.get_object_or_fail(EntityJobResult, job=job, entity=orga1).messages)
+        self.assertListEqual(
+            ['Invalid name'],
+            self.get_object_or_fail(EntityJobResult, job=job, entity=orga2).messages,
+        )
+        self.assertIsNone(self.get_object_or_fail(EntityJobResult, job=job, entity=orga3).messages)
+
+    def test_validate_unique(self):
+        "The uniqueness checks involving fields which are not modified are performed."
+        user = self.login_as_root_and_get()
+
+        create_orga = partial(FakeOrganisation.objects.create, user=user)
+        orga1 = create_orga(name='Genshiken')
+        orga2 = create_orga(name='GENSHIKEN')
+
+        job = self._create_job(user, FakeOrganisation, [('name', 'upper', '')])
+
+        with patch.object(FakeOrganisation._meta, 'unique_together', [('user', 'name')]):
+            batch_process_type.execute(job)
+
+        self.assertEqual('Genshiken', self.refresh(orga1).name)
+        self.assertEqual('GENSHIKEN', self.refresh(orga2).name)
+
+        result = self.get_alone_element(EntityJobResult.objects.filter(job=job))
+        self.assertEqual(orga1.id, result.entity_id)
+        self.assertTrue(result.messages)
+
+    def test_queries(self):
+        "The number of queries does not depend on the number of entities."
+        user = self.login_as_root_and_get()
+        create_orga = partial(FakeOrganisation.objects.create, user=user)
+
+        def count_queries(names):
+            FakeOrganisation.objects.all().delete()
+            for name in names:
+                create_orga(name=name)
+
+            job = self._create_job(
+                user, FakeOrganisation, [('name', 'upper', ''), ('description', 'suffix', '!')],
+            )
+
+            with toggle_history(enabled=False):
+                with CaptureQueriesContext(connection) as ctxt:
+                    batch_process_type.execute(job)
+
+            return len(ctxt)
+
+        count_queries(['Club #0'])  # Fill caches
+
+        self.assertEqual(
+            count_queries([f'Club #{i}' for i in range(2)]),
+            count_queries([f'Club #{i}' for i in range(8)]),
+        )
+        self.assertListEqual(
+            [f'CLUB #{i}' for i in range(8)],
+            [*FakeOrganisation.objects.order_by('id').values_list('name', flat=True)],
+        )
+
     def test_use_edit_perm(self):
         user = self.login_as_standard()
         self.add_credentials(user.role, all='!CHANGE', own='*')
@@ -1,11 +1,13 @@
 from copy import deepcopy
 from json import dumps as json_dump
 
+from django.test.utils import override_settings
 from django.urls import reverse
 
 from creme.creme_core.bricks import RelationsBrick
 from creme.creme_core.constants import MODELBRICK_ID
 from creme.creme_core.core.entity_cell import EntityCellRegularField
+from creme.creme_core.gui.brick_cache import BrickCache
 from creme.creme_core.gui.bricks import (
     Brick,
     BrickManager,
@@ -410,6 +412,37 @@ class BrickViewsTestCase(BrickTestCaseMixin, CremeTestCase):
             response.json(),
         )
 
+    @override_settings(BRICKS_CACHE_ALIAS='default')
+    def test_reload_detailview__fragment_cache(self):
+        user = self.login_as_root_and_get()
+        atom = FakeContact.objects.create(user=user, first_name='Atom', last_name='Tenma')
+        renders = []
+
+        class FoobarBrick(self.TestBrick):
+            id = Brick.generate_id('creme_core', 'test_bricks_reload_detailview_cache')
+            dependencies = (FakeOrganisation,)
+            fragment_cache = True
+
+            def detailview_display(this, context):
+                renders.append(context['object'])
+                return super().detailview_display(context)
+
+        self.brick_registry.register(FoobarBrick)
+
+        BrickCache.invalidate_all()
+        url = reverse('creme_core__reload_detailview_bricks', args=(atom.id,))
+        data = {'brick_id': FoobarBrick.id}
+        expected = [[FoobarBrick.id, self.TestBrick.string_format_detail(id=FoobarBrick.id)]]
+        self.assertListEqual(expected, self.assertGET200(url, data=data).json())
+        self.assertListEqual([atom], renders)
+
+        self.assertListEqual(expected, self.assertGET200(url, data=data).json())
+        self.assertEqual(1, len(renders))
+
+        FakeOrganisation.objects.create(user=user, name='Acme')
+        self.assertGET200(url, data=data)
+        self.assertEqual(2, len(renders))
+
     def test_reload_detailview__invalid_brick_id(self):
         user = self.login_as_root_and_get()
         atom = FakeContact.objects.create(user=user, first_name='Atom', last_name='Tenma')
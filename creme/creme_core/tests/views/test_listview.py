@@ -4,6 +4,7 @@ from decimal import Decimal
 from functools import partial
 from json import dumps as json_dump
 from random import shuffle
+from unittest.mock import patch
 from urllib.parse import quote, urlencode
 from xml.etree.ElementTree import tostring as html_tostring
 
@@ -31,7 +32,9 @@ from creme.creme_core.core.entity_filter import (
     operators,
 )
 from creme.creme_core.core.function_field import function_field_registry
+from creme.creme_core.core.paginator import FlowPaginator
 from creme.creme_core.gui.listview import ListViewState
+from creme.creme_core.gui.listview.count import CachedCounter, EstimatedCounter
 from creme.creme_core.gui.view_tag import ViewTag
 from creme.creme_core.models import (
     CremeProperty,
@@ -3477,6 +3480,69 @@ class ListViewTestCase(CremeTestCase):
         page1_fast = post()
         self.assertHasAttr(page1_fast, 'next_page_info')  # Means fast mode
 
+    @staticmethod
+    def _count_queries(captured_sql):
+        return sum(1 for sql in captured_sql if sql.startswith('SELECT COUNT(*)'))
+
+    @override_settings(
+        LISTVIEW_COUNT_MODE='cached',
+        LISTVIEW_COUNT_CACHE_ALIAS='default',
+        FAST_QUERY_MODE_THRESHOLD=100000,
+        PAGE_SIZES=[10],
+        DEFAULT_PAGE_SIZE_IDX=0,
+    )
+    def test_count__cached(self):
+        user = self.login_as_root_and_get()
+        CachedCounter.invalidate_all()
+        self._build_orgas(user=user)
+        hf = self._build_hf()
+
+        def post(page):
+            with CaptureQueriesContext() as context:
+                response = self.assertPOST200(self.url, data={'hfilter': hf.id, 'page': page})
+
+            return response, self._count_queries(context.captured_sql)
+
+        response1, count_queries1 = post(page=1)
+        self.assertEqual(13, response1.context['page_obj'].paginator.count)
+        self.assertIs(False, response1.context['count_estimated'])
+
+        response2, count_queries2 = post(page=2)
+        self.assertEqual(13, response2.context['page_obj'].paginator.count)
+        self.assertEqual(count_queries1 - 1, count_queries2)
+
+        # Invalidation by signal ---
+        FakeOrganisation.objects.create(user=user, name='Mafia #13')
+        response3, count_queries3 = post(page=2)
+        self.assertEqual(14, response3.context['page_obj'].paginator.count)
+        self.assertEqual(count_queries1, count_queries3)
+
+    @override_settings(
+        LISTVIEW_COUNT_MODE='estimated',
+        LISTVIEW_COUNT_CACHE_ALIAS='',
+        FAST_QUERY_MODE_THRESHOLD=100000,
+    )
+    def test_count__estimated(self):
+        user = self.login_as_root_and_get()
+        self._build_orgas(user=user)
+        hf = self._build_hf()
+
+        with patch.object(EstimatedCounter, 'estimate', return_value=150_000):
+            response1 = self.assertPOST200(self.url, data={'hfilter': hf.id})
+
+        self.assertIsInstance(response1.context['page_obj'].paginator, FlowPaginator)
+        self.assertEqual(150_000, response1.context['page_obj'].paginator.count)
+        self.assertIs(True, response1.context['count_estimated'])
+        self.assertContains(response1, '≈')
+
+        # Below the threshold => exact count
+        with patch.object(EstimatedCounter, 'estimate', return_value=99_999):
+            response2 = self.assertPOST200(self.url, data={'hfilter': hf.id})
+
+        self.assertEqual(13, response2.context['page_obj'].paginator.count)
+        self.assertIs(False, response2.context['count_estimated'])
+        self.assertNotContains(response2, '≈')
+
     def test_listview_popup__GET(self):
         # user = self.login_as_root_and_get()
         user = self.login_as_standard(listable_models=[FakeOrganisation])
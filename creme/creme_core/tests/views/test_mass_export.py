@@ -2,20 +2,23 @@ from datetime import date
 from functools import partial
 from io import BytesIO
 from pathlib import Path
+from unittest.mock import patch
 from urllib.parse import urlencode
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.db.models import Q
+from django.http import StreamingHttpResponse
 from django.test.utils import override_settings
 from django.urls import reverse
 from django.utils.encoding import force_str
 from django.utils.html import format_html
 from django.utils.timezone import localtime
 from django.utils.translation import gettext as _
-from django.utils.translation import pgettext
+from django.utils.translation import ngettext, pgettext
 from openpyxl import load_workbook
 
+from creme.creme_core.backends.csv_export import CSVExportBackend
 from creme.creme_core.core.entity_cell import (
     EntityCellFunctionField,
     EntityCellRegularField,
@@ -25,6 +28,8 @@ from creme.creme_core.core.entity_filter.condition_handler import (
     RegularFieldConditionHandler,
 )
 from creme.creme_core.core.entity_filter.operators import ISTARTSWITH
+from creme.creme_core.core.job import get_queue
+from creme.creme_core.creme_jobs import mass_export_type
 from creme.creme_core.gui.history import html_history_registry
 from creme.creme_core.models import (
     CremeProperty,
@@ -40,7 +45,9 @@ from creme.creme_core.models import (
     FieldsConfig,
     FileRef,
     HeaderFilter,
+    Job,
     Language,
+    Notification,
     Relation,
     RelationType,
 )
@@ -48,6 +55,7 @@ from creme.creme_core.models.history import TYPE_EXPORT, HistoryLine
 from creme.creme_core.utils.content_type import as_ctype
 from creme.creme_core.utils.queries import QSerializer
 from creme.creme_core.utils.xlrd_utils import XlrdReader
+from creme.creme_core.views.mass_export import MassExport
 
 from ..base import CremeTestCase
 
@@ -117,7 +125,9 @@ class MassExportViewsTestCase(CremeTestCase):
 
     @staticmethod
     def _build_dl_url(ct_or_model, doc_type='csv', header=False,
-                      efilter_id=None, hfilter_id=None, **kwargs):
+                      efilter_id=None, hfilter_id=None,
+                      url_name='creme_core__mass_export',
+                      **kwargs):
         parameters = '?ct_id={ctid}&type={doctype}{efilter}{hfilter}{header}'.format(
             ctid='' if ct_or_model is None else as_ctype(ct_or_model).id,
             doctype=doc_type,
@@ -129,7 +139,7 @@ class MassExportViewsTestCase(CremeTestCase):
         if kwargs:
             parameters += f'&{urlencode(kwargs, doseq=True)}'
 
-        return reverse('creme_core__mass_export') + parameters
+        return reverse(url_name) + parameters
 
     def _build_contact_dl_url(self, hfilter_id=None, **kwargs):
         ct = self.ct
@@ -246,7 +256,7 @@ class MassExportViewsTestCase(CremeTestCase):
 
         self.assertListEqual(
             [','.join(f'"{hfi.title}"' for hfi in cells)],
-            [force_str(line) for line in response.content.splitlines()],
+            [force_str(line) for line in b''.join(response.streaming_content).splitlines()],
         )
         self.assertFalse(HistoryLine.objects.exclude(id__in=existing_hline_ids))
 
@@ -272,7 +282,7 @@ class MassExportViewsTestCase(CremeTestCase):
         response = self.assertGET200(self._build_contact_dl_url())
 
         # TODO: sort the relations by their verbose_name ??
-        result = response.content.splitlines()
+        result = b''.join(response.streaming_content).splitlines()
         it = (force_str(line) for line in result)
         self.assertEqual(next(it), ','.join(f'"{hfi.title}"' for hfi in hf.cells))
         self.assertEqual(next(it), '"","Black","Jet","Bebop",""')
@@ -286,6 +296,7 @@ class MassExportViewsTestCase(CremeTestCase):
         hline = self.get_alone_element(HistoryLine.objects.exclude(id__in=existing_hline_ids))
         self.assertEqual(self.ct,     hline.entity_ctype)
         self.assertEqual(user,        hline.entity_owner)
+        self.assertEqual(user.username, hline.username)
         self.assertEqual(TYPE_EXPORT, hline.type)
 
         count = len(result) - 1
@@ -309,6 +320,52 @@ class MassExportViewsTestCase(CremeTestCase):
             html_history_registry.line_explainers([hline], user)[0].render(),
         )
 
+    def test_csv__streaming(self):
+        user = self.login_as_root_and_get()
+        hf = self._build_hf_n_contacts(user=user)
+        existing_hline_ids = [*HistoryLine.objects.values_list('id', flat=True)]
+
+        with patch.object(MassExport, 'page_size', 2), \
+                patch.object(CSVExportBackend, 'chunk_size', 1):
+            response = self.assertGET200(self._build_contact_dl_url())
+            self.assertIsInstance(response, StreamingHttpResponse)
+            self.assertEqual(
+                'attachment; filename="fakecontact.csv"',
+                response['Content-Disposition'],
+            )
+
+            # The rows are generated when the content is consumed
+            self.assertFalse(HistoryLine.objects.exclude(id__in=existing_hline_ids))
+
+            chunks = [force_str(chunk) for chunk in response.streaming_content]
+
+        # One chunk per row
+        self.assertEqual(5, len(chunks))
+        self.assertEqual('"","Black","Jet","Bebop",""\r\n', chunks[1])
+        self.assertEqual('"","Wong","Edward","","is a girl"\r\n', chunks[4])
+
+        hline = self.get_alone_element(HistoryLine.objects.exclude(id__in=existing_hline_ids))
+        self.assertEqual(TYPE_EXPORT, hline.type)
+        self.assertEqual(user.username, hline.username)
+        self.assertListEqual([4, hf.name], hline.modifications)
+
+    def test_csv__streaming_interrupted(self):
+        "No history line is created when the client stops the download."
+        user = self.login_as_root_and_get()
+        self._build_hf_n_contacts(user=user)
+        existing_hline_ids = [*HistoryLine.objects.values_list('id', flat=True)]
+
+        with patch.object(MassExport, 'page_size', 2), \
+                patch.object(CSVExportBackend, 'chunk_size', 1):
+            response = self.assertGET200(self._build_contact_dl_url())
+            content = iter(response.streaming_content)
+            next(content)  # Header
+            next(content)  # First row
+            response.close()
+            del content
+
+        self.assertFalse(HistoryLine.objects.exclude(id__in=existing_hline_ids))
+
     def test_scsv(self):
         user = self.login_as_root_and_get()
         cells = self._build_hf_n_contacts(user=user).cells
@@ -316,7 +373,7 @@ class MassExportViewsTestCase(CremeTestCase):
         response = self.assertGET200(self._build_contact_dl_url(doc_type='scsv'))
 
         # TODO: sort the relations by their verbose_name ??
-        it = (force_str(line) for line in response.content.splitlines())
+        it = (force_str(line) for line in b''.join(response.streaming_content).splitlines())
         self.assertEqual(next(it), ';'.join(f'"{hfi.title}"' for hfi in cells))
         self.assertEqual(next(it), '"";"Black";"Jet";"Bebop";""')
         self.assertEqual(next(it), '"";"Spiegel";"Spike";"Bebop/Swordfish";""')
@@ -359,7 +416,7 @@ class MassExportViewsTestCase(CremeTestCase):
         self.assertTrue(user.has_perm_to_view(organisations['Swordfish']))
 
         response = self.assertGET200(self._build_contact_dl_url())
-        result = [*map(force_str, response.content.splitlines())]
+        result = [*map(force_str, b''.join(response.streaming_content).splitlines())]
         self.assertEqual(result[1], '"","Black","Jet","",""')
         self.assertEqual(result[2], '"","Spiegel","Spike","Swordfish",""')
         self.assertEqual(result[3], '"","Wong","Edward","","is a girl"')
@@ -380,7 +437,7 @@ class MassExportViewsTestCase(CremeTestCase):
 
         response = self.assertGET200(self._build_contact_dl_url(hfilter_id=hf.id))
 
-        result = [force_str(line) for line in response.content.splitlines()]
+        result = [force_str(line) for line in b''.join(response.streaming_content).splitlines()]
         self.assertEqual(2, len(result))
         self.assertEqual(
             '"{}","{}"'.format(
@@ -422,7 +479,7 @@ class MassExportViewsTestCase(CremeTestCase):
 
         response = self.assertGET200(self._build_contact_dl_url(hfilter_id=hf.id))
 
-        it = (force_str(line) for line in response.content.splitlines())
+        it = (force_str(line) for line in b''.join(response.streaming_content).splitlines())
         next(it)
 
         self.assertEqual(next(it), '"Black","Jet face","Jet\'s selfie"')
@@ -457,7 +514,7 @@ class MassExportViewsTestCase(CremeTestCase):
             list_url=FakeEmailCampaign.get_lv_absolute_url(),
             hfilter_id=hf.id,
         ))
-        result = [force_str(line) for line in response.content.splitlines()]
+        result = [force_str(line) for line in b''.join(response.streaming_content).splitlines()]
         self.assertEqual(4, len(result))
 
         self.assertEqual(result[1], '"Camp#1","ML#1/ML#2"')
@@ -475,7 +532,7 @@ class MassExportViewsTestCase(CremeTestCase):
 
         response = self.assertGET200(self._build_contact_dl_url())
 
-        it = (force_str(line) for line in response.content.splitlines())
+        it = (force_str(line) for line in b''.join(response.streaming_content).splitlines())
         self.assertEqual(
             next(it),
             ','.join(
@@ -493,7 +550,7 @@ class MassExportViewsTestCase(CremeTestCase):
             self._build_contact_dl_url(extra_q=QSerializer().dumps(Q(last_name='Wong'))),
         )
 
-        result = [force_str(line) for line in response.content.splitlines()]
+        result = [force_str(line) for line in b''.join(response.streaming_content).splitlines()]
         self.assertEqual(2, len(result))
         self.assertEqual('"","Wong","Edward","","is a girl"', result[1])
 
@@ -520,7 +577,7 @@ class MassExportViewsTestCase(CremeTestCase):
             list_url=FakeContact.get_lv_absolute_url(),
             efilter_id=efilter.id
         ))
-        result = [force_str(line) for line in response.content.splitlines()]
+        result = [force_str(line) for line in b''.join(response.streaming_content).splitlines()]
         self.assertEqual(2, len(result))
 
         self.assertEqual('"","Wong","Edward","","is a girl"', result[1])
@@ -673,7 +730,7 @@ class MassExportViewsTestCase(CremeTestCase):
             follow=True,
         )
 
-        lines = {force_str(line) for line in response.content.splitlines()}
+        lines = {force_str(line) for line in b''.join(response.streaming_content).splitlines()}
         self.assertIn('"Bebop","1000"', lines)
         self.assertIn('"Swordfish","20000"', lines)
         self.assertIn('"Redtail",""', lines)
@@ -708,7 +765,7 @@ class MassExportViewsTestCase(CremeTestCase):
             follow=True,
         )
 
-        lines = {force_str(line) for line in response.content.splitlines()}
+        lines = {force_str(line) for line in b''.join(response.streaming_content).splitlines()}
         self.assertIn(f'''"Bebop","{_('Percent')}"''',    lines)
         self.assertIn(f'''"Swordfish","{_('Amount')}"''', lines)
 
@@ -741,7 +798,7 @@ class MassExportViewsTestCase(CremeTestCase):
                 '"123233","Spiegel","Spike"',
             ],
             # NB: slice to remove the header
-            [force_str(line) for line in response.content.splitlines()[1:]],
+            [force_str(line) for line in b''.join(response.streaming_content).splitlines()[1:]],
         )
 
     @override_settings(PAGE_SIZES=[10], DEFAULT_PAGE_SIZE_IDX=0)
@@ -775,7 +832,7 @@ class MassExportViewsTestCase(CremeTestCase):
                 '"123455","Black","Jet"',
             ],
             # NB: slice to remove the header
-            [force_str(line) for line in response.content.splitlines()[1:]],
+            [force_str(line) for line in b''.join(response.streaming_content).splitlines()[1:]],
         )
 
     def test_distinct(self):
@@ -814,7 +871,7 @@ class MassExportViewsTestCase(CremeTestCase):
                 f'"{camp2.name}","{ml1.name}"',
             ],
             # NB: slice to remove the header
-            [force_str(line) for line in response.content.splitlines()[1:]],
+            [force_str(line) for line in b''.join(response.streaming_content).splitlines()[1:]],
         )
 
     def test_no_order(self):
@@ -843,5 +900,253 @@ class MassExportViewsTestCase(CremeTestCase):
         ))
         self.assertListEqual(
             [f'"{l1.name}"', f'"{l2.name}"'],
-            [force_str(line) for line in response.content.splitlines()[1:]],
+            [force_str(line) for line in b''.join(response.streaming_content).splitlines()[1:]],
+        )
+
+    def _build_job_url(self, **kwargs):
+        return self._build_contact_dl_url(url_name='creme_core__mass_export_job', **kwargs)
+
+    def test_job__csv(self):
+        user = self.login_as_root_and_get()
+        hf = self._build_hf_n_contacts(user=user)
+        existing_hline_ids = [*HistoryLine.objects.values_list('id', flat=True)]
+
+        queue = get_queue()
+        queue.clear()
+
+        response = self.assertPOST200(self._build_job_url(), follow=True)
+
+        job = self.get_alone_element(Job.objects.filter(type_id=mass_export_type.id))
+        self.assertRedirects(response, job.get_absolute_url())
+        self.assertEqual(user, job.user)
+        self.assertEqual(Job.STATUS_WAIT, job.status)
+        self.assertListEqual([job], queue.started_jobs)
+        self.assertListEqual(
+            [
+                _('Export «{model}»').format(model='Test Contacts'),
+                _('View: {}').format(hf.name),
+            ],
+            job.description,
+        )
+        self.assertFalse(HistoryLine.objects.exclude(id__in=existing_hline_ids))
+
+        # NB: the buffered lines of history are inserted at the commit
+        with self.captureOnCommitCallbacks(execute=True):
+            mass_export_type.execute(job)
+
+        job = self.refresh(job)
+        self.assertEqual(Job.STATUS_OK, job.status)
+        self.assertEqual(4, job.data['count'])
+        self.assertIsNone(job.data['page'])
+        self.assertEqual(
+            ngettext(
+                '{count} entity has been exported.',
+                '{count} entities have been exported.',
+                4
+            ).format(count=4),
+            mass_export_type.progress(job).label,
+        )
+
+        fileref = mass_export_type.get_fileref(job)
+        self.assertIsInstance(fileref, FileRef)
+        self.assertEqual('fakecontact.csv', fileref.basename)
+        self.assertEqual(user, fileref.user)
+        self.assertListEqual(
+            [_('File: {}').format('fakecontact.csv')],
+            mass_export_type.get_stats(job),
+        )
+
+        with open(fileref.filedata.path, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+
+        self.assertListEqual(
+            [
+                ','.join(f'"{hfi.title}"' for hfi in hf.cells),
+                '"","Black","Jet","Bebop",""',
+                '"","Spiegel","Spike","Bebop/Swordfish",""',
+                '"","Valentine","Faye","","is a girl/is beautiful"',
+                '"","Wong","Edward","","is a girl"',
+            ],
+            lines,
+        )
+
+        hline = self.get_alone_element(HistoryLine.objects.exclude(id__in=existing_hline_ids))
+        self.assertEqual(TYPE_EXPORT, hline.type)
+        self.assertListEqual([4, hf.name], hline.modifications)
+
+        notif = self.get_alone_element(Notification.objects.filter(user=user))
+        self.assertEqual(fileref.id, notif.content.ref.instance_id)
+
+    def test_job__get(self):
+        "The Job is not created by a GET request."
+        user = self.login_as_root_and_get()
+        self._build_hf_n_contacts(user=user)
+
+        self.assertGET405(self._build_job_url())
+        self.assertFalse(Job.objects.filter(type_id=mass_export_type.id))
+
+    def test_job__ajax(self):
+        user = self.login_as_root_and_get()
+        self._build_hf_n_contacts(user=user)
+
+        response = self.assertPOST200(
+            self._build_job_url(), headers={'X-Requested-With': 'XMLHttpRequest'},
+        )
+
+        job = self.get_alone_element(Job.objects.filter(type_id=mass_export_type.id))
+        self.assertEqual(job.get_absolute_url(), response.text)
+
+    def test_job__xlsx(self):
+        user = self.login_as_root_and_get()
+        cells = self._build_hf_n_contacts(user=user).cells
+        self.assertPOST200(self._build_job_url(doc_type='xlsx'), follow=True)
+
+        job = self.get_alone_element(Job.objects.filter(type_id=mass_export_type.id))
+        mass_export_type.execute(job)
+
+        job = self.refresh(job)
+        self.assertEqual(Job.STATUS_OK, job.status)
+
+        fileref = mass_export_type.get_fileref(job)
+        self.assertEqual('fakecontact.xlsx', fileref.basename)
+        self.assertEqual(Path(settings.MEDIA_ROOT, 'xlsx'), Path(fileref.filedata.path).parent)
+
+        # The spool has been removed
+        self.assertEqual(1, FileRef.objects.filter(description=_('Mass export')).count())
+
+        wb = load_workbook(filename=fileref.filedata.path, read_only=True)
+        self.assertListEqual(
+            [
+                [hfi.title for hfi in cells],
+                [None, 'Black',     'Jet',    'Bebop',           None],
+                [None, 'Spiegel',   'Spike',  'Bebop/Swordfish', None],
+                [None, 'Valentine', 'Faye',   None,              'is a girl/is beautiful'],
+                [None, 'Wong',      'Edward', None,              'is a girl'],
+            ],
+            [[tcell.value for tcell in row] for row in wb.active.rows],
+        )
+        wb.close()
+
+    def test_job__resume(self):
+        user = self.login_as_root_and_get()
+        self._build_hf_n_contacts(user=user)
+        self.assertPOST200(self._build_job_url(), follow=True)
+
+        job = self.get_alone_element(Job.objects.filter(type_id=mass_export_type.id))
+
+        original_iter_page_rows = MassExport.iter_page_rows
+        pages_count = 0
+
+        def crashing_iter_page_rows(this, **kwargs):
+            nonlocal pages_count
+            pages_count += 1
+            if pages_count > 1:
+                raise ValueError('Crash')
+
+            yield from original_iter_page_rows(this, **kwargs)
+
+        with patch.object(MassExport, 'page_size', 2), \
+                patch.object(MassExport, 'iter_page_rows', crashing_iter_page_rows):
+            mass_export_type.execute(job)
+
+        job = self.refresh(job)
+        self.assertEqual(Job.STATUS_ERROR, job.status)
+        self.assertEqual(2, job.data['count'])
+        self.assertIsNotNone(job.data['page'])
+        self.assertIsNone(mass_export_type.get_fileref(job))
+
+        spool = self.get_object_or_fail(FileRef, id=job.data['spool'])
+        # Removed by the temporary files cleaner if the job is not resumed
+        self.assertTrue(spool.temporary)
+
+        # A page which has been partially written
+        with open(spool.filedata.path, 'a', encoding='utf-8') as f:
+            f.write('"","Partial","Line","",""\r\n')
+
+        spool_states = []
+
+        def checking_iter_page_rows(this, **kwargs):
+            # Not removed by the temporary files cleaner while the job runs
+            spool_states.append(FileRef.objects.get(id=spool.id).temporary)
+
+            yield from original_iter_page_rows(this, **kwargs)
+
+        with patch.object(MassExport, 'page_size', 2), \
+                patch.object(MassExport, 'iter_page_rows', checking_iter_page_rows):
+            mass_export_type.execute(job)
+
+        self.assertTrue(spool_states)
+        self.assertNotIn(True, spool_states)
+
+        job = self.refresh(job)
+        self.assertEqual(Job.STATUS_OK, job.status)
+        self.assertEqual(4, job.data['count'])
+
+        fileref = mass_export_type.get_fileref(job)
+        self.assertEqual(spool.id, fileref.id)
+        self.assertTrue(fileref.temporary)
+
+        with open(fileref.filedata.path, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+
+        self.assertListEqual(
+            [
+                '"","Black","Jet","Bebop",""',
+                '"","Spiegel","Spike","Bebop/Swordfish",""',
+                '"","Valentine","Faye","","is a girl/is beautiful"',
+                '"","Wong","Edward","","is a girl"',
+            ],
+            lines[1:],
+        )
+
+    def test_job__deleted_hfilter(self):
+        user = self.login_as_root_and_get()
+        hf = self._build_hf_n_contacts(user=user)
+        self.assertPOST200(self._build_job_url(hfilter_id=hf.id), follow=True)
+
+        job = self.get_alone_element(Job.objects.filter(type_id=mass_export_type.id))
+        hf.delete()
+
+        mass_export_type.execute(job)
+
+        job = self.refresh(job)
+        self.assertEqual(Job.STATUS_ERROR, job.status)
+        self.assertStartsWith(
+            job.error, _('The export cannot be performed anymore [{}]').format('')[:-2],
+        )
+
+    def test_job__deleted_hfilter__spool(self):
+        "The spool of a stopped execution is released."
+        user = self.login_as_root_and_get()
+        hf = self._build_hf_n_contacts(user=user)
+        self.assertPOST200(self._build_job_url(hfilter_id=hf.id), follow=True)
+
+        job = self.get_alone_element(Job.objects.filter(type_id=mass_export_type.id))
+        spool = mass_export_type._get_spool(job, delimiter=',', header=['Last name'])
+        self.assertFalse(spool.temporary)
+
+        hf.delete()
+        mass_export_type.execute(job)
+        self.assertEqual(Job.STATUS_ERROR, self.refresh(job).status)
+        self.assertTrue(self.refresh(spool).temporary)
+
+    def test_job__invalid_hfilter(self):
+        self.login_as_root()
+        self.assertPOST404(self._build_job_url(hfilter_id='test-hf_doesnotexist'))
+        self.assertFalse(Job.objects.filter(type_id=mass_export_type.id))
+
+    @override_settings(MAX_JOBS_PER_USER=1)
+    def test_job__max_jobs(self):
+        user = self.login_as_root_and_get()
+        self._build_hf_n_contacts(user=user)
+        Job.objects.create(user=user, type_id=mass_export_type.id, language='en')
+
+        response = self.assertPOST200(self._build_job_url(), follow=True)
+        self.assertRedirects(response, reverse('creme_core__my_jobs'))
+        self.assertEqual(1, Job.objects.filter(type_id=mass_export_type.id).count())
+
+        response = self.assertPOST200(
+            self._build_job_url(), headers={'X-Requested-With': 'XMLHttpRequest'},
         )
+        self.assertEqual(reverse('creme_core__my_jobs'), response.text)
+        self.assertEqual(1, Job.objects.filter(type_id=mass_export_type.id).count())
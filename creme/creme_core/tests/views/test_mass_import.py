@@ -1,6 +1,7 @@
 from decimal import Decimal
 from functools import partial
 from json import dumps as json_dump
+from unittest.mock import patch
 
 from django.contrib.contenttypes.models import ContentType
 from django.template.defaultfilters import slugify
@@ -22,6 +23,7 @@ from creme.creme_core.creme_jobs.mass_import import (
     MassImportJobErrorsBrick,
     mass_import_type,
 )
+from creme.creme_core.forms.mass_import import ImportForm
 from creme.creme_core.gui.job import JobErrorsBrick
 from creme.creme_core.models import (
     CremeProperty,
@@ -478,6 +480,56 @@ class MassImportViewsTestCase(MassImportBaseTestCaseMixin,
     def test_csv__create_related_entities(self):
         return self._test_import__create_related_entities(self._build_csv_doc)
 
+    def test_csv__complex__blocks(self):
+        "The lines are prefetched by small blocks."
+        with patch.object(ImportForm, 'lines_block_size', 2):
+            self._test_import__complex(self._build_csv_doc)
+
+    def test_csv__create_related_entities__blocks(self):
+        "The entities created by a block are found by the next ones."
+        user = self.login_as_root_and_get()
+        contact_ids = [*FakeContact.objects.values_list('id', flat=True)]
+
+        orga_name = 'Nerv'
+        self.assertFalse(FakeOrganisation.objects.filter(name=orga_name))
+
+        employed = RelationType.objects.smart_update_or_create(
+            ('test-subject_employed_by', 'is an employee of'),
+            ('test-object_employed_by',  'employs'),
+        )[0]
+        doc = self._build_csv_doc(
+            [
+                ('Ayanami', 'Rei', orga_name),
+                ('Ikari', 'Shinji', orga_name),
+                ('Soryu', 'Asuka', orga_name),
+            ],
+            user=user,
+        )
+        response = self.client.post(
+            self._build_import_url(FakeContact), follow=True,
+            data={
+                **self.lv_import_data,
+                'document': doc.id,
+                'user': user.id,
+
+                'dyn_relations': self._dyn_relations_value(employed, FakeOrganisation, 3, 'name'),
+                'dyn_relations_can_create': True,
+            },
+        )
+        self.assertNoFormError(response)
+
+        with patch.object(ImportForm, 'lines_block_size', 2):
+            job = self._execute_job(response)
+
+        employer = self.get_object_or_fail(FakeOrganisation, name=orga_name)
+        contacts = FakeContact.objects.exclude(id__in=contact_ids)
+        self.assertEqual(3, len(contacts))
+
+        for contact in contacts:
+            self.assertHaveRelation(subject=contact, type=employed, object=employer)
+
+        self.assertEqual(3, len(self._get_job_results(job)))
+
     def test_xls__simple(self):
         return self._test_import__simple(self._build_xls_doc)
 
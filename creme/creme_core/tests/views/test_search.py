@@ -1,6 +1,7 @@
 from functools import partial
 
 from django.contrib.contenttypes.models import ContentType
+from django.test.utils import override_settings
 from django.urls import reverse
 from django.utils.translation import gettext as _
 
@@ -8,6 +9,7 @@ from creme.creme_core.core.entity_cell import (
     EntityCellCustomField,
     EntityCellFunctionField,
 )
+from creme.creme_core.core.search_index import get_search_index
 from creme.creme_core.gui.bricks import QuerysetBrick
 from creme.creme_core.models import (
     CustomField,
@@ -20,6 +22,7 @@ from creme.creme_core.models import (
     FieldsConfig,
     SearchConfigItem,
 )
+from creme.creme_core.utils.profiling import CaptureQueriesContext
 
 from ..base import CremeTestCase
 from .base import BrickTestCaseMixin
@@ -820,3 +823,30 @@ class SearchViewTestCase(BrickTestCaseMixin, CremeTestCase):
             {'best': None, 'results': []},
             response3.json(),
         )
+
+
+@override_settings(
+    SEARCH_INDEX_BACKEND='creme.creme_core.core.search_index.DatabaseSearchIndex',
+)
+class IndexedSearchViewTestCase(SearchViewTestCase):
+    "Same tests, but the search uses the index."
+    def _search(self, searched=None, ct_id=None):
+        # NB: some tests modify the search configuration after the creation of
+        #     the entities, so we rebuild the index like the command would do.
+        index = get_search_index()
+        index.rebuild(FakeContact)
+        index.rebuild(FakeOrganisation)
+
+        return super()._search(searched=searched, ct_id=ct_id)
+
+    def test_search_index_used(self):
+        user = self.login_as_root_and_get()
+        self._setup_contacts(user=user)
+
+        with CaptureQueriesContext() as context:
+            response = self._search('linu', self.contact_ct_id)
+
+        self.assertEqual(200, response.status_code)
+        self.assertTrue(
+            any('creme_core_searchindexentry' in sql for sql in context.captured_sql)
+        )
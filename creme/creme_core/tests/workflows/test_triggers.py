@@ -51,6 +51,7 @@ class EntityCreationTriggerTestCase(CremeTestCase):
         trigger = EntityCreationTrigger(model=FakeContact)
         self.assertEqual(FakeContact, trigger.model)
         self.assertEqual('EntityCreationTrigger(model=FakeContact)', repr(trigger))
+        self.assertEqual(FakeContact, trigger.index_key())
 
         model_key = 'creme_core.fakecontact'
         serialized = {'type': type_id, 'model': model_key}
@@ -186,6 +187,7 @@ class PropertyAddingTriggerTestCase(CremeTestCase):
             f'PropertyAddingTrigger(entity_model=FakeOrganisation, ptype="{ptype.uuid}")',
             repr(trigger)
         )
+        self.assertEqual(ptype.uuid, trigger.index_key())
 
         with self.assertNumQueries(1):
             self.assertEqual(ptype, trigger.property_type)
@@ -361,6 +363,7 @@ class RelationAddingTriggerTestCase(CremeTestCase):
             ' rtype="creme_core-subject_has", object_model=FakeContact)',
             repr(trigger),
         )
+        self.assertEqual(rtype.id, trigger.index_key())
 
         with self.assertNumQueries(1):
             self.assertEqual(rtype, trigger.relation_type)
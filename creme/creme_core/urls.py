@@ -495,6 +495,11 @@ creme_core_patterns = [
         mass_export.MassExport.as_view(),
         name='creme_core__mass_export',
     ),
+    re_path(
+        r'^mass_export/job[/]?$',
+        mass_export.MassExportJobCreation.as_view(),
+        name='creme_core__mass_export_job',
+    ),
 
     re_path(
         r'^mass_import/',
@@ -1,6 +1,6 @@
 ################################################################################
 #    Creme is a free/open-source Customer Relationship Management software
-#    Copyright (C) 2017-2025  Hybird
+#    Copyright (C) 2017-2026  Hybird
 #
 #    This program is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU Affero General Public License as published by
@@ -25,6 +25,7 @@ from django.template.context import make_context
 from django.template.engine import Engine
 
 from .. import utils
+from ..gui.brick_cache import brick_cache
 from ..gui.bricks import Brick, BrickManager, BrickRegistry, VoidBrick
 from ..gui.bricks import brick_registry as global_brick_registry
 from ..http import CremeJsonResponse
@@ -111,7 +112,10 @@ class BricksReloading(generic.CheckedView):
                 # brick, & so avoid annoying side effects.
                 # Notice that build_context() creates a shared dictionary with
                 # the "shared" key in order to explicitly share data between 2+ bricks.
-                brick_renders.append((brick.id, render_func({**context})))
+                brick_renders.append((
+                    brick.id,
+                    brick_cache.render(brick=brick, method=render_method, context={**context}),
+                ))
 
         return brick_renders
 
@@ -17,6 +17,7 @@
 ################################################################################
 
 import logging
+from collections.abc import Iterable
 from enum import Enum
 from functools import partial
 from json import JSONDecodeError
@@ -73,6 +74,8 @@ class EntitiesList(base.PermissionsMixin, base.TitleMixin, ListView):
      - Choice of EntityFilters (i.e. which entities to display).
      - Pagination, with a fast pagination mode when there is a lot of entities
        Related settings: PAGE_SIZES, DEFAULT_PAGE_SIZE_IDX, FAST_QUERY_MODE_THRESHOLD.
+     - Counting of the entities, with a strategy which can avoid the COUNT query
+       (see 'get_counter()'). Related settings: LISTVIEW_COUNT_*.
      - Ordering: some columns can be used to order the list ; the chosen column
        is used as main order criterion, the model's meta ordering information are used
        as secondary criteria.
@@ -161,6 +164,7 @@ class EntitiesList(base.PermissionsMixin, base.TitleMixin, ListView):
 
         self.queryset = None  # We hide voluntarily the class attribute which SHOULD not be used.
         self.count = None
+        self.count_estimated = False
         self.fast_mode = None
         self.ordering = None  # Idem
 
@@ -280,6 +284,7 @@ class EntitiesList(base.PermissionsMixin, base.TitleMixin, ListView):
 
         context['model'] = self.model
         context['list_view_state'] = self.state
+        context['count_estimated'] = self.count_estimated
 
         context['list_title'] = self.get_title()
         context['sub_title'] = self.get_sub_title()
@@ -305,6 +310,11 @@ class EntitiesList(base.PermissionsMixin, base.TitleMixin, ListView):
         # TODO: regroup registries ??
         context['cell_sorter_registry'] = self.get_cell_sorter_registry()
 
+        context['cells_contents'] = self.get_cells_contents(
+            cells=self.header_filters.selected.filtered_cells,
+            entities=page_obj.object_list if (page_obj := context.get('page_obj')) else (),
+        )
+
         context['aggregations'] = (
             {} if self.is_popup_view else
             self.aggregator_registry.aggregation_for_cells(
@@ -315,9 +325,38 @@ class EntitiesList(base.PermissionsMixin, base.TitleMixin, ListView):
 
         return context
 
+    def get_cells_contents(self, *,
+                           cells: list[EntityCell],
+                           entities: Iterable[CremeEntity],
+                           ) -> dict[str, dict[int, str]]:
+        """Render the cells for the entities of the page (column by column,
+        see EntityCell.render_many()).
+        @return: A dictionary {cell_key: {entity_id: rendered_content}}.
+        """
+        user = self.request.user
+        tag = self.view_tag
+        entities = [*entities]
+
+        return {
+            cell.key: {
+                entity.id: content
+                for entity, content in zip(
+                    entities, cell.render_many(entities, user, tag=tag),
+                )
+            }
+            for cell in cells
+            if cell.type_id != EntityCellActions.type_id
+        }
+
     def get_buttons(self) -> lv_gui.ListViewButtonList:
         return lv_gui.ListViewButtonList(self.button_classes)
 
+    def get_counter(self) -> lv_gui.count.ExactCounter:
+        """Get the instance which counts the entities (see the setting
+        "LISTVIEW_COUNT_MODE").
+        """
+        return lv_gui.counter_classes[settings.LISTVIEW_COUNT_MODE]()
+
     def get_entity_filter(self, entity_filters: EntityFilterList) -> EntityFilter:
         return self.state.set_entityfilter(
             entity_filters=entity_filters,
@@ -528,27 +567,29 @@ class EntitiesList(base.PermissionsMixin, base.TitleMixin, ListView):
         # ----
         # If the query does not use the real entities' specific fields to filter,
         # we perform a query on CremeEntity & so we avoid a JOIN.
-        if filtered:
-            count = qs.count()
-        else:
-            model = self.model
+        model = self.model
+        count_qs = qs
+
+        if not filtered:
             try:
-                count = EntityCredentials.filter_entities(
+                count_qs = EntityCredentials.filter_entities(
                     user,
                     CremeEntity.objects.filter(
                         is_deleted=False,
                         entity_type=ContentType.objects.get_for_model(model),
                     ),
                     as_model=model,
-                ).count()
+                )
             except EntityCredentials.FilteringError as e:
                 logger.debug(
                     '%s.get_unordered_queryset_n_count() : fast count is not possible (%s)',
                     type(self).__name__, e,
                 )
-                count = qs.count()
 
-        return qs, count
+        count = self.get_counter().count(count_qs, model=model)
+        self.count_estimated = count.estimated
+
+        return qs, count.value
 
     def get_search_field_registry(self) -> lv_gui.ListViewSearchFieldRegistry:
         return self.search_field_registry
@@ -658,7 +699,9 @@ class EntitiesList(base.PermissionsMixin, base.TitleMixin, ListView):
         page = self.PAGE_BUILDERS[type(paginator)](self, paginator=paginator)
 
         # Optimisation time !!
-        self.header_filter.populate_entities(page.object_list, self.request.user)
+        user = self.request.user
+        self.header_filter.populate_entities(page.object_list, user)
+        user.populate_credentials(page.object_list)
 
         is_paginated = page.has_other_pages()
 
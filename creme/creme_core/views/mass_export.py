@@ -17,19 +17,24 @@
 ################################################################################
 
 import logging
+from itertools import chain
 
+from django.conf import settings
 from django.core.exceptions import BadRequest
-from django.http import Http404
+from django.http import Http404, HttpResponse, HttpResponseRedirect
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from django.utils.encoding import smart_str
 
 from ..backends import export_backend_registry
 from ..core import sorter
 from ..core.paginator import FlowPaginator
+from ..creme_jobs import mass_export_type
 from ..forms.listview import ListViewSearchForm
 from ..gui.listview import search_field_registry
 from ..gui.view_tag import ViewTag
-from ..models import EntityCredentials, EntityFilter, HeaderFilter
+from ..http import is_ajax
+from ..models import EntityCredentials, EntityFilter, HeaderFilter, Job
 from ..models.history import _HLTEntityExport
 from ..utils import bool_from_str_extended, get_from_GET_or_404
 from ..utils.meta import Order
@@ -39,7 +44,6 @@ from .generic import base
 logger = logging.getLogger(__name__)
 
 
-# TODO: stream response ??
 # TODO: factorise with generic.listview.EntitiesList ?
 class MassExport(base.EntityCTypeRelatedMixin, base.CheckedView):
     ct_id_arg = 'ct_id'
@@ -160,9 +164,88 @@ class MassExport(base.EntityCTypeRelatedMixin, base.CheckedView):
 
         return sort_info.field_names
 
-    def get(self, request, *args, **kwargs):
-        user = request.user
+    def get_queryset(self, *, model, cells, efilter):
+        request = self.request
+        entities_qs = model.objects.filter(is_deleted=False)
+        use_distinct = False
+
+        # ----
+        if efilter is not None:
+            entities_qs = efilter.filter(entities_qs)
+
+        # ----
+        serialized_extra_q = request.GET.get(self.extra_q_arg)
+        if serialized_extra_q is not None:
+            try:
+                extra_q = QSerializer().loads(serialized_extra_q)
+            except Exception as e:
+                raise BadRequest(f'Invalid extra Q: {e}')
+
+            entities_qs = entities_qs.filter(extra_q)
+            use_distinct = True  # TODO: test + only if needed
+
+        # ----
+        search_form = self.get_search_form(cells=cells)
+        search_q = search_form.search_q
+        if search_q:
+            try:
+                entities_qs = entities_qs.filter(search_q)
+            except Exception as e:
+                logger.exception(
+                    'Error when building the search queryset with Q=%s (%s).',
+                    search_q, e,
+                )
+            else:
+                use_distinct = True  # TODO: test + only if needed
+
+        # ----
+        entities_qs = EntityCredentials.filter(request.user, entities_qs)
+
+        if use_distinct:
+            entities_qs = entities_qs.distinct()
+
+        return entities_qs
+
+    def iter_page_rows(self, *, entities, header_filter, cells):
+        """Generator of the exported rows corresponding to a page of entities."""
+        user = self.request.user
+        tag = ViewTag.TEXT_PLAIN
+
+        header_filter.populate_entities(entities, user)  # Optimisation time !!!
+
+        # NB: we render column by column, so the printers/credentials are
+        #     resolved once per page instead of once per entity.
+        columns = [cell.render_many(entities, user, tag=tag) for cell in cells]
+
+        for values in zip(*columns) if columns else ([] for __ in entities):
+            yield [smart_str(res) if res else '' for res in values]
+
+    def iter_entity_rows(self, *, paginator, header_filter, cells, ctype, efilter):
+        """Generator of the exported rows (one per entity).
+        The pages of entities are retrieved lazily, so the rows can be streamed
+        by the backend ; the history line is created once all the rows have
+        been generated (nothing is created if the streaming is interrupted).
+        """
+        total_count = 0
+
+        for entities_page in paginator.pages():
+            for line in self.iter_page_rows(
+                entities=entities_page.object_list,
+                header_filter=header_filter,
+                cells=cells,
+            ):
+                total_count += 1
+                yield line
+
+        # NB: the rows are generated after the response has been processed by
+        #     the middlewares, so the global information (user...) have been
+        #     cleared; the user is passed explicitly.
+        _HLTEntityExport.create_line(
+            ctype=ctype, user=self.request.user, count=total_count,
+            hfilter=header_filter, efilter=efilter,
+        )
 
+    def get(self, request, *args, **kwargs):
         header_only = self.get_header_only()
         backend_cls = self.get_backend_class()
         ct = self.get_ctype()
@@ -171,82 +254,62 @@ class MassExport(base.EntityCTypeRelatedMixin, base.CheckedView):
 
         cells = self.get_cells(header_filter=hf)
 
-        writer = backend_cls()
-        writerow = writer.writerow
-        # Doesn't accept generator expression... ;(
-        writerow([smart_str(cell.title) for cell in cells])
+        rows = [[smart_str(cell.title) for cell in cells]]
 
         if not header_only:
-            ordering = self.get_ordering(model=model, cells=cells)
-
-            entities_qs = model.objects.filter(is_deleted=False)
-            use_distinct = False
-
-            # ----
+            # NB: the queryset is built (& the arguments are validated) before
+            #     the rows are generated, because errors cannot be returned
+            #     once the response is streamed.
             efilter = self.get_entity_filter()
-            if efilter is not None:
-                entities_qs = efilter.filter(entities_qs)
-
-            # ----
-            serialized_extra_q = request.GET.get(self.extra_q_arg)
-            if serialized_extra_q is not None:
-                try:
-                    extra_q = QSerializer().loads(serialized_extra_q)
-                except Exception as e:
-                    raise BadRequest(f'Invalid extra Q: {e}')
-
-                entities_qs = entities_qs.filter(extra_q)
-                use_distinct = True  # TODO: test + only if needed
-
-            # ----
-            search_form = self.get_search_form(cells=cells)
-            search_q = search_form.search_q
-            if search_q:
-                try:
-                    entities_qs = entities_qs.filter(search_q)
-                except Exception as e:
-                    logger.exception(
-                        'Error when building the search queryset with Q=%s (%s).',
-                        search_q, e,
-                    )
-                else:
-                    use_distinct = True  # TODO: test + only if needed
-
-            # ----
-            entities_qs = EntityCredentials.filter(user, entities_qs)
-
-            if use_distinct:
-                entities_qs = entities_qs.distinct()
-
-            paginator = self.get_paginator(queryset=entities_qs, ordering=ordering)
+            paginator = self.get_paginator(
+                queryset=self.get_queryset(model=model, cells=cells, efilter=efilter),
+                ordering=self.get_ordering(model=model, cells=cells),
+            )
+            rows = chain(
+                rows,
+                self.iter_entity_rows(
+                    paginator=paginator, header_filter=hf, cells=cells,
+                    ctype=ct, efilter=efilter,
+                ),
+            )
 
-            total_count = 0
-            tag = ViewTag.TEXT_PLAIN
+        return backend_cls().stream(rows, filename=ct.model, user=request.user)
 
-            for entities_page in paginator.pages():
-                entities = entities_page.object_list
 
-                hf.populate_entities(entities, user)  # Optimisation time !!!
+class MassExportJobCreation(MassExport):
+    """Creates a Job which performs the export in the job manager (see
+    <creme_core.creme_jobs.mass_export>), & redirects to the job's page
+    (which displays the progress & then the exported file).
+    It uses the same GET arguments as MassExport (in the URL), but the Job is
+    only created by a POST request ; it's useful for big exports which take
+    too much time to be performed in a request.
+    With an AJAX request, the URL of the Job's page is returned instead of
+    the redirection.
+    """
+    http_method_names = ['post']
 
-                for entity in entities:
-                    total_count += 1
-                    line = []
+    def _redirect(self, url):
+        if is_ajax(self.request):
+            return HttpResponse(url, content_type='text/plain')
 
-                    for cell in cells:
-                        try:
-                            res = cell.render(entity, user, tag=tag)
-                        except Exception as e:
-                            logger.debug('Exception in CSV export: %s', e)
-                            res = ''
+        return HttpResponseRedirect(url)
 
-                        line.append(smart_str(res) if res else '')
+    def post(self, request, *args, **kwargs):
+        user = request.user
 
-                    writerow(line)
+        if Job.objects.not_finished(user).count() >= settings.MAX_JOBS_PER_USER:
+            return self._redirect(reverse('creme_core__my_jobs'))
 
-            _HLTEntityExport.create_line(
-                ctype=ct, user=user, count=total_count, hfilter=hf, efilter=efilter,
-            )
+        # NB: arguments are validated now, in order to get errors immediately.
+        self.get_backend_class()
+        self.get_ctype()
+        self.get_header_filter()
+        self.get_entity_filter()
 
-        writer.save(ct.model, user)
+        job = Job.objects.create(
+            user=user,
+            type=mass_export_type,
+            data={'GET': request.GET.urlencode()},
+        )
 
-        return writer.response
+        return self._redirect(job.get_absolute_url())
@@ -85,6 +85,9 @@ class _EntityTrigger(WorkflowTrigger):
     def source_class(self):
         raise NotImplementedError
 
+    def index_key(self):
+        return self._model
+
     def _activate(self, event):
         assert isinstance(event, _EntityEvent)
 
@@ -197,6 +200,9 @@ class PropertyAddingTrigger(WorkflowTrigger):
             f')'
         )
 
+    def index_key(self):
+        return self._ptype_uuid
+
     def _activate(self, event):
         assert isinstance(event, PropertyAdded)
 
@@ -322,6 +328,9 @@ class RelationAddingTrigger(WorkflowTrigger):
             f')'
         )
 
+    def index_key(self):
+        return self._rtype_id
+
     def _activate(self, event):
         assert isinstance(event, RelationAdded)
 
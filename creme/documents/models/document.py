@@ -1,6 +1,6 @@
 ################################################################################
 #    Creme is a free/open-source Customer Relationship Management software
-#    Copyright (C) 2009-2025  Hybird
+#    Copyright (C) 2009-2026  Hybird
 #
 #    This program is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU Affero General Public License as published by
@@ -116,6 +116,14 @@ class AbstractDocument(CremeEntity):
 
         super().save(*args, **kwargs)
 
+    def allows_bulk_save(self, field_names):
+        # NB: save() only fills the empty fields (& the MIME type at creation)
+        return (
+            type(self).save is AbstractDocument.save
+            and bool(self.title)
+            and self.file_size is not None
+        )
+
 
 class Document(AbstractDocument):
     class Meta(AbstractDocument.Meta):
@@ -149,6 +149,12 @@ class DocumentTestCase(BrickTestCaseMixin, _DocumentsTestCase):
             ),
         )
 
+        # Bulk saving ---
+        self.assertTrue(doc1.allows_bulk_save(['title', 'description']))
+
+        doc1.title = ''
+        self.assertFalse(doc1.allows_bulk_save(['title']))
+
     @override_settings(ALLOWED_EXTENSIONS=('txt', 'pdf'))
     def test_creation_view(self):
         user = self.login_as_root_and_get()
@@ -1,6 +1,6 @@
 ################################################################################
 #    Creme is a free/open-source Customer Relationship Management software
-#    Copyright (C) 2009-2024  Hybird
+#    Copyright (C) 2009-2026  Hybird
 #
 #    This program is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU Affero General Public License as published by
@@ -17,6 +17,7 @@
 ################################################################################
 
 import logging
+from itertools import chain
 
 from django.utils.functional import partition
 from django.utils.translation import gettext_lazy as _
@@ -25,6 +26,7 @@ from creme.creme_core.gui.bricks import QuerysetBrick
 from creme.sketch.bricks import ChartBrick
 
 from . import get_graph_model
+from .core import GraphExpander
 from .models import RootNode
 
 logger = logging.getLogger(__name__)
@@ -49,6 +51,11 @@ class RelationChartBrick(ChartBrick):
     node_text_color = "black"
     edge_color_range = None
 
+    # Number of hops from the root nodes (see GraphExpander)
+    expansion_depth = 1
+    # Maximum number of displayed nodes (None means "no limit")
+    max_nodes = None
+
     def get_chart_props(self, context):
         return {
             "transition": self.enable_transition,
@@ -63,52 +70,27 @@ class RelationChartBrick(ChartBrick):
         }
 
     def get_graph_chart_data(self, graph, user):
-        root_nodes = graph.get_root_nodes(user)
-        orbital_entities = {}
-
-        for node in root_nodes:
-            root_entity = node.real_entity
-            relations = sorted(
-                graph.get_root_node_relations(node, user),
-                key=lambda r: r.type.id
-            )
+        expansion = GraphExpander(
+            depth=self.expansion_depth, max_nodes=self.max_nodes,
+        ).expand(graph=graph, user=user)
 
+        for root_entity in expansion.roots:
             yield {
                 'id': root_entity.pk,
                 'label': str(root_entity),
                 'url': root_entity.get_absolute_url()
             }
 
-            for relation in relations:
-                entity = orbital_entities.get(relation.object_entity_id)
-
-                if entity is None:
-                    entity = relation.real_object
-                    orbital_entities[relation.object_entity_id] = entity
-
-                yield {
-                    'id': entity.pk,
-                    'parent': root_entity.pk,
-                    'label': str(entity),
-                    'relation': {
-                        'label': str(relation.type.predicate),
-                        'id': relation.type.id,
-                    },
-                    'url': entity.get_absolute_url(),
-                }
-
-        orbital_relations = graph.get_orbital_relations(limit_to=orbital_entities.keys())
-
-        for relation in orbital_relations:
-            entity = orbital_entities[relation.object_entity_id]
+        for edge in chain(expansion.edges, expansion.orbital_edges):
+            entity = edge.entity
 
             yield {
-                'id': relation.object_entity_id,
-                'parent': relation.subject_entity_id,
+                'id': entity.pk,
+                'parent': edge.parent_id,
                 'label': str(entity),
                 'relation': {
-                    'label': str(relation.type.predicate),
-                    'id': relation.type.id,
+                    'label': str(edge.relation_type.predicate),
+                    'id': edge.relation_type.id,
                 },
                 'url': entity.get_absolute_url(),
             }
@@ -0,0 +1,215 @@
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2026  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from creme.creme_core.models import CremeEntity, Relation, RelationType
+
+from .models import AbstractGraph, RootNode
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class GraphEdge:
+    "Relationship between 2 nodes of a graph."
+    parent_id: int
+    entity: CremeEntity
+    relation_type: RelationType
+
+
+@dataclass
+class GraphExpansion:
+    """Nodes & edges of a graph, as built by GraphExpander.expand()."""
+    # Real entities of the root nodes
+    roots: list[CremeEntity] = field(default_factory=list)
+    # Edges related to the types of relationship of the root nodes
+    edges: list[GraphEdge] = field(default_factory=list)
+    # Edges related to the orbital types of relationship
+    orbital_edges: list[GraphEdge] = field(default_factory=list)
+    # Is True if the nodes budget has been reached
+    truncated: bool = False
+
+
+class GraphExpander:
+    """Build the nodes & edges of a Graph with a bounded number of queries.
+
+    The root nodes, their relationships & the orbital relationships are
+    retrieved with set-based queries (whatever the number of nodes), the
+    real entities are retrieved per ContentType & the credentials are
+    computed in bulk (see CremeUser.populate_credentials()).
+
+    The expansion can go further than the direct neighbours of the root nodes:
+    with a depth of N, the reached nodes are expanded again (N-1 times) by
+    following the types of relationship of the root node they come from.
+    A budget of nodes can be given to limit the size of huge graphs.
+    """
+    def __init__(self, *, depth: int = 1, max_nodes: int | None = None):
+        """Constructor.
+        @param depth: Number of hops from the root nodes (at least 1).
+        @param max_nodes: Maximum number of nodes (root nodes included);
+               <None> means "no limit".
+        """
+        if depth < 1:
+            raise ValueError(f'GraphExpander: depth must be >= 1 (got {depth})')
+
+        if max_nodes is not None and max_nodes < 1:
+            raise ValueError(f'GraphExpander: max_nodes must be >= 1 (got {max_nodes})')
+
+        self.depth = depth
+        self.max_nodes = max_nodes
+
+    def _visible_entities(self, user, entities) -> dict[int, CremeEntity]:
+        "Get the real entities which can be viewed, by ID."
+        entities = [*entities]
+        CremeEntity.populate_real_entities(entities)
+
+        real_entities = [entity.get_real_entity() for entity in entities]
+        user.populate_credentials(real_entities)
+
+        has_perm_to_view = user.has_perm_to_view
+
+        return {
+            entity.id: entity
+            for entity in real_entities
+            if has_perm_to_view(entity)
+        }
+
+    def expand(self, graph: AbstractGraph, user) -> GraphExpansion:
+        expansion = GraphExpansion()
+        max_nodes = self.max_nodes
+
+        # Root nodes ---
+        root_nodes = [
+            root
+            for root in RootNode.objects.filter(graph=graph.id)
+                                        .select_related('entity')
+                                        .prefetch_related('relation_types')
+            if not root.entity.is_deleted
+        ]
+        visible_roots = self._visible_entities(
+            user, {root.entity_id: root.entity for root in root_nodes}.values(),
+        )
+
+        nodes = {}  # Real entities by ID
+        # Types of relationship to follow, by ID of entity to expand
+        frontier = defaultdict(dict)
+        rtypes = {}
+
+        for root in root_nodes:
+            entity = visible_roots.get(root.entity_id)
+            if entity is None:
+                continue
+
+            if entity.id not in nodes:
+                if max_nodes is not None and len(nodes) >= max_nodes:
+                    expansion.truncated = True
+                    continue
+
+                nodes[entity.id] = entity
+                expansion.roots.append(entity)
+
+            for rtype in root.relation_types.all():
+                rtypes[rtype.id] = rtype
+                frontier[entity.id][rtype.id] = rtype
+
+        # Relationships of the nodes, hop by hop ---
+        hidden_ids = set()
+        reached = {}  # Real entities which are the target of an edge, by ID
+
+        for __ in range(self.depth):
+            if not frontier:
+                break
+
+            relations_per_subject = defaultdict(list)
+            for relation in Relation.objects.filter(
+                subject_entity__in=frontier.keys(),
+                type__in=rtypes.keys(),
+            ).select_related('object_entity').order_by('type_id', 'id'):
+                relations_per_subject[relation.subject_entity_id].append(relation)
+
+            new_entities = self._visible_entities(
+                user,
+                {
+                    relation.object_entity_id: relation.object_entity
+                    for relations in relations_per_subject.values()
+                    for relation in relations
+                    if relation.object_entity_id not in nodes
+                    and relation.object_entity_id not in hidden_ids
+                }.values(),
+            )
+            next_frontier = defaultdict(dict)
+
+            for subject_id, followed_rtypes in frontier.items():
+                for relation in relations_per_subject[subject_id]:
+                    rtype = followed_rtypes.get(relation.type_id)
+                    if rtype is None:
+                        continue
+
+                    object_id = relation.object_entity_id
+                    entity = nodes.get(object_id)
+
+                    if entity is None:
+                        entity = new_entities.get(object_id)
+
+                        if entity is None:
+                            hidden_ids.add(object_id)
+                            continue
+
+                        if max_nodes is not None and len(nodes) >= max_nodes:
+                            expansion.truncated = True
+                            continue
+
+                        nodes[object_id] = entity
+                        next_frontier[object_id].update(followed_rtypes)
+
+                    reached[object_id] = entity
+                    expansion.edges.append(
+                        GraphEdge(parent_id=subject_id, entity=entity, relation_type=rtype)
+                    )
+
+            frontier = next_frontier
+
+        if expansion.truncated:
+            logger.warning(
+                'GraphExpander: the graph id=%s has been truncated to %s nodes',
+                graph.id, max_nodes,
+            )
+
+        # Orbital relationships (between the reached nodes) ---
+        if reached:
+            orbital_rtype_ids = [*graph.orbital_relation_types.values_list('pk', flat=True)]
+
+            if orbital_rtype_ids:
+                expansion.orbital_edges.extend(
+                    GraphEdge(
+                        parent_id=relation.subject_entity_id,
+                        entity=reached[relation.object_entity_id],
+                        relation_type=relation.type,
+                    ) for relation in Relation.objects.filter(
+                        type__in=orbital_rtype_ids,
+                        subject_entity__in=reached.keys(),
+                        object_entity__in=reached.keys(),
+                    ).select_related('type')
+                )
+
+        return expansion
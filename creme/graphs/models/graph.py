@@ -110,7 +110,7 @@ class AbstractGraph(CremeEntity):
                     object_entity__in=limit_to,
                 )
 
-            qs.select_related('type')
+            qs = qs.select_related('type')
         else:
             qs = Relation.objects.none()
 
@@ -0,0 +1,203 @@
+from functools import partial
+
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+from creme.creme_core.models import (
+    FakeContact,
+    FakeOrganisation,
+    Relation,
+    RelationType,
+)
+from creme.creme_core.tests.base import CremeTestCase
+from creme.graphs import get_graph_model
+from creme.graphs.core import GraphEdge, GraphExpander
+from creme.graphs.models import RootNode
+
+Graph = get_graph_model()
+
+
+class GraphExpanderTestCase(CremeTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        cls.is_employee = RelationType.objects.builder(
+            id='test-subject_employee', predicate='is employed by',
+        ).symmetric(id='test-object_employee', predicate='has employee').get_or_create()[0]
+        cls.has_employee = cls.is_employee.symmetric_type
+
+        cls.is_client = RelationType.objects.builder(
+            id='test-subject_client', predicate='is client of',
+        ).symmetric(id='test-object_client', predicate='has client').get_or_create()[0]
+        cls.has_client = cls.is_client.symmetric_type
+
+    def _create_graph(self, user, roots, rtype):
+        graph = Graph.objects.create(user=user, name='Employees graph')
+
+        for root in roots:
+            node = RootNode.objects.create(graph=graph, real_entity=root)
+            node.relation_types.set([rtype])
+
+        return graph
+
+    def _add_employees(self, user, orga, count):
+        contacts = [
+            FakeContact.objects.create(
+                user=user, first_name=f'Contact #{i}', last_name=orga.name,
+            ) for i in range(count)
+        ]
+
+        for contact in contacts:
+            Relation.objects.create(
+                user=user, type=self.is_employee, subject_entity=contact, object_entity=orga,
+            )
+
+        return contacts
+
+    def test_expand(self):
+        user = self.get_root_user()
+
+        orga = FakeOrganisation.objects.create(user=user, name='NERV')
+        contact1, contact2 = self._add_employees(user, orga, 2)
+
+        Relation.objects.create(
+            user=user, type=self.is_client, subject_entity=contact1, object_entity=contact2,
+        )
+
+        graph = self._create_graph(user, roots=[orga], rtype=self.has_employee)
+        graph.orbital_relation_types.set([self.is_client])
+
+        expansion = GraphExpander().expand(graph=graph, user=user)
+        self.assertFalse(expansion.truncated)
+
+        roots = expansion.roots
+        self.assertListEqual([orga], roots)
+        self.assertIsInstance(roots[0], FakeOrganisation)
+
+        self.assertListEqual(
+            [
+                GraphEdge(parent_id=orga.id, entity=contact1, relation_type=self.has_employee),
+                GraphEdge(parent_id=orga.id, entity=contact2, relation_type=self.has_employee),
+            ],
+            expansion.edges,
+        )
+        self.assertIsInstance(expansion.edges[0].entity, FakeContact)
+
+        self.assertListEqual(
+            [GraphEdge(parent_id=contact1.id, entity=contact2, relation_type=self.is_client)],
+            expansion.orbital_edges,
+        )
+
+    def test_expand__queries(self):
+        "The number of queries does not depend on the number of nodes."
+        user = self.get_root_user()
+        create_orga = partial(FakeOrganisation.objects.create, user=user)
+
+        def count_queries(graph):
+            with CaptureQueriesContext(connections['default']) as ctxt:
+                expansion = GraphExpander().expand(graph=graph, user=user)
+
+            return len(ctxt), expansion
+
+        orga1 = create_orga(name='NERV')
+        self._add_employees(user, orga1, 1)
+        graph1 = self._create_graph(user, roots=[orga1], rtype=self.has_employee)
+        graph1.orbital_relation_types.set([self.is_client])
+
+        orgas = [create_orga(name=f'Seele #{i}') for i in range(3)]
+        for orga in orgas:
+            self._add_employees(user, orga, 5)
+        graph2 = self._create_graph(user, roots=orgas, rtype=self.has_employee)
+        graph2.orbital_relation_types.set([self.is_client])
+
+        count1, expansion1 = count_queries(graph1)
+        count2, expansion2 = count_queries(graph2)
+        self.assertEqual(1, len(expansion1.edges))
+        self.assertEqual(15, len(expansion2.edges))
+        self.assertEqual(count1, count2)
+
+    def test_expand__depth(self):
+        user = self.get_root_user()
+
+        create_orga = partial(FakeOrganisation.objects.create, user=user)
+        orga1 = create_orga(name='NERV')
+        orga2 = create_orga(name='Seele')
+        orga3 = create_orga(name='Gehirn')
+
+        create_rel = partial(Relation.objects.create, user=user, type=self.has_client)
+        create_rel(subject_entity=orga1, object_entity=orga2)
+        create_rel(subject_entity=orga2, object_entity=orga3)
+        # Cycle => not expanded again
+        create_rel(subject_entity=orga3, object_entity=orga1)
+
+        graph = self._create_graph(user, roots=[orga1], rtype=self.has_client)
+
+        self.assertListEqual(
+            [GraphEdge(parent_id=orga1.id, entity=orga2, relation_type=self.has_client)],
+            GraphExpander().expand(graph=graph, user=user).edges,
+        )
+        self.assertListEqual(
+            [
+                GraphEdge(parent_id=orga1.id, entity=orga2, relation_type=self.has_client),
+                GraphEdge(parent_id=orga2.id, entity=orga3, relation_type=self.has_client),
+                GraphEdge(parent_id=orga3.id, entity=orga1, relation_type=self.has_client),
+            ],
+            GraphExpander(depth=5).expand(graph=graph, user=user).edges,
+        )
+
+    def test_expand__max_nodes(self):
+        user = self.get_root_user()
+
+        orga = FakeOrganisation.objects.create(user=user, name='NERV')
+        contact1, contact2, contact3 = self._add_employees(user, orga, 3)
+        graph = self._create_graph(user, roots=[orga], rtype=self.has_employee)
+
+        with self.assertLogs('creme.graphs.core', level='WARNING'):
+            expansion = GraphExpander(max_nodes=3).expand(graph=graph, user=user)
+
+        self.assertTrue(expansion.truncated)
+        self.assertListEqual([orga], expansion.roots)
+        self.assertListEqual(
+            [contact1, contact2], [edge.entity for edge in expansion.edges],
+        )
+
+    def test_expand__credentials(self):
+        user = self.login_as_standard(allowed_apps=['creme_core', 'graphs'])
+        self.add_credentials(user.role, own=['VIEW'])
+
+        other_user = self.get_root_user()
+        create_orga = partial(FakeOrganisation.objects.create, name='NERV')
+        orga = create_orga(user=user)
+        forbidden_orga = create_orga(user=other_user)
+
+        contact1, contact2 = self._add_employees(user, orga, 2)
+        contact2.user = other_user
+        contact2.save()
+
+        graph = Graph.objects.create(user=user, name='Employees graph')
+        for root in (orga, forbidden_orga):
+            node = RootNode.objects.create(graph=graph, real_entity=root)
+            node.relation_types.set([self.has_employee])
+
+        expansion = GraphExpander().expand(graph=graph, user=user)
+        self.assertListEqual([orga], expansion.roots)
+        self.assertListEqual([contact1], [edge.entity for edge in expansion.edges])
+
+    def test_expand__deleted_root(self):
+        user = self.get_root_user()
+
+        orga = FakeOrganisation.objects.create(user=user, name='NERV', is_deleted=True)
+        self._add_employees(user, orga, 1)
+        graph = self._create_graph(user, roots=[orga], rtype=self.has_employee)
+
+        expansion = GraphExpander().expand(graph=graph, user=user)
+        self.assertFalse(expansion.roots)
+        self.assertFalse(expansion.edges)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            GraphExpander(depth=0)
+
+        with self.assertRaises(ValueError):
+            GraphExpander(max_nodes=0)
@@ -396,6 +396,38 @@ class CurrentQuoteSettingTestCase(OpportunitiesBaseTestCase):
         self.assertEqual(300, self.refresh(quote).total_no_vat)
         self.assertEqual(300, self.refresh(opportunity).estimated_sales)
 
+    @skipIfCustomOrganisation
+    def test_use_for_estimation__lines_modified(self):
+        "The totals of the Quote are updated incrementally by the lines."
+        user = self.login_as_root_and_get()
+        self._set_quote_config(use_current_quote=True)
+
+        opportunity = self._create_opportunity_n_organisations(user=user)[0]
+        self.client.post(_build_gendoc_url(opportunity))
+
+        quote = Quote.objects.all()[0]
+        self.assertPOST200(self._build_current_quote_url(opportunity, quote), follow=True)
+
+        create_sline = partial(
+            ServiceLine.objects.create, user=user, related_document=quote,
+        )
+        create_sline(on_the_fly_item='Stuff #1', unit_price=Decimal('300'))
+        self.assertEqual(300, self.refresh(opportunity).estimated_sales)
+
+        # The total is already positive
+        line2 = create_sline(on_the_fly_item='Stuff #2', unit_price=Decimal('200'))
+        self.assertEqual(500, self.refresh(quote).total_no_vat)
+        self.assertEqual(500, self.refresh(opportunity).estimated_sales)
+
+        line2 = self.refresh(line2)
+        line2.unit_price = Decimal('150')
+        line2.save()
+        self.assertEqual(450, self.refresh(opportunity).estimated_sales)
+
+        line2.delete()
+        self.assertEqual(300, self.refresh(quote).total_no_vat)
+        self.assertEqual(300, self.refresh(opportunity).estimated_sales)
+
     @skipIfCustomOrganisation
     def test_relations_deleted(self):
         user = self.login_as_root_and_get()
@@ -223,6 +223,13 @@ class AbstractContact(CremeEntity, PersonWithAddressesMixin):
                 email=self.email or '',
             )
 
+    def allows_bulk_save(self, field_names):
+        # NB: save() synchronises the fields of the related user
+        return type(self).save is AbstractContact.save and (
+            not self.is_user_id
+            or not {'last_name', 'first_name', 'email'}.intersection(field_names)
+        )
+
     def trash(self):
         self._check_deletion()
         super().trash()
@@ -173,6 +173,18 @@ class ContactTestCase(_PersonsTestCase):
         )
 
     @skipIfCustomAddress
+    def test_allows_bulk_save(self):
+        user = self.login_as_root_and_get()
+        contact = Contact.objects.create(user=user, first_name='Deunan', last_name='Knut')
+        self.assertTrue(contact.allows_bulk_save(['last_name', 'description']))
+
+        # The related user must be synchronised by save()
+        user_contact = user.linked_contact
+        self.assertTrue(user_contact.allows_bulk_save(['description']))
+        self.assertFalse(user_contact.allows_bulk_save(['description', 'last_name']))
+        self.assertFalse(user_contact.allows_bulk_save(['first_name']))
+        self.assertFalse(user_contact.allows_bulk_save(['email']))
+
     def test_clone(self):
         "Addresses & is_user are problematic."
         user = self.login_as_root_and_get()
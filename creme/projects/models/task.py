@@ -170,6 +170,10 @@ class AbstractProjectTask(CremeEntity):
 
         super().save(*args, **kwargs)
 
+    def allows_bulk_save(self, field_names):
+        # NB: save() does something only at creation
+        return type(self).save is AbstractProjectTask.save
+
 
 class ProjectTask(AbstractProjectTask):
     class Meta(AbstractProjectTask.Meta):
@@ -29,6 +29,12 @@ class TaskTestCase(ProjectsTestCase):
         self.assertGreaterEqual(status_count, 2)
         self.assertEqual(status_count, TaskStatus.objects.order_by('-order')[0].order)
 
+    def test_allows_bulk_save(self):
+        user = self.login_as_root_and_get()
+        project = self.create_project(user=user, name='Eva01')[0]
+        task = self.create_task(project, 'Building')
+        self.assertTrue(task.allows_bulk_save(['title', 'description']))
+
     def test_creation(self):
         "Create 2 tasks without collision."
         user = self.login_as_root_and_get()
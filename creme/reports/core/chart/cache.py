@@ -0,0 +1,156 @@
+################################################################################
+#    Creme is a free/open-source Customer Relationship Management software
+#    Copyright (C) 2026  Hybird
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+################################################################################
+
+from __future__ import annotations
+
+import json
+import logging
+from collections.abc import Callable
+from hashlib import sha1
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.timezone import get_current_timezone_name, localdate
+from django.utils.translation import get_language
+
+from creme.creme_core.core.token_cache import TokenCache
+from creme.creme_core.utils.queries import QSerializer
+
+if TYPE_CHECKING:
+    from django.core.cache.backends.base import BaseCache
+
+    from creme.reports.models import ReportChart
+
+logger = logging.getLogger(__name__)
+
+ChartResults = tuple[list[str], list]
+
+
+class ChartCache:
+    """Cache for the results of <ReportChart.fetch()>; it avoids performing the
+    (heavy) aggregation queries each time a chart is displayed (e.g. the home
+    page with many charts bricks).
+
+    The results are stored in a Django's cache (see the settings
+    "REPORTS_CHARTS_CACHE_ALIAS" & "REPORTS_CHARTS_CACHE_TIMEOUT").
+    The keys of the results contain some tokens which are renewed to invalidate
+    the results (see 'reports.signals' & 'creme_core.core.token_cache'):
+      - one token per ContentType, renewed when an entity of this type is
+        created/modified/deleted (or one of its relationships...).
+      - a global token, renewed when the configuration (reports, charts,
+        filters, credentials...) is modified.
+    The key contains the credentials signature of the user too (so users with
+    the same credentials do not share their results), the extra filter & the
+    current date (so the filters with relative dates, like "current month",
+    are computed again each day).
+
+    Notice that some modifications are not detected, so use a timeout if you
+    use such things:
+      - modifications which do not send signals (e.g. QuerySet.update()).
+      - modifications of the instances used as abscissa which are not entities
+        of the report's type (e.g. the name of a category used by a ForeignKey,
+        the name of an entity used by a relationship), because only the
+        ContentType of the report invalidates the results.
+    """
+    key_prefix = 'reports-chart'
+
+    def __init__(self):
+        self.tokens = TokenCache(
+            key_prefix=self.key_prefix, alias_setting='REPORTS_CHARTS_CACHE_ALIAS',
+        )
+
+    @property
+    def cache(self) -> BaseCache | None:
+        "Get the Django's cache which is used; <None> means the cache is disabled."
+        return self.tokens.cache
+
+    @staticmethod
+    def _user_signature(user) -> str:
+        return (
+            'superuser' if user.is_superuser else
+            f'{user.id}-{user.role_id}-{int(user.is_staff)}'
+        )
+
+    def _build_key(self, *, cache: BaseCache, chart: ReportChart, user,
+                   extra_q: Q | None, order: str,
+                   ) -> str | None:
+        if extra_q is None:
+            q_signature = ''
+        else:
+            try:
+                q_signature = json.dumps(QSerializer().serialize(extra_q), sort_keys=True)
+            except Exception as e:
+                logger.debug('ChartCache: the extra Q cannot be serialized (%s)', e)
+                return None
+
+        report = chart.linked_report
+        signature = json.dumps([
+            *self.tokens.get_many(cache, ['global', f'ctype-{report.ct_id}']),
+            report.id, report.filter_id,
+            chart.abscissa_cell_value, chart.abscissa_type, chart.abscissa_parameter,
+            chart.ordinate_type, chart.ordinate_cell_key,
+            self._user_signature(user),
+            q_signature, order,
+            get_language(), get_current_timezone_name(), localdate().isoformat(),
+        ])
+
+        return f'{self.key_prefix}-{chart.id}-{sha1(signature.encode()).hexdigest()}'
+
+    def get_or_fetch(self, *,
+                     chart: ReportChart,
+                     user,
+                     fetcher: Callable[[], ChartResults],
+                     extra_q: Q | None = None,
+                     order: str = 'ASC',
+                     ) -> ChartResults:
+        """Get the results of a chart from the cache ; they are computed if
+        they are not cached yet (or if they have been invalidated).
+        @param chart: Instance of ReportChart.
+        @param user: The user who sees the chart.
+        @param fetcher: Callable which computes the results.
+        @param extra_q: see <ReportChart.fetch()>.
+        @param order: see <ReportChart.fetch()>.
+        @return: see <ReportChart.fetch()>.
+        """
+        cache = self.cache
+        key = None if cache is None else self._build_key(
+            cache=cache, chart=chart, user=user, extra_q=extra_q, order=order,
+        )
+
+        if key is None:
+            return fetcher()
+
+        results = cache.get(key)
+
+        if results is None:
+            results = fetcher()
+            cache.set(key, results, timeout=settings.REPORTS_CHARTS_CACHE_TIMEOUT)
+
+        return results
+
+    def invalidate_ctype(self, ctype_id: int) -> None:
+        "Invalidate the results of the charts related to a ContentType (ID)."
+        self.tokens.renew(f'ctype-{ctype_id}')
+
+    def invalidate_all(self) -> None:
+        "Invalidate the results of all the charts."
+        self.tokens.renew('global')
+
+
+chart_cache = ChartCache()
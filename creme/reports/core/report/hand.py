@@ -19,7 +19,8 @@
 from __future__ import annotations
 
 import logging
-from collections.abc import Iterable, Iterator
+from collections import defaultdict
+from collections.abc import Iterable, Iterator, Sequence
 from typing import TYPE_CHECKING
 from uuid import UUID
 
@@ -35,7 +36,12 @@ from creme.creme_core.auth.entity_credentials import EntityCredentials
 from creme.creme_core.core.function_field import function_field_registry
 from creme.creme_core.gui.field_printers import field_printer_registry
 from creme.creme_core.gui.view_tag import ViewTag
-from creme.creme_core.models import CremeEntity, CustomField, RelationType
+from creme.creme_core.models import (
+    CremeEntity,
+    CustomField,
+    Relation,
+    RelationType,
+)
 from creme.creme_core.models.utils import model_verbose_name
 from creme.creme_core.utils.meta import FieldInfo
 from creme.reports import constants
@@ -70,6 +76,10 @@ class ReportHand:
         self._title = title
         self._support_subreport = support_subreport
 
+        # Related instances retrieved by populate_entities() ; format:
+        #   {entity_id: [related instances]}  (see _get_filtered_related_entities())
+        self._related_cache: dict[int, list] | None = None
+
     def _generate_flattened_report(self, entities, user, scope: QuerySet) -> str:
         columns = self._report_field.sub_report.columns
 
@@ -84,17 +94,66 @@ class ReportHand:
     def _get_related_instances(self, entity: CremeEntity, user) -> QuerySet:
         raise NotImplementedError
 
-    def _get_filtered_related_entities(self, entity: CremeEntity, user) -> QuerySet:
-        related_entities = EntityCredentials.filter(
-            user=user,
-            queryset=self._get_related_instances(entity, user),
-        )
+    def _get_related_instances_map(self,
+                                   entities: Sequence[CremeEntity],
+                                   user,
+                                   ) -> dict[int, list[Model]] | None:
+        """Retrieve the related instances (see _get_related_instances()) of
+        several entities at once ; they are filtered like in
+        _get_filtered_related_entities().
+        @return A dictionary {entity_id: [related instances]},
+                or None if the hand cannot do it.
+        """
+        return None
+
+    def _filter_related_instances(self, qs: QuerySet, user) -> QuerySet:
+        if issubclass(qs.model, CremeEntity):
+            qs = EntityCredentials.filter(user=user, queryset=qs)
+
         report = self._report_field.sub_report
+        if report is not None and report.filter is not None:
+            qs = report.filter.filter(qs)
+
+        return qs
+
+    @staticmethod
+    def _group_related_instances(entities: Sequence[CremeEntity],
+                                 related_ids: dict[int, list[int]],
+                                 qs: QuerySet,
+                                 ) -> dict[int, list[Model]]:
+        """Retrieve the related instances of several entities with one query.
+        @param entities: Sequence of entities.
+        @param related_ids: IDs of the related instances, per entity ID.
+        @param qs: QuerySet of the related instances (gives the order).
+        """
+        pk_set = {pk for pks in related_ids.values() for pk in pks}
+        instances = [*qs.filter(pk__in=pk_set)] if pk_set else []
+        positions = {instance.pk: idx for idx, instance in enumerate(instances)}
+
+        return {
+            entity.id: [
+                instances[idx]
+                for idx in sorted(
+                    positions[pk] for pk in related_ids.get(entity.id, ()) if pk in positions
+                )
+            ] for entity in entities
+        }
+
+    def _get_filtered_related_entities(self, entity: CremeEntity, user) -> QuerySet | list:
+        cache = self._related_cache
+        if cache is not None:
+            related_entities = cache.get(entity.id)
+            if related_entities is not None:
+                return related_entities
+
+        return self._filter_related_instances(self._get_related_instances(entity, user), user)
 
-        if report.filter is not None:
-            related_entities = report.filter.filter(related_entities)
+    def _populate_sub_report(self, instances: Sequence[Model], user) -> None:
+        report = self._report_field.sub_report
 
-        return related_entities
+        if report is not None:
+            for column in report.columns:
+                column.populate_entities(instances, user)
 
     def _get_value(self,
                    entity: CremeEntity,
@@ -156,13 +215,13 @@ class ReportHand:
         """Used as _get_value() method by subclasses which manage
         sub-reports (no sub-report case).
         """
-        qs = self._get_related_instances(entity, user)
         extract = self._related_model_value_extractor
 
-        if issubclass(qs.model, CremeEntity):
-            qs = EntityCredentials.filter(user, qs)
-
-        return ', '.join(str(extract(instance)) for instance in qs)
+        # NB: there is no sub-report, so only the credentials are used to filter
+        return ', '.join(
+            str(extract(instance))
+            for instance in self._get_filtered_related_entities(entity, user)
+        )
 
     def _get_value_single(self,
                           entity: CremeEntity,
@@ -208,6 +267,44 @@ class ReportHand:
         """
         return None
 
+    def populate_entities(self, entities: Sequence[CremeEntity], user) -> None:
+        """Retrieve the data needed by get_value() for several entities at once
+        (e.g. a page of the entities of the report), in order to get a constant
+        number of queries for the whole page.
+        The default implementation retrieves the related instances of the hands
+        which support sub-reports (see _get_related_instances_map()) & populates
+        the columns of the sub-report with them.
+        @param entities: Sequence of CremeEntities (those which are then passed
+               to get_value()) ; an empty sequence clears the cache.
+        @param user: User instance ; used to compute credentials.
+        """
+        self._related_cache = None
+
+        if not self._support_subreport:
+            return
+
+        report = self._report_field.sub_report
+        # NB: aggregates need the related instances as a QuerySet (scope)
+        if report is not None and any(
+            isinstance(column.hand, RHAggregate) for column in report.columns
+        ):
+            return
+
+        related_map = self._get_related_instances_map(entities, user) if entities else {}
+
+        if related_map is not None:
+            self._related_cache = related_map or None
+            self._populate_sub_report(
+                [
+                    *{
+                        instance.pk: instance
+                        for instances in related_map.values()
+                        for instance in instances
+                    }.values()
+                ],
+                user,
+            )
+
     def get_value(self,
                   entity: CremeEntity | None,
                   user,
@@ -368,6 +465,8 @@ class RHForeignKey(RHRegularField):
                 self._value_extractor = lambda fk_instance, user: str(fk_instance)
 
         self._qs = qs
+        # Instances retrieved by populate_entities() ; format {fk_id: instance_or_None}
+        self._fk_cache: dict[int, Model | None] = {}
         super().__init__(
             report_field,
             support_subreport=True,
@@ -377,13 +476,31 @@ class RHForeignKey(RHRegularField):
     # NB: cannot rename to _get_related_instances() because forbidden entities
     #     are filtered instead of outputting '??'
     def _get_fk_instance(self, entity: CremeEntity) -> CremeEntity | None:
+        fk_id = getattr(entity, self._fk_attr_name)
+        if fk_id is None:
+            return None
+
         try:
-            rel_entity = self._qs.get(pk=getattr(entity, self._fk_attr_name))
+            return self._fk_cache[fk_id]
+        except KeyError:
+            pass
+
+        try:
+            rel_entity = self._qs.get(pk=fk_id)
         except ObjectDoesNotExist:
             rel_entity = None
 
         return rel_entity
 
+    def populate_entities(self, entities, user):
+        attr_name = self._fk_attr_name
+        fk_ids = {getattr(entity, attr_name) for entity in entities}
+        fk_ids.discard(None)
+
+        instances = self._qs.in_bulk(fk_ids) if fk_ids else {}
+        self._fk_cache = {fk_id: instances.get(fk_id) for fk_id in fk_ids}
+        self._populate_sub_report([*instances.values()], user)
+
     def _get_value_flattened_subreport(self, entity, user, scope):
         fk_entity = self._get_fk_instance(entity)
 
@@ -429,6 +546,25 @@ class RHManyToManyField(RHRegularField):
     def _get_related_instances(self, entity, user):
         return getattr(entity, self._field_info[0].name).all()
 
+    def _get_related_instances_map(self, entities, user):
+        m2m_field = self._field_info[0]
+        source_name = m2m_field.m2m_field_name()
+        target_name = m2m_field.m2m_reverse_field_name()
+
+        related_ids = defaultdict(list)
+        for source_id, target_id in m2m_field.remote_field.through.objects.filter(
+            **{f'{source_name}__in': [entity.id for entity in entities]}
+        ).values_list(source_name, target_name):
+            related_ids[source_id].append(target_id)
+
+        return self._group_related_instances(
+            entities=entities,
+            related_ids=related_ids,
+            qs=self._filter_related_instances(
+                m2m_field.remote_field.model._default_manager.all(), user,
+            ),
+        )
+
     def get_linkable_ctypes(self):
         m2m_model = self._field_info[0].remote_field.model
 
@@ -451,6 +587,9 @@ class RHCustomField(ReportHand):
 
         super().__init__(report_field, title=cf.name)
 
+    def populate_entities(self, entities, user):
+        CremeEntity.populate_custom_values(entities, [self._cfield])
+
     def _get_value_single_on_allowed(self, entity, user, scope):
         cvalue = entity.get_custom_value(self._cfield)
         # TODO: use a EntityCellCustomField & remove __str__ methods of CustomFieldValue models ?
@@ -490,6 +629,29 @@ class RHRelation(ReportHand):
             relations__object_entity=entity.id,
         )
 
+    def _get_related_instances_map(self, entities, user):
+        if self._report_field.sub_report is None:
+            return None
+
+        related_ids = defaultdict(list)
+        for subject_id, object_id in Relation.objects.filter(
+            type=self._rtype, subject_entity__in=[entity.id for entity in entities],
+        ).values_list('subject_entity_id', 'object_entity_id'):
+            related_ids[subject_id].append(object_id)
+
+        return self._group_related_instances(
+            entities=entities,
+            related_ids=related_ids,
+            qs=self._filter_related_instances(self._related_model.objects.all(), user),
+        )
+
+    def populate_entities(self, entities, user):
+        if self._report_field.sub_report is None:
+            if entities:
+                CremeEntity.populate_relations(entities, [self._rtype.id])
+        else:
+            super().populate_entities(entities, user)
+
     # TODO: add a feature in base class to retrieved efficiently real entities ??
     # TODO: extract algorithm that retrieve efficiently real entity from
     #       CremeEntity.get_related_entities()
@@ -529,6 +691,9 @@ class RHFunctionField(ReportHand):
 
         super().__init__(report_field, title=str(funcfield.verbose_name))
 
+    def populate_entities(self, entities, user):
+        self._funcfield.populate_entities(entities, user)
+
     def _get_value_single_on_allowed(self, entity, user, scope):
         return self._funcfield(entity, user).render(tag=ViewTag.TEXT_PLAIN)
 
@@ -16,6 +16,8 @@
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ################################################################################
 
+from collections.abc import Iterator
+
 
 class ExpandableLine:
     """Store a line of report values that can be expanded in several lines if
@@ -24,7 +26,7 @@ class ExpandableLine:
     def __init__(self, values: list[str | list]):
         self._cvalues = values
 
-    def _visit(self, lines: list, current_line: list) -> None:
+    def _visit(self, current_line: list) -> Iterator[list[str]]:
         values: list[str | None] = []
         values_to_build = None
 
@@ -45,12 +47,13 @@ class ExpandableLine:
             cls = type(self)
 
             for future_node in values_to_build:
-                cls(future_node)._visit(lines, [*current_line])
+                yield from cls(future_node)._visit([*current_line])
         else:
-            lines.append(current_line)
+            yield current_line
 
-    def get_lines(self) -> list[list[str]]:
-        lines: list[list[str]] = []
-        self._visit(lines, [])
+    def iter_lines(self) -> Iterator[list[str]]:
+        """Generator of the expanded lines (they are built lazily)."""
+        return self._visit([])
 
-        return lines
+    def get_lines(self) -> list[list[str]]:
+        return [*self.iter_lines()]
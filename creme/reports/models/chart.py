@@ -19,6 +19,7 @@
 from __future__ import annotations
 
 import logging
+from functools import partial
 from typing import TYPE_CHECKING
 from uuid import uuid4
 
@@ -44,6 +45,7 @@ from ..core.chart import (
     chart_fetcher_registry,
     ordinate_constraints,
 )
+from ..core.chart.cache import chart_cache
 
 if TYPE_CHECKING:
     from ..core.chart import ChartHand
@@ -210,14 +212,7 @@ class ReportChart(CremeModel):
         cell = ord_info.cell
         self.ordinate_cell_key = cell.portable_key if cell else ''
 
-    # TODO: use creme_core.utils.meta.Order
-    def fetch(self,
-              user,
-              extra_q: models.Q | None = None,
-              order: str = 'ASC',
-              ) -> tuple[list[str], list]:
-        assert order == 'ASC' or order == 'DESC'
-
+    def _fetch(self, *, user, extra_q: models.Q | None, order: str) -> tuple[list[str], list]:
         report = self.linked_report
         entities = EntityCredentials.filter(
             user=user,
@@ -229,6 +224,26 @@ class ReportChart(CremeModel):
 
         return self.hand.fetch(entities=entities, order=order, user=user, extra_q=extra_q)
 
+    # TODO: use creme_core.utils.meta.Order
+    def fetch(self,
+              user,
+              extra_q: models.Q | None = None,
+              order: str = 'ASC',
+              ) -> tuple[list[str], list]:
+        """Get the values of the chart.
+        The results are cached (see 'reports.core.chart.cache').
+        @param user: The user who sees the chart (used to compute credentials).
+        @param extra_q: Instance of Q, or None ; applied to narrow the entities.
+        @param order: 'ASC' or 'DESC'.
+        @return: see <ChartHand.fetch()>.
+        """
+        assert order == 'ASC' or order == 'DESC'
+
+        return chart_cache.get_or_fetch(
+            chart=self, user=user, extra_q=extra_q, order=order,
+            fetcher=partial(self._fetch, user=user, extra_q=extra_q, order=order),
+        )
+
     def fetch_colormap(self, user):
         return self.hand.fetch_colormap(user=user)
 
@@ -20,8 +20,8 @@ from __future__ import annotations
 
 import logging
 # import warnings
-from collections.abc import Iterator
-from itertools import chain
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import chain, islice
 from typing import TYPE_CHECKING, Type
 
 from django.conf import settings
@@ -34,6 +34,7 @@ from django.utils.translation import gettext_lazy as _
 from creme.creme_core.auth.entity_credentials import EntityCredentials
 from creme.creme_core.core.entity_filter import EF_REGULAR
 from creme.creme_core.core.field_tags import FieldTag
+from creme.creme_core.core.paginator import FlowPaginator
 from creme.creme_core.models import (
     CremeEntity,
     CremeModel,
@@ -62,6 +63,9 @@ class AbstractReport(CremeEntity):
     creation_label = _('Create a report')
     save_label     = _('Save the report')
 
+    # Number of entities retrieved by query when the lines are generated
+    lines_page_size: int = 256
+
     _columns: list[Field] | None = None
 
     class Meta:
@@ -160,33 +164,85 @@ class AbstractReport(CremeEntity):
         if extra_q is not None:
             entities = entities.filter(extra_q)
 
-        if limit_to:
-            entities = entities[:limit_to]
-
         fields = self.filtered_columns
 
-        for entity in entities:
-            yield [
-                field.get_value(entity, scope=entities, user=user)
-                for field in fields
-            ]
-
-    # TODO: transform into generator (--> StreamResponse)
-    def fetch_all_lines(self,
-                        limit_to: int | None = None,
-                        extra_q: models.Q | None = None,
-                        user=None) -> list[list[str]]:
+        if limit_to:
+            # NB: the scope is sliced too (aggregates are computed on the displayed entities)
+            entities = entities[:limit_to]
+            pages = [entities]
+        else:
+            pages = self._iter_pages(entities)
+
+        try:
+            for page in pages:
+                page = [*page]
+
+                # Optimisation: each column retrieves its data for the whole page
+                for field in fields:
+                    field.populate_entities(page, user)
+
+                for entity in page:
+                    yield [
+                        field.get_value(entity, scope=entities, user=user)
+                        for field in fields
+                    ]
+        finally:
+            # The cached data of the columns must not be used outside this page
+            for field in fields:
+                field.populate_entities([], user)
+
+    def _iter_pages(self, entities: models.QuerySet) -> Iterator[Iterable[CremeEntity]]:
+        """Split the entities in pages, in order to avoid the retrieving of
+        all the entities (& their cached data) at once.
+        """
+        try:
+            paginator = FlowPaginator(queryset=entities, per_page=self.lines_page_size)
+        except ValueError as e:
+            logger.warning(
+                'Report.fetch_lines(): the entities cannot be paginated (%s) => '
+                'the whole queryset is used.', e
+            )
+            page_size = self.lines_page_size
+            entities_it = entities.iterator(chunk_size=page_size)
+
+            while page := [*islice(entities_it, page_size)]:
+                yield page
+        else:
+            for page in paginator.pages():
+                yield page.object_list
+
+    def fetch_lines(self,
+                    limit_to: int | None = None,
+                    extra_q: models.Q | None = None,
+                    user=None) -> Iterator[list[str]]:
+        """Generator of the lines of the report (the values of the selected
+        sub-reports are expanded in several lines).
+        The entities are retrieved page by page & the lines are generated
+        lazily, so the memory usage is bounded even with big reports.
+        @param limit_to: Maximum number of entities (the number of lines can
+               be greater because of the expanded sub-reports).
+        @param extra_q: Additional Q instance to filter the entities.
+        @param user: Lines are filtered with the credentials of this user
+               (default: a super-user).
+        """
         from ..core.report import ExpandableLine  # Lazy loading
 
-        lines = []
+        count = 0
 
         for values in self._fetch(limit_to=limit_to, extra_q=extra_q, user=user):
-            lines.extend(ExpandableLine(values).get_lines())
+            for line in ExpandableLine(values).iter_lines():
+                count += 1
+                yield line
 
-            if limit_to is not None and len(lines) >= limit_to:  # Meh
+            if limit_to is not None and count >= limit_to:  # Meh
                 break  # TODO: test
 
-        return lines
+    def fetch_all_lines(self,
+                        limit_to: int | None = None,
+                        extra_q: models.Q | None = None,
+                        user=None) -> list[list[str]]:
+        "Get all the lines at once; see fetch_lines()."
+        return [*self.fetch_lines(limit_to=limit_to, extra_q=extra_q, user=user)]
 
     def get_children_fields_flat(self) -> Iterator[Field]:
         return chain.from_iterable(
@@ -298,6 +354,14 @@ class Field(CremeModel):
         hand = self.hand
         return hand.get_value(entity, user, scope) if hand else '??'
 
+    def populate_entities(self, entities: Sequence[CremeEntity], user) -> None:
+        """Retrieve at once the data needed to get the values of several entities.
+        See ReportHand.populate_entities().
+        """
+        hand = self.hand
+        if hand:
+            hand.populate_entities(entities, user)
+
     @property
     def model(self) -> Type[CremeEntity]:
         return self.report.ct.model_class()
@@ -16,10 +16,94 @@
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ################################################################################
 
+from django.contrib.auth import get_user_model
 from django.dispatch import receiver
 
+from creme.creme_core import models as core_models
+from creme.creme_core.core.token_cache import (
+    concrete_models,
+    watch_m2m,
+    watch_models,
+)
+from creme.creme_core.global_info import get_per_request_cache
 from creme.creme_core.signals import pre_uninstall_flush
 
+from . import get_report_model
+from .core.chart.cache import chart_cache
+from .models import Field, ReportChart
+
+# Models which are used to configure the charts (or their credentials)
+_CHART_CONFIG_MODELS = (
+    get_report_model(), Field, ReportChart,
+    core_models.EntityFilter, core_models.EntityFilterCondition,
+    core_models.CustomField, core_models.CustomFieldEnumValue,
+    core_models.RelationType, core_models.FieldsConfig,
+    core_models.UserRole, core_models.SetCredentials, get_user_model(),
+)
+
+
+def _get_custom_field_ctype_id(cf_value):
+    # NB: the values deleted in bulk (see CustomFieldValue.save_values_for_entities())
+    #     have no cached CustomField ; we avoid a query per value.
+    if type(cf_value).custom_field.is_cached(cf_value):
+        return cf_value.custom_field.content_type_id
+
+    cfield_id = cf_value.custom_field_id
+    cache = get_per_request_cache()
+    cache_key = 'reports-custom_fields_ctypes'
+    ctype_ids = cache.get(cache_key)
+
+    if ctype_ids is None or cfield_id not in ctype_ids:
+        ctype_ids = cache[cache_key] = dict(
+            core_models.CustomField.objects.values_list('id', 'content_type_id')
+        )
+
+    return ctype_ids.get(cfield_id)
+
+
+def _invalidate_charts_cache(sender, instance, **kwargs):
+    if chart_cache.cache is None:
+        return
+
+    if isinstance(instance, core_models.CremeEntity):
+        chart_cache.invalidate_ctype(instance.entity_type_id)
+    elif isinstance(instance, core_models.Relation):
+        # NB: the symmetrical relation manages the type of the subject
+        chart_cache.invalidate_ctype(instance.object_ctype_id)
+    elif isinstance(instance, core_models.CustomFieldValue):
+        ctype_id = _get_custom_field_ctype_id(instance)
+        if ctype_id is not None:
+            chart_cache.invalidate_ctype(ctype_id)
+    elif isinstance(instance, _CHART_CONFIG_MODELS):
+        chart_cache.invalidate_all()
+
+
+def _invalidate_charts_cache_on_m2m(sender, instance, action, **kwargs):
+    if (
+        action.startswith('post_')
+        and isinstance(instance, core_models.CremeEntity)
+        and chart_cache.cache is not None
+    ):
+        chart_cache.invalidate_ctype(instance.entity_type_id)
+
+
+# NB: "sender=CremeEntity" does not work (the signal is sent for final class),
+#     so we connect the handlers to each concerned model.
+_entity_models = concrete_models(core_models.CremeEntity)
+watch_models(
+    _invalidate_charts_cache,
+    models=[
+        *_entity_models,
+        *concrete_models(core_models.Relation, core_models.CustomFieldValue),
+        *_CHART_CONFIG_MODELS,
+    ],
+    dispatch_uid='reports-invalidate_charts_cache',
+)
+watch_m2m(
+    _invalidate_charts_cache_on_m2m,
+    models=_entity_models, dispatch_uid='reports-invalidate_charts_cache_on_m2m',
+)
+
 
 @receiver(pre_uninstall_flush, dispatch_uid='reports-manage_uninstallation')
 def _uninstall_reports(
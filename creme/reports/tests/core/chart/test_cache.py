@@ -0,0 +1,207 @@
+from datetime import date
+from functools import partial
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.db.models import Q
+from django.test.utils import override_settings
+
+from creme.creme_core.models import (
+    CustomField,
+    CustomFieldInteger,
+    EntityFilter,
+    FakeContact,
+    FakePosition,
+    Relation,
+)
+from creme.creme_core.tests.fake_constants import FAKE_REL_SUB_EMPLOYED_BY
+from creme.reports.core.chart.cache import ChartCache, chart_cache
+from creme.reports.models import ReportChart
+
+from ...base import BaseReportsTestCase
+
+
+@override_settings(REPORTS_CHARTS_CACHE_ALIAS='default', REPORTS_CHARTS_CACHE_TIMEOUT=None)
+class ChartCacheTestCase(BaseReportsTestCase):
+    def setUp(self):
+        super().setUp()
+        caches['default'].clear()
+
+    def _create_chart(self, user):
+        report = self._create_simple_contacts_report(user=user)
+
+        return ReportChart.objects.create(
+            linked_report=report,
+            name='Contacts by position',
+            abscissa_cell_value='position', abscissa_type=ReportChart.Group.FK,
+            ordinate_type=ReportChart.Aggregator.COUNT,
+        )
+
+    @staticmethod
+    def _get_count(results, position):
+        x, y = results
+        return y[x.index(position.title)][0]
+
+    def test_cache(self):
+        self.assertIsInstance(chart_cache, ChartCache)
+        self.assertIs(caches['default'], chart_cache.cache)
+
+        with override_settings(REPORTS_CHARTS_CACHE_ALIAS=''):
+            self.assertIsNone(chart_cache.cache)
+
+    def test_fetch(self):
+        user = self.login_as_root_and_get()
+        chart = self._create_chart(user)
+
+        lord = FakePosition.objects.create(title='Lord')
+        FakeContact.objects.create(
+            user=user, first_name='Eddard', last_name='Stark', position=lord,
+        )
+
+        results1 = chart.fetch(user=user)
+        self.assertEqual(1, self._get_count(results1, lord))
+
+        chart = self.refresh(chart)
+        chart.linked_report  # NOQA
+        with self.assertNumQueries(0):
+            results2 = chart.fetch(user=user)
+
+        self.assertEqual(results1, results2)
+
+        # Other arguments => other results
+        x_desc, y_desc = chart.fetch(user=user, order='DESC')
+        self.assertListEqual([*reversed(results1[0])], x_desc)
+
+        self.assertTupleEqual(([], []), chart.fetch(user=user, extra_q=Q(first_name='Robb')))
+
+    def test_fetch__disabled(self):
+        user = self.login_as_root_and_get()
+        chart = self._create_chart(user)
+
+        with override_settings(REPORTS_CHARTS_CACHE_ALIAS=''):
+            with patch.object(ReportChart, '_fetch', return_value=([], [])) as fetch_mock:
+                chart.fetch(user=user)
+                chart.fetch(user=user)
+
+        self.assertEqual(2, fetch_mock.call_count)
+
+    def test_fetch__timeout(self):
+        user = self.login_as_root_and_get()
+        chart = self._create_chart(user)
+
+        lord = FakePosition.objects.create(title='Lord')
+        create_contact = partial(FakeContact.objects.create, user=user, position=lord)
+        create_contact(first_name='Eddard', last_name='Stark')
+        self.assertEqual(1, self._get_count(chart.fetch(user=user), lord))
+
+        # NB: update() does not send signals => the results are not invalidated
+        FakeContact.objects.update(position=None)
+        self.assertEqual(1, self._get_count(chart.fetch(user=user), lord))
+
+        with override_settings(REPORTS_CHARTS_CACHE_TIMEOUT=0):  # Expire immediately
+            FakeContact.objects.update(position=lord)
+            chart.fetch(user=user, order='DESC')
+
+            FakeContact.objects.update(position=None)
+            self.assertEqual(0, self._get_count(chart.fetch(user=user, order='DESC'), lord))
+
+    def test_invalidation__date(self):
+        "The results are computed again each day (filters with relative dates)."
+        user = self.login_as_root_and_get()
+        chart = self._create_chart(user)
+
+        with patch.object(ReportChart, '_fetch', return_value=([], [])) as fetch_mock:
+            chart.fetch(user=user)
+            chart.fetch(user=user)
+            self.assertEqual(1, fetch_mock.call_count)
+
+            with patch(
+                'creme.reports.core.chart.cache.localdate',
+                return_value=date(year=2030, month=1, day=1),
+            ):
+                chart.fetch(user=user)
+
+        self.assertEqual(2, fetch_mock.call_count)
+
+    def test_invalidation__entity(self):
+        user = self.login_as_root_and_get()
+        chart = self._create_chart(user)
+
+        lord = FakePosition.objects.create(title='Lord')
+        create_contact = partial(FakeContact.objects.create, user=user, position=lord)
+        ned = create_contact(first_name='Eddard', last_name='Stark')
+        self.assertEqual(1, self._get_count(chart.fetch(user=user), lord))
+
+        create_contact(first_name='Robb', last_name='Stark')
+        self.assertEqual(2, self._get_count(chart.fetch(user=user), lord))
+
+        ned.delete()
+        self.assertEqual(1, self._get_count(chart.fetch(user=user), lord))
+
+    def test_invalidation__relation(self):
+        user = self.login_as_root_and_get()
+        create_contact = partial(FakeContact.objects.create, user=user)
+        ned = create_contact(first_name='Eddard', last_name='Stark')
+        robb = create_contact(first_name='Robb', last_name='Stark')
+
+        get_token = partial(chart_cache.tokens.get, caches['default'])
+        token_name = f'ctype-{self.ct_contact.id}'
+        token = get_token(token_name)
+
+        Relation.objects.create(
+            user=user, subject_entity=ned, type_id=FAKE_REL_SUB_EMPLOYED_BY,
+            object_entity=robb,
+        )
+        self.assertNotEqual(token, get_token(token_name))
+
+    def test_invalidation__custom_value(self):
+        user = self.login_as_root_and_get()
+        cfield = CustomField.objects.create(
+            name='Size', field_type=CustomField.INT, content_type=FakeContact,
+        )
+        ned = FakeContact.objects.create(user=user, first_name='Eddard', last_name='Stark')
+
+        get_token = partial(chart_cache.tokens.get, caches['default'])
+        token_name = f'ctype-{self.ct_contact.id}'
+        token1 = get_token(token_name)
+
+        save_values = partial(
+            CustomFieldInteger.save_values_for_entities, custom_field=cfield, entities=[ned],
+        )
+        save_values(value=180)
+        token2 = get_token(token_name)
+        self.assertNotEqual(token1, token2)
+
+        # Deletion (no cached CustomField)
+        save_values(value=None)
+        self.assertNotEqual(token2, get_token(token_name))
+
+    def test_invalidation__configuration(self):
+        user = self.login_as_root_and_get()
+        chart = self._create_chart(user)
+
+        lord = FakePosition.objects.create(title='Lord')
+        FakeContact.objects.create(
+            user=user, first_name='Eddard', last_name='Stark', position=lord,
+        )
+        chart.fetch(user=user)
+
+        token = chart_cache.tokens.get(caches['default'], 'global')
+        EntityFilter.objects.smart_update_or_create(
+            'test-filter', 'Starks', FakeContact, is_custom=True,
+        )
+        self.assertNotEqual(token, chart_cache.tokens.get(caches['default'], 'global'))
+
+    def test_credentials(self):
+        "The results depend on the credentials of the user."
+        user = self.login_as_basic_user()
+        other_user = self.get_root_user()
+        chart = self._create_chart(user)
+
+        lord = FakePosition.objects.create(title='Lord')
+        create_contact = partial(FakeContact.objects.create, position=lord)
+        create_contact(user=user,       first_name='Eddard', last_name='Stark')
+        create_contact(user=other_user, first_name='Robb',   last_name='Stark')
+
+        self.assertEqual(2, self._get_count(chart.fetch(user=other_user), lord))
+        self.assertEqual(1, self._get_count(chart.fetch(user=user), lord))
@@ -775,6 +775,12 @@ class ExpandableLineTestCase(CremeTestCase):
             ExpandableLine(values=['a', 'b', [['c', 'd'], ['e', 'f']], 'g']).get_lines(),
         )
 
+    def test_iter_lines(self):
+        lines = ExpandableLine(values=['a', [['b'], ['c']], 'd']).iter_lines()
+        self.assertListEqual(['a', 'b', 'd'], next(lines))
+        self.assertListEqual(['a', 'c', 'd'], next(lines))
+        self.assertIsNone(next(lines, None))
+
 
 class FieldAggregationRegistryTestCase(CremeTestCase):
     def test_empty(self):
@@ -1,3 +1,4 @@
+from collections.abc import Iterator
 from datetime import date
 from decimal import Decimal
 from functools import partial
@@ -5,6 +6,8 @@ from uuid import uuid4
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils.formats import number_format
 from django.utils.translation import gettext as _
@@ -32,12 +35,14 @@ from creme.creme_core.models import (
     FakeMailingList,
     FakeOrganisation,
     FakePosition,
+    Language,
     Relation,
     RelationType,
 )
 from creme.creme_core.tests.fake_constants import (
     FAKE_REL_OBJ_BILL_ISSUED,
     FAKE_REL_OBJ_EMPLOYED_BY,
+    FAKE_REL_SUB_EMPLOYED_BY,
 )
 from creme.reports.constants import (
     RFT_AGG_CUSTOM,
@@ -958,6 +963,127 @@ class FetchTestCase(BaseReportsTestCase):
         lines.pop(2)  # doc12
         self.assertEqual(lines, fetch(user=user))
 
+    def test_related__sub_report__expanded__pages(self):
+        "Sub-report (expanded); the entities are retrieved page by page."
+        user = self.login_as_basic_user()
+
+        self._aux_fetch_related(
+            select_doc_report=True, user=user, other_user=self.get_root_user(),
+        )
+        folder3 = FakeReportsFolder.objects.create(user=user, title='Empty')
+
+        report = self.folder_report
+        report.lines_page_size = 2
+
+        lines_gen = report.fetch_lines()
+        self.assertIsInstance(lines_gen, Iterator)
+
+        folder1 = self.folder1
+        doc11 = self.doc11
+        self.assertListEqual(
+            [
+                [folder3.title,      '',               ''],
+                [folder1.title,      doc11.title,      doc11.description],
+                [folder1.title,      self.doc12.title, ''],
+                [self.folder2.title, self.doc21.title, ''],
+            ],
+            [*lines_gen],
+        )
+
+        # The expanded lines of an entity are not split
+        self.assertListEqual(
+            [
+                [folder3.title, '',               ''],
+                [folder1.title, doc11.title,      doc11.description],
+                [folder1.title, self.doc12.title, ''],
+            ],
+            [*report.fetch_lines(limit_to=2)],
+        )
+
+    def _aux_populate_queries(self, user):
+        "The number of queries must not depend on the number of entities."
+        orga_report = Report.objects.create(user=user, name='Orga report', ct=self.ct_orga)
+        Field.objects.create(report=orga_report, name='name', type=RFT_FIELD, order=1)
+
+        cfield = CustomField.objects.create(
+            name='Size', field_type=CustomField.INT, content_type=FakeContact,
+        )
+        report = Report.objects.create(user=user, name='Contacts report', ct=self.ct_contact)
+        create_field = partial(Field.objects.create, report=report)
+        create_field(name='last_name',             type=RFT_FIELD,    order=1)
+        create_field(name='image',                 type=RFT_FIELD,    order=2)
+        create_field(name='languages',             type=RFT_FIELD,    order=3)
+        create_field(name=str(cfield.uuid),        type=RFT_CUSTOM,   order=4)
+        create_field(name='get_pretty_properties', type=RFT_FUNCTION, order=5)
+        create_field(name=REL_SUB_HAS,             type=RFT_RELATION, order=6)
+        create_field(
+            name=FAKE_REL_SUB_EMPLOYED_BY, type=RFT_RELATION, order=7,
+            sub_report=orga_report, selected=True,
+        )
+
+        create_language = Language.objects.create
+        languages = [create_language(name='Klingon'), create_language(name='Elvish')]
+        ptype = CremePropertyType.objects.create(text='Is a Stark')
+        count = 0
+
+        def create_contacts(number):
+            nonlocal count
+
+            for __ in range(number):
+                count += 1
+                img = FakeImage.objects.create(user=user, name=f'Face #{count}')
+                contact = FakeContact.objects.create(
+                    user=user, first_name='Stark', last_name=f'#{count}', image=img,
+                )
+                contact.languages.set(languages)
+                cfield.value_class.objects.create(
+                    entity=contact, custom_field=cfield, value=count,
+                )
+                CremeProperty.objects.create(type=ptype, creme_entity=contact)
+
+                orga = FakeOrganisation.objects.create(user=user, name=f'House #{count}')
+                create_rel = partial(
+                    Relation.objects.create,
+                    user=user, subject_entity=contact, object_entity=orga,
+                )
+                create_rel(type_id=FAKE_REL_SUB_EMPLOYED_BY)
+                create_rel(type_id=REL_SUB_HAS)
+
+        def fetch():
+            report_ = self.refresh(report)
+            report_.columns  # NOQA
+
+            with CaptureQueriesContext(connection) as ctxt:
+                lines = [*report_.fetch_lines(user=user)]
+
+            return lines, len(ctxt)
+
+        create_contacts(2)
+        fetch()  # Fill the caches (ContentTypes...)
+        lines1, queries_count1 = fetch()
+        self.assertEqual(2, len(lines1))
+        self.assertListEqual(
+            [
+                '#1', 'Face #1', 'Elvish, Klingon', '1', ptype.text,
+                'House #1', 'House #1',
+            ],
+            lines1[0],
+        )
+
+        create_contacts(4)
+        lines2, queries_count2 = fetch()
+        self.assertEqual(6, len(lines2))
+        self.assertListEqual(lines1[0], lines2[0])
+        self.assertEqual(queries_count1, queries_count2)
+
+    def test_populate__queries(self):
+        self._aux_populate_queries(user=self.login_as_root_and_get())
+
+    def test_populate__queries__regular_user(self):
+        user = self.login_as_standard(allowed_apps=['creme_core', 'reports'])
+        self.add_credentials(user.role, own='*')
+        self._aux_populate_queries(user=user)
+
     def test_related__sub_report__not_expanded(self):
         "Sub-report (not expanded)."
         user = self.login_as_basic_user()
@@ -1,5 +1,6 @@
 from datetime import date, datetime
 from functools import partial
+from unittest.mock import patch
 
 from django.test.utils import override_settings
 from django.urls import reverse
@@ -1143,6 +1144,10 @@ class ExportTestCase(BaseReportsTestCase):
     def _build_export_url(report):
         return reverse('reports__export_report', args=(report.id,))
 
+    @staticmethod
+    def _get_text(response):
+        return b''.join(response.streaming_content).decode()
+
     def test_filter__custom_range(self):
         user = self.login_as_root_and_get()
 
@@ -1316,7 +1321,7 @@ class ExportTestCase(BaseReportsTestCase):
             '"{}","{}","{}","{}"\r\n'.format(
                 _('Name'), _('Owner user'), rt.predicate, _('Properties'),
             ),
-            response.text,
+            self._get_text(response),
         )
 
     def test_perms(self):
@@ -1367,7 +1372,7 @@ class ExportTestCase(BaseReportsTestCase):
             self._build_export_url(report), data={'doc_type': 'csv'},
         )
 
-        content = (s for s in response.text.split('\r\n') if s)
+        content = (s for s in self._get_text(response).split('\r\n') if s)
         self.assertEqual(
             smart_str('"{}","{}","{}","{}"'.format(
                 _('Last name'), _('Owner user'), _('owns'), _('Properties'),
@@ -1383,6 +1388,25 @@ class ExportTestCase(BaseReportsTestCase):
         with self.assertRaises(StopIteration):
             next(content)
 
+    def test_streaming(self):
+        user = self.login_as_root_and_get()
+        self._create_persons(user=user)
+        report = self._create_simple_contacts_report(user=user)
+
+        with patch.object(Report, 'lines_page_size', 2):
+            response = self.assertGET200(
+                self._build_export_url(report), data={'doc_type': 'csv'},
+            )
+            self.assertTrue(response.streaming)
+
+            # NB: the lines are fetched when the content is consumed
+            content = [s for s in self._get_text(response).split('\r\n') if s]
+
+        self.assertListEqual(
+            ['"{}"'.format(_('Last name')), '"Ayanami"', '"Katsuragi"', '"Langley"'],
+            content,
+        )
+
     def test_date_filter__custom(self):
         "With date filter."
         user = self.login_as_root_and_get()
@@ -1400,7 +1424,7 @@ class ExportTestCase(BaseReportsTestCase):
             },
         )
 
-        content = [s for s in response.text.split('\r\n') if s]
+        content = [s for s in self._get_text(response).split('\r\n') if s]
         self.assertEqual(3, len(content))
 
         self.assertEqual(f'"Ayanami","{user}","","Kawaii"', content[1])
@@ -1426,7 +1450,7 @@ class ExportTestCase(BaseReportsTestCase):
             },
         )
 
-        content1 = [s for s in response1.text.split('\r\n') if s]
+        content1 = [s for s in self._get_text(response1).split('\r\n') if s]
         self.assertEqual(2, len(content1))
         self.assertEqual(f'"Baby","{user}","",""', content1[1])
 
@@ -1443,7 +1467,7 @@ class ExportTestCase(BaseReportsTestCase):
             },
         )
 
-        content2 = [s for s in response2.text.split('\r\n') if s]
+        content2 = [s for s in self._get_text(response2).split('\r\n') if s]
         self.assertEqual(2, len(content2))
         self.assertEqual(f'"Baby","{user}","",""', content2[1])
 
@@ -1496,7 +1520,7 @@ class ExportTestCase(BaseReportsTestCase):
 
         response = self.assertGET200(self._build_export_url(report), data={'doc_type': 'csv'})
 
-        content = (s for s in response.text.split('\r\n') if s)
+        content = (s for s in self._get_text(response).split('\r\n') if s)
         self.assertEqual(smart_str('"{}"'.format(_('Last name'))), next(content))
 
         self.assertEqual('"Ayanami"',   next(content))
@@ -1522,7 +1546,7 @@ class ExportTestCase(BaseReportsTestCase):
         response = self.assertGET200(self._build_export_url(report), data={'doc_type': 'csv'})
 
         # content = (s for s in response.content.decode().split('\r\n') if s)
-        content = (s for s in response.text.split('\r\n') if s)
+        content = (s for s in self._get_text(response).split('\r\n') if s)
         self.assertEqual(smart_str('"{}"'.format(_('Last name'))), next(content))
 
         self.assertEqual('"Ayanami"',   next(content))
@@ -1545,7 +1569,7 @@ class ExportTestCase(BaseReportsTestCase):
 
         response = self.assertGET200(self._build_export_url(report), data={'doc_type': 'csv'})
 
-        content = (s for s in response.text.split('\r\n') if s)
+        content = (s for s in self._get_text(response).split('\r\n') if s)
         self.assertEqual(
             smart_str('"{}","is an employee of"'.format(_('Last name'))),
             next(content),
@@ -1574,7 +1598,7 @@ class ExportTestCase(BaseReportsTestCase):
             },
         )
 
-        content = [s for s in response.text.split('\r\n') if s]
+        content = [s for s in self._get_text(response).split('\r\n') if s]
         self.assertEqual(2, len(content))
         self.assertEqual('"{}"'.format(_('Last name')), content[0])
         self.assertEqual(f'"{osaka.last_name}"',        content[1])
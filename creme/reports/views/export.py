@@ -69,7 +69,10 @@ class Preview(generic.EntityDetail):
 
                 if not EntityCredentials.filter(user, ct.get_all_objects_for_this_type()).exists():
                     empty_message = _('You can see no «{model}»').format(model=ct)
-                elif report.filter and not report.fetch_all_lines(limit_to=1, user=user):
+                elif (
+                    report.filter
+                    and next(report.fetch_lines(limit_to=1, user=user), None) is None
+                ):
                     empty_message = _('No «{model}» matches the filter «{filter}»').format(
                         model=ct,
                         filter=report.filter,
@@ -134,26 +137,27 @@ class Export(generic.base.EntityRelatedMixin, generic.CheckedView):
 
         return form
 
+    def iter_rows(self, *, report, q_filter, user):
+        """Generator of the exported rows (header included) ; the lines of the
+        report are generated lazily, so they can be streamed by the backend.
+        """
+        yield [smart_str(column.title) for column in report.get_children_fields_flat()]
+
+        for line in report.fetch_lines(extra_q=q_filter, user=user):
+            yield [smart_str(value) for value in line]
+
     def get(self, request, *args, **kwargs):
         user = request.user
         report = self.get_related_entity()
         form = self.get_form(report=report, request=request)
 
-        q_filter = form.get_q()
         writer = form.get_backend()
 
         if writer is None:
             raise ConflictError('Unknown extension')
 
-        writerow = writer.writerow
-
-        writerow([
-            smart_str(column.title) for column in report.get_children_fields_flat()
-        ])
-
-        for line in report.fetch_all_lines(extra_q=q_filter, user=user):
-            writerow([smart_str(value) for value in line])
-
-        writer.save(smart_str(report.name), user)
-
-        return writer.response
+        return writer.stream(
+            self.iter_rows(report=report, q_filter=form.get_q(), user=user),
+            filename=smart_str(report.name),
+            user=user,
+        )
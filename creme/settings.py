@@ -75,6 +75,66 @@ DEFAULT_AUTO_FIELD = 'django.db.models.AutoField'
 # - the paginator only allows to go to the next & the previous pages (& the main query is faster).
 FAST_QUERY_MODE_THRESHOLD = 100000
 
+# Strategy used to count the entities displayed by the list-views
+# (see 'creme_core.gui.listview.count'):
+#  - "exact": a COUNT query is performed at each display (& page change).
+#  - "cached": the exact counts are stored in a Django's cache (see the
+#    settings LISTVIEW_COUNT_CACHE_*) ; they are invalidated when an entity of
+#    the related type (or one of its relationships...) is modified.
+#  - "estimated": like "cached", but the row estimate of the database planner
+#    is used when it reaches FAST_QUERY_MODE_THRESHOLD ; the count is displayed
+#    as approximate (PostgreSQL only, the other DBMS use "cached").
+LISTVIEW_COUNT_MODE = 'exact'
+# Alias of the Django's cache (see the setting CACHES) used by the modes
+# "cached" & "estimated" ; an empty string disables the cache.
+# BEWARE: the caches of Creme (this one & the settings *_CACHE_ALIAS below) are
+#         invalidated with tokens stored in the Django's cache (see
+#         'creme_core.core.token_cache') ; if you run several processes (e.g.
+#         gunicorn workers), use a shared backend (memcached, redis...), or a
+#         process could use outdated values.
+LISTVIEW_COUNT_CACHE_ALIAS = 'default'
+# Lifetime of the counts (in seconds) ; keep it short, because the modifications
+# which do not send signals (e.g. QuerySet.update()) are not detected.
+LISTVIEW_COUNT_CACHE_TIMEOUT = 30
+
+# Index used by the global search & the quick search (see
+# 'creme_core.core.search_index') ; the value is the path of a class inheriting
+# 'creme_core.core.search_index.SearchIndexBackend' ; an empty string disables
+# the index (the configured fields are searched directly in the entities' tables).
+# Available backend: 'creme.creme_core.core.search_index.DatabaseSearchIndex'
+# (use PostgreSQL to get an index on the values).
+# BEWARE: run the command "creme_search_index" when you enable the index, or
+#         when you modify the search configuration.
+SEARCH_INDEX_BACKEND = ''
+
+# Process-wide cache for the configuration instances read by most of the
+# requests (SettingValue, FieldsConfig, CustomField...) ; see
+# 'creme_core.core.config_cache.ConfigCache'.
+# Alias of the Django's cache (see the setting CACHES) which stores the
+# generation of the cached configuration ; an empty string disables the
+# process-wide cache (the instances are cached per request only).
+# See the remark about the shared backends above LISTVIEW_COUNT_CACHE_ALIAS.
+CONFIG_CACHE_ALIAS = ''
+
+# Cache for the HTML of the bricks which enable it (see the attribute
+# 'Brick.fragment_cache' & 'creme_core.gui.brick_cache.BrickCache').
+# Alias of the Django's cache (see the setting CACHES) ; an empty string disables
+# the cache (see the remark about the shared backends above LISTVIEW_COUNT_CACHE_ALIAS).
+BRICKS_CACHE_ALIAS = ''
+# Lifetime of the fragments (in seconds) ; <None> means the fragments are only
+# invalidated when the related instances are modified.
+BRICKS_CACHE_TIMEOUT = 300
+
+# Concurrent rendering of the bricks on the detail-views & the home
+# (see 'creme_core.gui.brick_rendering.ConcurrentBricksRenderer').
+# Number of threads used to render the bricks of a page ; each thread uses its
+# own connection to the DataBase (so check the maximum number of connections
+# of your DB server). 0 means the bricks are rendered sequentially.
+BRICKS_RENDERING_WORKERS = 0
+# Maximum duration (in seconds) of the rendering of a brick ; when it's exceeded,
+# a placeholder is displayed & the brick is loaded by the browser afterwards.
+BRICKS_RENDERING_TIMEOUT = 10
+
 # JOBS #########################################################################
 # Maximum number of not finished jobs each user can have at the same time.
 #  When this number is reached for a user, he must wait one of his
@@ -99,6 +159,22 @@ MAX_USER_JOBS = 5
 # the effects of a hypothetical redis problem).
 PSEUDO_PERIOD = 1  # In hours
 
+# Number of worker processes which are started by the job scheduler to run the
+# jobs. These workers are started once (so Django is loaded only once), & they
+# are re-used by the successive jobs; so short jobs (reminders, sending of
+# emails...) are much cheaper to run, & the memory used by the jobs is bounded.
+# Notice that one worker is reserved to the system jobs, so the number of running
+# user jobs is then limited by this value minus one too (see MAX_USER_JOBS); the
+# system jobs which cannot be run immediately wait for a free worker.
+# 0 means "no worker": a new process is created for each execution of a job ;
+# otherwise the value must be >= 2.
+JOBMANAGER_WORKERS = 0
+
+# Number of jobs executed by a worker before it's replaced by a new process
+# (it avoids that the memory used by a worker grows indefinitely).
+# 0 means "never replaced".
+JOBMANAGER_WORKER_MAX_JOBS = 50
+
 # Broker's URL (communication between the views and the job scheduler)
 # It's a URL which starts by "type://".
 # Currently, there are 2 queue types:
@@ -1310,6 +1386,19 @@ REPORTS_REPORT_MODEL = 'reports.Report'
 
 REPORTS_REPORT_FORCE_NOT_CUSTOM = False
 
+# Cache for the results of the charts (useful with the dashboards which display
+# many charts); see 'reports.core.chart.cache.ChartCache'.
+# Alias of the Django's cache (see the setting CACHES) ; an empty string disables
+# the cache (see the remark about the shared backends above LISTVIEW_COUNT_CACHE_ALIAS).
+REPORTS_CHARTS_CACHE_ALIAS = ''
+# Lifetime of the results (in seconds) ; <None> means the results are only
+# invalidated when the entities/configuration are modified.
+# Notice that only the modifications of the entities of the report's type
+# invalidate the results (not the modifications of the instances used as
+# abscissa, like the targets of ForeignKeys or relationships) ; so do not use
+# <None> if it's a problem for you.
+REPORTS_CHARTS_CACHE_TIMEOUT = 300
+
 # ACTIVITIES -------------------------------------------------------------------
 ACTIVITIES_ACTIVITY_MODEL = 'activities.Activity'
 ACTIVITIES_ACTIVITY_FORCE_NOT_CUSTOM = False
@@ -1322,6 +1411,16 @@ ACTIVITIES_ACTIVITY_FORCE_NOT_CUSTOM = False
 #       creates the "missing" calendars for the existing users.
 ACTIVITIES_DEFAULT_CALENDAR_IS_PUBLIC = True
 
+# Cache for the data of the calendar view (useful with shared calendars); it's
+# used to answer the conditional requests (ETag) & the incremental
+# synchronisations too; see 'activities.core.calendar_cache.CalendarCache'.
+# Alias of the Django's cache (see the setting CACHES) ; an empty string disables
+# the cache (see the remark about the shared backends above LISTVIEW_COUNT_CACHE_ALIAS).
+ACTIVITIES_CALENDAR_CACHE_ALIAS = ''
+# Lifetime of the data (in seconds) ; <None> means the data are only
+# invalidated when the activities/calendars are modified.
+ACTIVITIES_CALENDAR_CACHE_TIMEOUT = 300
+
 # GRAPHS -----------------------------------------------------------------------
 GRAPHS_GRAPH_MODEL = 'graphs.Graph'
 GRAPHS_GRAPH_FORCE_NOT_CUSTOM = False